@@ -18,6 +18,21 @@
 
 """Module with utils for the Eonvelope :mod:`api` api."""
 
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import ValidationError
+
+from core.utils import FetchingCriterion
+
+if TYPE_CHECKING:
+    from collections.abc import Container
+
+    from django_stubs_ext import StrOrPromise
+
+
 type ParsableType = type
 
 
@@ -77,3 +92,40 @@ def csv_query_param_to_typed_list(
         raise ValueError(
             f"Invalid input: expected comma-separated {parse_type.__name__}s, got '{query_param}'"
         ) from error
+
+
+def validate_fetching_criterion(
+    criterion: str | None,
+    criterion_arg: str,
+    available_criteria: Container[str],
+    unavailable_message: StrOrPromise,
+) -> FetchingCriterion:
+    """Helper function to validate a fetching criterion from the request data.
+
+    Args:
+        criterion: The requested criterion.
+        criterion_arg: The requested argument for the criterion.
+        available_criteria: The criteria available for the fetch.
+        unavailable_message: The error message if the criterion is not available,
+            formatted with the criterion.
+
+    Returns:
+        The validated fetching criterion.
+
+    Raises:
+        ValidationError: If the criterion is missing, not available or invalid.
+    """
+    if not criterion:
+        raise ValidationError(
+            {"criterion": _("Fetching criterion is required.")},
+        )
+    if criterion not in available_criteria:
+        raise ValidationError(
+            {"criterion": unavailable_message % {"criterion": criterion}},
+        )
+    fetching_criterion = FetchingCriterion(criterion, criterion_arg)
+    try:
+        fetching_criterion.validate()
+    except ValueError as error:
+        raise ValidationError({"criterion_arg": str(error)}) from error
+    return fetching_criterion
@@ -51,6 +51,7 @@ class AccountFilterSet(filters.FilterSet):
             "protocol": FilterSetups.CHOICE,
             "timeout": FilterSetups.FLOAT,
             "allow_insecure_connection": FilterSetups.BOOL,
+            "use_compression": FilterSetups.BOOL,
             "is_healthy": FilterSetups.BOOL,
             "last_error": FilterSetups.TEXT,
             "last_error_occurred_at": FilterSetups.DATETIME,
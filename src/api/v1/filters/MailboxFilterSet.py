@@ -49,6 +49,8 @@ class MailboxFilterSet(filters.FilterSet):
             "type": FilterSetups.CHOICE,
             "save_to_eml": FilterSetups.BOOL,
             "save_attachments": FilterSetups.BOOL,
+            "use_idle": FilterSetups.BOOL,
+            "partial_fetch": FilterSetups.BOOL,
             "is_healthy": FilterSetups.BOOL,
             "last_error": FilterSetups.TEXT,
             "last_error_occurred_at": FilterSetups.DATETIME,
@@ -20,7 +20,7 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, Final, override
+from typing import TYPE_CHECKING, Any, ClassVar, Final, override
 
 from django.core.exceptions import ValidationError
 from rest_framework import serializers
@@ -53,8 +53,8 @@ class BaseAccountSerializer(serializers.ModelSerializer[Account]):
         model: Final[type[Model]] = Account
         """The model to serialize."""
 
-        fields = "__all__"
-        """Include all fields."""
+        exclude: ClassVar[list[str]] = ["jmap_mailbox_state"]
+        """Exclude the internal sync state fields of :class:`core.models.Account`."""
 
         read_only_fields: Final[list[str]] = [
             "is_healthy",
@@ -20,7 +20,7 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Final
+from typing import TYPE_CHECKING, ClassVar, Final
 
 from rest_framework import serializers
 
@@ -43,14 +43,26 @@ class BaseMailboxSerializer(serializers.ModelSerializer[Mailbox]):
 
         Contains constraints that must be implemented by all serializers.
         Other serializer metaclasses should inherit from this.
-        :attr:`read_only_fields` must not be shortened in subclasses.
+        :attr:`read_only_fields` and :attr:`exclude` must not be shortened in subclasses.
         """
 
         model: Final[type[Model]] = Mailbox
         """The model to serialize."""
 
-        fields = "__all__"
-        """Includes all fields."""
+        exclude: ClassVar[list[str]] = [
+            "imap_uidvalidity",
+            "imap_highest_uid",
+            "imap_highestmodseq",
+            "pop_seen_uidls",
+            "jmap_email_state",
+            "exchange_sync_state",
+            "exchange_failed_item_ids",
+            "fetch_progress_checkpoint",
+        ]
+        """Exclude the internal sync state fields of :class:`core.models.Mailbox`.
+
+        The other fetch progress fields are not editable and therefore read-only.
+        """
 
         read_only_fields: Final[list[str]] = [
             "name",
@@ -22,6 +22,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Final, override
 
+from celery import current_app
 from django.http import FileResponse, Http404
 from django.utils.translation import gettext_lazy as _
 from django_filters.rest_framework import DjangoFilterBackend
@@ -39,14 +40,15 @@ from rest_framework.exceptions import ValidationError
 from rest_framework.filters import OrderingFilter
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from rest_framework.serializers import BooleanField, CharField
+from rest_framework.serializers import BooleanField, CharField, ChoiceField
 
+from api.utils import validate_fetching_criterion
 from api.v1.filters import AccountFilterSet
 from api.v1.mixins.ToggleFavoriteMixin import ToggleFavoriteMixin
 from api.v1.serializers import AccountSerializer
-from core.constants import SupportedEmailDownloadFormats
+from core.constants import EmailFetchingCriterionChoices, SupportedEmailDownloadFormats
 from core.models import Account, Mailbox
-from core.utils.fetchers.exceptions import MailAccountError
+from core.utils.fetchers.exceptions import FetcherError, MailAccountError
 
 if TYPE_CHECKING:
     from django.db.models import QuerySet
@@ -98,6 +100,29 @@ if TYPE_CHECKING:
         },
         description=_("Tests an account."),
     ),
+    fetch=extend_schema(
+        request=inline_serializer(
+            name="fetch_account_criterion_data",
+            fields={
+                "criterion": ChoiceField(choices=EmailFetchingCriterionChoices),
+                "criterion_arg": CharField(required=False),
+            },
+        ),
+        responses={
+            200: inline_serializer(
+                name="fetch_account_response",
+                fields={
+                    "detail": CharField(),
+                    "data": AccountSerializer(),
+                },
+            )
+        },
+        description=_(
+            "Fetches the emails from all mailboxes of an account with a single login based on the given criterion. "
+            "Only criteria available for the protocol of that account are accepted. "
+            "The health of every mailbox is reported in the account data."
+        ),
+    ),
     download=extend_schema(
         parameters=[
             OpenApiParameter(
@@ -249,6 +274,53 @@ class AccountViewSet(viewsets.ModelViewSet[Account], ToggleFavoriteMixin):
         response.data["data"] = self.get_serializer(account).data
         return response
 
+    URL_PATH_FETCH = "fetch"
+    URL_NAME_FETCH = "fetch"
+
+    @action(
+        detail=True,
+        methods=["post"],
+        url_path=URL_PATH_FETCH,
+        url_name=URL_NAME_FETCH,
+    )
+    def fetch(self, request: Request, pk: int | None = None) -> Response:
+        """Action method fetching the mails from all mailboxes of the account.
+
+        Args:
+            request: The request triggering the action.
+            pk: The private key of the account. Defaults to None.
+
+        Returns:
+            A response with the account data.
+        """
+        account = self.get_object()
+        criterion = request.data.get("criterion")
+        criterion_arg = request.data.get("criterion_arg", "")
+        validate_fetching_criterion(
+            criterion,
+            criterion_arg,
+            account.get_fetcher_class().AVAILABLE_FETCHING_CRITERIA,
+            _("The given criterion %(criterion)s is not available for this account."),
+        )
+        try:
+            current_app.send_task(
+                "core.tasks.fetch_account_emails",
+                args=[account.id, criterion, criterion_arg],
+            ).get()
+        except FetcherError as error:
+            response = Response(
+                {
+                    "detail": _("Error with mailaccount occurred."),
+                    "error": str(error),
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        else:
+            response = Response({"detail": _("Emails fetched from all mailboxes.")})
+        account.refresh_from_db()
+        response.data["data"] = self.get_serializer(account).data
+        return response
+
     URL_PATH_DOWNLOAD = "download"
     URL_NAME_DOWNLOAD = "download"
 
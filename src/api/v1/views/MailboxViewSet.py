@@ -20,6 +20,7 @@
 
 from __future__ import annotations
 
+from dataclasses import asdict
 from tempfile import NamedTemporaryFile
 from typing import TYPE_CHECKING, Final, override
 
@@ -41,16 +42,20 @@ from rest_framework.exceptions import ValidationError
 from rest_framework.filters import OrderingFilter
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from rest_framework.serializers import BooleanField, CharField, ChoiceField
+from rest_framework.serializers import (
+    BooleanField,
+    CharField,
+    ChoiceField,
+    IntegerField,
+)
 
-from api.utils import query_param_list_to_typed_list
+from api.utils import query_param_list_to_typed_list, validate_fetching_criterion
 from api.v1.filters import MailboxFilterSet
 from api.v1.mixins import ToggleFavoriteMixin
 from api.v1.serializers import MailboxWithDaemonSerializer
 from api.v1.serializers.UploadEmailSerializer import UploadEmailSerializer
 from core.constants import EmailFetchingCriterionChoices, SupportedEmailDownloadFormats
 from core.models import Email, Mailbox
-from core.utils import FetchingCriterion
 from core.utils.fetchers.exceptions import FetcherError
 
 if TYPE_CHECKING:
@@ -104,6 +109,36 @@ if TYPE_CHECKING:
             "Fetches the emails from a mailbox based on the given criterion. Only criteria available for that mailbox are accepted."
         ),
     ),
+    fetch_estimate=extend_schema(
+        request=inline_serializer(
+            name="fetch_estimate_criterion_data",
+            fields={
+                "criterion": ChoiceField(choices=EmailFetchingCriterionChoices),
+                "criterion_arg": CharField(required=False),
+            },
+        ),
+        responses={
+            200: inline_serializer(
+                name="fetch_estimate_mailbox_response",
+                fields={
+                    "detail": CharField(),
+                    "estimate": inline_serializer(
+                        name="fetch_estimate",
+                        fields={
+                            "message_count": IntegerField(),
+                            "total_size": IntegerField(),
+                            "known_count": IntegerField(),
+                        },
+                    ),
+                    "data": MailboxWithDaemonSerializer(),
+                },
+            )
+        },
+        description=_(
+            "Estimates the number and total size of the emails that fetching from a mailbox based on the given criterion would download, "
+            "and how many of them are already archived. Nothing is downloaded."
+        ),
+    ),
     download=extend_schema(
         parameters=[
             OpenApiParameter(
@@ -191,6 +226,8 @@ class MailboxViewSet(
         "account__protocol",
         "save_attachments",
         "save_to_eml",
+        "use_idle",
+        "partial_fetch",
         "is_favorite",
         "is_healthy",
         "created",
@@ -292,24 +329,12 @@ class MailboxViewSet(
         mailbox = self.get_object()
         criterion = request.data.get("criterion")
         criterion_arg = request.data.get("criterion_arg", "")
-        if not criterion:
-            raise ValidationError(
-                {"criterion": _("Fetching criterion is required.")},
-            )
-        if criterion not in mailbox.available_fetching_criteria:
-            raise ValidationError(
-                {
-                    "criterion": _(
-                        "The given criterion %(criterion)s is not available for this mailbox."
-                    )
-                    % {"criterion": criterion}
-                },
-            )
-        fetching_criterion = FetchingCriterion(criterion, criterion_arg)
-        try:
-            fetching_criterion.validate()
-        except ValueError as error:
-            raise ValidationError({"criterion_arg": str(error)}) from error
+        validate_fetching_criterion(
+            criterion,
+            criterion_arg,
+            mailbox.available_fetching_criteria,
+            _("The given criterion %(criterion)s is not available for this mailbox."),
+        )
         try:
             current_app.send_task(
                 "core.tasks.fetch_mailbox_emails",
@@ -329,6 +354,50 @@ class MailboxViewSet(
         response.data["data"] = self.get_serializer(mailbox).data
         return response
 
+    URL_PATH_FETCH_ESTIMATE = "fetch-estimate"
+    URL_NAME_FETCH_ESTIMATE = "fetch-estimate"
+
+    @action(
+        detail=True,
+        methods=["post"],
+        url_path=URL_PATH_FETCH_ESTIMATE,
+        url_name=URL_NAME_FETCH_ESTIMATE,
+    )
+    def fetch_estimate(self, request: Request, pk: int | None = None) -> Response:
+        """Action method estimating what fetching mails from the mailbox would download.
+
+        Args:
+            request: The request triggering the action.
+            pk: The private key of the mailbox. Defaults to None.
+
+        Returns:
+            A response with the estimate and the mailbox data.
+        """
+        mailbox = self.get_object()
+        fetching_criterion = validate_fetching_criterion(
+            request.data.get("criterion"),
+            request.data.get("criterion_arg", ""),
+            mailbox.available_fetching_criteria,
+            _("The given criterion %(criterion)s is not available for this mailbox."),
+        )
+        try:
+            estimate = mailbox.estimate_fetch(fetching_criterion)
+        except FetcherError as error:
+            response = Response(
+                {
+                    "detail": _("Error with mailaccount or mailbox occurred."),
+                    "error": str(error),
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        else:
+            response = Response(
+                {"detail": _("Estimated fetch."), "estimate": asdict(estimate)}
+            )
+        mailbox.refresh_from_db()
+        response.data["data"] = self.get_serializer(mailbox).data
+        return response
+
     URL_PATH_DOWNLOAD = "download"
     URL_NAME_DOWNLOAD = "download"
 
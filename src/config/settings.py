@@ -1051,6 +1051,55 @@ CONSTANCE_CONFIG = {
         ),
         bool,
     ),
+    "MAX_CONNECTIONS_PER_ACCOUNT": (
+        4,
+        _(
+            "Maximum number of connections opened in parallel to fetch the mailboxes of one account."
+        ),
+        int,
+    ),
+    "MAX_CONNECTIONS_PER_MAIL_HOST": (
+        8,
+        _(
+            "Maximum number of connections held in parallel to one mailserver by the account fetches of one worker process."
+        ),
+        int,
+    ),
+    "IMAP_FETCH_BATCH_MAX_SIZE": (
+        50000000,
+        _(
+            "Maximum total size in bytes of the messages downloaded from an IMAP server in one request."
+        ),
+        int,
+    ),
+    "INGEST_PARSE_WORKERS": (
+        2,
+        _(
+            "Number of threads per fetch that parse fetched emails while the next ones are downloaded. With 0, every email is parsed and saved before the next one is downloaded."
+        ),
+        int,
+    ),
+    "INGEST_QUEUE_SIZE": (
+        32,
+        _(
+            "Maximum number of fetched emails per fetch that wait to be parsed and saved. Downloading pauses while the queue is full."
+        ),
+        int,
+    ),
+    "INGEST_PERSIST_BATCH_SIZE": (
+        20,
+        _(
+            "Maximum number of fetched or uploaded emails that are saved together in one database transaction."
+        ),
+        int,
+    ),
+    "INGEST_UPLOAD_PARSE_PROCESSES": (
+        0,
+        _(
+            "Number of processes per upload that parse uploaded emails while the previous ones are saved. With 0, the emails are parsed by the uploading task itself."
+        ),
+        int,
+    ),
     "EMAIL_EXPIRATION_DAYS": (
         -1,
         _(
@@ -1066,6 +1115,8 @@ CONSTANCE_CONFIG_FIELDSETS = (
         (
             "REGISTRATION_ENABLED",
             "ALLOW_INSECURE_CONNECTIONS",
+            "MAX_CONNECTIONS_PER_ACCOUNT",
+            "MAX_CONNECTIONS_PER_MAIL_HOST",
         ),
     ),
     (
@@ -1088,6 +1139,11 @@ CONSTANCE_CONFIG_FIELDSETS = (
             "EMAIL_CSS",
             "DONT_PARSE_CONTENT_MAINTYPES",
             "DONT_PARSE_CONTENT_SUBTYPES",
+            "IMAP_FETCH_BATCH_MAX_SIZE",
+            "INGEST_PARSE_WORKERS",
+            "INGEST_QUEUE_SIZE",
+            "INGEST_PERSIST_BATCH_SIZE",
+            "INGEST_UPLOAD_PARSE_PROCESSES",
         ),
     ),
     (
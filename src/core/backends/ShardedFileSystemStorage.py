@@ -18,20 +18,115 @@
 
 """Module with the :class:`core.backends.ShardedFileSystemStorage` storage class."""
 
+from __future__ import annotations
+
 import os
-from typing import override
+import threading
+from contextlib import contextmanager
+from hashlib import sha256
+from typing import TYPE_CHECKING, override
 
 from django.core.files.storage import FileSystemStorage
+from django.db import IntegrityError, transaction
+
+from core.models import StorageShard, StoredBlob
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
 
-from core.models import StorageShard
+    from django.core.files import File
 
 
 class ShardedFileSystemStorage(FileSystemStorage):
-    """FileSystemStorage backend for sharded storage."""
+    """FileSystemStorage backend for sharded, content-addressed storage.
+
+    Files are tracked by the SHA-256 digest of their content in :class:`core.models.StoredBlob`.
+    Saving a file with the same content as a stored one returns the path of the stored file
+    and deleting a file only removes it once every save of it has been deleted.
+    """
+
+    _new_file_names = threading.local()
+    """Holds the lists collecting the names of the files newly written by this thread."""
+
+    @contextmanager
+    def discard_new_files_on_error(self) -> Iterator[None]:
+        """Context manager deleting the files newly written inside it if it is left by an error.
+
+        Wrap it around a transaction that saves files.
+        The :class:`core.models.StoredBlob`s of the new files are rolled back with the transaction,
+        so the files would stay in the storage without anything referencing them.
+        Files that were already stored are not affected.
+
+        Yields:
+            Nothing.
+        """
+        if not hasattr(self._new_file_names, "collectors"):
+            self._new_file_names.collectors = []
+        new_file_names: list[str] = []
+        self._new_file_names.collectors.append(new_file_names)
+        try:
+            yield
+        except BaseException:
+            for name in new_file_names:
+                # the shard file count has been rolled back too
+                super().delete(name)
+            raise
+        finally:
+            self._new_file_names.collectors.remove(new_file_names)
 
     @override
     def _save(self, name: str, content: bytes) -> str:
-        """Extended method for saving files in current storage directory with safe filename."""
+        """Extended method for saving files in current storage directory with safe filename.
+
+        If a file with the same content is already stored, its path is returned instead.
+        """
+        digest = self._get_content_digest(content)
+        with transaction.atomic():
+            stored_blob = (
+                StoredBlob.objects.select_for_update().filter(digest=digest).first()
+            )
+            if stored_blob is not None and self.exists(stored_blob.file_path):
+                self._add_reference(stored_blob)
+                return stored_blob.file_path
+
+            file_path = self._save_to_shard(name, content)
+            if stored_blob is not None:
+                # the file of the blob has gone missing
+                stored_blob.file_path = file_path
+                stored_blob.reference_count = 1
+                stored_blob.save(update_fields=["file_path", "reference_count"])
+                return file_path
+            try:
+                with transaction.atomic():
+                    StoredBlob.objects.create(digest=digest, file_path=file_path)
+            except IntegrityError:
+                # the same content has been stored concurrently
+                self._delete_from_shard(file_path)
+                stored_blob = StoredBlob.objects.select_for_update().get(digest=digest)
+                self._add_reference(stored_blob)
+                return stored_blob.file_path
+        return file_path
+
+    @override
+    def delete(self, name: str) -> None:
+        """Extended method for deleting files in a storage directory.
+
+        Files that have been saved more than once are only deleted with their last reference.
+        """
+        with transaction.atomic():
+            stored_blob = (
+                StoredBlob.objects.select_for_update().filter(file_path=name).first()
+            )
+            if stored_blob is not None:
+                if stored_blob.reference_count > 1:
+                    stored_blob.reference_count -= 1
+                    stored_blob.save(update_fields=["reference_count"])
+                    return
+                stored_blob.delete()
+        self._delete_from_shard(name)
+
+    def _save_to_shard(self, name: str, content: File) -> str:
+        """Saves a file in the current storage directory with safe filename."""
         storage_shard = StorageShard.get_current_storage()
         name = self.generate_filename(
             os.path.join(
@@ -40,14 +135,29 @@ class ShardedFileSystemStorage(FileSystemStorage):
         )
         save_return = super()._save(name, content)
         storage_shard.increment_file_count()
+        for new_file_names in getattr(self._new_file_names, "collectors", []):
+            new_file_names.append(save_return)
         return save_return
 
-    @override
-    def delete(self, name: str) -> None:
-        """Extended method for deleting files in a storage directory."""
+    def _delete_from_shard(self, name: str) -> None:
+        """Deletes a file from its storage directory."""
         if self.exists(name):
             storage_shard = StorageShard.objects.get(
                 shard_directory_name=os.path.dirname(name)
             )
             super().delete(name)
             storage_shard.decrement_file_count()
+
+    @staticmethod
+    def _add_reference(stored_blob: StoredBlob) -> None:
+        """Counts another save of a stored file."""
+        stored_blob.reference_count += 1
+        stored_blob.save(update_fields=["reference_count"])
+
+    @staticmethod
+    def _get_content_digest(content: File) -> str:
+        """Computes the SHA-256 hex digest of a file."""
+        content_hash = sha256()
+        for chunk in content.chunks():
+            content_hash.update(chunk)
+        return content_hash.hexdigest()
@@ -90,6 +90,9 @@ class EmailFetchingCriterionChoices(TextChoices):
     UNDELETED = "UNDELETED", _("All UNDELETED emails")
     """Filter by "UNDELETED" flag."""
 
+    INCREMENTAL = "INCREMENTAL", _("All emails that arrived since the LAST FETCH")
+    """Only fetch messages that are new since the last sync, using the sync state stored on the mailbox."""
+
     # all filters with arg
     KEYWORD = "KEYWORD {}", _("All emails with the given KEYWORD")
     """Filter by "KEYWORD". Must be formatted."""
@@ -0,0 +1,41 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+#
+# Eonvelope - a open-source self-hostable email archiving server
+# Copyright (C) 2024 David Aderbauer & The Eonvelope Contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""Module with the rebuildthreads management command."""
+
+from __future__ import annotations
+
+from typing import Any, override
+
+from django.core.management.base import BaseCommand
+
+from core.models import Email
+
+
+class Command(BaseCommand):
+    """Recomputes the thread ids of all :class:`core.models.Email` instances."""
+
+    help = "Recomputes the conversation threads of all emails from their in-reply-to and references links."
+
+    @override
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Rebuilds the threads and reports how many were found."""
+        thread_count = Email.rebuild_threads()
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt {thread_count} conversation threads.")
+        )
@@ -0,0 +1,49 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+#
+# Eonvelope - a open-source self-hostable email archiving server
+# Copyright (C) 2024 David Aderbauer & The Eonvelope Contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""Module with the runidlelistener management command."""
+
+from __future__ import annotations
+
+import signal
+from typing import TYPE_CHECKING, Any, override
+
+from django.core.management.base import BaseCommand
+
+from core.utils.IdleListener import IdleListener
+
+if TYPE_CHECKING:
+    from types import FrameType
+
+
+class Command(BaseCommand):
+    """Runs the :class:`core.utils.IdleListener.IdleListener` until it is terminated."""
+
+    help = "Listens to all mailboxes with IDLE enabled and fetches new emails as soon as they arrive."
+
+    @override
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Runs the listener and stops it gracefully on SIGTERM and SIGINT."""
+        listener = IdleListener()
+
+        def stop_listener(signum: int, frame: FrameType | None) -> None:
+            listener.stop()
+
+        signal.signal(signal.SIGTERM, stop_listener)
+        signal.signal(signal.SIGINT, stop_listener)
+        listener.run()
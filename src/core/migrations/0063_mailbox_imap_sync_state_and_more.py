@@ -0,0 +1,116 @@
+# Generated by Django 5.2.10 on 2026-02-08 16:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0062_account_allow_insecure_connection"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="mailbox",
+            name="imap_uidvalidity",
+            field=models.PositiveBigIntegerField(
+                blank=True,
+                default=None,
+                editable=False,
+                null=True,
+                verbose_name="UIDVALIDITY",
+            ),
+        ),
+        migrations.AddField(
+            model_name="mailbox",
+            name="imap_highest_uid",
+            field=models.PositiveBigIntegerField(
+                default=0,
+                editable=False,
+                verbose_name="highest fetched UID",
+            ),
+        ),
+        migrations.RemoveConstraint(
+            model_name="daemon",
+            name="fetching_criterion_valid_choice",
+        ),
+        migrations.AlterField(
+            model_name="daemon",
+            name="fetching_criterion",
+            field=models.CharField(
+                choices=[
+                    ("DAILY", "All emails received the last DAY"),
+                    ("WEEKLY", "All emails received the last WEEK"),
+                    ("MONTHLY", "All emails received the last MONTH"),
+                    ("ANNUALLY", "All emails received the last YEAR"),
+                    ("RECENT", "All RECENT emails"),
+                    ("UNSEEN", "All UNSEEN emails"),
+                    ("SEEN", "All SEEN emails"),
+                    ("ALL", "All emails"),
+                    ("NEW", "All RECENT and UNSEEN emails"),
+                    ("OLD", "All emails that are not RECENT"),
+                    ("FLAGGED", "FLAGGED emails"),
+                    ("UNFLAGGED", "All emails that are not FLAGGED"),
+                    ("DRAFT", "All email DRAFTs"),
+                    ("UNDRAFT", "All emails that are not DRAFTs"),
+                    ("ANSWERED", "All ANSWERED emails"),
+                    ("UNANSWERED", "All UNANSWERED emails"),
+                    ("DELETED", "All DELETED emails"),
+                    ("UNDELETED", "All UNDELETED emails"),
+                    ("INCREMENTAL", "All emails that arrived since the LAST FETCH"),
+                    ("KEYWORD {}", "All emails with the given KEYWORD"),
+                    ("UNKEYWORD {}", "All emails without the given KEYWORD"),
+                    ("LARGER {}", "All emails LARGER than the given size"),
+                    ("SMALLER {}", "All emails SMALLER than the given size"),
+                    ("SUBJECT {}", "All emails with SUBJECT containing the given text"),
+                    ("BODY {}", "All emails with BODY containing the given text"),
+                    ("FROM {}", "All emails sent FROM the given address"),
+                    ("SENTSINCE {}", "All emails SENT SINCE the given date"),
+                ],
+                default="ALL",
+                help_text="The selection criterion for emails to archive.",
+                max_length=127,
+                verbose_name="fetching criterion",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="daemon",
+            constraint=models.CheckConstraint(
+                condition=models.Q(
+                    (
+                        "fetching_criterion__in",
+                        [
+                            "DAILY",
+                            "WEEKLY",
+                            "MONTHLY",
+                            "ANNUALLY",
+                            "RECENT",
+                            "UNSEEN",
+                            "SEEN",
+                            "ALL",
+                            "NEW",
+                            "OLD",
+                            "FLAGGED",
+                            "UNFLAGGED",
+                            "DRAFT",
+                            "UNDRAFT",
+                            "ANSWERED",
+                            "UNANSWERED",
+                            "DELETED",
+                            "UNDELETED",
+                            "INCREMENTAL",
+                            "KEYWORD {}",
+                            "UNKEYWORD {}",
+                            "LARGER {}",
+                            "SMALLER {}",
+                            "SUBJECT {}",
+                            "BODY {}",
+                            "FROM {}",
+                            "SENTSINCE {}",
+                        ],
+                    )
+                ),
+                name="fetching_criterion_valid_choice",
+            ),
+        ),
+    ]
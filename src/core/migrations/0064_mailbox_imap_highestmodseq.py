@@ -0,0 +1,24 @@
+# Generated by Django 5.2.10 on 2026-02-09 10:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0063_mailbox_imap_sync_state_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="mailbox",
+            name="imap_highestmodseq",
+            field=models.PositiveBigIntegerField(
+                blank=True,
+                default=None,
+                editable=False,
+                null=True,
+                verbose_name="HIGHESTMODSEQ",
+            ),
+        ),
+    ]
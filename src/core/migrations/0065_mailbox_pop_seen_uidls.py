@@ -0,0 +1,23 @@
+# Generated by Django 5.2.10 on 2026-02-10 18:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0064_mailbox_imap_highestmodseq"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="mailbox",
+            name="pop_seen_uidls",
+            field=models.JSONField(
+                blank=True,
+                default=list,
+                editable=False,
+                verbose_name="seen UIDLs",
+            ),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.10 on 2026-02-11 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0065_mailbox_pop_seen_uidls"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="account",
+            name="jmap_mailbox_state",
+            field=models.CharField(
+                blank=True,
+                default="",
+                editable=False,
+                max_length=255,
+                verbose_name="JMAP mailbox state",
+            ),
+        ),
+        migrations.AddField(
+            model_name="mailbox",
+            name="jmap_email_state",
+            field=models.CharField(
+                blank=True,
+                default="",
+                editable=False,
+                max_length=255,
+                verbose_name="JMAP email state",
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.10 on 2026-02-12 10:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0066_account_jmap_mailbox_state_mailbox_jmap_email_state"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="mailbox",
+            name="exchange_sync_state",
+            field=models.TextField(
+                blank=True,
+                default="",
+                editable=False,
+                verbose_name="Exchange sync state",
+            ),
+        ),
+    ]
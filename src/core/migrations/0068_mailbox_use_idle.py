@@ -0,0 +1,22 @@
+# Generated by Django 5.2.10 on 2026-02-14 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0067_mailbox_exchange_sync_state"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="mailbox",
+            name="use_idle",
+            field=models.BooleanField(
+                default=False,
+                help_text="Whether new emails in this mailbox are fetched as soon as the server announces them. Only available for IMAP accounts.",
+                verbose_name="listen with IDLE",
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.10 on 2026-02-16 18:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0068_mailbox_use_idle"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="account",
+            name="use_compression",
+            field=models.BooleanField(
+                blank=True,
+                default=True,
+                help_text="Whether to compress the connection if the host supports it. Only available for IMAP accounts.",
+                verbose_name="use compression",
+            ),
+        ),
+    ]
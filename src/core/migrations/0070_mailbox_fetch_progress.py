@@ -0,0 +1,63 @@
+# Generated by Django 5.2.10 on 2026-02-18 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0069_account_use_compression"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="mailbox",
+            name="fetch_progress_criterion",
+            field=models.CharField(
+                blank=True,
+                default="",
+                editable=False,
+                max_length=255,
+                verbose_name="criterion of the latest fetch",
+            ),
+        ),
+        migrations.AddField(
+            model_name="mailbox",
+            name="fetch_progress_checkpoint",
+            field=models.TextField(
+                blank=True,
+                default="",
+                editable=False,
+                verbose_name="fetch checkpoint",
+            ),
+        ),
+        migrations.AddField(
+            model_name="mailbox",
+            name="fetch_progress_count",
+            field=models.PositiveIntegerField(
+                default=0,
+                editable=False,
+                verbose_name="processed messages of the latest fetch",
+            ),
+        ),
+        migrations.AddField(
+            model_name="mailbox",
+            name="fetch_progress_total",
+            field=models.PositiveIntegerField(
+                default=0,
+                editable=False,
+                verbose_name="total messages of the latest fetch",
+            ),
+        ),
+        migrations.AddField(
+            model_name="mailbox",
+            name="fetch_progress_updated",
+            field=models.DateTimeField(
+                blank=True,
+                default=None,
+                editable=False,
+                null=True,
+                verbose_name="last progress of the latest fetch",
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.10 on 2026-02-18 10:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0070_mailbox_fetch_progress"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="mailbox",
+            name="partial_fetch",
+            field=models.BooleanField(
+                default=False,
+                help_text="Whether attachments that are not parsed are left out when downloading the emails in this mailbox. Only available for IMAP accounts and if the emails are not stored in .eml files.",
+                verbose_name="fetch partially",
+            ),
+        ),
+    ]
@@ -0,0 +1,136 @@
+# Generated by Django 5.2.10 on 2026-10-16 09:12
+
+import re
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+MESSAGE_ID_MAX_LENGTH = 255
+
+
+def split_message_ids(header):
+    return {
+        message_id
+        for message_id in re.split(r"[\s,]+", header or "")
+        if message_id and len(message_id) <= MESSAGE_ID_MAX_LENGTH
+    }
+
+
+def index_existing_references(apps, schema_editor):
+    Email = apps.get_model("core", "Email")
+    MessageIDReference = apps.get_model("core", "MessageIDReference")
+    new_references = []
+    for email_pk, user_pk, headers in (
+        Email.objects.exclude(headers=None)
+        .values_list("pk", "mailbox__account__user_id", "headers")
+        .iterator(chunk_size=BATCH_SIZE)
+    ):
+        in_reply_to_message_id = (headers.get("in-reply-to") or "").strip()
+        if 0 < len(in_reply_to_message_id) <= MESSAGE_ID_MAX_LENGTH:
+            new_references.append(
+                MessageIDReference(
+                    user_id=user_pk,
+                    email_id=email_pk,
+                    message_id=in_reply_to_message_id,
+                    in_reply_to=True,
+                )
+            )
+        new_references.extend(
+            MessageIDReference(
+                user_id=user_pk,
+                email_id=email_pk,
+                message_id=message_id,
+                in_reply_to=False,
+            )
+            for message_id in split_message_ids(headers.get("references"))
+        )
+        if len(new_references) >= BATCH_SIZE:
+            MessageIDReference.objects.bulk_create(
+                new_references, ignore_conflicts=True
+            )
+            new_references = []
+    MessageIDReference.objects.bulk_create(new_references, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0071_mailbox_partial_fetch"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MessageIDReference",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="time of creation"
+                    ),
+                ),
+                (
+                    "updated",
+                    models.DateTimeField(
+                        auto_now=True, verbose_name="time of last update"
+                    ),
+                ),
+                (
+                    "message_id",
+                    models.CharField(max_length=255, verbose_name="message-ID"),
+                ),
+                (
+                    "in_reply_to",
+                    models.BooleanField(default=False, verbose_name="in reply to"),
+                ),
+                (
+                    "email",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="message_id_references",
+                        to="core.email",
+                        verbose_name="email",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="message_id_references",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="user",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "message-ID reference",
+                "verbose_name_plural": "message-ID references",
+                "db_table": "message_id_references",
+                "get_latest_by": "created",
+                "indexes": [
+                    models.Index(
+                        fields=["user", "message_id"],
+                        name="messageidreference_user_mid",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("email", "message_id", "in_reply_to"),
+                        name="messageidreference_unique_together_email_message_id_in_reply_to",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(index_existing_references, migrations.RunPython.noop),
+    ]
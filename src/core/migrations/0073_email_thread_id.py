@@ -0,0 +1,56 @@
+# Generated by Django 5.2.10 on 2026-10-16 11:40
+
+import itertools
+
+from django.db import migrations, models
+
+
+def compute_thread_ids(apps, schema_editor):
+    Email = apps.get_model("core", "Email")
+    parents = {}
+
+    def find_root(email_pk):
+        root = parents.setdefault(email_pk, email_pk)
+        while root != parents[root]:
+            root = parents[root]
+        while email_pk != root:
+            parents[email_pk], email_pk = root, parents[email_pk]
+        return root
+
+    for from_email_pk, to_email_pk in itertools.chain(
+        Email.in_reply_to.through.objects.values_list("from_email_id", "to_email_id"),
+        Email.references.through.objects.values_list("from_email_id", "to_email_id"),
+    ):
+        from_root = find_root(from_email_pk)
+        to_root = find_root(to_email_pk)
+        if from_root != to_root:
+            parents[max(from_root, to_root)] = min(from_root, to_root)
+
+    threads = {}
+    for email_pk in parents:
+        threads.setdefault(find_root(email_pk), []).append(email_pk)
+    Email.objects.update(thread_id=models.F("pk"))
+    for thread_id, email_pks in threads.items():
+        Email.objects.filter(pk__in=email_pks).update(thread_id=thread_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0072_messageidreference"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="email",
+            name="thread_id",
+            field=models.PositiveBigIntegerField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                null=True,
+                verbose_name="thread ID",
+            ),
+        ),
+        migrations.RunPython(compute_thread_ids, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,88 @@
+# Generated by Django 5.2.10 on 2026-10-16 14:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0073_email_thread_id"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StoredBlob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="time of creation"
+                    ),
+                ),
+                (
+                    "updated",
+                    models.DateTimeField(
+                        auto_now=True, verbose_name="time of last update"
+                    ),
+                ),
+                (
+                    "digest",
+                    models.CharField(
+                        editable=False,
+                        max_length=64,
+                        unique=True,
+                        verbose_name="digest",
+                    ),
+                ),
+                (
+                    "file_path",
+                    models.CharField(
+                        editable=False,
+                        max_length=255,
+                        unique=True,
+                        verbose_name="filepath",
+                    ),
+                ),
+                (
+                    "reference_count",
+                    models.PositiveIntegerField(
+                        default=1, verbose_name="reference count"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "stored blob",
+                "verbose_name_plural": "stored blobs",
+                "db_table": "stored_blobs",
+            },
+        ),
+        migrations.AlterField(
+            model_name="attachment",
+            name="file_path",
+            field=models.CharField(
+                blank=True,
+                max_length=255,
+                null=True,
+                verbose_name="filepath",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="email",
+            name="file_path",
+            field=models.CharField(
+                blank=True,
+                max_length=255,
+                null=True,
+                verbose_name="filepath",
+            ),
+        ),
+    ]
@@ -0,0 +1,95 @@
+# Generated by Django 5.2.10 on 2026-10-17 10:21
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+def index_existing_message_ids(apps, schema_editor):
+    Email = apps.get_model("core", "Email")
+    EmailMessageID = apps.get_model("core", "EmailMessageID")
+    new_message_ids = []
+    for email_pk, user_pk, message_id in Email.objects.values_list(
+        "pk", "mailbox__account__user_id", "message_id"
+    ).iterator(chunk_size=BATCH_SIZE):
+        new_message_ids.append(
+            EmailMessageID(user_id=user_pk, email_id=email_pk, message_id=message_id)
+        )
+        if len(new_message_ids) >= BATCH_SIZE:
+            EmailMessageID.objects.bulk_create(new_message_ids, ignore_conflicts=True)
+            new_message_ids = []
+    EmailMessageID.objects.bulk_create(new_message_ids, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0074_storedblob_alter_file_path"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EmailMessageID",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="time of creation"
+                    ),
+                ),
+                (
+                    "updated",
+                    models.DateTimeField(
+                        auto_now=True, verbose_name="time of last update"
+                    ),
+                ),
+                (
+                    "message_id",
+                    models.CharField(max_length=255, verbose_name="message-ID"),
+                ),
+                (
+                    "email",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="indexed_message_id",
+                        to="core.email",
+                        verbose_name="email",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="email_message_ids",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="user",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "email message-ID",
+                "verbose_name_plural": "email message-IDs",
+                "db_table": "email_message_ids",
+                "get_latest_by": "created",
+                "indexes": [
+                    models.Index(
+                        fields=["user", "message_id"],
+                        name="emailmessageid_user_mid",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(index_existing_message_ids, migrations.RunPython.noop),
+    ]
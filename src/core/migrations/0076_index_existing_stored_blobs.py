@@ -0,0 +1,68 @@
+# Generated by Django 5.2.10 on 2026-10-17 12:40
+
+from hashlib import sha256
+
+from django.core.files.storage import default_storage
+from django.db import migrations
+from django.db.models import Count
+
+BATCH_SIZE = 1000
+
+
+def get_file_digest(file_path):
+    content_hash = sha256()
+    try:
+        with default_storage.open(file_path) as file:
+            for chunk in file.chunks():
+                content_hash.update(chunk)
+    except FileNotFoundError:
+        return None
+    return content_hash.hexdigest()
+
+
+def index_existing_files(apps, schema_editor):
+    StoredBlob = apps.get_model("core", "StoredBlob")
+    indexed_file_paths = set(StoredBlob.objects.values_list("file_path", flat=True))
+    indexed_digests = set(StoredBlob.objects.values_list("digest", flat=True))
+    new_stored_blobs = []
+    for model_name in ("Email", "Attachment"):
+        Model = apps.get_model("core", model_name)
+        for file_path, reference_count in (
+            Model.objects.exclude(file_path__isnull=True)
+            .exclude(file_path="")
+            .values("file_path")
+            .annotate(reference_count=Count("pk"))
+            .values_list("file_path", "reference_count")
+            .iterator(chunk_size=BATCH_SIZE)
+        ):
+            if file_path in indexed_file_paths:
+                continue
+            digest = get_file_digest(file_path)
+            # files with the same content as an indexed one stay untracked,
+            # they are deleted directly with their only reference
+            if digest is None or digest in indexed_digests:
+                continue
+            indexed_file_paths.add(file_path)
+            indexed_digests.add(digest)
+            new_stored_blobs.append(
+                StoredBlob(
+                    digest=digest,
+                    file_path=file_path,
+                    reference_count=reference_count,
+                )
+            )
+            if len(new_stored_blobs) >= BATCH_SIZE:
+                StoredBlob.objects.bulk_create(new_stored_blobs, ignore_conflicts=True)
+                new_stored_blobs = []
+    StoredBlob.objects.bulk_create(new_stored_blobs, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0075_emailmessageid"),
+    ]
+
+    operations = [
+        migrations.RunPython(index_existing_files, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.10 on 2026-10-17 13:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0076_index_existing_stored_blobs"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="mailbox",
+            name="exchange_failed_item_ids",
+            field=models.JSONField(
+                blank=True,
+                default=list,
+                editable=False,
+                verbose_name="failed Exchange item IDs",
+            ),
+        ),
+    ]
@@ -26,6 +26,7 @@ from typing import TYPE_CHECKING, Any, override
 
 from django.core.files.storage import default_storage
 from django.db.models import CharField, Model
+from django.utils.text import get_valid_filename
 from django.utils.translation import gettext_lazy as _
 
 if TYPE_CHECKING:
@@ -38,16 +39,16 @@ logger = logging.getLogger(__name__)
 class FilePathModelMixin(Model):
     """Mixin adding functionality for managing a single storage file for a model class."""
 
-    file_path = CharField(
+    file_path = CharField(  # noqa: DJ001  # null marks that no file has been saved
         max_length=255,
-        unique=True,
         blank=True,
         null=True,
         # Translators: Do not capitalize the very first letter unless your language requires it.
         verbose_name=_("filepath"),
     )
     """The relative path in the storage where the file is stored.
-    Can be null if no file has been saved (null does not collide with the unique constraint.).
+    Instances that store files with identical content share the same path.
+    Can be null if no file has been saved.
     """
 
     class Meta:
@@ -64,18 +65,44 @@ class FilePathModelMixin(Model):
         file_payload = kwargs.pop("file_payload", None)
         super().save(*args, **kwargs)
         if file_payload is not None and not self.file_path:
-            logger.debug("Storing file for %s ...", self)
-            self.file_path = default_storage.save(
-                self._get_storage_file_name(),
-                BytesIO(file_payload),
-            )
+            self.store_file(file_payload)
             self.save(update_fields=["file_path"])
-            logger.debug("Successfully stored file.")
+
+    def store_file(self, file_payload: bytes) -> None:
+        """Stores the file in the storage and sets `file_path`, without saving the instance.
+
+        Used by :meth:`save` and when instances are saved in bulk.
+
+        Args:
+            file_payload: The data of the file.
+
+        Raises:
+            ValueError: If the instance is not in the db yet.
+        """
+        if self.pk is None:
+            raise ValueError("The instance is not in the db!")
+        logger.debug("Storing file for %s ...", self)
+        self.file_path = default_storage.save(
+            self._get_storage_file_name(),
+            BytesIO(file_payload),
+        )
+        logger.debug("Successfully stored file.")
 
     def _get_storage_file_name(self) -> str:
         """Create the filename for the stored file."""
         return str(self.pk)
 
+    def get_archive_file_name(self) -> str:
+        """Create the filename for the file in a downloaded archive.
+
+        Unlike the name of the stored file, which is shared between instances with identical content,
+        it is unique for every instance.
+
+        Returns:
+            The filename for the archive entry.
+        """
+        return get_valid_filename(self._get_storage_file_name())
+
     def open_file(self, mode: str = "rb") -> File:
         """Opens and returns the stored file as a filestream.
 
@@ -103,6 +130,7 @@ class FilePathModelMixin(Model):
     def delete_file(self) -> None:
         """Deletes the file and sets `file_path` to `None`.
 
+        The storage only removes the file once no other instance shares it.
         Intended for use in a signal.
         """
         if self.file_path:
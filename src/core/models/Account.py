@@ -21,13 +21,16 @@
 from __future__ import annotations
 
 import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING, Any, ClassVar, override
 
 from dirtyfields import DirtyFieldsMixin
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import connection, models
 from django.utils.translation import gettext_lazy as _
 from django_celery_beat.models import IntervalSchedule
 from django_prometheus.models import ExportModelOperationsMixin
@@ -45,6 +48,7 @@ from core.mixins import (
     TimestampModelMixin,
     URLMixin,
 )
+from core.utils.connection_limits import get_mail_host_slots
 from core.utils.fetchers import (
     ExchangeFetcher,
     IMAP4_SSL_Fetcher,
@@ -53,14 +57,21 @@ from core.utils.fetchers import (
     POP3_SSL_Fetcher,
     POP3Fetcher,
 )
-from core.utils.fetchers.exceptions import FetcherError, MailAccountError
+from core.utils.fetchers.exceptions import (
+    FetcherError,
+    MailAccountError,
+    MailboxError,
+)
 from eonvelope.utils.workarounds import get_config
 
 from .Mailbox import Mailbox
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     from django_stubs_ext import StrOrPromise
 
+    from core.utils import FetchingCriterion
     from core.utils.fetchers import BaseFetcher
 
 
@@ -159,6 +170,27 @@ class Account(
     )
     """Whether to allow insecure connections to the host, defaults to `False`."""
 
+    use_compression = models.BooleanField(
+        default=True,
+        blank=True,
+        # Translators: Do not capitalize the very first letter unless your language requires it.
+        verbose_name=_("use compression"),
+        help_text=_(
+            "Whether to compress the connection if the host supports it. Only available for IMAP accounts."
+        ),
+    )
+    """Whether to compress the connection to the host if it supports it, defaults to `True`."""
+
+    jmap_mailbox_state = models.CharField(
+        max_length=255,
+        default="",
+        blank=True,
+        editable=False,
+        # Translators: Do not capitalize the very first letter unless your language requires it.
+        verbose_name=_("JMAP mailbox state"),
+    )
+    """The JMAP Mailbox state string at the last mailbox update. Empty if the mailboxes have never been fetched via JMAP."""
+
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         related_name="accounts",
@@ -207,8 +239,23 @@ class Account(
 
     @override
     def save(self, *args: Any, **kwargs: Any) -> None:
-        """Extended to auto-update mailboxes when the account is saved for the first time."""
+        """Extended to auto-update mailboxes when the account is saved for the first time.
+
+        The stored JMAP mailbox state is reset if the connection data changes.
+        """
         needs_mailbox_update = self.pk is None
+        if (
+            not needs_mailbox_update
+            and self.jmap_mailbox_state
+            and any(
+                field in self.get_dirty_fields()
+                for field in ("mail_address", "mail_host", "mail_host_port", "protocol")
+            )
+        ):
+            self.jmap_mailbox_state = ""
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "jmap_mailbox_state"}
         super().save(*args, **kwargs)
         if needs_mailbox_update:
             logger.info("Autoupdate mailboxes for new %s.", self)
@@ -356,6 +403,150 @@ class Account(
 
         logger.info("Successfully updated mailboxes.")
 
+    def fetch(
+        self, criterion: FetchingCriterion, mailboxes: Iterable[Mailbox] | None = None
+    ) -> list[Mailbox]:
+        """Fetches emails based on :attr:`criterion` from mailboxes of this account and adds them to the db.
+
+        The mailboxes are fetched in parallel over up to `MAX_CONNECTIONS_PER_ACCOUNT` connections,
+        each of which fetches mailboxes one after another until all of them are done.
+        Additional connections are only opened while fewer than `MAX_CONNECTIONS_PER_MAIL_HOST`
+        connections to :attr:`mail_host` are held by the fetches of this process.
+        Every mailbox is marked as healthy or unhealthy on its own,
+        an error with one mailbox does not stop fetching the others.
+        An error with the account stops all connections from fetching further mailboxes.
+        If successful, marks this account as healthy.
+
+        Args:
+            criterion: The criterion used to fetch emails from the mailboxes.
+            mailboxes: The mailboxes of this account to fetch. Defaults to all of them.
+
+        Returns:
+            The mailboxes that failed to be fetched.
+
+        Raises:
+            MailAccountError: If connecting or fetching failed due to a MailAccountError.
+                Marks the account as unhealthy in this case.
+        """
+        if mailboxes is None:
+            mailboxes = self.mailboxes.all()
+        mailbox_queue: queue.SimpleQueue[Mailbox] = queue.SimpleQueue()
+        for mailbox in mailboxes:
+            mailbox_queue.put(mailbox)
+        connection_count = max(
+            1, min(mailbox_queue.qsize(), get_config("MAX_CONNECTIONS_PER_ACCOUNT"))
+        )
+        logger.info(
+            "Fetching and saving emails with criterion %s from %s over %d connections ...",
+            criterion,
+            self,
+            connection_count,
+        )
+        mail_host_slots = get_mail_host_slots(self.mail_host)
+        failed_mailboxes: list[Mailbox] = []
+        stop_event = threading.Event()
+        if connection_count == 1:
+            self._fetch_mailbox_queue(
+                criterion, mailbox_queue, failed_mailboxes, stop_event, mail_host_slots
+            )
+        else:
+            with ThreadPoolExecutor(
+                max_workers=connection_count,
+                thread_name_prefix=f"account-fetch-{self.id}",
+            ) as executor:
+                futures = [
+                    executor.submit(
+                        self._fetch_mailbox_queue_in_thread,
+                        criterion,
+                        mailbox_queue,
+                        failed_mailboxes,
+                        stop_event,
+                        mail_host_slots,
+                        wait_for_slot=index == 0,
+                    )
+                    for index in range(connection_count)
+                ]
+            for future in futures:
+                future.result()
+        self.set_healthy()
+        logger.info(
+            "Successfully fetched and saved emails, %d mailboxes failed.",
+            len(failed_mailboxes),
+        )
+        return failed_mailboxes
+
+    def _fetch_mailbox_queue_in_thread(
+        self,
+        criterion: FetchingCriterion,
+        mailbox_queue: queue.SimpleQueue[Mailbox],
+        failed_mailboxes: list[Mailbox],
+        stop_event: threading.Event,
+        mail_host_slots: threading.BoundedSemaphore,
+        *,
+        wait_for_slot: bool,
+    ) -> None:
+        """Runs :meth:`_fetch_mailbox_queue` in a worker thread of :meth:`fetch`.
+
+        Closes the database connection of the thread afterwards.
+        """
+        try:
+            self._fetch_mailbox_queue(
+                criterion,
+                mailbox_queue,
+                failed_mailboxes,
+                stop_event,
+                mail_host_slots,
+                wait_for_slot=wait_for_slot,
+            )
+        finally:
+            connection.close()
+
+    def _fetch_mailbox_queue(
+        self,
+        criterion: FetchingCriterion,
+        mailbox_queue: queue.SimpleQueue[Mailbox],
+        failed_mailboxes: list[Mailbox],
+        stop_event: threading.Event,
+        mail_host_slots: threading.BoundedSemaphore,
+        *,
+        wait_for_slot: bool = True,
+    ) -> None:
+        """Fetches mailboxes from a queue over a single connection until the queue is empty.
+
+        Args:
+            criterion: The criterion used to fetch emails from the mailboxes.
+            mailbox_queue: The queue of mailboxes to fetch, shared by all connections.
+            failed_mailboxes: The list to add the mailboxes that failed to be fetched to.
+            stop_event: Set to stop all connections from fetching further mailboxes.
+                Is set by this method if the account fails.
+            mail_host_slots: The free connection slots to :attr:`mail_host`.
+            wait_for_slot: Whether to wait for a free connection slot to :attr:`mail_host`.
+                If False and there is no free slot, no connection is opened.
+
+        Raises:
+            MailAccountError: If connecting or fetching failed due to a MailAccountError.
+        """
+        if not mail_host_slots.acquire(blocking=wait_for_slot):
+            return
+        try:
+            if stop_event.is_set() or mailbox_queue.empty():
+                return
+            with self.get_fetcher() as fetcher:
+                while not stop_event.is_set():
+                    try:
+                        mailbox = mailbox_queue.get_nowait()
+                    except queue.Empty:
+                        return
+                    try:
+                        mailbox.fetch(criterion, fetcher=fetcher)
+                    except MailboxError:
+                        failed_mailboxes.append(mailbox)
+        except MailAccountError:
+            stop_event.set()
+            raise
+        finally:
+            mail_host_slots.release()
+
     def add_daemons(self) -> None:
         """Adds a default set of daemons to the in- and sent mailboxes of this account."""
         inbox_mailboxes = self.mailboxes.filter(
@@ -366,7 +557,7 @@ class Account(
                 get_config("DEFAULT_INBOX_FETCHING_CRITERION")
                 if self.protocol
                 not in [EmailProtocolChoices.POP3, EmailProtocolChoices.POP3_SSL]
-                else EmailFetchingCriterionChoices.ALL
+                else EmailFetchingCriterionChoices.INCREMENTAL
             )
             if (
                 fetching_criterion
@@ -388,7 +579,7 @@ class Account(
                 get_config("DEFAULT_SENTBOX_FETCHING_CRITERION")
                 if self.protocol
                 not in [EmailProtocolChoices.POP3, EmailProtocolChoices.POP3_SSL]
-                else EmailFetchingCriterionChoices.ALL
+                else EmailFetchingCriterionChoices.INCREMENTAL
             )
             if (
                 fetching_criterion
@@ -21,7 +21,6 @@
 from __future__ import annotations
 
 import logging
-import os
 from functools import cached_property
 from hashlib import md5
 from tempfile import NamedTemporaryFile
@@ -48,7 +47,6 @@ from core.constants import (
     PAPERLESS_SUPPORTED_IMAGE_TYPES,
     PAPERLESS_TIKA_SUPPORTED_MIMETYPES,
     VCARD_TEMPLATE,
-    HeaderFields,
 )
 from core.mixins import (
     DownloadMixin,
@@ -62,11 +60,13 @@ from core.utils.mail_parsing import make_icalendar_readout, make_vcard_readout
 from eonvelope.utils.workarounds import get_config
 
 if TYPE_CHECKING:
-    from email.message import EmailMessage
+    from collections.abc import Sequence
     from tempfile import _TemporaryFileWrapper
 
     from django.db.models import QuerySet
 
+    from core.utils.mail_parsing import ParsedEmail
+
     from .Email import Email
 
 
@@ -533,65 +533,137 @@ class Attachment(
         )
 
     @classmethod
-    def create_from_email_message(
-        cls, email_message: EmailMessage, email: Email
+    def create_from_parsed_email(
+        cls, parsed_email: ParsedEmail, email: Email
     ) -> list[Attachment]:
-        """Creates :class:`core.models.Attachment`s from an email message.
+        """Creates :class:`core.models.Attachment`s from a parsed email.
 
         Args:
-            email_message: The email_message to get and create all attachments from.
-            email: The email model created from the email_message.
+            parsed_email: The parsed email to create all attachments from.
+            email: The email model created from the parsed email.
 
         Returns:
-            A list of :class:`core.models.Attachment` in the email message.
+            A list of :class:`core.models.Attachment` in the parsed email.
         """
         if email.pk is None:
             raise ValueError("Email is not in db!")
         logger.debug("Parsing and saving attachments in email %s ...", email.message_id)
+        new_attachments = []
+        for new_attachment, part_payload in cls._parse_attachments(parsed_email, email):
+            logger.debug("Saving attachment %s to db ...", new_attachment.file_name)
+            new_attachment.save(file_payload=part_payload)
+            new_attachments.append(new_attachment)
+        logger.debug("Successfully parsed and saved attachments.")
+        return new_attachments
+
+    @classmethod
+    def create_from_parsed_emails(
+        cls, parsed_emails: Sequence[tuple[ParsedEmail, Email]]
+    ) -> list[Attachment]:
+        """Creates the :class:`core.models.Attachment`s for a batch of new emails.
+
+        Works like :meth:`create_from_parsed_email` for every email,
+        but with a constant number of queries for the whole batch.
+
+        Args:
+            parsed_emails: The parsed emails with the email models created from them.
+                The emails must not have any attachments in the db yet.
+
+        Returns:
+            A list of :class:`core.models.Attachment` in the parsed emails.
+
+        Raises:
+            ValueError: If one of the emails is not in the db.
+        """
+        new_attachments = []
+        part_payloads = []
+        for parsed_email, email in parsed_emails:
+            if email.pk is None:
+                raise ValueError("Email is not in db!")
+            for new_attachment, part_payload in cls._parse_attachments(
+                parsed_email, email
+            ):
+                new_attachment.file_name = get_valid_filename(new_attachment.file_name)
+                new_attachments.append(new_attachment)
+                part_payloads.append(part_payload)
+        if not new_attachments:
+            return []
+        logger.debug("Saving %d attachments to db ...", len(new_attachments))
+        cls.objects.bulk_create(new_attachments)
+        if any(new_attachment.pk is None for new_attachment in new_attachments):
+            # the db backend doesn't return the ids of bulk inserted rows,
+            # as the emails are new, their attachments are exactly the ones just inserted in this order
+            attachment_pks = (
+                cls.objects.filter(
+                    email__in={email.pk for _parsed_email, email in parsed_emails}
+                )
+                .order_by("pk")
+                .values_list("pk", flat=True)
+            )
+            for new_attachment, attachment_pk in zip(
+                new_attachments, attachment_pks, strict=True
+            ):
+                new_attachment.pk = attachment_pk
+
+        stored_attachments = []
+        for new_attachment, part_payload in zip(
+            new_attachments, part_payloads, strict=True
+        ):
+            if new_attachment.email.mailbox.save_attachments:
+                new_attachment.store_file(part_payload)
+                stored_attachments.append(new_attachment)
+        cls.objects.bulk_update(stored_attachments, ["file_path"])
+        logger.debug("Successfully saved attachments.")
+        return new_attachments
+
+    @classmethod
+    def _parse_attachments(
+        cls, parsed_email: ParsedEmail, email: Email
+    ) -> list[tuple[Attachment, bytes]]:
+        """Creates the attachments of a parsed email without saving them.
+
+        Only the payloads of the attachments with content types that are not ignored are decoded.
+
+        Args:
+            parsed_email: The parsed email to get all attachments from.
+            email: The email model created from the parsed email.
+
+        Returns:
+            The unsaved :class:`core.models.Attachment`s in the parsed email with their payloads.
+        """
         ignore_maintypes = get_config("DONT_PARSE_CONTENT_MAINTYPES")
         ignore_subtypes = get_config("DONT_PARSE_CONTENT_SUBTYPES")
-        new_attachments = []
-        for part in email_message.walk():
-            if part.is_multipart():
-                # for safe get_payload
-                continue
-            content_disposition = part.get_content_disposition()
-            content_maintype = part.get_content_maintype()
-            content_subtype = part.get_content_subtype()
-            # first part of the condition checks whether the part qualifies as attachment in general,
-            # the second one whether the parts contenttype is blacklisted
+        parsed_attachments = []
+        for parsed_attachment in parsed_email.attachments:
             if (
-                content_disposition
-                or (
-                    content_maintype != "text"
-                    or content_subtype not in ["plain", "html"]
-                )
-            ) and (
-                content_maintype not in ignore_maintypes
-                and content_subtype not in ignore_subtypes
+                parsed_attachment.content_maintype in ignore_maintypes
+                or parsed_attachment.content_subtype in ignore_subtypes
             ):
-                part_payload = part.get_payload(decode=True)
-                if isinstance(part_payload, bytes):
-                    new_attachment = cls(
+                continue
+            part_payload = parsed_attachment.payload
+            if part_payload is None:
+                continue
+            parsed_attachments.append(
+                (
+                    cls(
                         file_name=(
-                            part.get_filename()
+                            parsed_attachment.file_name
                             or md5(  # noqa: S324  # no safe hash required here
                                 part_payload
                             ).hexdigest()
-                            + f".{content_subtype}"
+                            + f".{parsed_attachment.content_subtype}"
                         ),
-                        content_disposition=content_disposition or "",
-                        content_id=part.get(HeaderFields.CONTENT_ID, ""),
-                        content_maintype=content_maintype,
-                        content_subtype=content_subtype,
+                        content_disposition=parsed_attachment.content_disposition,
+                        content_id=parsed_attachment.content_id,
+                        content_maintype=parsed_attachment.content_maintype,
+                        content_subtype=parsed_attachment.content_subtype,
                         datasize=len(part_payload),
                         email=email,
-                    )
-                    logger.debug("Saving attachment %s to db ...", part.get_filename())
-                    new_attachment.save(file_payload=part_payload)
-                    new_attachments.append(new_attachment)
-        logger.debug("Successfully parsed and saved attachments.")
-        return new_attachments
+                    ),
+                    part_payload,
+                )
+            )
+        return parsed_attachments
 
     @staticmethod
     def queryset_as_file(queryset: QuerySet[Attachment]) -> _TemporaryFileWrapper:
@@ -620,7 +692,7 @@ class Attachment(
                 with (
                     attachment_file,
                     zipfile.open(
-                        os.path.basename(attachment_item.file_path), "w"
+                        attachment_item.get_archive_file_name(), "w"
                     ) as zipped_file,
                 ):
                     zipped_file.write(attachment_file.read())
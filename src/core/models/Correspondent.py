@@ -22,7 +22,7 @@ from __future__ import annotations
 
 import logging
 from io import BytesIO
-from typing import TYPE_CHECKING, ClassVar, override
+from typing import TYPE_CHECKING, ClassVar, Final, override
 
 import httpcore
 import httpx
@@ -33,6 +33,7 @@ from django_prometheus.models import ExportModelOperationsMixin
 from rest_framework import status
 from vobject import vCard
 
+from core.constants import HeaderFields
 from core.mixins import (
     DownloadMixin,
     FavoriteModelMixin,
@@ -42,6 +43,8 @@ from core.mixins import (
 from core.utils.mail_parsing import find_best_href_in_header
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     from django.contrib.auth.models import User
     from django.db.models import QuerySet
 
@@ -50,6 +53,10 @@ logger = logging.getLogger(__name__)
 """The logger instance for the module."""
 
 
+type CorrespondentCache = dict[tuple[int, str], Correspondent]
+"""Correspondents resolved during an ingest run by the pk of their user and their stripped mailaddress."""
+
+
 class Correspondent(
     ExportModelOperationsMixin("correspondent"),
     DownloadMixin,
@@ -70,6 +77,18 @@ class Correspondent(
         "This will only delete the records of these correspondents, not of their emails."
     )
 
+    MAILINGLIST_HEADERS: Final[dict[str, str]] = {
+        "list_id": HeaderFields.MailingList.ID,
+        "list_owner": HeaderFields.MailingList.OWNER,
+        "list_subscribe": HeaderFields.MailingList.SUBSCRIBE,
+        "list_unsubscribe": HeaderFields.MailingList.UNSUBSCRIBE,
+        "list_unsubscribe_post": HeaderFields.MailingList.UNSUBSCRIBE_POST,
+        "list_post": HeaderFields.MailingList.POST,
+        "list_help": HeaderFields.MailingList.HELP,
+        "list_archive": HeaderFields.MailingList.ARCHIVE,
+    }
+    """The headers of the mailinglist data by the name of their field."""
+
     email_address = models.CharField(
         max_length=255,
         # Translators: Do not capitalize the very first letter unless your language requires it.
@@ -391,15 +410,200 @@ class Correspondent(
                 name,
             )
             return None
-        correspondent, _ = cls.objects.get_or_create(
-            email_address=address.strip(), user=user
+        correspondent, created = cls.objects.get_or_create(
+            email_address=address.strip(),
+            user=user,
+            defaults={"email_name": name},
         )
-        if name:
+        if not created and name and correspondent.email_name != name:
             correspondent.email_name = name
-            correspondent.save()
+            correspondent.save(update_fields=["email_name"])
         logger.debug("Successfully saved correspondent %s to db.", address)
         return correspondent
 
+    @classmethod
+    def create_from_correspondent_tuples(
+        cls,
+        correspondent_tuples: Iterable[tuple[str, str]],
+        user: User,
+        cache: CorrespondentCache | None = None,
+    ) -> dict[str, Correspondent]:
+        """Creates :class:`core.models.Correspondent`s from a batch of email header data.
+
+        Works like :meth:`create_from_correspondent_tuple` for every tuple,
+        but with a constant number of queries for the whole batch.
+        Only the names that have changed are written.
+
+        Args:
+            correspondent_tuples: The tuples of correspondent data to create models from.
+            user: The user the correspondents shall belong to.
+            cache: The correspondents resolved earlier in the same ingest run.
+                Correspondents found in it are not queried again, new ones are added to it.
+                Must be cleared if the transaction the correspondents were resolved in is rolled back.
+
+        Returns:
+            The :class:`core.models.Correspondent`s with the data from the headers by their stripped mailaddress.
+            Tuples without address are left out.
+        """
+        email_names = cls._collect_email_names(correspondent_tuples)
+        if not email_names:
+            return {}
+        if cache is None:
+            cache = {}
+
+        cached_correspondents = {
+            address: cache[(user.pk, address)]
+            for address in email_names
+            if (user.pk, address) in cache
+        }
+        uncached_addresses = set(email_names) - set(cached_correspondents)
+        existing_correspondents = (
+            list(cls.objects.filter(user=user, email_address__in=uncached_addresses))
+            if uncached_addresses
+            else []
+        )
+        missing_addresses = uncached_addresses - {
+            correspondent.email_address for correspondent in existing_correspondents
+        }
+        if missing_addresses:
+            existing_correspondents.extend(
+                cls._bulk_create_missing(
+                    {address: email_names[address] for address in missing_addresses},
+                    user,
+                )
+            )
+        correspondents = cls._match_addresses(
+            email_names, cached_correspondents, existing_correspondents
+        )
+        for address, correspondent in correspondents.items():
+            cache[(user.pk, address)] = correspondent
+        cls._bulk_update_email_names(correspondents, email_names)
+        logger.debug("Successfully saved %d correspondents to db.", len(correspondents))
+        return correspondents
+
+    @staticmethod
+    def _collect_email_names(
+        correspondent_tuples: Iterable[tuple[str, str]],
+    ) -> dict[str, str]:
+        """Collects the names for the addresses in a batch of email header data.
+
+        Args:
+            correspondent_tuples: The tuples of correspondent data.
+
+        Returns:
+            The last non-empty name for every stripped mailaddress.
+            Tuples without address are left out.
+        """
+        email_names: dict[str, str] = {}
+        for name, address in correspondent_tuples:
+            stripped_address = address.strip()
+            if not stripped_address:
+                logger.debug(
+                    "Skipping correspondent %s with empty mailaddress.",
+                    name,
+                )
+                continue
+            if name or stripped_address not in email_names:
+                email_names[stripped_address] = name
+        return email_names
+
+    @classmethod
+    def _bulk_create_missing(
+        cls, email_names: dict[str, str], user: User
+    ) -> list[Correspondent]:
+        """Creates the correspondents that are not in the db yet.
+
+        Args:
+            email_names: The names of the new correspondents by their mailaddress.
+            user: The user the correspondents shall belong to.
+
+        Returns:
+            The new correspondents, including those created concurrently.
+        """
+        cls.objects.bulk_create(
+            [
+                cls(email_address=address, email_name=name, user=user)
+                for address, name in email_names.items()
+            ],
+            ignore_conflicts=True,
+        )
+        return list(cls.objects.filter(user=user, email_address__in=email_names))
+
+    @staticmethod
+    def _match_addresses(
+        addresses: Iterable[str],
+        cached_correspondents: dict[str, Correspondent],
+        existing_correspondents: list[Correspondent],
+    ) -> dict[str, Correspondent]:
+        """Assigns the resolved correspondents to the mailaddresses they were resolved for.
+
+        Args:
+            addresses: The stripped mailaddresses.
+            cached_correspondents: The correspondents from the cache by their mailaddress.
+            existing_correspondents: The correspondents loaded from the db.
+
+        Returns:
+            The correspondents by their mailaddress.
+            Addresses that could not be resolved are left out.
+        """
+        by_address = {
+            correspondent.email_address: correspondent
+            for correspondent in existing_correspondents
+        }
+        # the db may compare the addresses case-insensitively
+        by_lowercase_address = {
+            correspondent.email_address.lower(): correspondent
+            for correspondent in existing_correspondents
+        }
+        correspondents = {}
+        for address in addresses:
+            correspondent = (
+                cached_correspondents.get(address)
+                or by_address.get(address)
+                or by_lowercase_address.get(address.lower())
+            )
+            if correspondent is not None:
+                correspondents[address] = correspondent
+        return correspondents
+
+    @classmethod
+    def _bulk_update_email_names(
+        cls, correspondents: dict[str, Correspondent], email_names: dict[str, str]
+    ) -> None:
+        """Writes the changed names of correspondents to the db.
+
+        Args:
+            correspondents: The correspondents by their mailaddress.
+            email_names: The names from the headers by mailaddress.
+        """
+        renamed_correspondents = {}
+        for address, correspondent in correspondents.items():
+            name = email_names[address]
+            if name and correspondent.email_name != name:
+                correspondent.email_name = name
+                renamed_correspondents[correspondent.pk] = correspondent
+        if renamed_correspondents:
+            cls.objects.bulk_update(renamed_correspondents.values(), ["email_name"])
+
+    def set_mailinglist_from_headers(self, headers: dict[str, str | None]) -> list[str]:
+        """Sets the mailinglist data of this correspondent from the headers of an email it sent.
+
+        Does not save the correspondent.
+
+        Args:
+            headers: The headers of the email.
+
+        Returns:
+            The names of the fields that have changed.
+        """
+        changed_fields = []
+        for field_name, header_name in self.MAILINGLIST_HEADERS.items():
+            value = headers.get(header_name) or ""
+            if getattr(self, field_name) != value:
+                setattr(self, field_name, value)
+                changed_fields.append(field_name)
+        return changed_fields
+
     @staticmethod
     def queryset_as_file(queryset: QuerySet) -> BytesIO:
         """Parse the correspondents in the queryset into a vcard object bytestream.
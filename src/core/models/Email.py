@@ -21,19 +21,19 @@
 from __future__ import annotations
 
 import contextlib
-import email
+import itertools
 import logging
 import os
 import re
 import shutil
-from email import policy
-from functools import cached_property
+from functools import cached_property, partial
 from hashlib import md5
 from tempfile import NamedTemporaryFile, TemporaryDirectory
 from typing import TYPE_CHECKING, Any, ClassVar, override
 from zipfile import ZipFile
 
-from django.db import connection, models, transaction
+from django.core.files.storage import default_storage
+from django.db import models, transaction
 from django.template import engines
 from django.utils.translation import gettext as __
 from django.utils.translation import gettext_lazy as _
@@ -54,23 +54,29 @@ from core.mixins import (
     URLMixin,
 )
 from core.utils.fetchers.exceptions import MailboxError
+from core.utils.IngestPipeline import IngestPipeline
+from core.utils.KnownMessageIDs import KnownMessageIDs
 from core.utils.mail_parsing import (
-    get_bodytexts,
-    get_header,
+    ParsedEmail,
     is_x_spam,
     parse_datetime_header,
+    parse_email_bytes_detached,
+    scan_headers,
 )
 from eonvelope.utils.workarounds import get_config
 
 from .Attachment import Attachment
 from .EmailCorrespondent import EmailCorrespondent
+from .EmailMessageID import EmailMessageID
+from .MessageIDReference import MessageIDReference
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator, Sequence
     from tempfile import _TemporaryFileWrapper
 
     from django.db.models import QuerySet
 
-    from .Correspondent import Correspondent
+    from .Correspondent import Correspondent, CorrespondentCache
     from .Mailbox import Mailbox
 
 
@@ -156,6 +162,18 @@ class Email(
     )
     """The mails that this email references."""
 
+    thread_id = models.PositiveBigIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        db_index=True,
+        # Translators: Do not capitalize the very first letter unless your language requires it.
+        verbose_name=_("thread ID"),
+    )
+    """The id of the conversation this mail belongs to.
+    Emails connected through :attr:`in_reply_to` or :attr:`references` share the same thread id.
+    Null until the links of the email have been added."""
+
     datasize = models.PositiveIntegerField(
         # Translators: Do not capitalize the very first letter unless your language requires it.
         verbose_name=_("datasize"),
@@ -236,10 +254,18 @@ class Email(
         """Extended :django::func:`django.models.Model.save` method.
 
         Saves the data to eml if configured.
+        Indexes the message-id of a new email in :class:`core.models.EmailMessageID`.
         """
         if not self.mailbox.save_to_eml:
             kwargs.pop("file_payload", None)
+        is_new = self._state.adding
         super().save(*args, **kwargs)
+        if is_new:
+            EmailMessageID.objects.create(
+                user_id=self.mailbox.account.user_id,
+                email_id=self.pk,
+                message_id=self.message_id,
+            )
 
     @override
     def _get_storage_file_name(self) -> str:
@@ -255,23 +281,29 @@ class Email(
         Returns:
             The :class:`core.models.Email` instance with data from the bytes.
         """
-        email_message = email.message_from_bytes(email_bytes, policy=policy.default)
-        header_dict: dict[str, str | None] = {}
-        for header_name in email_message:
-            header_dict[header_name.lower()] = get_header(email_message, header_name)
-        bodytexts = get_bodytexts(email_message)
+        return self.fill_from_parsed_email(ParsedEmail.from_bytes(email_bytes))
+
+    def fill_from_parsed_email(self, parsed_email: ParsedEmail) -> Email:
+        """Fills the :class:`core.models.Email` with data from a parsed email.
+
+        Args:
+            parsed_email: The parsed email data.
 
-        self.headers = header_dict
-        self.message_id = (
-            header_dict.get(HeaderFields.MESSAGE_ID)
-            or md5(email_bytes).hexdigest()  # noqa: S324  # no safe hash required here
+        Returns:
+            The :class:`core.models.Email` instance with data from the parsed email.
+        """
+        self.headers = parsed_email.headers
+        self.message_id = parsed_email.message_id
+        self.datetime = parse_datetime_header(
+            parsed_email.headers.get(HeaderFields.DATE)
         )
-        self.datetime = parse_datetime_header(header_dict.get(HeaderFields.DATE))
-        self.subject = header_dict.get(HeaderFields.SUBJECT) or __("No subject")
-        self.x_spam_flag = is_x_spam(header_dict.get(HeaderFields.X_SPAM))
-        self.datasize = len(email_bytes)
-        self.plain_bodytext = bodytexts.get("plain", "")
-        self.html_bodytext = bodytexts.get("html", "")
+        self.subject = parsed_email.headers.get(HeaderFields.SUBJECT) or __(
+            "No subject"
+        )
+        self.x_spam_flag = is_x_spam(parsed_email.headers.get(HeaderFields.X_SPAM))
+        self.datasize = parsed_email.datasize
+        self.plain_bodytext = parsed_email.bodytexts.get("plain", "")
+        self.html_bodytext = parsed_email.bodytexts.get("html", "")
 
         return self
 
@@ -289,61 +321,27 @@ class Email(
                         and new_emailcorrespondents is not None
                     ):
                         for new_emailcorrespondent in new_emailcorrespondents:
-                            new_emailcorrespondent.correspondent.list_id = (
-                                self.headers.get(HeaderFields.MailingList.ID, "")
-                            )
-                            new_emailcorrespondent.correspondent.list_help = (
-                                self.headers.get(HeaderFields.MailingList.HELP, "")
+                            changed_fields = new_emailcorrespondent.correspondent.set_mailinglist_from_headers(
+                                self.headers
                             )
-                            new_emailcorrespondent.correspondent.list_archive = (
-                                self.headers.get(HeaderFields.MailingList.ARCHIVE, "")
-                            )
-                            new_emailcorrespondent.correspondent.list_subscribe = (
-                                self.headers.get(HeaderFields.MailingList.SUBSCRIBE, "")
-                            )
-                            new_emailcorrespondent.correspondent.list_unsubscribe = (
-                                self.headers.get(
-                                    HeaderFields.MailingList.UNSUBSCRIBE, ""
+                            if changed_fields:
+                                new_emailcorrespondent.correspondent.save(
+                                    update_fields=changed_fields
                                 )
-                            )
-                            new_emailcorrespondent.correspondent.list_unsubscribe_post = self.headers.get(
-                                HeaderFields.MailingList.UNSUBSCRIBE_POST, ""
-                            )
-                            new_emailcorrespondent.correspondent.list_post = (
-                                self.headers.get(HeaderFields.MailingList.POST, "")
-                            )
-                            new_emailcorrespondent.correspondent.list_owner = (
-                                self.headers.get(HeaderFields.MailingList.OWNER, "")
-                            )
-                            new_emailcorrespondent.correspondent.save()
 
     def add_in_reply_to(self) -> None:
-        """Adds the in-reply-to emails from the headerfields to the model."""
-        if self.headers:
-            in_reply_to_message_id = self.headers.get(HeaderFields.IN_REPLY_TO)
-            if in_reply_to_message_id:
-                for in_reply_to_email in Email.objects.filter(
-                    message_id=in_reply_to_message_id.strip(),
-                    mailbox__account__user=self.mailbox.account.user,
-                ):
-                    self.in_reply_to.add(in_reply_to_email)
+        """Adds the in-reply-to emails from the headerfields to the model.
+
+        Also links the emails that are already in the db and reply to this email.
+        """
+        Email._bulk_add_links([self], references=False)
 
     def add_references(self) -> None:
-        """Adds the references from the headerfields to the model."""
-        if self.headers:
-            references_header = self.headers.get(HeaderFields.REFERENCES)
-            if references_header:
-                referenced_message_ids = [
-                    message_id.strip()
-                    for message_id in re.split(r"[ ,]", references_header)
-                ]
-                for referenced_message_id in referenced_message_ids:
-                    if referenced_message_id:  # re.split may produce empty strings
-                        for referenced_email in Email.objects.filter(
-                            message_id=referenced_message_id,
-                            mailbox__account__user=self.mailbox.account.user,
-                        ):
-                            self.references.add(referenced_email)
+        """Adds the references from the headerfields to the model.
+
+        Also links the emails that are already in the db and reference this email.
+        """
+        Email._bulk_add_links([self], in_reply_to=False)
 
     def reprocess(self) -> None:
         """Reprocesses the mails connections to other emails in the database."""
@@ -353,9 +351,20 @@ class Email(
             self.fill_from_email_bytes(email_bytes)
         with transaction.atomic():
             self.save()
+            EmailMessageID.objects.update_or_create(
+                email_id=self.pk,
+                defaults={
+                    "user_id": self.mailbox.account.user_id,
+                    "message_id": self.message_id,
+                },
+            )
+            self.message_id_references.all().delete()
             self.in_reply_to.clear()
-            self.add_in_reply_to()
             self.references.clear()
+            if self.thread_id is not None:
+                Email.rebuild_thread(self.thread_id)
+                self.refresh_from_db(fields=["thread_id"])
+            self.add_in_reply_to()
             self.add_references()
 
     def restore_to_mailbox(self) -> None:
@@ -379,62 +388,16 @@ class Email(
 
     @cached_property
     def conversation(self) -> QuerySet[Email]:
-        """Recursively gets all emails that are part of this emails conversation,
+        """Gets all emails that are part of this emails conversation,
         connected through references or in_reply_to.
 
         Returns:
             Queryset of all mails in the conversation.
         """
-        conversation_sql = """
-        WITH RECURSIVE
-        emails_links AS (
-            SELECT from_email_id, to_email_id FROM emails_in_reply_to
-            UNION ALL
-            SELECT from_email_id, to_email_id FROM emails_references
-        ),
-
-        conversation_root AS (
-            SELECT e.id
-            FROM emails e
-            WHERE e.id = %s
-
-            UNION ALL
-
-            SELECT DISTINCT linked.id
-            FROM emails linked
-            JOIN emails_links l ON l.to_email_id = linked.id
-            JOIN conversation_root cr ON cr.id = l.from_email_id
-        ),
-
-        conversation_thread AS (
-            SELECT e.id
-            FROM emails e
-            JOIN conversation_root cr ON e.id = cr.id
-            WHERE NOT EXISTS (
-                SELECT 1
-                FROM emails_links l
-                WHERE l.from_email_id = e.id
-            )
-
-            UNION ALL
-
-            SELECT DISTINCT linking.id
-            FROM emails linking
-            JOIN emails_links l ON l.from_email_id = linking.id
-            JOIN conversation_thread ct ON l.to_email_id = ct.id
-        )
-
-        SELECT DISTINCT id
-        FROM conversation_thread;
-        """
-        with connection.cursor() as cursor:
-            cursor.execute(conversation_sql, [self.id])
-            conversation_rows = cursor.fetchall()
-        conversation_ids = [
-            conversation_row[0] for conversation_row in conversation_rows
-        ]
+        if self.thread_id is None:
+            return Email.objects.filter(pk=self.pk)
         return Email.objects.filter(
-            id__in=conversation_ids, mailbox__account__user=self.mailbox.account.user
+            thread_id=self.thread_id, mailbox__account__user=self.mailbox.account.user
         ).order_by("datetime")
 
     @property
@@ -500,31 +463,27 @@ class Email(
 
     @classmethod
     def create_from_email_bytes(
-        cls, email_bytes: bytes, mailbox: Mailbox
+        cls,
+        email_bytes: bytes,
+        mailbox: Mailbox,
+        known_message_ids: KnownMessageIDs | None = None,
     ) -> Email | None:
         """Creates an :class:`core.models.Email` from an email in bytes form.
 
         Args:
             email_bytes: The email bytes to parse the emaildata from.
             mailbox: The mailbox the email is in.
+            known_message_ids: The Message-IDs of the emails in `mailbox`.
+                If given, the email is checked against these instead of the db
+                and its Message-ID is added once it is saved.
 
         Returns:
             The :class:`core.models.Email` instance with data from the bytes.
-            None if there is no Message-ID header in :attr:`email_message`,
-            if the mail already exists in the db or
+            None if the mail already exists in the db or
             if the mail is spam and is supposed to be thrown out.
         """
-        email_message = email.message_from_bytes(email_bytes, policy=policy.default)
-
-        message_id = (
-            get_header(
-                email_message,
-                HeaderFields.MESSAGE_ID,
-            )
-            or md5(email_bytes).hexdigest()  # noqa: S324  # no safe hash required here
-        )
-        logger.debug("Parsed email %s ...", message_id)
-        x_spam = is_x_spam(get_header(email_message, HeaderFields.X_SPAM))
+        message_id, x_spam = cls._scan_email_bytes(email_bytes)
+        logger.debug("Scanned email %s ...", message_id)
         if x_spam and get_config("THROW_OUT_SPAM"):
             logger.debug(
                 "Skipping email with Message-ID %s in %s, it is flagged as spam.",
@@ -533,7 +492,11 @@ class Email(
             )
             return None
 
-        if cls.objects.filter(message_id=message_id, mailbox=mailbox).exists():
+        if (
+            message_id in known_message_ids
+            if known_message_ids is not None
+            else cls.objects.filter(message_id=message_id, mailbox=mailbox).exists()
+        ):
             logger.debug(
                 "Skipping email with Message-ID %s in %s, it already exists in the db.",
                 message_id,
@@ -541,17 +504,120 @@ class Email(
             )
             return None
 
-        new_email = cls(mailbox=mailbox).fill_from_email_bytes(email_bytes=email_bytes)
-
+        parsed_email = ParsedEmail.from_bytes(email_bytes)
+        new_email = cls(mailbox=mailbox).fill_from_parsed_email(parsed_email)
         logger.debug("Successfully parsed email.")
-        logger.debug("Saving email %s to db...", message_id)
+        if new_email.message_id != message_id:
+            # the scan may differ from the parser for malformed headers
+            saved_email = cls.create_from_parsed_email(
+                new_email, parsed_email, email_bytes
+            )
+        else:
+            saved_email = cls._save_parsed_email(new_email, parsed_email, email_bytes)
+        if saved_email is not None and known_message_ids is not None:
+            known_message_ids.add(saved_email.message_id)
+        return saved_email
+
+    @staticmethod
+    def _scan_email_bytes(email_bytes: bytes) -> tuple[str, bool | None]:
+        """Scans an email in bytes form for the data to decide whether it needs to be parsed.
+
+        Args:
+            email_bytes: The email bytes data.
+
+        Returns:
+            The Message-ID of the email as it is set by :meth:`fill_from_parsed_email`
+            and whether it is flagged as spam.
+        """
+        headers = scan_headers(
+            email_bytes, [HeaderFields.MESSAGE_ID, HeaderFields.X_SPAM]
+        )
+        return (
+            headers.get(HeaderFields.MESSAGE_ID)
+            or md5(email_bytes).hexdigest(),  # noqa: S324  # no safe hash required here
+            is_x_spam(headers.get(HeaderFields.X_SPAM)),
+        )
+
+    @classmethod
+    def parse_email_bytes(
+        cls, email_bytes: bytes, mailbox: Mailbox
+    ) -> tuple[Email, ParsedEmail]:
+        """Parses an email in bytes form without accessing the db.
+
+        Together with :meth:`create_from_parsed_email` this splits up :meth:`create_from_email_bytes`,
+        so that parsing can run in a different thread than saving.
+
+        Args:
+            email_bytes: The email bytes to parse the emaildata from.
+            mailbox: The mailbox the email is in.
+
+        Returns:
+            The unsaved :class:`core.models.Email` instance with data from the bytes
+            and the parsed email data.
+        """
+        parsed_email = ParsedEmail.from_bytes(email_bytes)
+        return cls(mailbox=mailbox).fill_from_parsed_email(parsed_email), parsed_email
+
+    @classmethod
+    def create_from_parsed_email(
+        cls, new_email: Email, parsed_email: ParsedEmail, email_bytes: bytes
+    ) -> Email | None:
+        """Saves an email parsed by :meth:`parse_email_bytes`.
+
+        Args:
+            new_email: The unsaved email instance.
+            parsed_email: The parsed email data.
+            email_bytes: The email bytes the email was parsed from.
+
+        Returns:
+            The saved :class:`core.models.Email` instance.
+            None if the mail already exists in the db or
+            if the mail is spam and is supposed to be thrown out.
+        """
+        if new_email.x_spam_flag and get_config("THROW_OUT_SPAM"):
+            logger.debug(
+                "Skipping email with Message-ID %s in %s, it is flagged as spam.",
+                new_email.message_id,
+                new_email.mailbox,
+            )
+            return None
+
+        if cls.objects.filter(
+            message_id=new_email.message_id, mailbox=new_email.mailbox
+        ).exists():
+            logger.debug(
+                "Skipping email with Message-ID %s in %s, it already exists in the db.",
+                new_email.message_id,
+                new_email.mailbox,
+            )
+            return None
+
+        return cls._save_parsed_email(new_email, parsed_email, email_bytes)
+
+    @staticmethod
+    def _save_parsed_email(
+        new_email: Email, parsed_email: ParsedEmail, email_bytes: bytes
+    ) -> Email | None:
+        """Saves a parsed email with its correspondents, references and attachments.
+
+        Args:
+            new_email: The unsaved email instance.
+            parsed_email: The parsed email data.
+            email_bytes: The email bytes the email was parsed from.
+
+        Returns:
+            The saved :class:`core.models.Email` instance.
+            None if saving failed.
+        """
+        logger.debug("Saving email %s to db...", new_email.message_id)
         try:
-            with transaction.atomic():
+            with default_storage.discard_new_files_on_error(), transaction.atomic():
                 new_email.save(file_payload=email_bytes)
-                new_email.add_correspondents()
-                new_email.add_in_reply_to()
-                new_email.add_references()
-                Attachment.create_from_email_message(email_message, new_email)
+                EmailCorrespondent.create_from_parsed_emails(
+                    [(parsed_email, new_email)]
+                )
+                Email._bulk_add_links([new_email])
+                Attachment.create_from_parsed_email(parsed_email, new_email)
         except Exception:
             logger.exception(
                 "Failed creating email from bytes: Error while saving email to db!"
@@ -560,6 +626,723 @@ class Email(
         logger.debug("Successfully saved email to db.")
         return new_email
 
+    @classmethod
+    def create_from_email_bytes_batch(
+        cls,
+        emails_bytes: Iterable[bytes],
+        mailbox: Mailbox,
+        batch_size: int | None = None,
+        *,
+        known_message_ids: KnownMessageIDs | None = None,
+        parse_processes: int | None = None,
+        on_batch_saved: Callable[[], object] | None = None,
+    ) -> int:
+        """Creates :class:`core.models.Email`s from emails in bytes form in batches.
+
+        Emails that are spam to be thrown out or that already exist in the db
+        are skipped before they are parsed, see :meth:`skip_known_email_bytes`.
+        If `parse_processes` is positive,
+        the emails are parsed by that many processes while the previous ones are saved,
+        see :class:`core.utils.IngestPipeline.IngestPipeline`.
+        Every batch is saved by :meth:`create_from_parsed_emails`.
+
+        Args:
+            emails_bytes: The email bytes to parse the emaildata from.
+            mailbox: The mailbox the emails are in.
+            batch_size: The number of emails saved together.
+                Defaults to the `INGEST_PERSIST_BATCH_SIZE` setting.
+            known_message_ids: The Message-IDs of the emails in `mailbox`.
+                Loaded from the db if not given.
+            parse_processes: The number of parsing processes.
+                Defaults to the `INGEST_UPLOAD_PARSE_PROCESSES` setting.
+            on_batch_saved: Called after every saved batch.
+
+        Returns:
+            The number of saved emails.
+        """
+        if batch_size is None:
+            batch_size = get_config("INGEST_PERSIST_BATCH_SIZE")
+        if parse_processes is None:
+            parse_processes = get_config("INGEST_UPLOAD_PARSE_PROCESSES")
+        new_emails_bytes = cls.skip_known_email_bytes(
+            emails_bytes, mailbox, known_message_ids
+        )
+
+        correspondent_cache: CorrespondentCache = {}
+        saved_emails: list[Email] = []
+
+        def save_batch(parsed_emails: list[tuple[Email, ParsedEmail, bytes]]) -> None:
+            """Saves a batch of parsed emails."""
+            saved_emails.extend(
+                cls.create_from_parsed_emails(
+                    parsed_emails, correspondent_cache=correspondent_cache
+                )
+            )
+            if on_batch_saved is not None:
+                on_batch_saved()
+
+        if parse_processes < 1:
+            parsed_emails: list[tuple[Email, ParsedEmail, bytes]] = []
+            for email_bytes in new_emails_bytes:
+                parsed_emails.append(
+                    (*cls.parse_email_bytes(email_bytes, mailbox), email_bytes)
+                )
+                if len(parsed_emails) >= batch_size:
+                    save_batch(parsed_emails)
+                    parsed_emails = []
+            if parsed_emails:
+                save_batch(parsed_emails)
+            return len(saved_emails)
+
+        def save_parsed_emails(
+            detached_parsed_emails: list[tuple[ParsedEmail, bytes]],
+        ) -> None:
+            """Saves a batch of emails parsed by :func:`core.utils.mail_parsing.parse_email_bytes_detached`."""
+            save_batch(
+                [
+                    (
+                        cls(mailbox=mailbox).fill_from_parsed_email(parsed_email),
+                        parsed_email,
+                        email_bytes,
+                    )
+                    for parsed_email, email_bytes in detached_parsed_emails
+                ]
+            )
+
+        IngestPipeline(
+            partial(
+                parse_email_bytes_detached,
+                ignore_maintypes=get_config("DONT_PARSE_CONTENT_MAINTYPES"),
+                ignore_subtypes=get_config("DONT_PARSE_CONTENT_SUBTYPES"),
+            ),
+            save_parsed_emails,
+            parse_workers=parse_processes,
+            queue_size=get_config("INGEST_QUEUE_SIZE"),
+            persist_batch_size=batch_size,
+            use_processes=True,
+        ).run(new_emails_bytes)
+        return len(saved_emails)
+
+    @classmethod
+    def skip_known_email_bytes(
+        cls,
+        emails_bytes: Iterable[bytes],
+        mailbox: Mailbox,
+        known_message_ids: KnownMessageIDs | None = None,
+    ) -> Iterator[bytes]:
+        """Leaves out the emails that don't need to be parsed, using :meth:`_scan_email_bytes`.
+
+        These are the emails that are spam to be thrown out,
+        the ones that already exist in the db and repeated ones.
+        The existing emails are looked up in memory, see :class:`core.utils.KnownMessageIDs.KnownMessageIDs`.
+
+        Args:
+            emails_bytes: The emails in bytes form.
+            mailbox: The mailbox the emails are in.
+            known_message_ids: The Message-IDs of the emails in `mailbox`.
+                Loaded from the db if not given.
+                The Message-IDs of the emails that are not left out are added.
+
+        Yields:
+            The emails that need to be parsed.
+        """
+        if known_message_ids is None:
+            known_message_ids = KnownMessageIDs(mailbox)
+        throw_out_spam = get_config("THROW_OUT_SPAM")
+        for email_bytes in emails_bytes:
+            message_id, x_spam = cls._scan_email_bytes(email_bytes)
+            if x_spam and throw_out_spam:
+                logger.debug(
+                    "Skipping email with Message-ID %s in %s, it is flagged as spam.",
+                    message_id,
+                    mailbox,
+                )
+                continue
+            if message_id in known_message_ids:
+                logger.debug(
+                    "Skipping email with Message-ID %s in %s, it already exists in the db.",
+                    message_id,
+                    mailbox,
+                )
+                continue
+            known_message_ids.add(message_id)
+            yield email_bytes
+
+    @classmethod
+    def create_from_parsed_emails(
+        cls,
+        parsed_emails: Sequence[tuple[Email, ParsedEmail, bytes]],
+        correspondent_cache: CorrespondentCache | None = None,
+    ) -> list[Email]:
+        """Saves a batch of emails parsed by :meth:`parse_email_bytes` with bulk queries.
+
+        Works like :meth:`create_from_parsed_email` for every email,
+        but the emails, their correspondents, links and attachments are saved
+        with a constant number of queries per batch.
+        If saving the batch fails, the emails are saved one by one instead,
+        so a single bad email does not cost the whole batch.
+
+        Args:
+            parsed_emails: The unsaved email instances with their parsed email data
+                and the email bytes they were parsed from.
+            correspondent_cache: The correspondents resolved in earlier batches of the same ingest run.
+                It is cleared if saving the batch fails.
+
+        Returns:
+            The saved :class:`core.models.Email` instances.
+            Emails that already exist in the db, duplicates within the batch
+            and spam that is supposed to be thrown out are left out.
+        """
+        new_parsed_emails = cls._filter_new_parsed_emails(parsed_emails)
+        if not new_parsed_emails:
+            return []
+
+        logger.debug("Saving %d emails to db ...", len(new_parsed_emails))
+        try:
+            with default_storage.discard_new_files_on_error(), transaction.atomic():
+                new_emails = cls._bulk_save_parsed_emails(
+                    new_parsed_emails, correspondent_cache
+                )
+        except Exception:
+            logger.exception(
+                "Failed saving a batch of emails to db, saving them one by one!"
+            )
+            if correspondent_cache is not None:
+                # the cached correspondents may have been rolled back
+                correspondent_cache.clear()
+            return cls._save_parsed_emails_one_by_one(new_parsed_emails)
+        logger.debug("Successfully saved emails to db.")
+        return new_emails
+
+    @classmethod
+    def _filter_new_parsed_emails(
+        cls, parsed_emails: Sequence[tuple[Email, ParsedEmail, bytes]]
+    ) -> list[tuple[Email, ParsedEmail, bytes]]:
+        """Leaves out the parsed emails that must not be saved by :meth:`create_from_parsed_emails`.
+
+        These are the emails that are spam to be thrown out,
+        the ones that already exist in the db and duplicates within the batch.
+        The existing emails are looked up with a single query.
+
+        Args:
+            parsed_emails: The unsaved email instances with their parsed email data
+                and the email bytes they were parsed from.
+
+        Returns:
+            The parsed emails that need to be saved.
+        """
+        throw_out_spam = get_config("THROW_OUT_SPAM")
+        new_parsed_emails: dict[tuple[int, str], tuple[Email, ParsedEmail, bytes]] = {}
+        for new_email, parsed_email, email_bytes in parsed_emails:
+            if new_email.x_spam_flag and throw_out_spam:
+                logger.debug(
+                    "Skipping email with Message-ID %s in %s, it is flagged as spam.",
+                    new_email.message_id,
+                    new_email.mailbox,
+                )
+                continue
+            new_parsed_emails.setdefault(
+                (new_email.mailbox_id, new_email.message_id),
+                (new_email, parsed_email, email_bytes),
+            )
+        if not new_parsed_emails:
+            return []
+
+        for mailbox_id, message_id in cls.objects.filter(
+            mailbox_id__in={
+                mailbox_id for mailbox_id, _message_id in new_parsed_emails
+            },
+            message_id__in={
+                message_id for _mailbox_id, message_id in new_parsed_emails
+            },
+        ).values_list("mailbox_id", "message_id"):
+            if new_parsed_emails.pop((mailbox_id, message_id), None) is not None:
+                logger.debug(
+                    "Skipping email with Message-ID %s in mailbox %s, it already exists in the db.",
+                    message_id,
+                    mailbox_id,
+                )
+        return list(new_parsed_emails.values())
+
+    @classmethod
+    def _save_parsed_emails_one_by_one(
+        cls, parsed_emails: list[tuple[Email, ParsedEmail, bytes]]
+    ) -> list[Email]:
+        """Saves parsed emails one by one, after saving them in bulk failed.
+
+        Args:
+            parsed_emails: The unsaved email instances with their parsed email data
+                and the email bytes they were parsed from.
+
+        Returns:
+            The saved :class:`core.models.Email` instances.
+        """
+        new_emails = []
+        for new_email, parsed_email, email_bytes in parsed_emails:
+            # reset the state that the failed bulk save may have left on the instance
+            new_email.pk = None
+            new_email.file_path = None
+            # required to save the instance again
+            new_email._state.adding = True  # noqa: SLF001
+            saved_email = cls.create_from_parsed_email(
+                new_email, parsed_email, email_bytes
+            )
+            if saved_email is not None:
+                new_emails.append(saved_email)
+        return new_emails
+
+    @classmethod
+    def _bulk_save_parsed_emails(
+        cls,
+        parsed_emails: list[tuple[Email, ParsedEmail, bytes]],
+        correspondent_cache: CorrespondentCache | None = None,
+    ) -> list[Email]:
+        """Saves new parsed emails with their correspondents, references and attachments in bulk.
+
+        Note:
+            Does not check for duplicates! This has to be done beforehand.
+
+        Args:
+            parsed_emails: The unsaved email instances with their parsed email data
+                and the email bytes they were parsed from.
+            correspondent_cache: The correspondents resolved earlier in the same ingest run.
+
+        Returns:
+            The saved :class:`core.models.Email` instances.
+        """
+        new_emails = [
+            new_email for new_email, _parsed_email, _email_bytes in parsed_emails
+        ]
+        cls.objects.bulk_create(new_emails)
+        if any(new_email.pk is None for new_email in new_emails):
+            # the db backend doesn't return the ids of bulk inserted rows
+            email_pks = {
+                (mailbox_id, message_id): email_pk
+                for mailbox_id, message_id, email_pk in cls.objects.filter(
+                    mailbox_id__in={new_email.mailbox_id for new_email in new_emails},
+                    message_id__in={new_email.message_id for new_email in new_emails},
+                ).values_list("mailbox_id", "message_id", "pk")
+            }
+            for new_email in new_emails:
+                new_email.pk = email_pks[(new_email.mailbox_id, new_email.message_id)]
+        EmailMessageID.objects.bulk_create(
+            EmailMessageID(
+                user_id=new_email.mailbox.account.user_id,
+                email=new_email,
+                message_id=new_email.message_id,
+            )
+            for new_email in new_emails
+        )
+
+        stored_emails = []
+        for new_email, _parsed_email, email_bytes in parsed_emails:
+            if new_email.mailbox.save_to_eml:
+                new_email.store_file(email_bytes)
+                stored_emails.append(new_email)
+        cls.objects.bulk_update(stored_emails, ["file_path"])
+
+        EmailCorrespondent.create_from_parsed_emails(
+            [
+                (parsed_email, new_email)
+                for new_email, parsed_email, _email_bytes in parsed_emails
+            ],
+            correspondent_cache,
+        )
+        cls._bulk_add_links(new_emails)
+        Attachment.create_from_parsed_emails(
+            [
+                (parsed_email, new_email)
+                for new_email, parsed_email, _email_bytes in parsed_emails
+            ]
+        )
+        return new_emails
+
+    @classmethod
+    def _bulk_add_links(
+        cls,
+        new_emails: Sequence[Email],
+        *,
+        in_reply_to: bool = True,
+        references: bool = True,
+    ) -> None:
+        """Adds the in-reply-to and referenced emails from the headerfields of a batch of emails.
+
+        The referenced message-ids are recorded in the :class:`core.models.MessageIDReference` index,
+        so emails that arrive before the messages they refer to are linked once those are saved.
+        Likewise, the emails in the index that refer to one of the new emails are linked to it.
+        The referenced emails are looked up in the :class:`core.models.EmailMessageID` index.
+        This takes a constant number of queries per user.
+
+        Args:
+            new_emails: The emails to add the links for.
+            in_reply_to: Whether to add the in-reply-to links.
+            references: Whether to add the references links.
+        """
+        new_emails_by_user: dict[int, list[Email]] = {}
+        for new_email in new_emails:
+            new_emails_by_user.setdefault(new_email.mailbox.account.user_id, []).append(
+                new_email
+            )
+        new_message_id_references = cls._index_message_id_references(
+            new_emails, in_reply_to=in_reply_to, references=references
+        )
+
+        new_links: set[tuple[int, int, bool]] = set()
+        for user_id, user_new_emails in new_emails_by_user.items():
+            new_links.update(
+                cls._find_referenced_links(
+                    user_id,
+                    [
+                        message_id_reference
+                        for message_id_reference in new_message_id_references
+                        if message_id_reference.user_id == user_id
+                    ],
+                )
+            )
+            new_links.update(
+                cls._find_pending_links(
+                    user_id,
+                    user_new_emails,
+                    in_reply_to=in_reply_to,
+                    references=references,
+                )
+            )
+
+        cls.in_reply_to.through.objects.bulk_create(
+            [
+                cls.in_reply_to.through(
+                    from_email_id=from_email_pk, to_email_id=to_email_pk
+                )
+                for from_email_pk, to_email_pk, is_in_reply_to in new_links
+                if is_in_reply_to
+            ],
+            ignore_conflicts=True,
+        )
+        cls.references.through.objects.bulk_create(
+            [
+                cls.references.through(
+                    from_email_id=from_email_pk, to_email_id=to_email_pk
+                )
+                for from_email_pk, to_email_pk, is_in_reply_to in new_links
+                if not is_in_reply_to
+            ],
+            ignore_conflicts=True,
+        )
+        cls._merge_threads(
+            new_emails,
+            {
+                (from_email_pk, to_email_pk)
+                for from_email_pk, to_email_pk, _is_in_reply_to in new_links
+            },
+        )
+
+    @classmethod
+    def _index_message_id_references(
+        cls,
+        new_emails: Sequence[Email],
+        *,
+        in_reply_to: bool,
+        references: bool,
+    ) -> list[MessageIDReference]:
+        """Records the message-ids referenced in the headerfields of a batch of emails.
+
+        Args:
+            new_emails: The emails to record the references of.
+            in_reply_to: Whether to record the in-reply-to message-ids.
+            references: Whether to record the references message-ids.
+
+        Returns:
+            The new :class:`core.models.MessageIDReference` instances.
+        """
+        new_message_id_references = []
+        for new_email in new_emails:
+            if not new_email.headers:
+                continue
+            user_id = new_email.mailbox.account.user_id
+            if in_reply_to:
+                in_reply_to_message_id = (
+                    new_email.headers.get(HeaderFields.IN_REPLY_TO) or ""
+                ).strip()
+                if cls._is_indexable_message_id(in_reply_to_message_id):
+                    new_message_id_references.append(
+                        MessageIDReference(
+                            user_id=user_id,
+                            email=new_email,
+                            message_id=in_reply_to_message_id,
+                            in_reply_to=True,
+                        )
+                    )
+            if references:
+                new_message_id_references.extend(
+                    MessageIDReference(
+                        user_id=user_id,
+                        email=new_email,
+                        message_id=referenced_message_id,
+                        in_reply_to=False,
+                    )
+                    for referenced_message_id in cls._split_message_ids(
+                        new_email.headers.get(HeaderFields.REFERENCES)
+                    )
+                )
+        MessageIDReference.objects.bulk_create(
+            new_message_id_references, ignore_conflicts=True
+        )
+        return new_message_id_references
+
+    @staticmethod
+    def _find_referenced_links(
+        user_id: int, message_id_references: list[MessageIDReference]
+    ) -> set[tuple[int, int, bool]]:
+        """Finds the emails of a user that new references point to.
+
+        Args:
+            user_id: The id of the user the referring emails belong to.
+            message_id_references: The new references of the user's emails.
+
+        Returns:
+            The pks of the referring and the referenced emails
+            and whether the link is an in-reply-to link.
+        """
+        if not message_id_references:
+            return set()
+        linked_email_pks: dict[str, list[int]] = {}
+        for message_id, email_pk in EmailMessageID.objects.filter(
+            user_id=user_id,
+            message_id__in={
+                message_id_reference.message_id
+                for message_id_reference in message_id_references
+            },
+        ).values_list("message_id", "email_id"):
+            linked_email_pks.setdefault(message_id, []).append(email_pk)
+        return {
+            (
+                message_id_reference.email.pk,
+                linked_email_pk,
+                message_id_reference.in_reply_to,
+            )
+            for message_id_reference in message_id_references
+            for linked_email_pk in linked_email_pks.get(
+                message_id_reference.message_id, []
+            )
+        }
+
+    @staticmethod
+    def _find_pending_links(
+        user_id: int,
+        new_emails: Sequence[Email],
+        *,
+        in_reply_to: bool,
+        references: bool,
+    ) -> set[tuple[int, int, bool]]:
+        """Finds the indexed references of a user's emails that point to new emails.
+
+        Args:
+            user_id: The id of the user the new emails belong to.
+            new_emails: The new emails of the user.
+            in_reply_to: Whether to find the in-reply-to references.
+            references: Whether to find the references references.
+
+        Returns:
+            The pks of the referring and the new emails
+            and whether the link is an in-reply-to link.
+        """
+        new_email_pks: dict[str, list[int]] = {}
+        for new_email in new_emails:
+            if new_email.message_id:
+                new_email_pks.setdefault(new_email.message_id, []).append(new_email.pk)
+        if not new_email_pks:
+            return set()
+        pending_references = MessageIDReference.objects.filter(
+            user_id=user_id, message_id__in=new_email_pks
+        ).exclude(email_id__in=[new_email.pk for new_email in new_emails])
+        if not (in_reply_to and references):
+            pending_references = pending_references.filter(in_reply_to=in_reply_to)
+        return {
+            (referring_email_pk, new_email_pk, is_in_reply_to)
+            for (
+                referring_email_pk,
+                message_id,
+                is_in_reply_to,
+            ) in pending_references.values_list("email_id", "message_id", "in_reply_to")
+            for new_email_pk in new_email_pks[message_id]
+        }
+
+    @staticmethod
+    def _is_indexable_message_id(message_id: str) -> bool:
+        """Checks whether a referenced message-id can be recorded in the :class:`core.models.MessageIDReference` index.
+
+        Args:
+            message_id: The referenced message-id.
+
+        Returns:
+            Whether the message-id is neither empty nor too long for the index.
+        """
+        if len(message_id) > MessageIDReference.message_id.field.max_length:
+            logger.debug(
+                "Skipping referenced Message-ID %s, it is too long.", message_id
+            )
+            return False
+        return bool(message_id)
+
+    @classmethod
+    def _split_message_ids(cls, header: str | None) -> set[str]:
+        """Splits a `References` header into the single message-ids.
+
+        The message-ids may be separated by commas or any whitespace,
+        including the linebreaks and tabs of folded headers.
+        Message-ids that can't be indexed are left out, see :meth:`_is_indexable_message_id`.
+
+        Args:
+            header: The `References` header.
+
+        Returns:
+            The message-ids in the header.
+        """
+        return {
+            message_id
+            for message_id in re.split(r"[\s,]+", header or "")
+            if cls._is_indexable_message_id(message_id)
+        }
+
+    @classmethod
+    def _merge_threads(
+        cls, new_emails: Sequence[Email], new_links: set[tuple[int, int]]
+    ) -> None:
+        """Sets the :attr:`thread_id` of new emails and merges the threads connected by new links.
+
+        The merged thread takes the smallest of the thread ids.
+
+        Args:
+            new_emails: The emails that have been saved.
+            new_links: The pks of the emails connected by new in-reply-to or references links.
+        """
+        thread_ids = {
+            new_email.pk: new_email.thread_id or new_email.pk
+            for new_email in new_emails
+        }
+        unthreaded_email_pks = set()
+        for email_pk, thread_id in cls.objects.filter(
+            pk__in={email_pk for link in new_links for email_pk in link}
+            - thread_ids.keys()
+        ).values_list("pk", "thread_id"):
+            if thread_id is None:
+                unthreaded_email_pks.add(email_pk)
+            thread_ids[email_pk] = thread_id or email_pk
+
+        merged_thread_ids = cls._merge_linked_threads(
+            (thread_ids[from_email_pk], thread_ids[to_email_pk])
+            for from_email_pk, to_email_pk in new_links
+            if from_email_pk in thread_ids and to_email_pk in thread_ids
+        )
+        threads: dict[int, set[int]] = {}
+        for thread_id, merged_thread_id in merged_thread_ids.items():
+            if thread_id != merged_thread_id:
+                threads.setdefault(merged_thread_id, set()).add(thread_id)
+        for merged_thread_id, thread_id_group in threads.items():
+            cls.objects.filter(thread_id__in=thread_id_group).update(
+                thread_id=merged_thread_id
+            )
+        for email_pk in unthreaded_email_pks:
+            # emails saved without a thread id
+            cls.objects.filter(pk=email_pk).update(
+                thread_id=merged_thread_ids.get(email_pk, email_pk)
+            )
+
+        for new_email in new_emails:
+            new_email.thread_id = merged_thread_ids.get(
+                thread_ids[new_email.pk], thread_ids[new_email.pk]
+            )
+        cls.objects.bulk_update(new_emails, ["thread_id"])
+
+    @classmethod
+    def rebuild_threads(cls) -> int:
+        """Recomputes the :attr:`thread_id` of all emails from their in-reply-to and references links.
+
+        Returns:
+            The number of threads with more than one email.
+        """
+        merged_thread_ids = cls._merge_linked_threads(
+            itertools.chain(
+                cls.in_reply_to.through.objects.values_list(
+                    "from_email_id", "to_email_id"
+                ),
+                cls.references.through.objects.values_list(
+                    "from_email_id", "to_email_id"
+                ),
+            )
+        )
+        threads: dict[int, list[int]] = {}
+        for email_pk, thread_id in merged_thread_ids.items():
+            threads.setdefault(thread_id, []).append(email_pk)
+        with transaction.atomic():
+            cls.objects.update(thread_id=models.F("pk"))
+            for thread_id, email_pks in threads.items():
+                cls.objects.filter(pk__in=email_pks).update(thread_id=thread_id)
+        return len(threads)
+
+    @classmethod
+    def rebuild_thread(cls, thread_id: int) -> None:
+        """Recomputes the :attr:`thread_id` of the emails in one thread from their links.
+
+        Splits the thread if links between its emails have been removed.
+
+        Args:
+            thread_id: The id of the thread to rebuild.
+        """
+        email_pks = set(
+            cls.objects.filter(thread_id=thread_id).values_list("pk", flat=True)
+        )
+        if not email_pks:
+            return
+        merged_thread_ids = cls._merge_linked_threads(
+            itertools.chain(
+                cls.in_reply_to.through.objects.filter(
+                    from_email_id__in=email_pks, to_email_id__in=email_pks
+                ).values_list("from_email_id", "to_email_id"),
+                cls.references.through.objects.filter(
+                    from_email_id__in=email_pks, to_email_id__in=email_pks
+                ).values_list("from_email_id", "to_email_id"),
+            )
+        )
+        threads: dict[int, list[int]] = {}
+        for email_pk in email_pks:
+            threads.setdefault(merged_thread_ids.get(email_pk, email_pk), []).append(
+                email_pk
+            )
+        with transaction.atomic():
+            for new_thread_id, thread_email_pks in threads.items():
+                if new_thread_id != thread_id:
+                    cls.objects.filter(pk__in=thread_email_pks).update(
+                        thread_id=new_thread_id
+                    )
+
+    @staticmethod
+    def _merge_linked_threads(links: Iterable[tuple[int, int]]) -> dict[int, int]:
+        """Groups ids into threads by the links between them.
+
+        Args:
+            links: The pairs of linked ids.
+
+        Returns:
+            The smallest id in the thread for every id in `links`.
+        """
+        parents: dict[int, int] = {}
+
+        def find_root(thread_id: int) -> int:
+            root = parents.setdefault(thread_id, thread_id)
+            while root != parents[root]:
+                root = parents[root]
+            while thread_id != root:
+                parents[thread_id], thread_id = root, parents[thread_id]
+            return root
+
+        for from_id, to_id in links:
+            from_root = find_root(from_id)
+            to_root = find_root(to_id)
+            if from_root != to_root:
+                parents[max(from_root, to_root)] = min(from_root, to_root)
+        return {thread_id: find_root(thread_id) for thread_id in parents}
+
     @staticmethod
     def _queryset_as_zip_eml(queryset: QuerySet[Email]) -> _TemporaryFileWrapper:
         """Parses a queryset of emails into a zip of eml files.
@@ -579,7 +1362,7 @@ class Email(
                 with (
                     eml_file,
                     zipfile.open(
-                        os.path.basename(email_item.file_path), "w"
+                        email_item.get_archive_file_name(), "w"
                     ) as zipped_file,
                 ):
                     zipped_file.write(eml_file.read())
@@ -33,6 +33,11 @@ from core.mixins import TimestampModelMixin, URLMixin
 from .Correspondent import Correspondent
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from core.utils.mail_parsing import ParsedEmail
+
+    from .Correspondent import CorrespondentCache
     from .Email import Email
 
 
@@ -152,3 +157,74 @@ class EmailCorrespondent(
             )
             new_email_correspondent_models.add(new_email_correspondent)
         return new_email_correspondent_models
+
+    @classmethod
+    def create_from_parsed_emails(
+        cls,
+        parsed_emails: Sequence[tuple[ParsedEmail, Email]],
+        correspondent_cache: CorrespondentCache | None = None,
+    ) -> list[EmailCorrespondent]:
+        """Creates the :class:`core.models.EmailCorrespondent`s for a batch of parsed emails.
+
+        Works like :func:`core.models.Email.Email.add_correspondents` for every email,
+        but with a constant number of queries per user.
+        The mailinglist data of the correspondents is written once at the end,
+        and only the fields that have changed.
+
+        Args:
+            parsed_emails: The parsed emails with the email models created from them.
+            correspondent_cache: The correspondents resolved earlier in the same ingest run,
+                see :func:`core.models.Correspondent.Correspondent.create_from_correspondent_tuples`.
+
+        Returns:
+            The new :class:`core.models.EmailCorrespondent` instances.
+
+        Raises:
+            ValueError: If one of the emails is not in the db.
+        """
+        mentions_by_user: dict[int, list[tuple[ParsedEmail, Email, str, str, str]]] = {}
+        users = {}
+        for parsed_email, email in parsed_emails:
+            if email.pk is None:
+                raise ValueError("Email is not in the db!")
+            if not parsed_email.correspondents:
+                continue
+            user = email.mailbox.account.user
+            users[user.pk] = user
+            mentions_by_user.setdefault(user.pk, []).extend(
+                (parsed_email, email, mention, name, address)
+                for mention, name, address in parsed_email.correspondents
+            )
+
+        new_email_correspondents = []
+        for user_pk, mentions in mentions_by_user.items():
+            correspondents = Correspondent.create_from_correspondent_tuples(
+                (
+                    (name, address)
+                    for _parsed_email, _email, _mention, name, address in mentions
+                ),
+                users[user_pk],
+                correspondent_cache,
+            )
+            changed_fields: set[str] = set()
+            changed_correspondents = {}
+            for parsed_email, email, mention, _name, address in mentions:
+                correspondent = correspondents.get(address.strip())
+                if correspondent is None:
+                    continue
+                if mention == HeaderFields.Correspondents.FROM:
+                    correspondent_changed_fields = (
+                        correspondent.set_mailinglist_from_headers(parsed_email.headers)
+                    )
+                    if correspondent_changed_fields:
+                        changed_fields.update(correspondent_changed_fields)
+                        changed_correspondents[correspondent.pk] = correspondent
+                new_email_correspondents.append(
+                    cls(email=email, correspondent=correspondent, mention=mention)
+                )
+            if changed_correspondents:
+                Correspondent.objects.bulk_update(
+                    changed_correspondents.values(), sorted(changed_fields)
+                )
+        cls.objects.bulk_create(new_email_correspondents, ignore_conflicts=True)
+        return new_email_correspondents
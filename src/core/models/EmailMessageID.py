@@ -0,0 +1,98 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+#
+# Eonvelope - a open-source self-hostable email archiving server
+# Copyright (C) 2024 David Aderbauer & The Eonvelope Contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""Module with the :class:`EmailMessageID` model class."""
+
+from __future__ import annotations
+
+from typing import ClassVar, override
+
+from django.conf import settings
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+from django_prometheus.models import ExportModelOperationsMixin
+
+from core.mixins import TimestampModelMixin
+
+
+class EmailMessageID(
+    ExportModelOperationsMixin("email_message_id"),
+    TimestampModelMixin,
+    models.Model,
+):
+    """Database model indexing the message-ids of the emails of every user.
+
+    Together with :class:`core.models.MessageIDReference` this allows to
+    resolve the references of an email without joining the mailboxes and accounts.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name="email_message_ids",
+        on_delete=models.CASCADE,
+        # Translators: Do not capitalize the very first letter unless your language requires it.
+        verbose_name=_("user"),
+    )
+    """The user the email belongs to. Deletion of that `user` deletes this entry."""
+
+    email = models.OneToOneField(
+        "Email",
+        related_name="indexed_message_id",
+        on_delete=models.CASCADE,
+        # Translators: Do not capitalize the very first letter unless your language requires it.
+        verbose_name=_("email"),
+    )
+    """The indexed email. Deletion of that `email` deletes this entry."""
+
+    message_id = models.CharField(
+        max_length=255,
+        # Translators: Do not capitalize the very first letter unless your language requires it.
+        verbose_name=_("message-ID"),
+    )
+    """The message-id of :attr:`email`."""
+
+    class Meta:
+        """Metadata class for the model."""
+
+        db_table = "email_message_ids"
+        """The name of the database table for the indexed message-ids."""
+        # Translators: Do not capitalize the very first letter unless your language requires it.
+        verbose_name = _("email message-ID")
+        # Translators: Do not capitalize the very first letter unless your language requires it.
+        verbose_name_plural = _("email message-IDs")
+        get_latest_by = TimestampModelMixin.Meta.get_latest_by
+
+        indexes: ClassVar[list[models.Index]] = [
+            models.Index(
+                fields=["user", "message_id"],
+                name="emailmessageid_user_mid",
+            )
+        ]
+        """The emails are looked up by :attr:`user` and :attr:`message_id`."""
+
+    @override
+    def __str__(self) -> str:
+        """Returns a string representation of the model data.
+
+        Returns:
+            The string representation of the entry, using :attr:`email` and :attr:`message_id`.
+        """
+        return _("Message-ID %(message_id)s of %(email)s") % {
+            "message_id": self.message_id,
+            "email": self.email,
+        }
@@ -21,15 +21,17 @@
 from __future__ import annotations
 
 import contextlib
+import functools
 import logging
 import os
 import re
 from tempfile import NamedTemporaryFile, TemporaryDirectory
-from typing import TYPE_CHECKING, BinaryIO, ClassVar, override
+from typing import TYPE_CHECKING, Any, BinaryIO, ClassVar, override
 from zipfile import BadZipFile, ZipFile
 
 from dirtyfields import DirtyFieldsMixin
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django_prometheus.models import ExportModelOperationsMixin
 
@@ -49,19 +51,27 @@ from core.mixins import (
     URLMixin,
 )
 from core.utils.fetchers.exceptions import MailAccountError, MailboxError
+from core.utils.IngestPipeline import IngestPipeline
+from core.utils.KnownMessageIDs import KnownMessageIDs
 from core.utils.mail_parsing import parse_mailbox_type
 from eonvelope.utils.workarounds import get_config
 
 from .Email import Email
 
 if TYPE_CHECKING:
+    import mailbox
+    from collections.abc import Callable, Iterator, Sequence
     from tempfile import _TemporaryFileWrapper
 
     from django_stubs_ext import StrOrPromise
 
     from core.utils import FetchingCriterion
+    from core.utils.fetchers import BaseFetcher
+    from core.utils.fetchers.FetchEstimate import FetchEstimate
+    from core.utils.mail_parsing import ParsedEmail
 
     from .Account import Account
+    from .Correspondent import CorrespondentCache
 
 
 logger = logging.getLogger(__name__)
@@ -133,6 +143,142 @@ class Mailbox(
     )
     """Whether to save the mails found in this mailbox as .eml files. :attr:`constance.get_config('DEFAULT_SAVE_TO_EML')` by default."""
 
+    use_idle = models.BooleanField(
+        default=False,
+        # Translators: IDLE is an IMAP term and must not be translated.
+        verbose_name=_("listen with IDLE"),
+        help_text=_(
+            "Whether new emails in this mailbox are fetched as soon as the server announces them. Only available for IMAP accounts."
+        ),
+    )
+    """Whether the IDLE listener holds a connection to this mailbox and fetches new mails as soon as they arrive. `False` by default."""
+
+    partial_fetch = models.BooleanField(
+        default=False,
+        # Translators: Do not capitalize the very first letter unless your language requires it.
+        verbose_name=_("fetch partially"),
+        help_text=_(
+            "Whether attachments that are not parsed are left out when downloading the emails in this mailbox. Only available for IMAP accounts and if the emails are not stored in .eml files."
+        ),
+    )
+    """Whether to download only the parts of the mails in this mailbox that are stored. Only used if :attr:`save_to_eml` is `False`. `False` by default."""
+
+    imap_uidvalidity = models.PositiveBigIntegerField(
+        null=True,
+        blank=True,
+        default=None,
+        editable=False,
+        # Translators: UIDVALIDITY is an IMAP term and must not be translated.
+        verbose_name=_("UIDVALIDITY"),
+    )
+    """The IMAP UIDVALIDITY of this mailbox at the last incremental fetch. None if it has never been synced."""
+
+    imap_highest_uid = models.PositiveBigIntegerField(
+        default=0,
+        editable=False,
+        # Translators: Do not capitalize the very first letter unless your language requires it.
+        verbose_name=_("highest fetched UID"),
+    )
+    """The highest IMAP UID that has been ingested from this mailbox. Only valid together with :attr:`imap_uidvalidity`."""
+
+    imap_highestmodseq = models.PositiveBigIntegerField(
+        null=True,
+        blank=True,
+        default=None,
+        editable=False,
+        # Translators: HIGHESTMODSEQ is an IMAP term and must not be translated.
+        verbose_name=_("HIGHESTMODSEQ"),
+    )
+    """The IMAP HIGHESTMODSEQ of this mailbox at the last complete incremental fetch. None if unknown."""
+
+    pop_seen_uidls = models.JSONField(
+        default=list,
+        blank=True,
+        editable=False,
+        # Translators: Do not capitalize the very first letter unless your language requires it.
+        verbose_name=_("seen UIDLs"),
+    )
+    """The POP3 UIDLs of the messages on the server that have already been ingested from this mailbox."""
+
+    jmap_email_state = models.CharField(
+        max_length=255,
+        default="",
+        blank=True,
+        editable=False,
+        # Translators: Do not capitalize the very first letter unless your language requires it.
+        verbose_name=_("JMAP email state"),
+    )
+    """The JMAP Email state string at the last complete incremental fetch. Empty if it has never been synced."""
+
+    exchange_sync_state = models.TextField(
+        default="",
+        blank=True,
+        editable=False,
+        # Translators: Do not capitalize the very first letter unless your language requires it.
+        verbose_name=_("Exchange sync state"),
+    )
+    """The Exchange SyncFolderItems state at the last incremental fetch. Empty if it has never been synced."""
+
+    exchange_failed_item_ids = models.JSONField(
+        default=list,
+        blank=True,
+        editable=False,
+        # Translators: Do not capitalize the very first letter unless your language requires it.
+        verbose_name=_("failed Exchange item IDs"),
+    )
+    """The Exchange ids of the items that could not be fetched by the last incremental fetch."""
+
+    fetch_progress_criterion = models.CharField(
+        max_length=255,
+        default="",
+        blank=True,
+        editable=False,
+        # Translators: Do not capitalize the very first letter unless your language requires it.
+        verbose_name=_("criterion of the latest fetch"),
+    )
+    """The criterion of the latest fetch that records its progress. Empty if there has been none."""
+
+    fetch_progress_checkpoint = models.TextField(
+        default="",
+        blank=True,
+        editable=False,
+        # Translators: Do not capitalize the very first letter unless your language requires it.
+        verbose_name=_("fetch checkpoint"),
+    )
+    """The server id of the last message processed by the latest fetch. Empty once that fetch has finished."""
+
+    fetch_progress_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        # Translators: Do not capitalize the very first letter unless your language requires it.
+        verbose_name=_("processed messages of the latest fetch"),
+    )
+    """The number of messages processed by the latest fetch."""
+
+    fetch_progress_total = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        # Translators: Do not capitalize the very first letter unless your language requires it.
+        verbose_name=_("total messages of the latest fetch"),
+    )
+    """The number of messages matched by the latest fetch."""
+
+    fetch_progress_updated = models.DateTimeField(
+        null=True,
+        blank=True,
+        default=None,
+        editable=False,
+        # Translators: Do not capitalize the very first letter unless your language requires it.
+        verbose_name=_("last progress of the latest fetch"),
+    )
+    """The time the progress of the latest fetch was last recorded. None if there has been no such fetch."""
+
+    _ingest_pipeline: IngestPipeline[tuple[Email, ParsedEmail, bytes]] | None = None
+    """The pipeline that is ingesting emails into this mailbox. None if there is none."""
+
+    _deferred_saves: list[Callable[[], object]] | None = None
+    """The saves deferred until the batch of emails being ingested without a pipeline is saved. None if there is no such ingest."""
+
     class Meta:
         """Metadata class for the model."""
 
@@ -163,6 +309,32 @@ class Mailbox(
             "name": self.name,
         }
 
+    @override
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        """Extended :django::func:`django.models.Model.save` method.
+
+        While emails are ingested into this mailbox,
+        saves of single fields from the fetching side are deferred
+        until all emails fetched before have been saved.
+        That way the sync state and fetch progress never run ahead of the saved emails.
+        """
+        update_fields = kwargs.get("update_fields")
+        if update_fields and (
+            self._ingest_pipeline is not None or self._deferred_saves is not None
+        ):
+            values = {field: getattr(self, field) for field in update_fields}
+
+            def deferred_save() -> None:
+                """Saves the deferred field values."""
+                Mailbox.objects.filter(pk=self.pk).update(**values)
+
+            if self._ingest_pipeline is not None:
+                self._ingest_pipeline.run_after_pending(deferred_save)
+            else:
+                self._deferred_saves.append(deferred_save)
+            return
+        super().save(*args, **kwargs)
+
     def test(self) -> None:
         """Tests whether the data in the model is correct.
 
@@ -190,13 +362,18 @@ class Mailbox(
         self.set_healthy()
         logger.info("Successfully tested mailbox")
 
-    def fetch(self, criterion: FetchingCriterion) -> None:
+    def fetch(
+        self, criterion: FetchingCriterion, fetcher: BaseFetcher | None = None
+    ) -> None:
         """Fetches emails from this mailbox based on :attr:`criterion` and adds them to the db.
 
         If successful, marks this mailbox as healthy, otherwise unhealthy.
 
         Args:
             criterion: The criterion used to fetch emails from the mailbox.
+            fetcher: An open fetcher for the account of this mailbox to reuse.
+                It is not closed after fetching.
+                By default, a new fetcher is opened and closed for this fetch.
 
         Raises:
             MailboxError: Reraised if fetching failed due to a MailboxError.
@@ -205,10 +382,15 @@ class Mailbox(
         logger.info(
             "Fetching and saving emails with criterion %s from %s ...", criterion, self
         )
-        with self.account.get_fetcher() as fetcher:
+        with (
+            contextlib.nullcontext(fetcher)
+            if fetcher is not None
+            else self.account.get_fetcher()
+        ) as mailbox_fetcher:
             try:
-                for fetched_mail in fetcher.fetch_emails(self, criterion):
-                    Email.create_from_email_bytes(fetched_mail, self)
+                self._ingest_emails(
+                    mailbox_fetcher.fetch_emails(self, criterion), criterion
+                )
             except MailboxError as error:
                 logger.info("Failed fetching %s with error: %s.", self, error)
                 self.set_unhealthy(error)
@@ -220,6 +402,206 @@ class Mailbox(
         self.set_healthy()
         logger.info("Successfully fetched and saved emails.")
 
+    def estimate_fetch(self, criterion: FetchingCriterion) -> FetchEstimate:
+        """Estimates what fetching emails from this mailbox based on :attr:`criterion` would download.
+
+        Nothing is downloaded or saved, except for the health flags of this mailbox and its account.
+
+        Args:
+            criterion: The criterion used to fetch emails from the mailbox.
+
+        Returns:
+            The number, total size and number of already known messages that would be fetched.
+
+        Raises:
+            MailboxError: Reraised if the estimation failed due to a MailboxError.
+            MailAccountError: Reraised if the estimation failed due to a MailAccountError.
+        """
+        logger.info("Estimating fetch with criterion %s from %s ...", criterion, self)
+        with self.account.get_fetcher() as fetcher:
+            try:
+                estimate = fetcher.estimate_emails(self, criterion)
+            except MailboxError as error:
+                logger.info("Failed estimating %s with error: %s.", self, error)
+                self.set_unhealthy(error)
+                raise
+            except MailAccountError as error:
+                logger.info("Failed estimating %s with error: %s.", self, error)
+                self.account.set_unhealthy(error)
+                raise
+        self.set_healthy()
+        logger.info("Successfully estimated fetch.")
+        return estimate
+
+    def _ingest_emails(
+        self, fetched_emails: Iterator[bytes], criterion: FetchingCriterion
+    ) -> None:
+        """Parses and saves fetched emails to this mailbox.
+
+        Fetches of all emails are checked for duplicates against the Message-IDs of this mailbox in memory,
+        see :class:`core.utils.KnownMessageIDs.KnownMessageIDs`.
+        All other fetches, like the regular ones of the daemons, return few emails,
+        most of them new or already skipped by the fetcher.
+        For them the Message-IDs are not preloaded and the emails are checked against the db
+        when they are saved instead, with one query per batch.
+        If the `INGEST_PARSE_WORKERS` setting is positive, the emails are ingested by an :class:`core.utils.IngestPipeline.IngestPipeline`,
+        so downloading, parsing and saving overlap.
+        Otherwise they are parsed and saved in batches by :meth:`core.models.Email.Email.create_from_email_bytes_batch`.
+        Either way, saves of single fields of this mailbox by the fetcher, like the sync state,
+        are deferred until all emails fetched before have been saved, see :meth:`save`.
+
+        Args:
+            fetched_emails: The fetched emails.
+            criterion: The criterion the emails were fetched with.
+        """
+        known_message_ids = KnownMessageIDs(
+            self, preload=criterion == EmailFetchingCriterionChoices.ALL
+        )
+        parse_workers = get_config("INGEST_PARSE_WORKERS")
+        if parse_workers < 1:
+            self._deferred_saves = []
+            try:
+                Email.create_from_email_bytes_batch(
+                    fetched_emails,
+                    self,
+                    known_message_ids=known_message_ids,
+                    parse_processes=0,
+                    on_batch_saved=self._run_deferred_saves,
+                )
+            finally:
+                self._deferred_saves = None
+            return
+
+        correspondent_cache: CorrespondentCache = {}
+        self._ingest_pipeline = IngestPipeline(
+            self._parse_fetched_email,
+            functools.partial(
+                self._save_parsed_emails, correspondent_cache=correspondent_cache
+            ),
+            parse_workers=parse_workers,
+            queue_size=get_config("INGEST_QUEUE_SIZE"),
+            persist_batch_size=get_config("INGEST_PERSIST_BATCH_SIZE"),
+        )
+        try:
+            self._ingest_pipeline.run(
+                Email.skip_known_email_bytes(fetched_emails, self, known_message_ids)
+            )
+        finally:
+            self._ingest_pipeline = None
+
+    def _run_deferred_saves(self) -> None:
+        """Runs the saves deferred while the latest batch of emails was ingested without a pipeline."""
+        if self._deferred_saves:
+            for deferred_save in self._deferred_saves:
+                deferred_save()
+            self._deferred_saves.clear()
+
+    def _parse_fetched_email(
+        self, email_bytes: bytes
+    ) -> tuple[Email, ParsedEmail, bytes]:
+        """Parses a fetched email for :meth:`_save_parsed_emails`.
+
+        Args:
+            email_bytes: The fetched email.
+
+        Returns:
+            The unsaved email, the parsed email data and the fetched email.
+        """
+        new_email, parsed_email = Email.parse_email_bytes(email_bytes, self)
+        return new_email, parsed_email, email_bytes
+
+    @staticmethod
+    def _save_parsed_emails(
+        parsed_emails: list[tuple[Email, ParsedEmail, bytes]],
+        correspondent_cache: CorrespondentCache | None = None,
+    ) -> None:
+        """Saves a batch of emails parsed by :meth:`_parse_fetched_email` with bulk queries.
+
+        Args:
+            parsed_emails: The parsed emails.
+            correspondent_cache: The correspondents resolved earlier in the same fetch.
+        """
+        Email.create_from_parsed_emails(
+            parsed_emails, correspondent_cache=correspondent_cache
+        )
+
+    def start_fetch_progress(
+        self, criterion: FetchingCriterion, message_ids: Sequence[str]
+    ) -> int:
+        """Starts recording the progress of a fetch of the listed messages.
+
+        If the latest fetch with the same criterion was interrupted,
+        it is resumed after its :attr:`fetch_progress_checkpoint`.
+        If the checkpoint is no longer among the listed messages, the fetch starts over.
+
+        Args:
+            criterion: The criterion of the fetch.
+            message_ids: The server ids of the matching messages in the order they are processed.
+
+        Returns:
+            The number of listed messages that have already been processed and can be skipped.
+        """
+        resume_index = 0
+        if (
+            self.fetch_progress_checkpoint
+            and self.fetch_progress_criterion == str(criterion)
+            and self.fetch_progress_checkpoint in message_ids
+        ):
+            resume_index = message_ids.index(self.fetch_progress_checkpoint) + 1
+            logger.info(
+                "Resuming the fetch of %s after %d of %d messages.",
+                self,
+                resume_index,
+                len(message_ids),
+            )
+        else:
+            self.fetch_progress_criterion = str(criterion)
+            self.fetch_progress_checkpoint = ""
+        self.fetch_progress_count = resume_index
+        self.fetch_progress_total = len(message_ids)
+        self.fetch_progress_updated = timezone.now()
+        self.save(
+            update_fields=[
+                "fetch_progress_criterion",
+                "fetch_progress_checkpoint",
+                "fetch_progress_count",
+                "fetch_progress_total",
+                "fetch_progress_updated",
+            ]
+        )
+        return resume_index
+
+    def advance_fetch_progress(self, checkpoint: str, message_count: int) -> None:
+        """Records that messages of the running fetch have been processed.
+
+        Args:
+            checkpoint: The server id of the last processed message.
+            message_count: The number of messages processed since the last record.
+        """
+        self.fetch_progress_checkpoint = checkpoint
+        self.fetch_progress_count += message_count
+        self.fetch_progress_updated = timezone.now()
+        self.save(
+            update_fields=[
+                "fetch_progress_checkpoint",
+                "fetch_progress_count",
+                "fetch_progress_updated",
+            ]
+        )
+
+    def finish_fetch_progress(self) -> None:
+        """Records that the running fetch has processed all its messages."""
+        self.fetch_progress_checkpoint = ""
+        self.fetch_progress_count = self.fetch_progress_total
+        self.fetch_progress_updated = timezone.now()
+        self.save(
+            update_fields=[
+                "fetch_progress_checkpoint",
+                "fetch_progress_count",
+                "fetch_progress_updated",
+            ]
+        )
+
     def _add_email_from_eml(self, file: BinaryIO) -> None:
         """Reads emails from a zipped mailbox dir."""
         Email.create_from_email_bytes(file.read(), mailbox=self)
@@ -228,10 +610,10 @@ class Mailbox(
         """Reads emails from a zip of eml files."""
         try:
             with ZipFile(file) as zipfile:
-                for zipped_file in zipfile.namelist():
-                    Email.create_from_email_bytes(
-                        zipfile.read(zipped_file), mailbox=self
-                    )
+                Email.create_from_email_bytes_batch(
+                    (zipfile.read(zipped_file) for zipped_file in zipfile.namelist()),
+                    mailbox=self,
+                )
         except BadZipFile as error:
             logger.exception("Error parsing file as zip!")
             raise ValueError(
@@ -251,13 +633,27 @@ class Mailbox(
             tempfile.seek(0)
             parser = parser_class(tempfile.name, create=False)
             parser.lock()
-            for key in parser.iterkeys():
-                with contextlib.suppress(
-                    AssertionError
-                ):  # Babyl.get_bytes can raise AssertionError for a bad message
-                    Email.create_from_email_bytes(parser.get_bytes(key), mailbox=self)
+            Email.create_from_email_bytes_batch(
+                self._iter_mailbox_file_bytes(parser), mailbox=self
+            )
             parser.close()
 
+    @staticmethod
+    def _iter_mailbox_file_bytes(parser: mailbox.Mailbox) -> Iterator[bytes]:
+        """Iterates over the messages of a mailbox file, skipping bad ones.
+
+        Args:
+            parser: The opened mailbox file.
+
+        Yields:
+            The messages in bytes form.
+        """
+        for key in parser.iterkeys():
+            with contextlib.suppress(
+                AssertionError
+            ):  # Babyl.get_bytes can raise AssertionError for a bad message
+                yield parser.get_bytes(key)
+
     def _add_emails_from_mailbox_zip(self, file: BinaryIO, file_format: str) -> None:
         """Reads emails from a zipped mailbox dir.
 
@@ -281,10 +677,10 @@ class Mailbox(
                     parser = parser_class(path, create=False)
                     parser.lock()
                     try:
-                        for key in parser.iterkeys():
-                            Email.create_from_email_bytes(
-                                parser.get_bytes(key), mailbox=self
-                            )
+                        Email.create_from_email_bytes_batch(
+                            (parser.get_bytes(key) for key in parser.iterkeys()),
+                            mailbox=self,
+                        )
                     except (
                         FileNotFoundError
                     ) as error:  # raised if the given maildir doesn't have the expected structure
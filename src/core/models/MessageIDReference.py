@@ -0,0 +1,114 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+#
+# Eonvelope - a open-source self-hostable email archiving server
+# Copyright (C) 2024 David Aderbauer & The Eonvelope Contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""Module with the :class:`MessageIDReference` model class."""
+
+from __future__ import annotations
+
+from typing import ClassVar, override
+
+from django.conf import settings
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+from django_prometheus.models import ExportModelOperationsMixin
+
+from core.mixins import TimestampModelMixin
+
+
+class MessageIDReference(
+    ExportModelOperationsMixin("message_id_reference"),
+    TimestampModelMixin,
+    models.Model,
+):
+    """Database model indexing the message-ids that emails refer to.
+
+    Every message-id from the `In-Reply-To` and `References` headers of an email is recorded,
+    whether there is an email with that message-id yet or not.
+    That way the emails referring to a message can be found and linked in one query when it arrives later.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name="message_id_references",
+        on_delete=models.CASCADE,
+        # Translators: Do not capitalize the very first letter unless your language requires it.
+        verbose_name=_("user"),
+    )
+    """The user the referring email belongs to. Deletion of that `user` deletes this reference."""
+
+    email = models.ForeignKey(
+        "Email",
+        related_name="message_id_references",
+        on_delete=models.CASCADE,
+        # Translators: Do not capitalize the very first letter unless your language requires it.
+        verbose_name=_("email"),
+    )
+    """The email with the reference. Deletion of that `email` deletes this reference."""
+
+    message_id = models.CharField(
+        max_length=255,
+        # Translators: Do not capitalize the very first letter unless your language requires it.
+        verbose_name=_("message-ID"),
+    )
+    """The referenced message-id."""
+
+    in_reply_to = models.BooleanField(
+        default=False,
+        # Translators: Do not capitalize the very first letter unless your language requires it.
+        verbose_name=_("in reply to"),
+    )
+    """Whether the message-id is from the `In-Reply-To` header, otherwise it is from the `References` header."""
+
+    class Meta:
+        """Metadata class for the model."""
+
+        db_table = "message_id_references"
+        """The name of the database table for the message-id references."""
+        # Translators: Do not capitalize the very first letter unless your language requires it.
+        verbose_name = _("message-ID reference")
+        # Translators: Do not capitalize the very first letter unless your language requires it.
+        verbose_name_plural = _("message-ID references")
+        get_latest_by = TimestampModelMixin.Meta.get_latest_by
+
+        constraints: ClassVar[list[models.BaseConstraint]] = [
+            models.UniqueConstraint(
+                fields=["email", "message_id", "in_reply_to"],
+                name="messageidreference_unique_together_email_message_id_in_reply_to",
+            )
+        ]
+        """:attr:`email`, :attr:`message_id` and :attr:`in_reply_to` in combination are unique."""
+
+        indexes: ClassVar[list[models.Index]] = [
+            models.Index(
+                fields=["user", "message_id"],
+                name="messageidreference_user_mid",
+            )
+        ]
+        """The references are looked up by :attr:`user` and :attr:`message_id`."""
+
+    @override
+    def __str__(self) -> str:
+        """Returns a string representation of the model data.
+
+        Returns:
+            The string representation of the reference, using :attr:`email` and :attr:`message_id`.
+        """
+        return _("Reference from %(email)s to message-ID %(message_id)s") % {
+            "email": self.email,
+            "message_id": self.message_id,
+        }
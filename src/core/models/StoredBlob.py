@@ -0,0 +1,90 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+#
+# Eonvelope - a open-source self-hostable email archiving server
+# Copyright (C) 2024 David Aderbauer & The Eonvelope Contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""Module with the :class:`StoredBlob` model class."""
+
+from __future__ import annotations
+
+from typing import override
+
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+from django_prometheus.models import ExportModelOperationsMixin
+
+from core.mixins.TimestampModelMixin import TimestampModelMixin
+
+
+class StoredBlob(
+    ExportModelOperationsMixin("stored_blob"), TimestampModelMixin, models.Model
+):
+    """A database model to keep track of the files in the storage by their content.
+
+    Files with identical content are only stored once
+    and shared by all instances that store them.
+
+    Important:
+        Managed by :class:`core.backends.ShardedFileSystemStorage`, never create or change instances directly!
+    """
+
+    digest = models.CharField(
+        max_length=64,
+        unique=True,
+        editable=False,
+        # Translators: Do not capitalize the very first letter unless your language requires it.
+        verbose_name=_("digest"),
+    )
+    """The hex SHA-256 digest of the file content. Unique."""
+
+    file_path = models.CharField(
+        max_length=255,
+        unique=True,
+        editable=False,
+        # Translators: Do not capitalize the very first letter unless your language requires it.
+        verbose_name=_("filepath"),
+    )
+    """The relative path in the storage where the file is stored. Unique."""
+
+    reference_count = models.PositiveIntegerField(
+        default=1,
+        # Translators: Do not capitalize the very first letter unless your language requires it.
+        verbose_name=_("reference count"),
+    )
+    """The number of times the file has been stored. 1 by default.
+    The file is only deleted from the storage once this drops to 0."""
+
+    class Meta:
+        """Metadata class for the model."""
+
+        db_table = "stored_blobs"
+        """The name of the database table for the stored blobs."""
+        # Translators: Do not capitalize the very first letter unless your language requires it.
+        verbose_name = _("stored blob")
+        # Translators: Do not capitalize the very first letter unless your language requires it.
+        verbose_name_plural = _("stored blobs")
+
+    @override
+    def __str__(self) -> str:
+        """Returns a string representation of the model data.
+
+        Returns:
+            The string representation of the stored blob, using :attr:`file_path` and :attr:`reference_count`.
+        """
+        return _("Stored file %(file_path)s with %(count)d references") % {
+            "file_path": self.file_path,
+            "count": self.reference_count,
+        }
@@ -24,8 +24,11 @@ from .Correspondent import Correspondent
 from .Daemon import Daemon
 from .Email import Email
 from .EmailCorrespondent import EmailCorrespondent
+from .EmailMessageID import EmailMessageID
 from .Mailbox import Mailbox
+from .MessageIDReference import MessageIDReference
 from .StorageShard import StorageShard
+from .StoredBlob import StoredBlob
 
 __all__ = [
     "Account",
@@ -34,6 +37,9 @@ __all__ = [
     "Daemon",
     "Email",
     "EmailCorrespondent",
+    "EmailMessageID",
     "Mailbox",
+    "MessageIDReference",
     "StorageShard",
+    "StoredBlob",
 ]
@@ -20,6 +20,7 @@
 
 from .delete_Attachment import post_delete_attachment
 from .delete_Email import post_delete_email
+from .delete_Mailbox import post_delete_mailbox
 from .save_Account import post_save_account_is_healthy
 from .save_Daemon import post_save_daemon_is_healthy
 from .save_Mailbox import post_save_mailbox_is_healthy
@@ -27,6 +28,7 @@ from .save_Mailbox import post_save_mailbox_is_healthy
 __all__ = [
     "post_delete_attachment",
     "post_delete_email",
+    "post_delete_mailbox",
     "post_save_account_is_healthy",
     "post_save_daemon_is_healthy",
     "post_save_mailbox_is_healthy",
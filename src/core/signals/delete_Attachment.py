@@ -37,6 +37,8 @@ def post_delete_attachment(
 ) -> None:
     """Receiver function deleting the file of the attachment from storage.
 
+    The file is kept while other attachments or emails with identical content still use it.
+
     Args:
         sender: The class type that sent the post_save signal.
         instance: The instance that has been saved.
@@ -21,8 +21,10 @@
 from __future__ import annotations
 
 import logging
+import threading
 from typing import Any
 
+from django.db import transaction
 from django.db.models.signals import post_delete
 from django.dispatch import receiver
 
@@ -30,10 +32,28 @@ from core.models import Email
 
 logger = logging.getLogger(__name__)
 
+_pending_rebuilds = threading.local()
+"""Holds the ids of the threads that lost emails in the current transaction of this thread."""
+
+
+def _rebuild_pending_threads() -> None:
+    """Rebuilds every thread that lost emails once.
+
+    Scheduled for every deleted email, so all but the first call do nothing.
+    """
+    thread_ids = getattr(_pending_rebuilds, "thread_ids", set())
+    _pending_rebuilds.thread_ids = set()
+    for thread_id in thread_ids:
+        Email.rebuild_thread(thread_id)
+
 
 @receiver(post_delete, sender=Email)
 def post_delete_email(sender: Email, instance: Email, **kwargs: Any) -> None:
-    """Receiver function deleting the .eml file of the email from storage.
+    """Receiver function deleting the .eml file and splitting the thread of the email.
+
+    The file is kept while other emails with identical content still use it.
+    The thread is rebuilt after the transaction is committed,
+    so that a cascading deletion rebuilds every affected thread only once.
 
     Args:
         sender: The class type that sent the post_save signal.
@@ -41,3 +61,8 @@ def post_delete_email(sender: Email, instance: Email, **kwargs: Any) -> None:
         **kwargs: Other keyword arguments.
     """
     instance.delete_file()
+    if instance.thread_id is not None:
+        if not hasattr(_pending_rebuilds, "thread_ids"):
+            _pending_rebuilds.thread_ids = set()
+        _pending_rebuilds.thread_ids.add(instance.thread_id)
+        transaction.on_commit(_rebuild_pending_threads)
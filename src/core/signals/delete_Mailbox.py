@@ -0,0 +1,47 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+#
+# Eonvelope - a open-source self-hostable email archiving server
+# Copyright (C) 2024 David Aderbauer & The Eonvelope Contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""Delete signal receivers for the :class:`core.models.Mailbox` model."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from core.models import Account, Mailbox
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(post_delete, sender=Mailbox)
+def post_delete_mailbox(sender: Mailbox, instance: Mailbox, **kwargs: Any) -> None:
+    """Receiver function resetting the JMAP mailbox state of the account.
+
+    The changes since the stored state don't include the deleted mailbox,
+    so it would never be recreated by :func:`core.models.Account.Account.update_mailboxes`.
+
+    Args:
+        sender: The class type that sent the post_delete signal.
+        instance: The instance that has been deleted.
+        **kwargs: Other keyword arguments.
+    """
+    Account.objects.filter(pk=instance.account_id).exclude(
+        jmap_mailbox_state=""
+    ).update(jmap_mailbox_state="")
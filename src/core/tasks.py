@@ -27,6 +27,7 @@ from core.utils import FetchingCriterion
 from core.utils.fetchers.exceptions import MailAccountError, MailboxError
 from eonvelope.utils.workarounds import get_config
 
+from .models.Account import Account
 from .models.Daemon import Daemon
 from .models.Email import Email
 from .models.Mailbox import Mailbox
@@ -91,6 +92,27 @@ def fetch_mailbox_emails(
     mailbox.set_healthy()
 
 
+@shared_task
+def fetch_account_emails(
+    account_id: int, fetching_criterion: str, fetching_criterion_arg: str = ""
+) -> None:
+    """Celery task to fetch and store emails from all mailboxes of an account with a single login.
+
+    Args:
+        account_id: The id of the account instance to fetch.
+        fetching_criterion: The criterion to fetch on.
+        fetching_criterion_arg: The argument for the criterion.
+
+    Raises:
+        Exception: Any exception that is raised during fetching.
+    """
+    try:
+        account = Account.objects.get(id=account_id)
+    except Account.DoesNotExist:
+        return
+    account.fetch(FetchingCriterion(fetching_criterion, fetching_criterion_arg))
+
+
 @shared_task
 def process_emails_file(file_path: str, file_format: str, mailbox_id: int) -> None:
     """Celery task to process uploaded emails.
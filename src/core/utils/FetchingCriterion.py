@@ -182,7 +182,7 @@ class FetchingCriterion:
                 return jmapc.EmailQueryFilterCondition(body=self._argument)
             case EmailFetchingCriterionChoices.FROM:
                 return jmapc.EmailQueryFilterCondition(mail_from=self._argument)
-            case _:  # only ALL left
+            case _:  # only ALL and INCREMENTAL left
                 return jmapc.EmailQueryFilterCondition()
         return jmapc.EmailQueryFilterCondition(after=start_time)
 
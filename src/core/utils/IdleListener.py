@@ -0,0 +1,211 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+#
+# Eonvelope - a open-source self-hostable email archiving server
+# Copyright (C) 2024 David Aderbauer & The Eonvelope Contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""Module with the :class:`IdleListener` class."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from django.db import close_old_connections, connection
+
+from core.constants import EmailFetchingCriterionChoices, EmailProtocolChoices
+from core.models import Mailbox
+
+from .FetchingCriterion import FetchingCriterion
+
+if TYPE_CHECKING:
+    from core.utils.fetchers import IMAP4Fetcher
+
+
+logger = logging.getLogger(__name__)
+"""The logger instance for this module."""
+
+
+class IdleListener:
+    """Listens to the mailboxes with :attr:`core.models.Mailbox.Mailbox.use_idle` set and fetches new emails as they arrive.
+
+    Holds one connection per mailbox, each in its own thread.
+    The connection idles until the server announces new messages
+    and then runs an incremental fetch over the same connection,
+    so there is no login and search in between arrivals.
+    The mailboxes are rescanned periodically to follow changes of the setting.
+    """
+
+    IDLE_PROTOCOLS = (EmailProtocolChoices.IMAP4, EmailProtocolChoices.IMAP4_SSL)
+    """The account protocols that support listening with IDLE."""
+
+    FETCHING_CRITERION = FetchingCriterion(EmailFetchingCriterionChoices.INCREMENTAL)
+    """The criterion for the fetches triggered by the listener."""
+
+    IDLE_RENEWAL_INTERVAL = 5 * 60
+    """The number of seconds after which a running IDLE is renewed.
+    Bounds the delay until a change of the mailbox setting or a stop request takes effect.
+    """
+
+    RESCAN_INTERVAL = 60
+    """The number of seconds between two scans for mailboxes to listen to."""
+
+    RECONNECT_DELAY = 60
+    """The number of seconds to wait before reconnecting after the first error.
+    Doubles with every consecutive error up to :attr:`MAX_RECONNECT_DELAY`.
+    """
+
+    MAX_RECONNECT_DELAY = 60 * 60
+    """The maximum number of seconds to wait before reconnecting after an error."""
+
+    def __init__(self) -> None:
+        """Constructor, sets up the listener without starting it."""
+        self._stop_event = threading.Event()
+        self._listener_threads: dict[int, threading.Thread] = {}
+        self._idle_unsupported_mailbox_ids: set[int] = set()
+
+    def run(self) -> None:
+        """Listens to all mailboxes with IDLE enabled until :meth:`stop` is called."""
+        logger.info("Starting IDLE listener ...")
+        try:
+            while not self._stop_event.is_set():
+                self.update_listeners()
+                self._stop_event.wait(self.RESCAN_INTERVAL)
+        finally:
+            self.stop()
+            connection.close()
+        logger.info("Stopped IDLE listener.")
+
+    def stop(self) -> None:
+        """Requests the listener and all its threads to stop.
+
+        Running IDLE commands are finished within :attr:`IDLE_RENEWAL_INTERVAL`.
+        """
+        self._stop_event.set()
+
+    def update_listeners(self) -> None:
+        """Starts a listener thread for every mailbox with IDLE enabled that has no running one.
+
+        Threads of mailboxes that have been disabled end on their own.
+        Threads that ended while their mailbox is still enabled are restarted,
+        unless the server doesn't support IDLE.
+        Those mailboxes are retried once their setting has been disabled and enabled again.
+        """
+        mailbox_ids = set(
+            Mailbox.objects.filter(
+                use_idle=True, account__protocol__in=self.IDLE_PROTOCOLS
+            ).values_list("id", flat=True)
+        )
+        self._idle_unsupported_mailbox_ids &= mailbox_ids
+        for mailbox_id, listener_thread in list(self._listener_threads.items()):
+            if not listener_thread.is_alive():
+                del self._listener_threads[mailbox_id]
+        for mailbox_id in (
+            mailbox_ids
+            - self._listener_threads.keys()
+            - self._idle_unsupported_mailbox_ids
+        ):
+            logger.debug("Starting listener for mailbox %s ...", mailbox_id)
+            listener_thread = threading.Thread(
+                target=self.listen,
+                args=(mailbox_id,),
+                name=f"idle-listener-{mailbox_id}",
+                daemon=True,
+            )
+            self._listener_threads[mailbox_id] = listener_thread
+            listener_thread.start()
+
+    def listen(self, mailbox_id: int) -> None:
+        """Listens to a mailbox until its IDLE setting is disabled or the listener is stopped.
+
+        Reconnects with an increasing delay starting at :attr:`RECONNECT_DELAY` if listening fails.
+
+        Args:
+            mailbox_id: The id of the mailbox to listen to.
+        """
+        consecutive_errors = 0
+        try:
+            while not self._stop_event.is_set():
+                # the db connection may have gone stale while idling
+                close_old_connections()
+                started_at = time.monotonic()
+                try:
+                    mailbox = Mailbox.objects.select_related("account").get(
+                        id=mailbox_id, use_idle=True
+                    )
+                    if not self._listen_on_connection(mailbox):
+                        return
+                except Mailbox.DoesNotExist:
+                    logger.info("Stopped listening to mailbox %s.", mailbox_id)
+                    return
+                except Exception:
+                    if time.monotonic() - started_at > self.IDLE_RENEWAL_INTERVAL:
+                        consecutive_errors = 0
+                    reconnect_delay = min(
+                        self.RECONNECT_DELAY * 2**consecutive_errors,
+                        self.MAX_RECONNECT_DELAY,
+                    )
+                    consecutive_errors += 1
+                    logger.warning(
+                        "Listening to mailbox %s failed, reconnecting in %s seconds.",
+                        mailbox_id,
+                        reconnect_delay,
+                        exc_info=True,
+                    )
+                    self._stop_event.wait(reconnect_delay)
+        finally:
+            connection.close()
+
+    def _listen_on_connection(self, mailbox: Mailbox) -> bool:
+        """Listens to a mailbox over a single connection.
+
+        Fetches the emails that arrived while no connection was held first.
+
+        Args:
+            mailbox: The mailbox to listen to.
+
+        Returns:
+            Whether listening should continue on a new connection.
+
+        Raises:
+            FetcherError: If connecting, idling or fetching fails.
+            DatabaseError: If accessing the database fails.
+        """
+        fetcher: IMAP4Fetcher
+        with mailbox.account.get_fetcher() as fetcher:  # type: ignore[assignment]  # only IMAP accounts are listened to
+            if not fetcher.supports_idle:
+                logger.warning(
+                    "%s does not support IDLE, not listening to %s.",
+                    mailbox.account,
+                    mailbox,
+                )
+                self._idle_unsupported_mailbox_ids.add(mailbox.id)
+                return False
+            logger.info("Listening to %s ...", mailbox)
+            mailbox.fetch(self.FETCHING_CRITERION, fetcher=fetcher)
+            while not self._stop_event.is_set():
+                if fetcher.wait_for_new_emails(mailbox, self.IDLE_RENEWAL_INTERVAL):
+                    logger.info("New emails arrived in %s.", mailbox)
+                    mailbox.fetch(self.FETCHING_CRITERION, fetcher=fetcher)
+                try:
+                    mailbox.refresh_from_db(fields=["use_idle"])
+                except Mailbox.DoesNotExist:
+                    return False
+                if not mailbox.use_idle:
+                    logger.info("Stopped listening to %s.", mailbox)
+                    return False
+        return False
@@ -0,0 +1,199 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+#
+# Eonvelope - a open-source self-hostable email archiving server
+# Copyright (C) 2024 David Aderbauer & The Eonvelope Contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""Module with the :class:`IngestPipeline` class."""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from typing import TYPE_CHECKING
+
+from django.db import connection
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+
+logger = logging.getLogger(__name__)
+"""The logger instance for this module."""
+
+
+class IngestPipeline[ParsedMessage]:
+    """Ingests fetched messages in three stages connected by a bounded queue.
+
+    The messages are fetched in a separate thread,
+    parsed by a pool of threads or processes and persisted in batches by the thread running the pipeline.
+    The messages are persisted in the order they were fetched.
+    The fetching stage pauses while the queue is full,
+    so at most `queue_size` fetched messages are held in memory.
+    """
+
+    QUEUE_POLL_INTERVAL = 1
+    """The number of seconds after which a blocked stage checks whether the pipeline has been stopped."""
+
+    def __init__(
+        self,
+        parse: Callable[[bytes], ParsedMessage],
+        persist: Callable[[list[ParsedMessage]], None],
+        *,
+        parse_workers: int,
+        queue_size: int,
+        persist_batch_size: int,
+        use_processes: bool = False,
+    ) -> None:
+        """Constructor, sets up the pipeline without running it.
+
+        Args:
+            parse: Parses a fetched message. Runs in the parsing workers, so it must not use the db.
+                With `use_processes`, it must be a module-level function with a picklable result.
+            persist: Persists a batch of parsed messages. Runs in the thread running the pipeline.
+            parse_workers: The number of parsing workers.
+            queue_size: The maximum number of messages between fetching and persisting.
+            persist_batch_size: The maximum number of messages persisted together.
+            use_processes: Whether the parsing workers are processes instead of threads.
+                Parsing is CPU-bound, so only processes make use of more than one core.
+        """
+        self._parse = parse
+        self._persist = persist
+        self._parse_workers = max(1, parse_workers)
+        self._use_processes = use_processes
+        self._persist_batch_size = max(1, persist_batch_size)
+        self._queue: queue.Queue[
+            Future[ParsedMessage] | Callable[[], object] | None
+        ] = queue.Queue(max(1, queue_size))
+        self._stop_event = threading.Event()
+        self._fetch_thread: threading.Thread | None = None
+        self._fetch_error: Exception | None = None
+
+    def run(self, messages: Iterator[bytes]) -> None:
+        """Fetches, parses and persists messages until all are persisted.
+
+        Args:
+            messages: The fetched messages. Iterated in a separate thread.
+
+        Raises:
+            Exception: Any exception raised by fetching, parsing or persisting.
+                The other stages are stopped first.
+        """
+        logger.debug(
+            "Running ingest pipeline with %d parsing %s ...",
+            self._parse_workers,
+            "processes" if self._use_processes else "threads",
+        )
+        executor: Executor = (
+            ProcessPoolExecutor(max_workers=self._parse_workers)
+            if self._use_processes
+            else ThreadPoolExecutor(
+                max_workers=self._parse_workers, thread_name_prefix="ingest-parse"
+            )
+        )
+        self._fetch_thread = threading.Thread(
+            target=self._fetch,
+            args=(messages, executor),
+            name=f"ingest-fetch-{threading.current_thread().name}",
+            daemon=True,
+        )
+        self._fetch_thread.start()
+        try:
+            self._consume()
+        finally:
+            self._stop_event.set()
+            self._fetch_thread.join()
+            executor.shutdown(wait=True, cancel_futures=True)
+        if self._fetch_error is not None:
+            raise self._fetch_error
+        logger.debug("Successfully ran ingest pipeline.")
+
+    def run_after_pending(self, func: Callable[[], object]) -> None:
+        """Runs a function once all messages fetched before have been persisted.
+
+        Only calls from the fetching stage are deferred, all others run right away.
+
+        Args:
+            func: The function to run.
+        """
+        if threading.current_thread() is self._fetch_thread:
+            self._put(func)
+        else:
+            func()
+
+    def _fetch(self, messages: Iterator[bytes], executor: Executor) -> None:
+        """The fetching stage, hands the messages to the parsing workers.
+
+        Args:
+            messages: The fetched messages.
+            executor: The pool of parsing workers.
+        """
+        try:
+            for message in messages:
+                if not self._put(executor.submit(self._parse, message)):
+                    break
+        except Exception as error:  # noqa: BLE001 ; reraised by the running thread
+            self._fetch_error = error
+        finally:
+            close = getattr(messages, "close", None)
+            if close is not None:
+                close()
+            self._put(None)
+            connection.close()
+
+    def _consume(self) -> None:
+        """The persisting stage, persists the parsed messages in batches."""
+        parsed_messages: list[ParsedMessage] = []
+        while True:
+            item = self._queue.get()
+            if isinstance(item, Future):
+                parsed_messages.append(item.result())
+                if (
+                    len(parsed_messages) < self._persist_batch_size
+                    and not self._queue.empty()
+                ):
+                    continue
+            if parsed_messages:
+                self._persist(parsed_messages)
+                parsed_messages = []
+            if item is None:
+                return
+            if not isinstance(item, Future):
+                item()
+
+    def _put(self, item: Future[ParsedMessage] | Callable[[], object] | None) -> bool:
+        """Puts an item into the queue, waits while the queue is full.
+
+        Args:
+            item: The item to queue.
+
+        Returns:
+            Whether the item was queued.
+            False if the pipeline has been stopped.
+        """
+        while not self._stop_event.is_set():
+            try:
+                self._queue.put(item, timeout=self.QUEUE_POLL_INTERVAL)
+            except queue.Full:
+                continue
+            return True
+        return False
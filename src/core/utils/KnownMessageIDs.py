@@ -0,0 +1,96 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+#
+# Eonvelope - a open-source self-hostable email archiving server
+# Copyright (C) 2024 David Aderbauer & The Eonvelope Contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""Module with the :class:`KnownMessageIDs` class."""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from core.models import Mailbox
+
+
+logger = logging.getLogger(__name__)
+"""The logger instance for this module."""
+
+
+class KnownMessageIDs:
+    """The Message-IDs of the emails in a mailbox, to check for duplicates in memory.
+
+    The Message-IDs are loaded from the db once, in chunks, when the instance is created.
+    Emails saved to the mailbox afterwards are added with :meth:`add`,
+    so one instance can check all emails of a fetch or an upload without further queries.
+    The check is exact: an email is only skipped if its Message-ID is known for certain.
+
+    Without preloading, only the added Message-IDs are known
+    and the check against the db is left to the caller.
+    That is cheaper for fetches that return few, mostly new emails,
+    so preloading only pays off for uploads and fetches of the whole mailbox.
+    """
+
+    LOAD_CHUNK_SIZE = 10000
+    """The number of Message-IDs loaded from the db per query."""
+
+    def __init__(self, mailbox: Mailbox, *, preload: bool = True) -> None:
+        """Constructor, loads the Message-IDs of the emails in `mailbox`.
+
+        Args:
+            mailbox: The mailbox to check the emails of.
+            preload: Whether to load the Message-IDs from the db. Defaults to `True`.
+        """
+        self.mailbox = mailbox
+        self.is_preloaded = preload
+        if not preload:
+            self._message_ids: set[str] = set()
+            return
+        logger.debug("Loading the Message-IDs of the emails in %s ...", mailbox)
+        self._message_ids = set(
+            mailbox.emails.values_list("message_id", flat=True).iterator(
+                chunk_size=self.LOAD_CHUNK_SIZE
+            )
+        )
+        logger.debug("Loaded %d Message-IDs.", len(self._message_ids))
+
+    def __contains__(self, message_id: object) -> bool:
+        """Checks whether there is an email with a Message-ID in the mailbox.
+
+        Args:
+            message_id: The Message-ID to check.
+
+        Returns:
+            Whether the Message-ID is known.
+        """
+        return message_id in self._message_ids
+
+    def __len__(self) -> int:
+        """Counts the known Message-IDs.
+
+        Returns:
+            The number of known Message-IDs.
+        """
+        return len(self._message_ids)
+
+    def add(self, message_id: str) -> None:
+        """Adds the Message-ID of an email that has been saved to the mailbox.
+
+        Args:
+            message_id: The Message-ID to add.
+        """
+        self._message_ids.add(message_id)
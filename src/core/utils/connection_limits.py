@@ -0,0 +1,54 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+#
+# Eonvelope - a open-source self-hostable email archiving server
+# Copyright (C) 2024 David Aderbauer & The Eonvelope Contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""Module limiting the number of parallel connections to a mailserver."""
+
+from __future__ import annotations
+
+import threading
+
+from eonvelope.utils.workarounds import get_config
+
+_mail_host_slots: dict[str, tuple[int, threading.BoundedSemaphore]] = {}
+"""The connection limit and the semaphore holding the free connection slots per mail host."""
+
+_mail_host_slots_lock = threading.Lock()
+"""Guards :attr:`_mail_host_slots`."""
+
+
+def get_mail_host_slots(mail_host: str) -> threading.BoundedSemaphore:
+    """Gets the semaphore holding the free connection slots to a mail host.
+
+    The semaphore is replaced if the `MAX_CONNECTIONS_PER_MAIL_HOST` setting has changed.
+    Slots taken from a replaced semaphore are returned to it, so they don't count against the new limit.
+    The limit only applies within the current process.
+
+    Args:
+        mail_host: The mail host to get the connection slots for.
+
+    Returns:
+        The semaphore for the mail host.
+    """
+    limit = max(1, get_config("MAX_CONNECTIONS_PER_MAIL_HOST"))
+    mail_host = mail_host.lower()
+    with _mail_host_slots_lock:
+        current_limit, slots = _mail_host_slots.get(mail_host, (None, None))
+        if slots is None or current_limit != limit:
+            slots = threading.BoundedSemaphore(limit)
+            _mail_host_slots[mail_host] = (limit, slots)
+        return slots
@@ -24,17 +24,21 @@ import logging
 from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING, Self, override
 
-from core.constants import EmailFetchingCriterionChoices
+from core.constants import EmailFetchingCriterionChoices, HeaderFields
 from core.utils import FetchingCriterion
+from core.utils.mail_parsing import is_x_spam, scan_headers
+from eonvelope.utils.workarounds import get_config
 
 if TYPE_CHECKING:
-    from collections.abc import Generator
+    from collections.abc import Generator, Iterable, Sequence
     from types import TracebackType
 
     from core.models.Account import Account
     from core.models.Email import Email
     from core.models.Mailbox import Mailbox
 
+    from .FetchEstimate import FetchEstimate
+
 
 class BaseFetcher(ABC):
     """Template class for the mailfetcher classes.
@@ -107,6 +111,44 @@ class BaseFetcher(ABC):
         Raises:
             ValueError: If the :attr:`fetching_criterion` is not available for this fetcher.
         """
+        self._check_fetching_args(mailbox, criterion)
+
+    @abstractmethod
+    def estimate_emails(  # type: ignore[return]  # this abstractmethod just provides basic arg-checking
+        self,
+        mailbox: Mailbox,
+        criterion: FetchingCriterion = DEFAULT_FETCHING_CRITERION,
+    ) -> FetchEstimate:
+        """Estimates what fetching emails based on a criterion would download, without downloading the emails.
+
+        Neither the sync state nor the fetch progress of the mailbox are changed.
+
+        Args:
+            mailbox: The model of the mailbox to estimate the fetch for.
+            criterion: Formatted criterion to filter mails by.
+                Defaults to :attr:`core.constants.EmailFetchingCriterionChoices.ALL`.
+
+        Returns:
+            The number, total size and number of already known messages that match the criterion.
+
+        Raises:
+            ValueError: If the :attr:`fetching_criterion` is not available for this fetcher.
+        """
+        self._check_fetching_args(mailbox, criterion)
+
+    def _check_fetching_args(
+        self, mailbox: Mailbox, criterion: FetchingCriterion
+    ) -> None:
+        """Checks whether emails can be fetched from a mailbox based on a criterion.
+
+        Args:
+            mailbox: The model of the mailbox to fetch data from.
+            criterion: Formatted criterion to filter mails by.
+
+        Raises:
+            ValueError: If the :attr:`fetching_criterion` is not available for this fetcher
+                or the :attr:`mailbox` does not belong to :attr:`self.account`.
+        """
         if criterion not in self.AVAILABLE_FETCHING_CRITERIA:
             self.logger.error(
                 "Fetching by criterion %s is not available via protocol %s!",
@@ -120,6 +162,70 @@ class BaseFetcher(ABC):
             self.logger.error("%s is not a mailbox of %s!", mailbox, self.account)
             raise ValueError(f"{mailbox} is not in {self.account}!")
 
+    def check_downloads_required(
+        self, mailbox: Mailbox, header_blocks: Sequence[bytes | None]
+    ) -> list[bool]:
+        """Decides for probed messages whether they need to be downloaded in full.
+
+        A message is not downloaded if its Message-ID is already in the mailbox
+        or if it is flagged as spam and THROW_OUT_SPAM is set.
+        Messages without header block or Message-ID are always downloaded,
+        they can only be identified by their full content.
+        Uses a single db query for all given messages.
+
+        Args:
+            mailbox: The mailbox the messages are in.
+            header_blocks: The raw header blocks of the messages. None for messages that could not be probed.
+
+        Returns:
+            For every header block whether its message needs to be downloaded.
+        """
+        throw_out_spam = get_config("THROW_OUT_SPAM")
+        message_ids: list[str | None] = []
+        for header_block in header_blocks:
+            if header_block is None:
+                message_ids.append(None)
+                continue
+            headers = scan_headers(
+                header_block, [HeaderFields.MESSAGE_ID, HeaderFields.X_SPAM]
+            )
+            if throw_out_spam and is_x_spam(headers.get(HeaderFields.X_SPAM)):
+                message_ids.append("")
+                continue
+            message_ids.append(headers.get(HeaderFields.MESSAGE_ID) or None)
+
+        known_message_ids = set(
+            mailbox.emails.filter(
+                message_id__in=[message_id for message_id in message_ids if message_id]
+            ).values_list("message_id", flat=True)
+        )
+        # the empty string marks spam
+        known_message_ids.add("")
+        return [message_id not in known_message_ids for message_id in message_ids]
+
+    @staticmethod
+    def count_known_messages(
+        mailbox: Mailbox, message_ids: Iterable[str | None]
+    ) -> int:
+        """Counts the messages that are already in the mailbox in the db.
+
+        Uses a single db query for all given messages.
+
+        Args:
+            mailbox: The mailbox the messages are in.
+            message_ids: The Message-IDs of the messages. None for messages without Message-ID.
+
+        Returns:
+            The number of messages whose Message-ID is in the mailbox.
+        """
+        message_ids = [message_id for message_id in message_ids if message_id]
+        known_message_ids = set(
+            mailbox.emails.filter(message_id__in=message_ids).values_list(
+                "message_id", flat=True
+            )
+        )
+        return sum(message_id in known_message_ids for message_id in message_ids)
+
     @abstractmethod
     def fetch_mailboxes(self) -> list[tuple[str, str]]:
         """Fetches all mailbox names from the server.
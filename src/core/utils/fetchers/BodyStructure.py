@@ -0,0 +1,316 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+#
+# Eonvelope - a open-source self-hostable email archiving server
+# Copyright (C) 2024 David Aderbauer & The Eonvelope Contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""Module with the :class:`BodyStructure` class."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+_TOKEN_REGEX = re.compile(
+    rb'\s*(?:([()])|"((?:[^"\\]|\\.)*)"|\{(\d+)\}\r\n|([^\s()"]+))', re.DOTALL
+)
+"""Matches the next token of an IMAP response: a parenthesis, a quoted string, a literal or an atom."""
+
+_MESSAGE_START_REGEX = re.compile(rb"^\d+ \(")
+"""Matches the start of the response to a FETCH command for a single message."""
+
+_MIN_STACK_DEPTH_TO_CLOSE = 2
+"""The parser stack depth below which a closing parenthesis has no opening counterpart."""
+
+
+type ParsedResponse = list[bytes | ParsedResponse | None]
+"""An IMAP response parsed into nested lists of strings, with NIL as None."""
+
+
+@dataclass
+class BodyStructure:
+    """A node of the MIME structure of a message as returned for the IMAP BODYSTRUCTURE item.
+
+    See https://datatracker.ietf.org/doc/html/rfc3501#section-7.4.2 for the format.
+    Encapsulated messages are not descended into.
+    """
+
+    section: str
+    """The IMAP section specifier of this part. Empty for the message itself."""
+
+    content_maintype: str
+    """The lowercase main content type."""
+
+    content_subtype: str
+    """The lowercase content subtype."""
+
+    content_disposition: str | None = None
+    """The lowercase content disposition. None if the part has none."""
+
+    parameters: dict[str, str] = field(default_factory=dict)
+    """The content type parameters with lowercase names."""
+
+    subparts: list[BodyStructure] = field(default_factory=list)
+    """The parts of a multipart. Empty for all other parts."""
+
+    @classmethod
+    def from_fetch_data(cls, fetch_data: list) -> dict[bytes, BodyStructure]:
+        """Parses the BODYSTRUCTURE items from the response to a FETCH command.
+
+        Args:
+            fetch_data: The response data of the FETCH command.
+
+        Returns:
+            The structures of the messages by uID.
+            Messages without UID or BODYSTRUCTURE item are left out.
+        """
+        structures = {}
+        for message_response in _join_fetch_data(fetch_data):
+            try:
+                parsed_response = _parse_response(message_response)
+                items = parsed_response[1]
+            except (ValueError, IndexError):
+                continue
+            if not isinstance(items, list):
+                continue
+            fetch_items = dict(zip(items[::2], items[1::2], strict=False))
+            uid = fetch_items.get(b"UID")
+            body = fetch_items.get(b"BODYSTRUCTURE")
+            if isinstance(uid, bytes) and isinstance(body, list):
+                try:
+                    structures[uid] = cls.from_body(body)
+                except (ValueError, IndexError, AttributeError):
+                    continue
+        return structures
+
+    @classmethod
+    def from_body(cls, body: ParsedResponse, section: str = "") -> BodyStructure:
+        """Creates the structure of a part from its parsed BODYSTRUCTURE.
+
+        Args:
+            body: The parsed BODYSTRUCTURE of the part.
+            section: The section specifier of the part. Empty for the message itself.
+
+        Returns:
+            The structure of the part.
+
+        Raises:
+            ValueError, IndexError, AttributeError: If the BODYSTRUCTURE is malformed.
+        """
+        if isinstance(body[0], list):
+            subparts = []
+            for subpart_body in body:
+                if not isinstance(subpart_body, list):
+                    break
+                subpart_number = len(subparts) + 1
+                subparts.append(
+                    cls.from_body(
+                        subpart_body,
+                        (
+                            f"{section}.{subpart_number}"
+                            if section
+                            else str(subpart_number)
+                        ),
+                    )
+                )
+            extension_data = body[len(subparts) + 1 :]
+            return cls(
+                section=section,
+                content_maintype="multipart",
+                content_subtype=_decode(body[len(subparts)]),
+                content_disposition=_parse_disposition(extension_data, 1),
+                parameters=(
+                    _parse_parameters(extension_data[0]) if extension_data else {}
+                ),
+                subparts=subparts,
+            )
+        content_maintype = _decode(body[0])
+        content_subtype = _decode(body[1])
+        if content_maintype == "text":
+            disposition_index = 9
+        elif content_maintype == "message" and content_subtype == "rfc822":
+            disposition_index = 11
+        else:
+            disposition_index = 8
+        return cls(
+            section=section,
+            content_maintype=content_maintype,
+            content_subtype=content_subtype,
+            content_disposition=_parse_disposition(body, disposition_index),
+            parameters=_parse_parameters(body[2]),
+        )
+
+    def walk(self) -> Iterator[BodyStructure]:
+        """Iterates over this part and all its subparts, depth-first.
+
+        Yields:
+            The parts of the structure.
+        """
+        yield self
+        for subpart in self.subparts:
+            yield from subpart.walk()
+
+    @property
+    def is_multipart(self) -> bool:
+        """Whether this part is a multipart."""
+        return bool(self.subparts)
+
+    def assemble(self, contents: dict[str, bytes]) -> bytes:
+        """Assembles the message in bytes form from the contents of its parts.
+
+        Parts whose content is missing are assembled with an empty body.
+
+        Args:
+            contents: The fetched contents by section specifier,
+                e.g. HEADER for the header of the message, 1.MIME for the header of part 1 and 1 for its body.
+
+        Returns:
+            The assembled message.
+        """
+        header = contents.get(
+            f"{self.section}.MIME" if self.section else "HEADER", b""
+        ).rstrip(b"\r\n")
+        assembled = header + b"\r\n\r\n" if header else b"\r\n"
+        if not self.is_multipart:
+            return assembled + contents.get(self.section, b"")
+        boundary = self.parameters.get("boundary", "").encode()
+        for subpart in self.subparts:
+            assembled += (
+                b"--" + boundary + b"\r\n" + subpart.assemble(contents) + b"\r\n"
+            )
+        return assembled + b"--" + boundary + b"--\r\n"
+
+
+def _join_fetch_data(fetch_data: list) -> list[bytes]:
+    """Joins the response data of a FETCH command into one IMAP response per message.
+
+    :mod:`imaplib` splits the response of a message at every literal.
+
+    Args:
+        fetch_data: The response data of the FETCH command.
+
+    Returns:
+        The responses of the messages with their literals in place.
+    """
+    message_responses: list[bytes] = []
+    for item in fetch_data:
+        fragment = item[0] + b"\r\n" + item[1] if isinstance(item, tuple) else item
+        if not isinstance(fragment, bytes):
+            continue
+        if _MESSAGE_START_REGEX.match(fragment) or not message_responses:
+            message_responses.append(fragment)
+        else:
+            message_responses[-1] += fragment
+    return message_responses
+
+
+def _parse_response(response: bytes) -> ParsedResponse:
+    """Parses an IMAP response into nested lists.
+
+    Args:
+        response: The IMAP response.
+
+    Returns:
+        The parsed response.
+
+    Raises:
+        ValueError: If the response is malformed.
+    """
+    stack: list[ParsedResponse] = [[]]
+    position = 0
+    while position < len(response):
+        match = _TOKEN_REGEX.match(response, position)
+        if match is None:
+            if response[position:].strip():
+                raise ValueError(f"Malformed IMAP response at {position}!")
+            break
+        position = match.end()
+        parenthesis, quoted, literal_length, atom = match.groups()
+        if parenthesis == b"(":
+            stack.append([])
+        elif parenthesis == b")":
+            if len(stack) < _MIN_STACK_DEPTH_TO_CLOSE:
+                raise ValueError(f"Unbalanced IMAP response at {position}!")
+            closed = stack.pop()
+            stack[-1].append(closed)
+        elif quoted is not None:
+            stack[-1].append(re.sub(rb"\\(.)", rb"\1", quoted))
+        elif literal_length is not None:
+            literal_end = position + int(literal_length)
+            stack[-1].append(response[position:literal_end])
+            position = literal_end
+        else:
+            stack[-1].append(None if atom.upper() == b"NIL" else atom)
+    if len(stack) != 1:
+        raise ValueError("Unbalanced IMAP response!")
+    return stack[0]
+
+
+def _decode(value: bytes | ParsedResponse | None) -> str:
+    """Decodes a string of a parsed BODYSTRUCTURE to lowercase.
+
+    Args:
+        value: The parsed string.
+
+    Returns:
+        The lowercase string. Empty for NIL.
+
+    Raises:
+        AttributeError: If the value is not a string.
+    """
+    if value is None:
+        return ""
+    return value.decode(errors="replace").lower()  # type: ignore[union-attr]
+
+
+def _parse_parameters(value: bytes | ParsedResponse | None) -> dict[str, str]:
+    """Parses a parenthesized parameter list of a parsed BODYSTRUCTURE.
+
+    Args:
+        value: The parsed parameter list.
+
+    Returns:
+        The parameters with lowercase names.
+    """
+    if not isinstance(value, list):
+        return {}
+    return {
+        _decode(name): parameter.decode(errors="replace")
+        for name, parameter in zip(value[::2], value[1::2], strict=False)
+        if isinstance(name, bytes) and isinstance(parameter, bytes)
+    }
+
+
+def _parse_disposition(body: ParsedResponse, index: int) -> str | None:
+    """Parses the content disposition of a parsed BODYSTRUCTURE.
+
+    Args:
+        body: The parsed BODYSTRUCTURE.
+        index: The position of the disposition in the BODYSTRUCTURE.
+
+    Returns:
+        The lowercase content disposition. None if there is none.
+    """
+    if len(body) <= index:
+        return None
+    disposition = body[index]
+    if not isinstance(disposition, list) or not disposition:
+        return None
+    return _decode(disposition[0]) or None
@@ -0,0 +1,143 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+#
+# Eonvelope - a open-source self-hostable email archiving server
+# Copyright (C) 2024 David Aderbauer & The Eonvelope Contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""Module with the :class:`DeflateSocket` class."""
+
+from __future__ import annotations
+
+import zlib
+from typing import TYPE_CHECKING, Any
+
+from django.conf import settings
+from prometheus_client import Counter
+
+if TYPE_CHECKING:
+    import socket
+    import ssl
+
+
+compressed_bytes_received = Counter(
+    "imap_compressed_received_bytes",
+    "Bytes received from IMAP servers over compressed connections, as transmitted.",
+    namespace=settings.PROMETHEUS_METRIC_NAMESPACE,
+)
+"""The metric counting the transmitted bytes of compressed connections."""
+
+decompressed_bytes_received = Counter(
+    "imap_decompressed_received_bytes",
+    "Bytes received from IMAP servers over compressed connections, after decompression.",
+    namespace=settings.PROMETHEUS_METRIC_NAMESPACE,
+)
+"""The metric counting the decompressed bytes of compressed connections."""
+
+
+class DeflateSocket:
+    """Wraps a socket in the raw DEFLATE streams negotiated by the IMAP COMPRESS extension (RFC 4978).
+
+    Replaces the socket of an :class:`imaplib.IMAP4` client,
+    which sends with :meth:`sendall` and receives with :meth:`recv`.
+    All other attributes are those of the wrapped socket.
+    """
+
+    def __init__(self, sock: socket.socket | ssl.SSLSocket) -> None:
+        """Constructor, sets up the compression streams.
+
+        Args:
+            sock: The connected socket to wrap.
+        """
+        self._sock = sock
+        self._compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+        self._decompressor = zlib.decompressobj(wbits=-zlib.MAX_WBITS)
+        self.compressed_bytes_received = 0
+        """The number of bytes received over the wrapped socket."""
+        self.decompressed_bytes_received = 0
+        """The number of bytes received after decompression."""
+
+    def recv(self, bufsize: int, flags: int = 0) -> bytes:
+        """Receives and decompresses data from the socket.
+
+        Args:
+            bufsize: The maximum number of decompressed bytes to return.
+            flags: The flags passed on to the wrapped socket.
+
+        Returns:
+            The decompressed data.
+            Empty if the connection has been closed.
+        """
+        while True:
+            compressed_data = self._decompressor.unconsumed_tail
+            if not compressed_data:
+                # output that exceeded the previous bufsize may still be pending in the decompressor
+                data = self._decompressor.decompress(b"", bufsize)
+                if data:
+                    return self._count_decompressed(data)
+                compressed_data = self._sock.recv(bufsize, flags)
+                if not compressed_data:
+                    return b""
+                self.compressed_bytes_received += len(compressed_data)
+                compressed_bytes_received.inc(len(compressed_data))
+            data = self._decompressor.decompress(compressed_data, bufsize)
+            if data:
+                return self._count_decompressed(data)
+
+    def _count_decompressed(self, data: bytes) -> bytes:
+        """Adds decompressed data to the received bytes counts.
+
+        Args:
+            data: The decompressed data.
+
+        Returns:
+            The decompressed data.
+        """
+        self.decompressed_bytes_received += len(data)
+        decompressed_bytes_received.inc(len(data))
+        return data
+
+    def sendall(self, data: bytes, flags: int = 0) -> None:
+        """Compresses and sends data over the socket.
+
+        The stream is flushed so that the server can act on the data right away.
+
+        Args:
+            data: The data to send.
+            flags: The flags passed on to the wrapped socket.
+        """
+        self._sock.sendall(
+            self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH),
+            flags,
+        )
+
+    @property
+    def saved_bytes(self) -> int:
+        """The number of received bytes saved by the compression.
+
+        Returns:
+            The difference of decompressed and compressed bytes received.
+        """
+        return self.decompressed_bytes_received - self.compressed_bytes_received
+
+    def __getattr__(self, name: str) -> Any:  # noqa: ANN401 ; socket attributes
+        """Passes all other attributes on to the wrapped socket.
+
+        Args:
+            name: The name of the attribute.
+
+        Returns:
+            The attribute of the wrapped socket.
+        """
+        return getattr(self._sock, name)
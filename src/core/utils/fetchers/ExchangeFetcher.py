@@ -21,6 +21,7 @@
 from __future__ import annotations
 
 import os
+from itertools import batched
 from typing import TYPE_CHECKING, override
 
 import exchangelib
@@ -33,13 +34,13 @@ from core.constants import (
     EmailProtocolChoices,
 )
 from core.utils.fetchers.exceptions import MailAccountError, MailboxError
-from core.utils.iterations import slices
 from eonvelope.utils.workarounds import get_config
 
 from .BaseFetcher import BaseFetcher
+from .FetchEstimate import FetchEstimate
 
 if TYPE_CHECKING:
-    from collections.abc import Generator
+    from collections.abc import Generator, Iterable, Sequence
 
     from core.models.Account import Account
     from core.models.Email import Email
@@ -59,6 +60,7 @@ class ExchangeFetcher(BaseFetcher):
 
     AVAILABLE_FETCHING_CRITERIA = (
         EmailFetchingCriterionChoices.ALL,
+        EmailFetchingCriterionChoices.INCREMENTAL,
         EmailFetchingCriterionChoices.SEEN,
         EmailFetchingCriterionChoices.UNSEEN,
         EmailFetchingCriterionChoices.DRAFT,
@@ -75,7 +77,11 @@ class ExchangeFetcher(BaseFetcher):
     Must be immutable!
     """
 
-    EMAIL_FETCH_BATCH_SIZE = 20
+    EMAIL_FETCH_BATCH_SIZE = 100
+    """Number of messages whose mime content is fetched by id in a single request."""
+
+    SYNC_MAX_CHANGES_RETURNED = 512
+    """Maximum number of item changes per SyncFolderItems request, 512 is the limit of EWS."""
 
     @override
     def __init__(self, account: Account) -> None:
@@ -193,8 +199,13 @@ class ExchangeFetcher(BaseFetcher):
     ) -> Generator[bytes]:
         """Fetches and returns maildata from a mailbox based on a given criterion.
 
-        Todo:
-            Rewrite this into a generator.
+        The ids of the matching items are queried first,
+        then their mime content is fetched in batches of :attr:`EMAIL_FETCH_BATCH_SIZE`.
+        For the :attr:`core.constants.EmailFetchingCriterionChoices.INCREMENTAL` criterion
+        the ids of the items created since :attr:`core.models.Mailbox.Mailbox.exchange_sync_state`
+        are determined with SyncFolderItems instead.
+        For all other criteria the progress is recorded in the mailbox after every batch until an item fails to be fetched,
+        an interrupted or incomplete fetch with the same criterion resumes from there.
 
         Args:
             mailbox: Database model of the mailbox to fetch data from.
@@ -217,16 +228,33 @@ class ExchangeFetcher(BaseFetcher):
         )
         try:
             mailbox_folder = self.open_mailbox(mailbox)
-            for query_slice in slices(0, self.EMAIL_FETCH_BATCH_SIZE):
-                mail_query_result = list(
+            if criterion == EmailFetchingCriterionChoices.INCREMENTAL:
+                yield from self._fetch_new_emails(mailbox, mailbox_folder)
+            else:
+                item_ids = list(
                     criterion.as_exchange_queryset(
                         mailbox_folder.all().order_by("datetime_received")
-                    )[query_slice]
+                    ).values_list("id", "changekey")
                 )
-                for mail in mail_query_result:
-                    yield mail.mime_content
-                if len(mail_query_result) < self.EMAIL_FETCH_BATCH_SIZE:
-                    break
+                resume_index = mailbox.start_fetch_progress(
+                    criterion, [item_id for item_id, _ in item_ids]
+                )
+                is_progress_advancing = True
+                for item_id_batch in batched(
+                    item_ids[resume_index:], self.EMAIL_FETCH_BATCH_SIZE, strict=False
+                ):
+                    failed_item_ids = yield from self._fetch_mime_contents(
+                        mailbox_folder, item_id_batch
+                    )
+                    if failed_item_ids:
+                        # the failed items must be fetched again when the fetch is resumed
+                        is_progress_advancing = False
+                    if is_progress_advancing:
+                        mailbox.advance_fetch_progress(
+                            item_id_batch[-1][0], len(item_id_batch)
+                        )
+                if is_progress_advancing:
+                    mailbox.finish_fetch_progress()
         except exchangelib.errors.EWSError as error:
             self.logger.exception("Error during fetching of mail contents!")
             raise MailboxError(error, _("fetching of mail contents")) from error
@@ -236,6 +264,224 @@ class ExchangeFetcher(BaseFetcher):
             mailbox,
         )
 
+    @override
+    def estimate_emails(
+        self,
+        mailbox: Mailbox,
+        criterion: FetchingCriterion = BaseFetcher.DEFAULT_FETCHING_CRITERION,
+    ) -> FetchEstimate:
+        """Estimates what fetching emails based on a given criterion would download.
+
+        The matching items are queried like in :meth:`fetch_emails`, but with their size and Message-ID instead of their mime content.
+        For the :attr:`core.constants.EmailFetchingCriterionChoices.INCREMENTAL` criterion
+        the stored sync state is not advanced.
+
+        Args:
+            mailbox: Database model of the mailbox to estimate the fetch for.
+            criterion: Formatted criterion to filter mails in the Exchange server.
+                Defaults to :attr:`eonvelope.MailFetchingCriteria.ALL`.
+
+        Returns:
+            The number, total size and number of already known messages that match the criterion.
+
+        Raises:
+            ValueError: If the :attr:`mailbox` does not belong to :attr:`self.account`.
+                If :attr:`criterion` is not in :attr:`ExchangeFetcher.AVAILABLE_FETCHING_CRITERIA`.
+            MailboxError: If an error occurs or a bad response is returned during an action on the mailbox.
+        """
+        super().estimate_emails(mailbox, criterion)
+        self.logger.debug(
+            "Estimating fetch of %s messages in %s ...", criterion, mailbox
+        )
+        only_fields = ("size", "message_id")
+        try:
+            mailbox_folder = self.open_mailbox(mailbox)
+            if criterion == EmailFetchingCriterionChoices.INCREMENTAL:
+                sync_state = mailbox.exchange_sync_state or None
+                try:
+                    items = list(
+                        self._sync_created_items(
+                            mailbox_folder, sync_state, only_fields
+                        )
+                    )
+                except exchangelib.errors.ErrorInvalidSyncStateData:
+                    if sync_state is None:
+                        raise
+                    items = list(
+                        self._sync_created_items(mailbox_folder, None, only_fields)
+                    )
+                item_data = [(item.size, item.message_id) for item in items]
+            else:
+                item_data = list(
+                    criterion.as_exchange_queryset(mailbox_folder.all()).values_list(
+                        *only_fields
+                    )
+                )
+        except exchangelib.errors.EWSError as error:
+            self.logger.exception("Error during estimation of fetch!")
+            raise MailboxError(error, _("estimation of fetch")) from error
+
+        estimate = FetchEstimate(
+            message_count=len(item_data),
+            total_size=sum(size or 0 for size, _message_id in item_data),
+            known_count=self.count_known_messages(
+                mailbox, [message_id for _size, message_id in item_data]
+            ),
+        )
+        self.logger.debug("Successfully estimated fetch: %s.", estimate)
+        return estimate
+
+    def _fetch_new_emails(
+        self, mailbox: Mailbox, mailbox_folder: exchangelib.Folder
+    ) -> Generator[bytes]:
+        """Fetches the messages that were created in the mailbox folder since the last sync.
+
+        Without a stored sync state all messages in the folder are new.
+        If the stored sync state is rejected by the server, the folder is synced from scratch.
+        The messages that failed to be fetched by the previous sync are retried first.
+        The new sync state is only stored once all messages have been synced,
+        together with the ids of the messages that could not be fetched,
+        so only those are retried by the next fetch.
+
+        Args:
+            mailbox: Database model of the mailbox to fetch data from.
+            mailbox_folder: The folder of the mailbox.
+
+        Yields:
+            The new mails in the mailbox.
+
+        Raises:
+            exchangelib.errors.EWSError: If an error occurs during the sync.
+        """
+        failed_item_ids = []
+        if mailbox.exchange_failed_item_ids:
+            self.logger.debug(
+                "Retrying %d failed messages in %s ...",
+                len(mailbox.exchange_failed_item_ids),
+                mailbox,
+            )
+            failed_item_ids = yield from self._fetch_mime_contents(
+                mailbox_folder,
+                [(item_id, None) for item_id in mailbox.exchange_failed_item_ids],
+            )
+        sync_state = mailbox.exchange_sync_state or None
+        self.logger.debug("Syncing %s since state %s ...", mailbox, sync_state)
+        try:
+            failed_item_ids += yield from self._fetch_mime_contents(
+                mailbox_folder,
+                (
+                    (item.id, item.changekey)
+                    for item in self._sync_created_items(mailbox_folder, sync_state)
+                ),
+            )
+        except exchangelib.errors.ErrorInvalidSyncStateData:
+            if sync_state is None:
+                raise
+            self.logger.info(
+                "The sync state of %s is invalid, resyncing it.", mailbox, exc_info=True
+            )
+            # the sync from scratch lists the failed messages again
+            mailbox.exchange_sync_state = ""
+            mailbox.exchange_failed_item_ids = []
+            yield from self._fetch_new_emails(mailbox, mailbox_folder)
+            return
+
+        if failed_item_ids:
+            self.logger.warning(
+                "Failed to fetch %d messages from %s, retrying them with the next fetch.",
+                len(failed_item_ids),
+                mailbox,
+            )
+        if (
+            mailbox_folder.item_sync_state != mailbox.exchange_sync_state
+            or failed_item_ids != mailbox.exchange_failed_item_ids
+        ):
+            mailbox.exchange_sync_state = mailbox_folder.item_sync_state
+            mailbox.exchange_failed_item_ids = failed_item_ids
+            mailbox.save(
+                update_fields=["exchange_sync_state", "exchange_failed_item_ids"]
+            )
+
+    def _sync_created_items(
+        self,
+        mailbox_folder: exchangelib.Folder,
+        sync_state: str | None,
+        only_fields: Sequence[str] = (),
+    ) -> Generator[exchangelib.items.Item]:
+        """Lists the items that were created in a folder since a sync state.
+
+        Once this generator is exhausted, the new sync state is in :attr:`exchangelib.Folder.item_sync_state`.
+
+        Args:
+            mailbox_folder: The folder to sync.
+            sync_state: The sync state to start from. None for a sync from scratch.
+            only_fields: The fields of the items to get besides their id and changekey. Defaults to none.
+
+        Yields:
+            Every created item.
+
+        Raises:
+            exchangelib.errors.EWSError: If an error occurs during the sync.
+        """
+        mailbox_folder.item_sync_state = sync_state
+        for change in mailbox_folder.sync_items(
+            sync_state=sync_state,
+            only_fields=list(only_fields),
+            max_changes_returned=self.SYNC_MAX_CHANGES_RETURNED,
+        ):
+            # exchangelib returns errors in the response as objects
+            if isinstance(change, Exception):
+                raise change
+            change_type, item = change
+            if change_type == "create":
+                yield item
+
+    def _fetch_mime_contents(
+        self,
+        mailbox_folder: exchangelib.Folder,
+        item_ids: Iterable[tuple[str, str | None]],
+    ) -> Generator[bytes, None, list[str]]:
+        """Fetches the mime content of items in batches of :attr:`EMAIL_FETCH_BATCH_SIZE`.
+
+        Items that can't be fetched are skipped.
+
+        Args:
+            mailbox_folder: The folder the items are in.
+            item_ids: The ids and changekeys of the items.
+
+        Yields:
+            The mime content of the items.
+
+        Returns:
+            The ids of the items that could not be fetched.
+
+        Raises:
+            exchangelib.errors.EWSError: If an error occurs during a request.
+        """
+        failed_item_ids = []
+        for item_id_batch in batched(
+            item_ids, self.EMAIL_FETCH_BATCH_SIZE, strict=False
+        ):
+            for (item_id, _changekey), item in zip(
+                item_id_batch,
+                mailbox_folder.account.fetch(
+                    ids=item_id_batch,
+                    folder=mailbox_folder,
+                    only_fields=["mime_content"],
+                    chunk_size=self.EMAIL_FETCH_BATCH_SIZE,
+                ),
+                strict=True,
+            ):
+                # exchangelib returns errors for single items as objects
+                if isinstance(item, Exception):
+                    self.logger.warning(
+                        "Failed to fetch message from %s: %s", mailbox_folder, item
+                    )
+                    failed_item_ids.append(item_id)
+                    continue
+                yield item.mime_content
+        return failed_item_ids
+
     @override
     def fetch_mailboxes(self) -> list[tuple[str, str]]:
         """Retrieves and returns the data of the mailboxes in the account.
@@ -0,0 +1,37 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+#
+# Eonvelope - a open-source self-hostable email archiving server
+# Copyright (C) 2024 David Aderbauer & The Eonvelope Contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""Module with the :class:`FetchEstimate` class."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass
+class FetchEstimate:
+    """The result of a dry run of a fetch, see :func:`core.utils.fetchers.BaseFetcher.BaseFetcher.estimate_emails`."""
+
+    message_count: int = 0
+    """The number of messages matching the criterion."""
+
+    total_size: int = 0
+    """The total size of the matching messages in bytes as reported by the server."""
+
+    known_count: int = 0
+    """The number of matching messages that are already in the db, as far as the server allows to tell."""
@@ -21,6 +21,7 @@
 from __future__ import annotations
 
 import imaplib
+import re
 from itertools import batched
 from typing import TYPE_CHECKING, override
 
@@ -30,12 +31,21 @@ from imap_tools.imap_utf7 import utf7_encode
 from core.constants import (
     EmailFetchingCriterionChoices,
     EmailProtocolChoices,
+    HeaderFields,
+)
+from core.utils.fetchers.BodyStructure import BodyStructure
+from core.utils.fetchers.DeflateSocket import DeflateSocket
+from core.utils.fetchers.exceptions import (
+    FetcherError,
+    MailAccountError,
+    MailboxError,
 )
-from core.utils.fetchers.exceptions import FetcherError, MailAccountError
 from core.utils.fetchers.SafeIMAPMixin import SafeIMAPMixin
-from core.utils.mail_parsing import parse_IMAP_mailbox_data
+from core.utils.mail_parsing import parse_IMAP_mailbox_data, scan_headers
+from eonvelope.utils.workarounds import get_config
 
 from .BaseFetcher import BaseFetcher
+from .FetchEstimate import FetchEstimate
 
 if TYPE_CHECKING:
     from collections.abc import Generator
@@ -83,6 +93,7 @@ class IMAP4Fetcher(BaseFetcher, SafeIMAPMixin):
         EmailFetchingCriterionChoices.UNKEYWORD,
         EmailFetchingCriterionChoices.LARGER,
         EmailFetchingCriterionChoices.SMALLER,
+        EmailFetchingCriterionChoices.INCREMENTAL,
     )
     """Tuple of all criteria available for fetching. Refers to :class:`MailFetchingCriteria`.
     Must be immutable!
@@ -91,6 +102,25 @@ class IMAP4Fetcher(BaseFetcher, SafeIMAPMixin):
     """
 
     EMAIL_FETCH_BATCH_SIZE = 100
+    """The maximum number of messages probed and downloaded in one request.
+    The batches are further split to stay below the `IMAP_FETCH_BATCH_MAX_SIZE` setting.
+    """
+
+    HEADER_PROBE_FETCH_ITEMS = (
+        "(UID RFC822.SIZE BODY.PEEK[HEADER.FIELDS (MESSAGE-ID X-SPAM-FLAG)])"
+    )
+    """The message data items fetched to decide whether a message needs to be downloaded."""
+
+    SIZE_PROBE_FETCH_ITEMS = "(UID RFC822.SIZE)"
+    """The message data items fetched to split a batch by size if the headers are not probed."""
+
+    STRUCTURE_PROBE_FETCH_ITEMS = "(UID RFC822.SIZE BODYSTRUCTURE)"
+    """The message data items fetched to decide which parts of a message need to be downloaded."""
+
+    IDLE_TIMEOUT = 29 * 60
+    """The maximum duration of a single IDLE command in seconds.
+    RFC 2177 requires clients to reissue IDLE at least every 29 minutes to avoid being logged off.
+    """
 
     @override
     def __init__(self, account: Account) -> None:
@@ -101,10 +131,16 @@ class IMAP4Fetcher(BaseFetcher, SafeIMAPMixin):
         """
         super().__init__(account)
 
+        self._deflate_socket: DeflateSocket | None = None
+        self._idle_uidnexts: dict[int, int] = {}
         self.connect_to_host()
         self.safe_login(  # dont use kwargs here, this would kill the utf-8 fallback!
             self.account.mail_address, self.account.password
         )
+        if self.account.use_compression:
+            self.enable_compression()
+        if self.supports_condstore and "ENABLE" in self._mail_client.capabilities:
+            self.safe_enable("CONDSTORE")
 
     @override
     def connect_to_host(self) -> None:
@@ -130,6 +166,30 @@ class IMAP4Fetcher(BaseFetcher, SafeIMAPMixin):
             raise MailAccountError(error, _("connecting")) from error
         self.logger.info("Successfully connected to %s.", self.account)
 
+    def enable_compression(self) -> None:
+        """Compresses the connection with the COMPRESS=DEFLATE extension (RFC 4978) if the server supports it.
+
+        Many servers only announce the extension after login,
+        so the capabilities are requested again if it is missing.
+        Failing to enable compression is logged, the connection stays uncompressed in that case.
+        """
+        if not self.supports_compression:
+            response = self.safe_capability()
+            if response is not None and response[0] == "OK":
+                self._mail_client.capabilities = tuple(
+                    response[1][-1].decode().upper().split()
+                )
+        if not self.supports_compression:
+            self.logger.debug("%s does not support compression.", self.account)
+            return
+        self.logger.debug("Enabling compression for %s ...", self.account)
+        response = self.safe_xatom("COMPRESS", "DEFLATE")
+        if response is None or response[0] != "OK":
+            return
+        self._deflate_socket = DeflateSocket(self._mail_client.sock)
+        self._mail_client.sock = self._deflate_socket  # type: ignore[assignment]  # the wrapper passes on all other socket attributes
+        self.logger.info("Successfully enabled compression for %s.", self.account)
+
     @override
     def test(self, mailbox: Mailbox | None = None) -> None:
         """Tests the connection to the mailserver and, if a mailbox is provided, whether it can be opened and listed.
@@ -163,6 +223,18 @@ class IMAP4Fetcher(BaseFetcher, SafeIMAPMixin):
     ) -> Generator[bytes]:
         """Fetches and returns maildata from a mailbox based on a given criterion.
 
+        For the :attr:`core.constants.EmailFetchingCriterionChoices.INCREMENTAL` criterion
+        only messages with a UID above :attr:`core.models.Mailbox.Mailbox.imap_highest_uid` are fetched.
+        The sync state of the mailbox is advanced after every completely consumed batch.
+        If the server supports CONDSTORE, an unchanged HIGHESTMODSEQ skips the search entirely.
+        For all other criteria the progress is recorded in the mailbox after every consumed batch,
+        an interrupted fetch with the same criterion resumes from there,
+        see :meth:`core.models.Mailbox.Mailbox.start_fetch_progress`.
+
+        Before downloading a batch of messages, their Message-ID and X-Spam-Flag headers are probed
+        and only messages that are neither in the db nor thrown out as spam are downloaded.
+        The batches are split by the sizes of the messages, see :meth:`_fetch_messages`.
+
         Args:
             mailbox: Database model of the mailbox to fetch data from.
             criterion: Formatted criterion to filter mails in the IMAP request.
@@ -178,19 +250,33 @@ class IMAP4Fetcher(BaseFetcher, SafeIMAPMixin):
         """
         super().fetch_emails(mailbox, criterion)
 
-        search_criterion = criterion.as_imap_criterion()
+        is_incremental = criterion == EmailFetchingCriterionChoices.INCREMENTAL
 
         self.logger.debug(
             "Searching and fetching %s messages in %s...",
-            search_criterion,
+            criterion,
             mailbox,
         )
         self.logger.debug("Opening mailbox %s ...", mailbox)
         self.safe_select(utf7_encode(mailbox.name), readonly=True)
         self.logger.debug("Successfully opened mailbox.")
 
+        highestmodseq = None
+        if is_incremental:
+            if self.supports_condstore:
+                highestmodseq = self._get_selected_mailbox_status("HIGHESTMODSEQ")
+            search_criterion = self._prepare_incremental_search(mailbox, highestmodseq)
+            if search_criterion is None:
+                self.logger.info(
+                    "%s is unchanged since the last sync, nothing to fetch.", mailbox
+                )
+                self.safe_unselect()
+                return
+        else:
+            search_criterion = criterion.as_imap_criterion()
+
         self.logger.debug("Searching %s messages in %s ...", search_criterion, mailbox)
-        if "SORT" in self._mail_client.capabilities:
+        if "SORT" in self._mail_client.capabilities and not is_incremental:
             _, message_uids = self.safe_uid("SORT", "(DATE)", "UTF-8", search_criterion)
         else:
             _, message_uids = self.safe_uid("SEARCH", search_criterion)
@@ -203,21 +289,12 @@ class IMAP4Fetcher(BaseFetcher, SafeIMAPMixin):
 
         self.logger.debug("Fetching %s messages in %s ...", search_criterion, mailbox)
         message_uid_list = message_uids[0].split()
-        for uids in batched(
-            message_uid_list, self.EMAIL_FETCH_BATCH_SIZE, strict=False
-        ):
-            try:
-                _, message_data = self.safe_uid("FETCH", b",".join(uids), "(RFC822)")
-            except FetcherError:
-                self.logger.warning(
-                    "Failed to fetch messages %s from %s!",
-                    uids,
-                    mailbox,
-                    exc_info=True,
-                )
-                continue
-            for _, message in message_data[::2]:
-                yield message
+        if is_incremental:
+            yield from self._fetch_new_messages(
+                mailbox, message_uid_list, highestmodseq
+            )
+        else:
+            yield from self._fetch_listed_messages(mailbox, criterion, message_uid_list)
         self.logger.debug(
             "Successfully fetched %s messages from %s.",
             search_criterion,
@@ -234,6 +311,714 @@ class IMAP4Fetcher(BaseFetcher, SafeIMAPMixin):
             mailbox,
         )
 
+    @override
+    def estimate_emails(
+        self,
+        mailbox: Mailbox,
+        criterion: FetchingCriterion = BaseFetcher.DEFAULT_FETCHING_CRITERION,
+    ) -> FetchEstimate:
+        """Estimates what fetching emails based on a given criterion would download.
+
+        The matching messages are searched like in :meth:`fetch_emails`
+        and their sizes and Message-IDs are probed in batches of :attr:`EMAIL_FETCH_BATCH_SIZE`.
+
+        Args:
+            mailbox: Database model of the mailbox to estimate the fetch for.
+            criterion: Formatted criterion to filter mails in the IMAP request.
+                Defaults to :attr:`eonvelope.MailFetchingCriteria.ALL`.
+
+        Returns:
+            The number, total size and number of already known messages that match the criterion.
+
+        Raises:
+            ValueError: If the :attr:`mailbox` does not belong to :attr:`self.account`.
+                If :attr:`criterion` is not in :attr:`IMAP4Fetcher.AVAILABLE_FETCHING_CRITERIA`.
+            MailboxError: If an error occurs or a bad response is returned during an action on the mailbox.
+        """
+        super().estimate_emails(mailbox, criterion)
+
+        self.logger.debug(
+            "Estimating fetch of %s messages in %s ...", criterion, mailbox
+        )
+        self.safe_select(utf7_encode(mailbox.name), readonly=True)
+
+        highest_uid = 0
+        if criterion == EmailFetchingCriterionChoices.INCREMENTAL:
+            if (
+                self._get_selected_mailbox_status("UIDVALIDITY")
+                == mailbox.imap_uidvalidity
+            ):
+                highest_uid = mailbox.imap_highest_uid
+            search_criterion = f"UID {highest_uid + 1}:*"
+        else:
+            search_criterion = criterion.as_imap_criterion()
+        _, message_uids = self.safe_uid("SEARCH", search_criterion)
+        # the range n:* always matches the highest uid, even if it is below n
+        message_uid_list = [
+            uid for uid in message_uids[0].split() if int(uid) > highest_uid
+        ]
+
+        estimate = FetchEstimate()
+        for uids in batched(
+            message_uid_list, self.EMAIL_FETCH_BATCH_SIZE, strict=False
+        ):
+            _, header_data = self.safe_uid(
+                "FETCH", b",".join(uids), self.HEADER_PROBE_FETCH_ITEMS
+            )
+            message_sizes = self._parse_message_sizes(header_data)
+            header_blocks = self._parse_header_blocks(header_data)
+            estimate.message_count += len(uids)
+            estimate.total_size += sum(message_sizes.get(uid, 0) for uid in uids)
+            estimate.known_count += self.count_known_messages(
+                mailbox,
+                [
+                    scan_headers(header_block, [HeaderFields.MESSAGE_ID]).get(
+                        HeaderFields.MESSAGE_ID
+                    )
+                    for header_block in header_blocks.values()
+                ],
+            )
+
+        self.safe_unselect()
+        self.logger.debug("Successfully estimated fetch: %s.", estimate)
+        return estimate
+
+    def _fetch_new_messages(
+        self,
+        mailbox: Mailbox,
+        message_uid_list: list[bytes],
+        highestmodseq: int | None,
+    ) -> Generator[bytes]:
+        """Downloads the messages found by an incremental search and advances the sync state of the mailbox.
+
+        Args:
+            mailbox: The selected mailbox.
+            message_uid_list: The uIDs found by the incremental search.
+            highestmodseq: The current HIGHESTMODSEQ of the mailbox. None if unknown.
+
+        Yields:
+            The downloaded messages.
+        """
+        # the range n:* always matches the highest uid, even if it is below n
+        message_uid_list = sorted(
+            (uid for uid in message_uid_list if int(uid) > mailbox.imap_highest_uid),
+            key=int,
+        )
+        # in a running incremental sync all messages are new, probing them would be wasted
+        is_probing_headers = mailbox.imap_highest_uid == 0
+        is_sync_state_advancing = True
+        for uids in batched(
+            message_uid_list, self.EMAIL_FETCH_BATCH_SIZE, strict=False
+        ):
+            is_batch_complete = yield from self._fetch_messages(
+                mailbox, uids, is_probing_headers=is_probing_headers
+            )
+            if not is_batch_complete:
+                # the failed messages must be fetched again in the next sync
+                is_sync_state_advancing = False
+                continue
+            if is_sync_state_advancing:
+                mailbox.imap_highest_uid = int(uids[-1])
+                mailbox.save(update_fields=["imap_highest_uid"])
+        if is_sync_state_advancing and highestmodseq != mailbox.imap_highestmodseq:
+            mailbox.imap_highestmodseq = highestmodseq
+            mailbox.save(update_fields=["imap_highestmodseq"])
+
+    def _fetch_listed_messages(
+        self,
+        mailbox: Mailbox,
+        criterion: FetchingCriterion,
+        message_uid_list: list[bytes],
+    ) -> Generator[bytes]:
+        """Downloads the messages found by a search and records the progress in the mailbox.
+
+        The progress is advanced after every consumed batch until a batch fails to download,
+        an interrupted or incomplete fetch with the same criterion resumes after the last complete batch.
+
+        Args:
+            mailbox: The selected mailbox.
+            criterion: The criterion of the search.
+            message_uid_list: The uIDs found by the search.
+
+        Yields:
+            The downloaded messages.
+        """
+        resume_index = mailbox.start_fetch_progress(
+            criterion, [uid.decode() for uid in message_uid_list]
+        )
+        is_progress_advancing = True
+        for uids in batched(
+            message_uid_list[resume_index:], self.EMAIL_FETCH_BATCH_SIZE, strict=False
+        ):
+            is_batch_complete = yield from self._fetch_messages(
+                mailbox, uids, is_probing_headers=True
+            )
+            if not is_batch_complete:
+                # the failed messages must be fetched again when the fetch is resumed
+                is_progress_advancing = False
+            if is_progress_advancing:
+                mailbox.advance_fetch_progress(uids[-1].decode(), len(uids))
+        if is_progress_advancing:
+            mailbox.finish_fetch_progress()
+        else:
+            self.logger.warning(
+                "Failed to fetch some messages from %s, keeping the fetch progress to retry them.",
+                mailbox,
+            )
+
+    def _fetch_messages(
+        self, mailbox: Mailbox, uids: tuple[bytes, ...], *, is_probing_headers: bool
+    ) -> Generator[bytes, None, bool]:
+        """Downloads messages from the selected mailbox.
+
+        The sizes come from the header probe or, if the headers are not probed, from a probe of the sizes alone,
+        see :meth:`_fetch_sized_messages`.
+        If the mailbox is set to partial fetching and its emails are not saved as eml,
+        the messages are downloaded without the parts that are not stored, see :meth:`_fetch_partial_messages`.
+
+        Args:
+            mailbox: The selected mailbox.
+            uids: The uIDs of the messages to download.
+            is_probing_headers: Whether to skip known messages by probing their headers first.
+
+        Yields:
+            The downloaded messages.
+
+        Returns:
+            Whether all messages were downloaded.
+        """
+        message_sizes = (
+            self._filter_new_message_uids(mailbox, uids) if is_probing_headers else None
+        )
+        if mailbox.partial_fetch and not mailbox.save_to_eml:
+            return (
+                yield from self._fetch_partial_messages(
+                    mailbox, uids if message_sizes is None else tuple(message_sizes)
+                )
+            )
+        if message_sizes is None:
+            message_sizes = self._fetch_message_sizes(mailbox, uids)
+        return (yield from self._fetch_sized_messages(mailbox, message_sizes))
+
+    def _fetch_sized_messages(
+        self, mailbox: Mailbox, message_sizes: dict[bytes, int]
+    ) -> Generator[bytes, None, bool]:
+        """Downloads messages from the selected mailbox in requests bounded by the size of the messages.
+
+        Consecutive messages are downloaded together as long as their total size stays below
+        the `IMAP_FETCH_BATCH_MAX_SIZE` setting.
+        Messages above that size are downloaded on their own.
+
+        Args:
+            mailbox: The selected mailbox.
+            message_sizes: The sizes of the messages to download by uID.
+
+        Yields:
+            The downloaded messages.
+
+        Returns:
+            Whether all messages were downloaded.
+        """
+        max_batch_size = get_config("IMAP_FETCH_BATCH_MAX_SIZE")
+
+        is_complete = True
+        uid_batch: list[bytes] = []
+        uid_batch_size = 0
+        for uid, size in [*message_sizes.items(), (None, 0)]:
+            if uid_batch and (uid is None or uid_batch_size + size > max_batch_size):
+                messages = self._fetch_message_batch(mailbox, uid_batch)
+                if messages is None:
+                    is_complete = False
+                else:
+                    yield from messages
+                uid_batch = []
+                uid_batch_size = 0
+            if uid is None:
+                continue
+            uid_batch.append(uid)
+            uid_batch_size += size
+        return is_complete
+
+    def _fetch_partial_messages(
+        self, mailbox: Mailbox, uids: tuple[bytes, ...]
+    ) -> Generator[bytes, None, bool]:
+        """Downloads messages from the selected mailbox without the parts that are not stored.
+
+        The structures of the messages are probed first.
+        Messages with parts that are skipped, see :meth:`_find_skipped_sections`,
+        are assembled from their header and the other parts, see :meth:`_fetch_message_parts`.
+        All other messages are downloaded fully, see :meth:`_fetch_sized_messages`.
+
+        Args:
+            mailbox: The selected mailbox.
+            uids: The uIDs of the messages to download.
+
+        Yields:
+            The downloaded messages.
+
+        Returns:
+            Whether all messages were downloaded.
+        """
+        if not uids:
+            return True
+        try:
+            _, structure_data = self.safe_uid(
+                "FETCH", b",".join(uids), self.STRUCTURE_PROBE_FETCH_ITEMS
+            )
+        except FetcherError:
+            self.logger.warning(
+                "Failed to fetch structures of messages %s from %s, fetching them fully.",
+                uids,
+                mailbox,
+                exc_info=True,
+            )
+            structure_data = []
+        message_sizes = self._parse_message_sizes(structure_data)
+        structures = BodyStructure.from_fetch_data(structure_data)
+
+        is_complete = True
+        full_message_sizes: dict[bytes, int] = {}
+        for uid in [*uids, None]:
+            structure = structures.get(uid) if uid is not None else None
+            skipped_sections = (
+                self._find_skipped_sections(structure) if structure else set()
+            )
+            if full_message_sizes and (uid is None or skipped_sections):
+                is_batch_complete = yield from self._fetch_sized_messages(
+                    mailbox, full_message_sizes
+                )
+                is_complete = is_complete and is_batch_complete
+                full_message_sizes = {}
+            if uid is None:
+                continue
+            if structure is None or not skipped_sections:
+                full_message_sizes[uid] = message_sizes.get(uid, 0)
+                continue
+            message = self._fetch_message_parts(
+                mailbox, uid, structure, skipped_sections
+            )
+            if message is None:
+                is_complete = False
+                continue
+            yield message
+        return is_complete
+
+    @staticmethod
+    def _find_skipped_sections(structure: BodyStructure) -> set[str]:
+        """Finds the parts of a message that don't need to be downloaded.
+
+        These are the parts that qualify as attachment but are of a content type
+        that is excluded by the `DONT_PARSE_CONTENT_MAINTYPES` or `DONT_PARSE_CONTENT_SUBTYPES` settings,
+        see :func:`core.models.Attachment.Attachment.create_from_parsed_email`.
+
+        Args:
+            structure: The structure of the message.
+
+        Returns:
+            The section specifiers of the parts to skip.
+            Empty if the message is not a multipart or can't be assembled from its parts.
+        """
+        if not structure.is_multipart or any(
+            "boundary" not in part.parameters
+            for part in structure.walk()
+            if part.is_multipart
+        ):
+            return set()
+        ignore_maintypes = get_config("DONT_PARSE_CONTENT_MAINTYPES")
+        ignore_subtypes = get_config("DONT_PARSE_CONTENT_SUBTYPES")
+        return {
+            part.section
+            for part in structure.walk()
+            if not part.is_multipart
+            and (
+                part.content_disposition
+                or part.content_maintype != "text"
+                or part.content_subtype not in ["plain", "html"]
+            )
+            and (
+                part.content_maintype in ignore_maintypes
+                or part.content_subtype in ignore_subtypes
+            )
+        }
+
+    def _fetch_message_parts(
+        self,
+        mailbox: Mailbox,
+        uid: bytes,
+        structure: BodyStructure,
+        skipped_sections: set[str],
+    ) -> bytes | None:
+        """Downloads a message from the selected mailbox without some of its parts.
+
+        The headers of all parts are downloaded, so the message keeps its structure.
+        The skipped parts are left empty.
+
+        Args:
+            mailbox: The selected mailbox.
+            uid: The uID of the message to download.
+            structure: The structure of the message.
+            skipped_sections: The section specifiers of the parts to skip.
+
+        Returns:
+            The message assembled from the downloaded parts.
+            None if downloading the message failed.
+        """
+        fetch_items = ["BODY.PEEK[HEADER]"]
+        for part in structure.walk():
+            if not part.section:
+                continue
+            fetch_items.append(f"BODY.PEEK[{part.section}.MIME]")
+            if not part.is_multipart and part.section not in skipped_sections:
+                fetch_items.append(f"BODY.PEEK[{part.section}]")
+        try:
+            _, part_data = self.safe_uid("FETCH", uid, f"({' '.join(fetch_items)})")
+        except FetcherError:
+            self.logger.warning(
+                "Failed to fetch parts of message %s from %s!",
+                uid,
+                mailbox,
+                exc_info=True,
+            )
+            return None
+        contents = {}
+        for item in part_data:
+            if not isinstance(item, tuple):
+                continue
+            section_match = re.search(rb"BODY\[([^\]]*)\] \{\d+\}$", item[0])
+            if section_match is not None:
+                contents[section_match.group(1).decode()] = item[1]
+        self.logger.debug(
+            "Skipped parts %s of message %s in %s.", skipped_sections, uid, mailbox
+        )
+        return structure.assemble(contents)
+
+    def _fetch_message_batch(
+        self, mailbox: Mailbox, uids: list[bytes]
+    ) -> list[bytes] | None:
+        """Downloads a batch of messages from the selected mailbox.
+
+        Args:
+            mailbox: The selected mailbox.
+            uids: The uIDs of the messages to download.
+
+        Returns:
+            The downloaded messages.
+            None if downloading the messages failed.
+        """
+        try:
+            _, message_data = self.safe_uid("FETCH", b",".join(uids), "(RFC822)")
+        except FetcherError:
+            self.logger.warning(
+                "Failed to fetch messages %s from %s!",
+                uids,
+                mailbox,
+                exc_info=True,
+            )
+            return None
+        return [message for _, message in message_data[::2]]
+
+    def _fetch_message_sizes(
+        self, mailbox: Mailbox, uids: tuple[bytes, ...]
+    ) -> dict[bytes, int]:
+        """Probes the sizes of messages.
+
+        Args:
+            mailbox: The selected mailbox.
+            uids: The uIDs of the messages to probe.
+
+        Returns:
+            The sizes of the messages by uID, in the given order.
+            The size is 0 for messages whose size could not be fetched.
+        """
+        try:
+            _, size_data = self.safe_uid(
+                "FETCH", b",".join(uids), self.SIZE_PROBE_FETCH_ITEMS
+            )
+        except FetcherError:
+            self.logger.warning(
+                "Failed to fetch sizes of messages %s from %s, fetching them in one batch.",
+                uids,
+                mailbox,
+                exc_info=True,
+            )
+            size_data = []
+        message_sizes = self._parse_message_sizes(size_data)
+        return {uid: message_sizes.get(uid, 0) for uid in uids}
+
+    @staticmethod
+    def _parse_message_sizes(fetch_data: list) -> dict[bytes, int]:
+        """Parses the RFC822.SIZE items from the response to a FETCH command.
+
+        Args:
+            fetch_data: The response data of the FETCH command.
+
+        Returns:
+            The sizes of the messages by uID.
+            The size is 0 for messages without RFC822.SIZE item.
+        """
+        message_sizes: dict[bytes, int] = {}
+        for item in fetch_data:
+            envelope = item[0] if isinstance(item, tuple) else item
+            if not isinstance(envelope, bytes):
+                continue
+            uid_match = re.search(rb"UID (\d+)", envelope)
+            if uid_match is None:
+                continue
+            size_match = re.search(rb"RFC822\.SIZE (\d+)", envelope)
+            message_sizes[uid_match.group(1)] = (
+                int(size_match.group(1)) if size_match else 0
+            )
+        return message_sizes
+
+    @staticmethod
+    def _parse_header_blocks(fetch_data: list) -> dict[bytes, bytes]:
+        """Parses the header blocks from the response to a header probe.
+
+        Args:
+            fetch_data: The response data of the FETCH command.
+
+        Returns:
+            The header blocks of the messages by uID.
+        """
+        header_blocks: dict[bytes, bytes] = {}
+        for item in fetch_data:
+            if not isinstance(item, tuple):
+                continue
+            envelope, header_bytes = item
+            uid_match = re.search(rb"UID (\d+)", envelope)
+            if uid_match is None:
+                continue
+            header_blocks[uid_match.group(1)] = header_bytes
+        return header_blocks
+
+    def _filter_new_message_uids(
+        self, mailbox: Mailbox, uids: tuple[bytes, ...]
+    ) -> dict[bytes, int]:
+        """Probes the identifying headers of messages and filters out the ones that don't need to be downloaded.
+
+        Messages that are already in the db or, if THROW_OUT_SPAM is set, are flagged as spam are dropped.
+        Messages without Message-ID and messages whose headers could not be fetched are always kept,
+        they can only be identified by their full content.
+
+        Args:
+            mailbox: The selected mailbox.
+            uids: The uIDs of the messages to probe.
+
+        Returns:
+            The sizes of the messages that need to be downloaded by uID, in the given order.
+            The size is 0 for messages whose size could not be fetched.
+        """
+        try:
+            _, header_data = self.safe_uid(
+                "FETCH", b",".join(uids), self.HEADER_PROBE_FETCH_ITEMS
+            )
+        except FetcherError:
+            self.logger.warning(
+                "Failed to fetch headers of messages %s from %s, fetching them fully.",
+                uids,
+                mailbox,
+                exc_info=True,
+            )
+            return dict.fromkeys(uids, 0)
+
+        header_blocks = self._parse_header_blocks(header_data)
+        message_sizes = self._parse_message_sizes(header_data)
+
+        is_download_required = self.check_downloads_required(
+            mailbox, [header_blocks.get(uid) for uid in uids]
+        )
+        uids_to_fetch = {
+            uid: message_sizes.get(uid, 0)
+            for uid, is_required in zip(uids, is_download_required, strict=True)
+            if is_required
+        }
+        self.logger.debug(
+            "Skipping %d of %d messages with a total size of %d bytes in %s, they are spam or already in the db.",
+            len(uids) - len(uids_to_fetch),
+            len(uids),
+            sum(
+                size for uid, size in message_sizes.items() if uid not in uids_to_fetch
+            ),
+            mailbox,
+        )
+        return uids_to_fetch
+
+    def wait_for_new_emails(
+        self, mailbox: Mailbox, timeout: float = IDLE_TIMEOUT
+    ) -> bool:
+        """Waits in IDLE state until the server announces new messages in a mailbox.
+
+        The server signals new messages with an untagged EXISTS response.
+        Messages that arrived after the last fetch but before idling are not announced,
+        so the UIDNEXT of the mailbox is compared to the highest fetched UID beforehand.
+        Which of the messages are new is left to an incremental fetch.
+
+        Args:
+            mailbox: Database model of the mailbox to listen to.
+            timeout: The maximum number of seconds to wait. Must not exceed :attr:`IDLE_TIMEOUT`.
+                Defaults to :attr:`IDLE_TIMEOUT`.
+
+        Returns:
+            Whether there are unfetched messages or the server announced new messages before the timeout.
+
+        Raises:
+            ValueError: If the :attr:`mailbox` does not belong to :attr:`self.account`.
+            MailboxError: If the server doesn't support IDLE,
+                or an error occurs or a bad response is returned during an action on the mailbox.
+        """
+        if mailbox.account != self.account:
+            self.logger.error("%s is not in %s!", mailbox, self.account)
+            raise ValueError(f"{mailbox} is not in {self.account}!")
+        if not self.supports_idle:
+            self.logger.error("%s does not support IDLE!", self.account)
+            raise MailboxError(
+                NotImplementedError(_("The server does not support IDLE.")),
+                _("idling"),
+            )
+
+        self.logger.debug("Opening mailbox %s ...", mailbox)
+        self.safe_select(utf7_encode(mailbox.name), readonly=True)
+        self.logger.debug("Successfully opened mailbox.")
+        # the EXISTS response to SELECT must not be mistaken for new messages
+        self._mail_client.response("EXISTS")
+        if self._has_unfetched_emails(mailbox):
+            self.logger.debug("%s has messages that have not been fetched.", mailbox)
+            self.logger.debug("Leaving mailbox %s ...", mailbox)
+            self.safe_unselect()
+            self.logger.debug("Successfully left mailbox.")
+            return True
+
+        self.logger.debug("Idling in %s for up to %s seconds ...", mailbox, timeout)
+        try:
+            with self._mail_client.idle(duration=timeout) as idler:
+                has_new_emails = any(
+                    response_type == "EXISTS" for response_type, _ in idler
+                )
+        except (imaplib.IMAP4.error, OSError) as error:
+            self.logger.exception("Error while idling in %s!", mailbox)
+            raise MailboxError(error, _("idling")) from error
+        self.logger.debug(
+            "Stopped idling in %s, new messages announced: %s.",
+            mailbox,
+            has_new_emails,
+        )
+
+        self.logger.debug("Leaving mailbox %s ...", mailbox)
+        self.safe_unselect()
+        self.logger.debug("Successfully left mailbox.")
+        return has_new_emails
+
+    def _has_unfetched_emails(self, mailbox: Mailbox) -> bool:
+        """Checks whether the selected mailbox has received messages since the last incremental fetch.
+
+        A UIDNEXT that was already checked in a previous call is ignored,
+        so messages that were expunged before being fetched don't keep triggering fetches.
+
+        Args:
+            mailbox: The selected mailbox.
+
+        Returns:
+            Whether the server reports UIDs above the highest fetched one.
+        """
+        uidnext = self._get_selected_mailbox_status("UIDNEXT")
+        if uidnext is None or uidnext == self._idle_uidnexts.get(mailbox.pk):
+            return False
+        self._idle_uidnexts[mailbox.pk] = uidnext
+        return (
+            self._get_selected_mailbox_status("UIDVALIDITY") != mailbox.imap_uidvalidity
+            or uidnext > mailbox.imap_highest_uid + 1
+        )
+
+    @property
+    def supports_idle(self) -> bool:
+        """Whether the server supports the IDLE extension (RFC 2177).
+
+        Returns:
+            Whether IDLE is in the server capabilities.
+        """
+        return "IDLE" in self._mail_client.capabilities
+
+    @property
+    def supports_compression(self) -> bool:
+        """Whether the server supports the COMPRESS=DEFLATE extension (RFC 4978).
+
+        Returns:
+            Whether COMPRESS=DEFLATE is in the server capabilities.
+        """
+        return "COMPRESS=DEFLATE" in self._mail_client.capabilities
+
+    @property
+    def supports_condstore(self) -> bool:
+        """Whether the server supports the CONDSTORE extension (RFC 7162).
+
+        Returns:
+            Whether CONDSTORE or QRESYNC, which implies CONDSTORE, is in the server capabilities.
+        """
+        capabilities = self._mail_client.capabilities
+        return "CONDSTORE" in capabilities or "QRESYNC" in capabilities
+
+    def _get_selected_mailbox_status(self, response_code: str) -> int | None:
+        """Reads a numeric response code that the server sent when selecting the mailbox.
+
+        Args:
+            response_code: The name of the response code, e.g. UIDVALIDITY or HIGHESTMODSEQ.
+
+        Returns:
+            The value of the response code. None if the server didn't send it.
+        """
+        _, response_data = self._mail_client.response(response_code)
+        if not response_data or not response_data[-1]:
+            return None
+        try:
+            return int(response_data[-1])
+        except ValueError:
+            self.logger.warning(
+                "Invalid %s response %s from server.", response_code, response_data
+            )
+            return None
+
+    def _prepare_incremental_search(
+        self, mailbox: Mailbox, highestmodseq: int | None
+    ) -> str | None:
+        """Checks the sync state of the currently selected mailbox and builds the search for new messages.
+
+        If the UIDVALIDITY reported by the server differs from the stored one,
+        the stored UIDs are meaningless and the sync state of the mailbox is reset,
+        resulting in a full resync.
+        Servers that never report a UIDVALIDITY keep their stored UIDs.
+        If the HIGHESTMODSEQ reported by the server is unchanged, nothing has happened in the mailbox.
+
+        Args:
+            mailbox: The selected mailbox.
+            highestmodseq: The HIGHESTMODSEQ of the selected mailbox.
+                None if the server doesn't support CONDSTORE.
+
+        Returns:
+            The UID range criterion for all messages that have not been fetched yet.
+            None if the mailbox is unchanged since the last sync.
+        """
+        uidvalidity = self._get_selected_mailbox_status("UIDVALIDITY")
+        if uidvalidity != mailbox.imap_uidvalidity:
+            self.logger.info(
+                "UIDVALIDITY of %s changed from %s to %s, resyncing all messages.",
+                mailbox,
+                mailbox.imap_uidvalidity,
+                uidvalidity,
+            )
+            mailbox.imap_uidvalidity = uidvalidity
+            mailbox.imap_highest_uid = 0
+            mailbox.imap_highestmodseq = None
+            mailbox.save(
+                update_fields=[
+                    "imap_uidvalidity",
+                    "imap_highest_uid",
+                    "imap_highestmodseq",
+                ]
+            )
+        elif highestmodseq is not None and highestmodseq == mailbox.imap_highestmodseq:
+            return None
+        return f"UID {mailbox.imap_highest_uid + 1}:*"
+
     @override
     def fetch_mailboxes(self) -> list[tuple[str, str]]:
         """Retrieves and returns the data of the mailboxes in the account.
@@ -280,4 +1065,10 @@ class IMAP4Fetcher(BaseFetcher, SafeIMAPMixin):
         """Logs out of the account and closes the connection to the IMAP server if it is open."""
         self.logger.debug("Closing connection to %s ...", self.account)
         self.safe_logout()
+        if self._deflate_socket is not None:
+            self.logger.info(
+                "Compression saved %d of %d received bytes.",
+                self._deflate_socket.saved_bytes,
+                self._deflate_socket.decompressed_bytes_received,
+            )
         self.logger.info("Successfully closed connection to %s.", self.account)
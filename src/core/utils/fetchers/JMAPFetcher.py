@@ -20,6 +20,10 @@
 
 from __future__ import annotations
 
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import batched
+from tempfile import SpooledTemporaryFile
 from typing import TYPE_CHECKING, override
 
 import jmapc
@@ -34,9 +38,11 @@ from eonvelope.utils.workarounds import get_config
 
 from .BaseFetcher import BaseFetcher
 from .exceptions import BadServerResponseError, MailAccountError, MailboxError
+from .FetchEstimate import FetchEstimate
 
 if TYPE_CHECKING:
-    from collections.abc import Generator
+    from collections.abc import Generator, Iterable, Sequence
+    from concurrent.futures import Future
 
     from core.models.Account import Account
     from core.models.Email import Email
@@ -56,6 +62,7 @@ class JMAPFetcher(BaseFetcher):
 
     AVAILABLE_FETCHING_CRITERIA = (
         EmailFetchingCriterionChoices.ALL,
+        EmailFetchingCriterionChoices.INCREMENTAL,
         EmailFetchingCriterionChoices.SEEN,
         EmailFetchingCriterionChoices.UNSEEN,
         EmailFetchingCriterionChoices.DRAFT,
@@ -76,6 +83,15 @@ class JMAPFetcher(BaseFetcher):
     Must be immutable!
     """
 
+    MAX_CONCURRENT_DOWNLOADS = 4
+    """Number of message blobs that are downloaded at the same time."""
+
+    BLOB_SPOOL_MAX_MEMORY_SIZE = 5 * 1024 * 1024
+    """Size in bytes above which downloaded message blobs are spooled to disk."""
+
+    BLOB_CHUNK_SIZE = 64 * 1024
+    """Size in bytes of the chunks that message blobs are streamed in."""
+
     @override
     def __init__(self, account: Account) -> None:
         super().__init__(account)
@@ -165,6 +181,143 @@ class JMAPFetcher(BaseFetcher):
             mailbox,
         )
 
+        mailbox_id = self._query_mailbox_id(mailbox)
+
+        if criterion == EmailFetchingCriterionChoices.INCREMENTAL:
+            yield from self._fetch_new_emails(mailbox, mailbox_id)
+            return
+
+        criterion_filter = criterion.as_jmap_filter()
+        criterion_filter.in_mailbox = mailbox_id
+        self.logger.debug("Querying %s messages in %s ...", criterion, mailbox)
+        emails = list(self._query_emails(mailbox, criterion_filter))
+        resume_index = mailbox.start_fetch_progress(
+            criterion, [email.id for email in emails]
+        )
+        for email_batch in batched(
+            emails[resume_index:], self._page_size, strict=False
+        ):
+            yield from self._download_blobs(mailbox, email_batch)
+            mailbox.advance_fetch_progress(email_batch[-1].id, len(email_batch))
+        mailbox.finish_fetch_progress()
+
+    @override
+    def estimate_emails(
+        self,
+        mailbox: Mailbox,
+        criterion: FetchingCriterion = BaseFetcher.DEFAULT_FETCHING_CRITERION,
+    ) -> FetchEstimate:
+        """Estimates what fetching emails based on a given criterion would download.
+
+        The matching messages are queried like in :meth:`fetch_emails`, but with their size and Message-ID instead of their blob id.
+
+        Args:
+            mailbox: Database model of the mailbox to estimate the fetch for.
+            criterion: Formatted criterion to filter mails by.
+                Defaults to :attr:`eonvelope.MailFetchingCriteria.ALL`.
+
+        Returns:
+            The number, total size and number of already known messages that match the criterion.
+
+        Raises:
+            ValueError: If the :attr:`mailbox` does not belong to :attr:`self.account`.
+                If :attr:`criterion` is not in :attr:`JMAPFetcher.AVAILABLE_FETCHING_CRITERIA`.
+            MailAccountError: If an error occurs or a bad response is returned.
+            MailboxError: If the mailbox is not found or a bad response is returned.
+        """
+        super().estimate_emails(mailbox, criterion)
+
+        self.logger.debug(
+            "Estimating fetch of %s messages in %s ...", criterion, mailbox
+        )
+        mailbox_id = self._query_mailbox_id(mailbox)
+        properties = ("size", "messageId")
+        changes = (
+            self._get_created_emails(mailbox, mailbox_id, properties)
+            if criterion == EmailFetchingCriterionChoices.INCREMENTAL
+            and mailbox.jmap_email_state
+            else None
+        )
+        if changes is not None:
+            emails: Iterable[jmapc.Email] = changes[0]
+        else:
+            criterion_filter = (
+                jmapc.EmailQueryFilterCondition()
+                if criterion == EmailFetchingCriterionChoices.INCREMENTAL
+                else criterion.as_jmap_filter()
+            )
+            criterion_filter.in_mailbox = mailbox_id
+            emails = self._query_emails(mailbox, criterion_filter, properties)
+
+        estimate = FetchEstimate()
+        message_ids = []
+        for email in emails:
+            estimate.message_count += 1
+            estimate.total_size += email.size or 0
+            # JMAP strips the angle brackets from the Message-ID
+            message_ids.append(f"<{email.message_id[0]}>" if email.message_id else None)
+        estimate.known_count = self.count_known_messages(mailbox, message_ids)
+        self.logger.debug("Successfully estimated fetch: %s.", estimate)
+        return estimate
+
+    def _fetch_new_emails(self, mailbox: Mailbox, mailbox_id: str) -> Generator[bytes]:
+        """Downloads the messages that were created in the mailbox since the last sync.
+
+        The changes are requested with Email/changes since :attr:`core.models.Mailbox.Mailbox.jmap_email_state`.
+        Messages that were moved into the mailbox are updates, not creations, so they are not considered new.
+        If there is no stored state or the server can't calculate the changes, all messages in the mailbox are downloaded.
+        The new state is only stored once all messages have been downloaded.
+
+        Args:
+            mailbox: Database model of the mailbox to fetch data from.
+            mailbox_id: The JMAP id of the mailbox.
+
+        Yields:
+            The new mails in the mailbox.
+        """
+        changes = (
+            self._get_created_emails(mailbox, mailbox_id)
+            if mailbox.jmap_email_state
+            else None
+        )
+        emails: Iterable[jmapc.Email]
+        if changes is None:
+            # the state is requested first so that no message created during the query is missed
+            new_state = self._get_email_state()
+            self.logger.debug("Querying all messages in %s ...", mailbox)
+            emails = self._query_emails(
+                mailbox, jmapc.EmailQueryFilterCondition(in_mailbox=mailbox_id)
+            )
+        else:
+            emails, new_state = changes
+            self.logger.info("Found %s new messages in %s.", len(emails), mailbox)
+
+        yield from self._download_blobs(mailbox, emails)
+
+        if new_state != mailbox.jmap_email_state:
+            mailbox.jmap_email_state = new_state
+            mailbox.save(update_fields=["jmap_email_state"])
+
+    @property
+    def _page_size(self) -> int:
+        """The maximum number of objects per JMAP /get request announced by the server."""
+        return max(
+            1, self._mail_client.jmap_session.capabilities.core.max_objects_in_get
+        )
+
+    def _query_mailbox_id(self, mailbox: Mailbox) -> str:
+        """Queries the JMAP id of a mailbox.
+
+        Args:
+            mailbox: The mailbox to get the id for.
+
+        Returns:
+            The JMAP id of the mailbox.
+
+        Raises:
+            MailAccountError: If an error occurs or a bad response is returned.
+            MailboxError: If the mailbox is not found on the server.
+        """
         method = jmapc.methods.MailboxQuery(
             filter=jmapc.MailboxQueryFilterCondition(name=mailbox.name)
         )
@@ -187,62 +340,376 @@ class JMAPFetcher(BaseFetcher):
         if not result.ids or not isinstance(result.ids, list):
             raise MailboxError(IndexError("Mailbox not found"))
         self.logger.debug("Successfully queried mailbox.")
+        return result.ids[0]
 
-        criterion_filter = criterion.as_jmap_filter()
-        criterion_filter.in_mailbox = result.ids[0]
-        methods = (
-            jmapc.methods.EmailQuery(
-                sort=[jmapc.Comparator(property="receivedAt", is_ascending=True)],
-                filter=criterion_filter,
-            ),
-            jmapc.methods.EmailGet(
-                ids=jmapc.Ref("/ids"),
-                properties=[
-                    "blobId",
-                ],
-            ),
-        )
-        self.logger.debug("Querying %s messages in %s ...", criterion, mailbox)
+    def _query_emails(
+        self,
+        mailbox: Mailbox,
+        email_filter: jmapc.EmailQueryFilterCondition,
+        properties: Sequence[str] = ("blobId",),
+    ) -> Generator[jmapc.Email]:
+        """Queries the blob ids of all messages matching a filter.
+
+        The query is paged with the maximum number of objects per /get request of the server.
+
+        Args:
+            mailbox: The mailbox that is queried.
+            email_filter: The filter for the Email/query request.
+            properties: The properties of the messages to get. Defaults to the blob id.
+
+        Yields:
+            The messages matching the filter with the requested properties.
+
+        Raises:
+            MailAccountError: If an error occurs.
+            MailboxError: If a bad response is returned.
+        """
+        page_size = self._page_size
+        position = 0
+        while True:
+            methods = (
+                jmapc.methods.EmailQuery(
+                    sort=[jmapc.Comparator(property="receivedAt", is_ascending=True)],
+                    filter=email_filter,
+                    position=position,
+                    limit=page_size,
+                    calculate_total=position == 0,
+                ),
+                jmapc.methods.EmailGet(
+                    ids=jmapc.Ref("/ids"),
+                    properties=list(properties),
+                ),
+            )
+            try:
+                results = self._mail_client.request(methods)
+            except requests.RequestException as error:
+                self.logger.exception("Error connecting to %s!", self.account)
+                raise MailAccountError(error) from error
+            if not isinstance(results[1].response, jmapc.methods.EmailGetResponse):
+                self.logger.error("Error in response from %s!", self.account)
+                raise MailboxError(
+                    BadServerResponseError(results[1].response.to_json()),
+                    methods[1].jmap_method_name,
+                )
+            query_response = results[0].response
+            if position == 0 and query_response.total is not None:
+                self.logger.info(
+                    "Found %s matching messages in %s.", query_response.total, mailbox
+                )
+            yield from results[1].response.data
+
+            position += len(query_response.ids)
+            # the server may use a lower limit than requested
+            if len(query_response.ids) < (query_response.limit or page_size):
+                break
+        self.logger.debug("Successfully queried %s messages in %s.", position, mailbox)
+
+    def _get_email_state(self) -> str:
+        """Requests the current JMAP Email state of the account.
+
+        Returns:
+            The current Email state.
+
+        Raises:
+            MailAccountError: If an error occurs or a bad response is returned.
+        """
+        method = jmapc.methods.EmailGet(ids=[], properties=["id"])
         try:
-            results = self._mail_client.request(methods)
+            result = self._mail_client.request(method)
         except requests.RequestException as error:
             self.logger.exception("Error connecting to %s!", self.account)
             raise MailAccountError(error) from error
-        if not isinstance(results[1].response, jmapc.methods.EmailGetResponse):
+        except jmapc.ClientError as error:
+            self.logger.exception(
+                "Wrong number of responses for request to %s!", self.account
+            )
+            raise MailAccountError(
+                BadServerResponseError(str(error)), method.jmap_method_name
+            ) from error
+        if not isinstance(result, jmapc.methods.EmailGetResponse):
             self.logger.error("Error in response from %s!", self.account)
-            raise MailboxError(
-                BadServerResponseError(results[1].response.to_json()),
-                methods[1].jmap_method_name,
+            raise MailAccountError(
+                BadServerResponseError(result.to_json()), method.jmap_method_name
             )
-        self.logger.info(
-            "Found %s messages matching %s in %s.",
-            len(results[1].response.data),
-            criterion,
-            mailbox,
+        return result.state
+
+    def _get_created_emails(
+        self,
+        mailbox: Mailbox,
+        mailbox_id: str,
+        properties: Sequence[str] = ("blobId",),
+    ) -> tuple[list[jmapc.Email], str] | None:
+        """Requests the messages that were created in a mailbox since its stored JMAP Email state.
+
+        Note:
+            The Email state is account-wide, so the created messages are filtered by their mailbox.
+
+        Args:
+            mailbox: The mailbox to get the new messages for.
+            mailbox_id: The JMAP id of the mailbox.
+            properties: The properties of the messages to get. Defaults to the blob id.
+
+        Returns:
+            The new messages in the mailbox and the new Email state.
+            None if the server can't calculate the changes.
+
+        Raises:
+            MailAccountError: If an error occurs.
+            MailboxError: If a bad response is returned.
+        """
+        state = mailbox.jmap_email_state
+        created_ids: list[str] = []
+        self.logger.debug(
+            "Requesting email changes in %s since state %s ...", mailbox, state
         )
+        has_more_changes = True
+        while has_more_changes:
+            method = jmapc.methods.EmailChanges(since_state=state)
+            try:
+                result = self._mail_client.request(method)
+            except requests.RequestException as error:
+                self.logger.exception("Error connecting to %s!", self.account)
+                raise MailAccountError(error) from error
+            except jmapc.ClientError as error:
+                self.logger.exception(
+                    "Wrong number of responses for request to %s!", self.account
+                )
+                raise MailAccountError(
+                    BadServerResponseError(str(error)), method.jmap_method_name
+                ) from error
+            if (
+                isinstance(result, jmapc.Error)
+                and result.type == "cannotCalculateChanges"
+            ):
+                self.logger.info(
+                    "%s can not calculate the email changes since state %s, resyncing %s.",
+                    self.account,
+                    state,
+                    mailbox,
+                )
+                return None
+            if not isinstance(result, jmapc.methods.EmailChangesResponse):
+                self.logger.error("Error in response from %s!", self.account)
+                raise MailboxError(
+                    BadServerResponseError(result.to_json()), method.jmap_method_name
+                )
+            created_ids.extend(result.created)
+            state = result.new_state
+            has_more_changes = result.has_more_changes
+        self.logger.debug("Successfully requested email changes.")
 
-        self.logger.debug("Downloading matching message blobs from %s ...", mailbox)
-        for email in results[1].response.data:
-            blob_url = self._mail_client.jmap_session.download_url.format(
-                accountId=self._mail_client.account_id,
-                blobId=email.blob_id,
-                name="",
-                type="message/rfc822",
+        created_emails: list[jmapc.Email] = []
+        for ids in batched(created_ids, self._page_size, strict=False):
+            method = jmapc.methods.EmailGet(
+                ids=list(ids), properties=[*properties, "mailboxIds"]
             )
             try:
-                response = self._mail_client.requests_session.get(
-                    blob_url, stream=True, timeout=self.account.timeout
-                )
-                response.raise_for_status()
+                result = self._mail_client.request(method)
             except requests.RequestException as error:
                 self.logger.exception("Error connecting to %s!", self.account)
                 raise MailAccountError(error) from error
-            yield response.raw.data
+            except jmapc.ClientError as error:
+                self.logger.exception(
+                    "Wrong number of responses for request to %s!", self.account
+                )
+                raise MailAccountError(
+                    BadServerResponseError(str(error)), method.jmap_method_name
+                ) from error
+            if not isinstance(result, jmapc.methods.EmailGetResponse):
+                self.logger.error("Error in response from %s!", self.account)
+                raise MailboxError(
+                    BadServerResponseError(result.to_json()), method.jmap_method_name
+                )
+            created_emails.extend(
+                email
+                for email in result.data
+                if email.mailbox_ids and email.mailbox_ids.get(mailbox_id)
+            )
+        return created_emails, state
+
+    def _download_blobs(
+        self, mailbox: Mailbox, emails: Iterable[jmapc.Email]
+    ) -> Generator[bytes]:
+        """Downloads the blobs of messages concurrently.
+
+        At most :attr:`MAX_CONCURRENT_DOWNLOADS` blobs are downloaded at the same time
+        and at most twice as many are downloaded ahead of the consumer.
+        The blobs are yielded in the order of the messages.
+
+        Args:
+            mailbox: The mailbox the messages are in.
+            emails: The messages to download.
+
+        Yields:
+            The downloaded message blobs.
+
+        Raises:
+            MailAccountError: If an error occurs during a download.
+        """
+        self.logger.debug("Downloading matching message blobs from %s ...", mailbox)
+        pending_downloads: deque[Future[SpooledTemporaryFile[bytes]]] = deque()
+        executor = ThreadPoolExecutor(
+            max_workers=self.MAX_CONCURRENT_DOWNLOADS,
+            thread_name_prefix="jmap-download",
+        )
+        try:
+            for email in emails:
+                pending_downloads.append(
+                    executor.submit(self._download_blob, email.blob_id)
+                )
+                if len(pending_downloads) >= 2 * self.MAX_CONCURRENT_DOWNLOADS:
+                    with pending_downloads.popleft().result() as blob_file:
+                        yield blob_file.read()
+            while pending_downloads:
+                with pending_downloads.popleft().result() as blob_file:
+                    yield blob_file.read()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            for download in pending_downloads:
+                if not download.cancelled() and download.exception() is None:
+                    download.result().close()
         self.logger.debug("Successfully downloaded message blobs.")
 
+    def _download_blob(self, blob_id: str | None) -> SpooledTemporaryFile[bytes]:
+        """Downloads a blob into a spool file.
+
+        Blobs larger than :attr:`BLOB_SPOOL_MAX_MEMORY_SIZE` are rolled over to disk,
+        so blobs that are downloaded ahead don't need to be held in memory.
+
+        Args:
+            blob_id: The id of the blob to download.
+
+        Returns:
+            The spool file with the blob data, positioned at its start.
+
+        Raises:
+            MailAccountError: If an error occurs during the download.
+        """
+        blob_url = self._mail_client.jmap_session.download_url.format(
+            accountId=self._mail_client.account_id,
+            blobId=blob_id,
+            name="",
+            type="message/rfc822",
+        )
+        blob_file = SpooledTemporaryFile(  # noqa: SIM115 ; closed by the caller
+            max_size=self.BLOB_SPOOL_MAX_MEMORY_SIZE
+        )
+        try:
+            response = self._mail_client.requests_session.get(
+                blob_url, stream=True, timeout=self.account.timeout
+            )
+            try:
+                response.raise_for_status()
+                for chunk in response.iter_content(chunk_size=self.BLOB_CHUNK_SIZE):
+                    blob_file.write(chunk)
+            finally:
+                response.close()
+        except requests.RequestException as error:
+            blob_file.close()
+            self.logger.exception("Error connecting to %s!", self.account)
+            raise MailAccountError(error) from error
+        blob_file.seek(0)
+        return blob_file
+
     @override
     def fetch_mailboxes(self) -> list[tuple[str, str]]:
-        method = jmapc.methods.MailboxGet(ids=None, properties=["name", "role"])
+        """Fetches the names and roles of the mailboxes in the account.
+
+        If the Mailbox state of a previous call is stored in :attr:`core.models.Account.Account.jmap_mailbox_state`,
+        only the mailboxes that were created or updated since then are returned.
+        If there is no stored state or the server can't calculate the changes, all mailboxes are returned.
+        The stored state is reset when a mailbox is deleted or the connection data of the account changes.
+
+        Returns:
+            The names and roles of the mailboxes.
+
+        Raises:
+            MailAccountError: If an error occurs or a bad response is returned.
+        """
+        changes = (
+            self._get_changed_mailbox_ids() if self.account.jmap_mailbox_state else None
+        )
+        if changes is None:
+            mailboxes, new_state = self._get_mailboxes(None)
+        else:
+            changed_mailbox_ids, new_state = changes
+            mailboxes = (
+                self._get_mailboxes(changed_mailbox_ids)[0]
+                if changed_mailbox_ids
+                else []
+            )
+        if new_state != self.account.jmap_mailbox_state:
+            self.account.jmap_mailbox_state = new_state
+            self.account.save(update_fields=["jmap_mailbox_state"])
+        return mailboxes
+
+    def _get_changed_mailbox_ids(self) -> tuple[list[str], str] | None:
+        """Requests the ids of the mailboxes that were created or updated since the stored JMAP Mailbox state.
+
+        Returns:
+            The ids of the changed mailboxes and the new Mailbox state.
+            None if the server can't calculate the changes.
+
+        Raises:
+            MailAccountError: If an error occurs or a bad response is returned.
+        """
+        state = self.account.jmap_mailbox_state
+        changed_mailbox_ids: list[str] = []
+        self.logger.debug(
+            "Requesting mailbox changes in %s since state %s ...", self.account, state
+        )
+        has_more_changes = True
+        while has_more_changes:
+            method = jmapc.methods.MailboxChanges(since_state=state)
+            try:
+                result = self._mail_client.request(method)
+            except requests.RequestException as error:
+                self.logger.exception("Error connecting to %s!", self.account)
+                raise MailAccountError(error) from error
+            except jmapc.ClientError as error:
+                self.logger.exception(
+                    "Wrong number of responses for request to %s!", self.account
+                )
+                raise MailAccountError(
+                    BadServerResponseError(str(error)), method.jmap_method_name
+                ) from error
+            if (
+                isinstance(result, jmapc.Error)
+                and result.type == "cannotCalculateChanges"
+            ):
+                self.logger.info(
+                    "%s can not calculate the mailbox changes since state %s, fetching all mailboxes.",
+                    self.account,
+                    state,
+                )
+                return None
+            if not isinstance(result, jmapc.methods.MailboxChangesResponse):
+                self.logger.error("Error in response from %s!", self.account)
+                raise MailAccountError(
+                    BadServerResponseError(result.to_json()), method.jmap_method_name
+                )
+            changed_mailbox_ids.extend(result.created)
+            changed_mailbox_ids.extend(result.updated)
+            state = result.new_state
+            has_more_changes = result.has_more_changes
+        self.logger.debug("Successfully requested mailbox changes.")
+        return changed_mailbox_ids, state
+
+    def _get_mailboxes(
+        self, mailbox_ids: list[str] | None
+    ) -> tuple[list[tuple[str, str]], str]:
+        """Requests the names and roles of mailboxes.
+
+        Args:
+            mailbox_ids: The ids of the mailboxes to get. None for all mailboxes.
+
+        Returns:
+            The names and roles of the mailboxes and the current Mailbox state.
+
+        Raises:
+            MailAccountError: If an error occurs or a bad response is returned.
+        """
+        method = jmapc.methods.MailboxGet(ids=mailbox_ids, properties=["name", "role"])
         self.logger.debug("Fetching mailboxes in %s ...", self.account)
         try:
             result = self._mail_client.request(method)
@@ -266,7 +733,7 @@ class JMAPFetcher(BaseFetcher):
             (mailbox.name, mailbox.role or "")
             for mailbox in result.data
             if mailbox.name is not None
-        ]
+        ], result.state
 
     @override
     def restore(self, email: Email) -> None:
@@ -21,6 +21,7 @@
 from __future__ import annotations
 
 import poplib
+from itertools import batched
 from typing import TYPE_CHECKING, override
 
 from django.utils.translation import gettext_lazy as _
@@ -29,6 +30,7 @@ from core.constants import EmailFetchingCriterionChoices, EmailProtocolChoices
 
 from .BaseFetcher import BaseFetcher
 from .exceptions import FetcherError, MailAccountError
+from .FetchEstimate import FetchEstimate
 from .SafePOPMixin import SafePOPMixin
 
 if TYPE_CHECKING:
@@ -52,11 +54,17 @@ class POP3Fetcher(BaseFetcher, SafePOPMixin):
     PROTOCOL = EmailProtocolChoices.POP3
     """Name of the used protocol, refers to :attr:`MailFetchingProtocols.POP3`."""
 
-    AVAILABLE_FETCHING_CRITERIA = (EmailFetchingCriterionChoices.ALL,)
+    AVAILABLE_FETCHING_CRITERIA = (
+        EmailFetchingCriterionChoices.ALL,
+        EmailFetchingCriterionChoices.INCREMENTAL,
+    )
     """Tuple of all criteria available for fetching. Refers to :class:`MailFetchingCriteria`.
     Must be immutable!
     """
 
+    EMAIL_FETCH_BATCH_SIZE = 100
+    """Number of messages that are probed together and after which the sync state is saved."""
+
     @override
     def __init__(self, account: Account) -> None:
         """Constructor, starts the POP connection and logs into the account.
@@ -124,9 +132,18 @@ class POP3Fetcher(BaseFetcher, SafePOPMixin):
     ) -> Generator[bytes]:
         """Fetches and returns all maildata from the server.
 
+        For the :attr:`core.constants.EmailFetchingCriterionChoices.INCREMENTAL` criterion
+        only messages with a UIDL that is not in :attr:`core.models.Mailbox.Mailbox.pop_seen_uidls` are retrieved.
+        If the server doesn't support UIDL, the headers of the messages are probed with TOP instead
+        and only messages that are not in the db yet are retrieved.
+        For the :attr:`core.constants.EmailFetchingCriterionChoices.ALL` criterion
+        the progress is recorded in the mailbox after every batch of :attr:`EMAIL_FETCH_BATCH_SIZE` messages
+        until a message fails to be retrieved, an interrupted or incomplete fetch resumes from there.
+        The progress is only recorded if the server supports UIDL.
+
         Args:
             mailbox: Database model of the mailbox to fetch data from.
-            criterion: POP only supports ALL lookups.
+            criterion: POP only supports ALL and INCREMENTAL lookups.
                 Defaults to :attr:`eonvelope.MailFetchingCriteria.ALL`.
                 This arg ensures compatibility with the other fetchers.
 
@@ -135,7 +152,7 @@ class POP3Fetcher(BaseFetcher, SafePOPMixin):
 
         Raises:
             ValueError: If the :attr:`mailbox` does not belong to :attr:`self.account`.
-                If :attr:`criterion` is not :attr:`eonvelope.MailFetchingCriteria.ALL`.
+                If :attr:`criterion` is not in :attr:`POP3Fetcher.AVAILABLE_FETCHING_CRITERIA`.
             MailAccountError: If an error occurs or a bad response is returned.
         """
         self.logger.debug("Fetching all messages in %s ...", mailbox)
@@ -149,22 +166,223 @@ class POP3Fetcher(BaseFetcher, SafePOPMixin):
         message_count = len(message_numbers_list)
         self.logger.info("Found %s messages in %s.", message_count, mailbox)
 
+        if criterion == EmailFetchingCriterionChoices.INCREMENTAL:
+            yield from self._fetch_new_emails(mailbox, message_count)
+            return
+
         self.logger.debug("Retrieving all messages in %s ...", mailbox)
-        for number in range(message_count):
-            try:
-                _, message_data, _ = self.safe_retr(number + 1)
-            except FetcherError:
-                self.logger.warning(
-                    "Failed to fetch message %s from %s!",
-                    number,
-                    mailbox,
-                    exc_info=True,
+        message_uidls = self._list_message_uidls()
+        # message numbers shift when messages are deleted between sessions,
+        # so the progress can only be checkpointed on UIDLs
+        is_progress_advancing = message_uidls is not None
+        resume_index = 0
+        if message_uidls is not None:
+            message_ids = [
+                message_uidls.get(number, "") for number in range(1, message_count + 1)
+            ]
+            resume_index = mailbox.start_fetch_progress(criterion, message_ids)
+        else:
+            self.logger.debug(
+                "%s doesn't support UIDL, the fetch progress is not recorded.",
+                self.account,
+            )
+        for numbers in batched(
+            range(resume_index + 1, message_count + 1),
+            self.EMAIL_FETCH_BATCH_SIZE,
+            strict=False,
+        ):
+            for number in numbers:
+                try:
+                    _, message_data, _ = self.safe_retr(number)
+                except FetcherError:
+                    self.logger.warning(
+                        "Failed to fetch message %s from %s!",
+                        number,
+                        mailbox,
+                        exc_info=True,
+                    )
+                    # the failed message must be fetched again when the fetch is resumed
+                    is_progress_advancing = False
+                    continue
+                full_message = b"\n".join(message_data)
+                yield full_message
+            if is_progress_advancing:
+                mailbox.advance_fetch_progress(
+                    message_ids[numbers[-1] - 1], len(numbers)
                 )
-                continue
-            full_message = b"\n".join(message_data)
-            yield full_message
+        if is_progress_advancing:
+            mailbox.finish_fetch_progress()
         self.logger.debug("Successfully fetched all messages in %s.", mailbox)
 
+    @override
+    def estimate_emails(
+        self,
+        mailbox: Mailbox,
+        criterion: FetchingCriterion = BaseFetcher.DEFAULT_FETCHING_CRITERION,
+    ) -> FetchEstimate:
+        """Estimates what fetching emails would retrieve from the sizes in the LIST response.
+
+        Messages are known if their UIDL is in :attr:`core.models.Mailbox.Mailbox.pop_seen_uidls`.
+        For the :attr:`core.constants.EmailFetchingCriterionChoices.INCREMENTAL` criterion
+        only the messages with unseen UIDL match, so none of them are known.
+        Messages that are in the db but not in the sync state can't be told apart without retrieving their headers.
+
+        Args:
+            mailbox: Database model of the mailbox to estimate the fetch for.
+            criterion: POP only supports ALL and INCREMENTAL lookups.
+                Defaults to :attr:`eonvelope.MailFetchingCriteria.ALL`.
+
+        Returns:
+            The number, total size and number of already known messages that match the criterion.
+
+        Raises:
+            ValueError: If the :attr:`mailbox` does not belong to :attr:`self.account`.
+                If :attr:`criterion` is not in :attr:`POP3Fetcher.AVAILABLE_FETCHING_CRITERIA`.
+            MailAccountError: If an error occurs or a bad response is returned.
+        """
+        super().estimate_emails(mailbox, criterion)
+
+        self.logger.debug(
+            "Estimating fetch of %s messages in %s ...", criterion, mailbox
+        )
+        _, message_numbers_list, _ = self.safe_list()
+        message_sizes = {}
+        for line in message_numbers_list:
+            number, size = line.split()[:2]
+            message_sizes[int(number)] = int(size)
+        message_uidls = self._list_message_uidls() or {}
+        seen_uidls = set(mailbox.pop_seen_uidls)
+
+        estimate = FetchEstimate()
+        for number, size in message_sizes.items():
+            is_known = message_uidls.get(number) in seen_uidls
+            if criterion == EmailFetchingCriterionChoices.INCREMENTAL and is_known:
+                continue
+            estimate.message_count += 1
+            estimate.total_size += size
+            estimate.known_count += is_known
+        self.logger.debug("Successfully estimated fetch: %s.", estimate)
+        return estimate
+
+    def _fetch_new_emails(
+        self, mailbox: Mailbox, message_count: int
+    ) -> Generator[bytes]:
+        """Retrieves the messages in the maildrop that have not been ingested yet.
+
+        Args:
+            mailbox: Database model of the mailbox to fetch data from.
+            message_count: The number of messages in the maildrop.
+
+        Yields:
+            The new mails in the mailbox.
+        """
+        message_uidls = self._list_message_uidls()
+        if message_uidls is None:
+            self.logger.info(
+                "%s does not support UIDL, probing message headers instead.",
+                self.account,
+            )
+            seen_uidls: set[str] = set()
+            message_numbers = list(range(1, message_count + 1))
+        else:
+            # uidls of messages that were deleted from the server are dropped
+            seen_uidls = set(mailbox.pop_seen_uidls).intersection(
+                message_uidls.values()
+            )
+            message_numbers = [
+                number
+                for number, uidl in message_uidls.items()
+                if uidl not in seen_uidls
+            ]
+        # without any sync state the messages may still be in the db from earlier fetches
+        is_probing_headers = not seen_uidls
+        self.logger.info(
+            "Retrieving %s new messages in %s ...", len(message_numbers), mailbox
+        )
+
+        try:
+            for numbers in batched(
+                message_numbers, self.EMAIL_FETCH_BATCH_SIZE, strict=False
+            ):
+                if is_probing_headers:
+                    header_blocks = self._probe_header_blocks(numbers)
+                    # the server doesn't support TOP, there is no need to try again
+                    is_probing_headers = None not in header_blocks
+                    is_download_required = self.check_downloads_required(
+                        mailbox, header_blocks
+                    )
+                else:
+                    is_download_required = [True] * len(numbers)
+                for number, is_required in zip(
+                    numbers, is_download_required, strict=True
+                ):
+                    if is_required:
+                        try:
+                            _, message_data, _ = self.safe_retr(number)
+                        except FetcherError:
+                            self.logger.warning(
+                                "Failed to fetch message %s from %s!",
+                                number,
+                                mailbox,
+                                exc_info=True,
+                            )
+                            continue
+                        yield b"\n".join(message_data)
+                    if message_uidls is not None:
+                        seen_uidls.add(message_uidls[number])
+        finally:
+            # saved once, rewriting the whole list per batch is quadratic for large maildrops
+            if message_uidls is not None:
+                self._save_seen_uidls(mailbox, seen_uidls)
+        self.logger.debug("Successfully fetched new messages in %s.", mailbox)
+
+    def _list_message_uidls(self) -> dict[int, str] | None:
+        """Lists the unique ids of all messages in the maildrop.
+
+        Returns:
+            The UIDL of every message number.
+            None if the server doesn't support UIDL.
+        """
+        response = self.safe_uidl()
+        if response is None:
+            return None
+        message_uidls = {}
+        for line in response[1]:
+            number, uidl = line.split(maxsplit=1)
+            message_uidls[int(number)] = uidl.decode(errors="replace")
+        return message_uidls
+
+    def _probe_header_blocks(self, numbers: tuple[int, ...]) -> list[bytes | None]:
+        """Retrieves the header blocks of messages.
+
+        Args:
+            numbers: The numbers of the messages in the maildrop.
+
+        Returns:
+            The header blocks of the messages.
+            None from the first message on that TOP fails for, the server likely doesn't support it.
+        """
+        header_blocks: list[bytes | None] = []
+        for number in numbers:
+            response = self.safe_top(number, 0)
+            if response is None:
+                header_blocks.extend([None] * (len(numbers) - len(header_blocks)))
+                break
+            header_blocks.append(b"\r\n".join(response[1]))
+        return header_blocks
+
+    @staticmethod
+    def _save_seen_uidls(mailbox: Mailbox, seen_uidls: set[str]) -> None:
+        """Stores the seen UIDLs in the mailbox if they have changed.
+
+        Args:
+            mailbox: The mailbox to update.
+            seen_uidls: The UIDLs of all ingested messages that are still on the server.
+        """
+        if seen_uidls != set(mailbox.pop_seen_uidls):
+            mailbox.pop_seen_uidls = sorted(seen_uidls)
+            mailbox.save(update_fields=["pop_seen_uidls"])
+
     @override
     def fetch_mailboxes(self) -> list[tuple[str, str]]:
         """Returns the data of the mailboxes. For POP3 there is only one mailbox named 'INBOX'.
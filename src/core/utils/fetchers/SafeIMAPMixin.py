@@ -228,6 +228,13 @@ class SafeIMAPMixin:
         """The :func:`safe` wrapped version of :func:`imaplib.IMAP4.uid`."""
         return self._mail_client.uid(*args, **kwargs)
 
+    @safe(exception_class=None)
+    def safe_enable(
+        self: IMAP4FetcherClass, *args: Any, **kwargs: Any
+    ) -> tuple[str, list[Any]]:
+        """The :func:`safe` wrapped version of :func:`imaplib.IMAP4.enable`."""
+        return self._mail_client.enable(*args, **kwargs)
+
     @safe(exception_class=MailAccountError)
     def safe_noop(
         self: IMAP4FetcherClass, *args: Any, **kwargs: Any
@@ -235,6 +242,20 @@ class SafeIMAPMixin:
         """The :func:`safe` wrapped version of :func:`imaplib.IMAP4.noop`."""
         return self._mail_client.noop(*args, **kwargs)
 
+    @safe(exception_class=None)
+    def safe_capability(
+        self: IMAP4FetcherClass, *args: Any, **kwargs: Any
+    ) -> tuple[str, list[Any]]:
+        """The :func:`safe` wrapped version of :func:`imaplib.IMAP4.capability`."""
+        return self._mail_client.capability(*args, **kwargs)
+
+    @safe(exception_class=None)
+    def safe_xatom(
+        self: IMAP4FetcherClass, *args: Any, **kwargs: Any
+    ) -> tuple[str, list[Any]]:
+        """The :func:`safe` wrapped version of :func:`imaplib.IMAP4.xatom`."""
+        return self._mail_client.xatom(*args, **kwargs)
+
     @safe(exception_class=MailboxError)
     def safe_check(
         self: IMAP4FetcherClass, *args: Any, **kwargs: Any
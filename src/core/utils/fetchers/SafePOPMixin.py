@@ -196,6 +196,26 @@ class SafePOPMixin:
         """The :func:`safe` wrapped version of :func:`poplib.POP3.retr`."""
         return self._mail_client.retr(*args, **kwargs)
 
+    @safe(exception_class=None)
+    def safe_uidl(
+        self: POP3FetcherClass, *args: Any, **kwargs: Any
+    ) -> tuple[bytes, list[bytes], int]:
+        """The :func:`safe` wrapped version of :func:`poplib.POP3.uidl`.
+
+        UIDL is an optional command, so a failure doesn't raise.
+        """
+        return self._mail_client.uidl(*args, **kwargs)
+
+    @safe(exception_class=None)
+    def safe_top(
+        self: POP3FetcherClass, *args: Any, **kwargs: Any
+    ) -> tuple[bytes, list[bytes], int]:
+        """The :func:`safe` wrapped version of :func:`poplib.POP3.top`.
+
+        TOP is an optional command, so a failure doesn't raise.
+        """
+        return self._mail_client.top(*args, **kwargs)
+
     @safe(exception_class=None)
     def safe_quit(self: POP3FetcherClass, *args: Any, **kwargs: Any) -> bytes:
         """The :func:`safe` wrapped version of :func:`poplib.POP3.quit`."""
@@ -30,7 +30,11 @@ import email.utils
 import logging
 import re
 from base64 import b64encode
+from dataclasses import dataclass, field
 from datetime import datetime, time
+from email import policy
+from functools import cached_property
+from hashlib import md5
 from typing import TYPE_CHECKING, TextIO
 
 import imap_tools.imap_utf7
@@ -38,9 +42,10 @@ import vobject
 from django.utils import timezone
 from django.utils.timezone import get_current_timezone
 
-from core.constants import MailboxTypeChoices
+from core.constants import HeaderFields, MailboxTypeChoices
 
 if TYPE_CHECKING:
+    from collections.abc import Container, Iterable
     from email.header import Header
     from email.message import EmailMessage
 
@@ -50,6 +55,10 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+_HEADER_BLOCK_END_REGEX = re.compile(rb"\r?\n\r?\n")
+"""Matches the empty line that ends the header block of an email."""
+
+
 def decode_header(header: Header | str) -> str:
     """Decodes an email header field.
 
@@ -100,6 +109,52 @@ def get_header(
     )
 
 
+def scan_headers(email_bytes: bytes, header_names: Iterable[str]) -> dict[str, str]:
+    """Scans the header block of an email in bytes form for some headers without parsing the email.
+
+    This is much cheaper than parsing the whole email with :mod:`email`,
+    so it can be used to decide whether an email needs to be parsed at all.
+    Folded headers are unfolded and encoded words are decoded,
+    so for unstructured headers like Message-ID the values are the same as with :func:`get_header`.
+    Structured headers like Date are not normalized.
+
+    Args:
+        email_bytes: The email bytes data.
+        header_names: The names of the headers to scan for. Case-insensitive.
+
+    Returns:
+        The decoded and stripped header values by their lowercase name.
+        Headers that are not in the email are left out.
+    """
+    scanned_header_names = {header_name.lower() for header_name in header_names}
+    if email_bytes.startswith((b"\n", b"\r\n")):
+        return {}
+    header_block_end = _HEADER_BLOCK_END_REGEX.search(email_bytes)
+    header_block = (
+        email_bytes[: header_block_end.start()] if header_block_end else email_bytes
+    )
+    header_values: dict[str, list[str]] = {}
+    current_values: list[str] | None = None
+    for line in header_block.splitlines():
+        if line.startswith((b" ", b"\t")):
+            # continuation line of a folded header
+            if current_values is not None:
+                current_values[-1] += line.decode(errors="replace")
+            continue
+        current_values = None
+        header_name, separator, header_value = line.partition(b":")
+        if not separator:
+            continue
+        decoded_header_name = header_name.decode(errors="replace").lower()
+        if decoded_header_name in scanned_header_names:
+            current_values = header_values.setdefault(decoded_header_name, [])
+            current_values.append(header_value.decode(errors="replace"))
+    return {
+        header_name: ",".join(decode_header(value).strip() for value in values)
+        for header_name, values in header_values.items()
+    }
+
+
 def parse_datetime_header(date_header: str | None) -> datetime:
     """Parses the date header into a datetime object.
 
@@ -150,6 +205,152 @@ def get_bodytexts(email_message: EmailMessage) -> dict[str, str]:
     return bodytexts
 
 
+@dataclass
+class ParsedAttachment:
+    """The data of an attachment of a :class:`ParsedEmail`.
+
+    The payload is only decoded when it is accessed.
+    """
+
+    part: EmailMessage | None
+    """The MIME part of the attachment. None once it has been detached, see :meth:`detach`."""
+
+    file_name: str | None
+    """The filename of the attachment. None if the part has none."""
+
+    content_disposition: str
+    """The content disposition of the attachment. Empty if the part has none."""
+
+    content_id: str
+    """The content ID of the attachment. Empty if the part has none."""
+
+    content_maintype: str
+    """The main content type of the attachment."""
+
+    content_subtype: str
+    """The content subtype of the attachment."""
+
+    @cached_property
+    def payload(self) -> bytes | None:
+        """The decoded payload of the attachment. None if it can't be decoded."""
+        if self.part is None:
+            return None
+        part_payload = self.part.get_payload(decode=True)
+        return part_payload if isinstance(part_payload, bytes) else None
+
+    def detach(self) -> None:
+        """Decodes the payload and drops the MIME part, so the attachment can be pickled cheaply."""
+        _ = self.payload
+        self.part = None
+
+
+@dataclass
+class ParsedEmail:
+    """The data of an email, parsed once from its bytes and shared by all the models created from it."""
+
+    message_id: str
+    """The Message-ID of the email. The md5 hash of the email if it has none."""
+
+    datasize: int
+    """The size of the email in bytes."""
+
+    headers: dict[str, str] = field(default_factory=dict)
+    """The decoded headers of the email by their lowercase name."""
+
+    bodytexts: dict[str, str] = field(default_factory=dict)
+    """The bodytexts of the email by their content subtype, see :func:`get_bodytexts`."""
+
+    attachments: list[ParsedAttachment] = field(default_factory=list)
+    """The parts of the email that qualify as attachments."""
+
+    correspondents: list[tuple[str, str, str]] = field(default_factory=list)
+    """The mention, name and address of the correspondents in the headers of the email."""
+
+    @classmethod
+    def from_bytes(cls, email_bytes: bytes) -> ParsedEmail:
+        """Parses an email in bytes form, walking its MIME tree once.
+
+        Args:
+            email_bytes: The email bytes data.
+
+        Returns:
+            The parsed email.
+        """
+        email_message = email.message_from_bytes(email_bytes, policy=policy.default)
+        headers = {
+            header_name.lower(): get_header(email_message, header_name)
+            for header_name in email_message
+        }
+        parsed_email = cls(
+            message_id=headers.get(HeaderFields.MESSAGE_ID)
+            or md5(email_bytes).hexdigest(),  # noqa: S324  # no safe hash required here
+            datasize=len(email_bytes),
+            headers=headers,
+        )
+        for mention in HeaderFields.Correspondents.values:
+            correspondent_header = headers.get(mention)
+            if correspondent_header:
+                parsed_email.correspondents.extend(
+                    (mention, name, address)
+                    for name, address in set(
+                        email.utils.getaddresses([correspondent_header])
+                    )
+                )
+        for part in email_message.walk():
+            if part.is_multipart():
+                continue
+            content_disposition = part.get_content_disposition()
+            content_maintype = part.get_content_maintype()
+            content_subtype = part.get_content_subtype()
+            if content_maintype == "text" and not content_disposition:
+                parsed_email.bodytexts[content_subtype] = part.get_content()
+            if content_disposition or (
+                content_maintype != "text" or content_subtype not in ["plain", "html"]
+            ):
+                parsed_email.attachments.append(
+                    ParsedAttachment(
+                        part=part,
+                        file_name=part.get_filename(),
+                        content_disposition=content_disposition or "",
+                        content_id=part.get(HeaderFields.CONTENT_ID, ""),
+                        content_maintype=content_maintype,
+                        content_subtype=content_subtype,
+                    )
+                )
+        return parsed_email
+
+
+def parse_email_bytes_detached(
+    email_bytes: bytes,
+    ignore_maintypes: Container[str] = (),
+    ignore_subtypes: Container[str] = (),
+) -> tuple[ParsedEmail, bytes]:
+    """Parses an email in bytes form with all attachments decoded and detached from the MIME tree.
+
+    Used to parse emails in a different process,
+    so the result has to be sent back in pickled form.
+    Attachments with ignored content types are left out without decoding their payloads.
+
+    Args:
+        email_bytes: The email bytes data.
+        ignore_maintypes: The main content types of the attachments to leave out.
+        ignore_subtypes: The content subtypes of the attachments to leave out.
+
+    Returns:
+        The parsed email and the email bytes data.
+    """
+    parsed_email = ParsedEmail.from_bytes(email_bytes)
+    parsed_email.attachments = [
+        attachment
+        for attachment in parsed_email.attachments
+        if attachment.content_maintype not in ignore_maintypes
+        and attachment.content_subtype not in ignore_subtypes
+    ]
+    for attachment in parsed_email.attachments:
+        attachment.detach()
+    return parsed_email, email_bytes
+
+
 def parse_IMAP_mailbox_data(  # noqa: N802 # that's how IMAP is spelled
     mailbox_data: bytes | str,
 ) -> tuple[str, str]:
@@ -56,6 +56,7 @@ class BaseAccountForm(RequiredMarkerModelForm):
             "mail_host_port",
             "timeout",
             "allow_insecure_connection",
+            "use_compression",
         ]
         """Exposes all fields that the user should be able to change."""
 
@@ -49,6 +49,8 @@ class BaseMailboxForm(RequiredMarkerModelForm):
         fields: ClassVar[list[str]] = [
             "save_to_eml",
             "save_attachments",
+            "use_idle",
+            "partial_fetch",
         ]
         """Exposes all fields that the user should be able to change."""
 
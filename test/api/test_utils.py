@@ -19,8 +19,15 @@
 """Test module for the :mod:`api.utils` module."""
 
 import pytest
+from rest_framework.exceptions import ValidationError
 
-from api.utils import csv_query_param_to_typed_list, query_param_list_to_typed_list
+from api.utils import (
+    csv_query_param_to_typed_list,
+    query_param_list_to_typed_list,
+    validate_fetching_criterion,
+)
+from core.constants import EmailFetchingCriterionChoices
+from core.utils import FetchingCriterion
 
 
 @pytest.mark.parametrize(
@@ -84,3 +91,40 @@ def test_csv_query_param_to_typed_list__invalid(invalid_query_param):
     """Tests :func:`api.v1.utils.csv_query_param_to_typed_list` in case of an invalid query_param."""
     with pytest.raises(ValueError, match=invalid_query_param):
         csv_query_param_to_typed_list(invalid_query_param, int)
+
+
+def test_validate_fetching_criterion():
+    """Tests :func:`api.utils.validate_fetching_criterion` in case of success."""
+    result = validate_fetching_criterion(
+        EmailFetchingCriterionChoices.LARGER,
+        "100",
+        [EmailFetchingCriterionChoices.LARGER],
+        "%(criterion)s is not available.",
+    )
+
+    assert result == FetchingCriterion(EmailFetchingCriterionChoices.LARGER, "100")
+
+
+@pytest.mark.parametrize(
+    ("criterion", "criterion_arg", "expected_error_field"),
+    [
+        (None, "", "criterion"),
+        ("", "", "criterion"),
+        (EmailFetchingCriterionChoices.ALL, "", "criterion"),
+        (EmailFetchingCriterionChoices.LARGER, "", "criterion_arg"),
+        (EmailFetchingCriterionChoices.LARGER, "big", "criterion_arg"),
+    ],
+)
+def test_validate_fetching_criterion_invalid(
+    criterion, criterion_arg, expected_error_field
+):
+    """Tests :func:`api.utils.validate_fetching_criterion` in case of an invalid criterion."""
+    with pytest.raises(ValidationError) as exc_info:
+        validate_fetching_criterion(
+            criterion,
+            criterion_arg,
+            [EmailFetchingCriterionChoices.LARGER],
+            "%(criterion)s is not available.",
+        )
+
+    assert expected_error_field in exc_info.value.detail
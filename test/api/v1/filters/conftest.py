@@ -250,6 +250,7 @@ def account_queryset(unblocked_db, pkg_monkeypatch):
                 mail_host_port=INT_TEST_ITEMS[number],
                 timeout=FLOAT_TEST_ITEMS[number],
                 allow_insecure_connection=BOOL_TEST_ITEMS[number],
+                use_compression=BOOL_TEST_ITEMS[number],
                 is_favorite=BOOL_TEST_ITEMS[number],
                 is_healthy=BOOL_TEST_ITEMS[number],
                 last_error=text_test_item,
@@ -273,6 +274,8 @@ def mailbox_queryset(unblocked_db, account_queryset):
                 name=text_test_item,
                 save_to_eml=BOOL_TEST_ITEMS[number],
                 save_attachments=BOOL_TEST_ITEMS[number],
+                use_idle=BOOL_TEST_ITEMS[number],
+                partial_fetch=BOOL_TEST_ITEMS[number],
                 is_favorite=BOOL_TEST_ITEMS[number],
                 is_healthy=BOOL_TEST_ITEMS[number],
                 last_error=text_test_item,
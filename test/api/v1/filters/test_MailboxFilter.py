@@ -104,6 +104,44 @@ def test_save_attachments_filter(
         assert data.id - 1 in expected_indices
 
 
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ("lookup_expr", "filterquery", "expected_indices"), BOOL_TEST_PARAMETERS
+)
+def test_use_idle_filter(mailbox_queryset, lookup_expr, filterquery, expected_indices):
+    """Tests :class:`api.v1.filters.MailboxFilterSet`'s filtering
+    for the :attr:`core.models.Mailbox.Mailbox.use_idle` field.
+    """
+    query = {"use_idle" + lookup_expr: filterquery}
+
+    filtered_data = MailboxFilterSet(query, queryset=mailbox_queryset).qs
+
+    assert filtered_data.distinct().count() == filtered_data.count()
+    assert filtered_data.count() == len(expected_indices)
+    for data in filtered_data:
+        assert data.id - 1 in expected_indices
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ("lookup_expr", "filterquery", "expected_indices"), BOOL_TEST_PARAMETERS
+)
+def test_partial_fetch_filter(
+    mailbox_queryset, lookup_expr, filterquery, expected_indices
+):
+    """Tests :class:`api.v1.filters.MailboxFilterSet`'s filtering
+    for the :attr:`core.models.Mailbox.Mailbox.partial_fetch` field.
+    """
+    query = {"partial_fetch" + lookup_expr: filterquery}
+
+    filtered_data = MailboxFilterSet(query, queryset=mailbox_queryset).qs
+
+    assert filtered_data.distinct().count() == filtered_data.count()
+    assert filtered_data.count() == len(expected_indices)
+    for data in filtered_data:
+        assert data.id - 1 in expected_indices
+
+
 @pytest.mark.django_db
 @pytest.mark.parametrize(
     ("lookup_expr", "filterquery", "expected_indices"), BOOL_TEST_PARAMETERS
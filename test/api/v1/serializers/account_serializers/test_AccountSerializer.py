@@ -62,6 +62,8 @@ def test_output(fake_account, request_context):
         serializer_data["allow_insecure_connection"]
         == fake_account.allow_insecure_connection
     )
+    assert "use_compression" in serializer_data
+    assert serializer_data["use_compression"] == fake_account.use_compression
     assert "is_healthy" in serializer_data
     assert serializer_data["is_healthy"] == fake_account.is_healthy
     assert "last_error" in serializer_data
@@ -77,7 +79,7 @@ def test_output(fake_account, request_context):
     assert "updated" in serializer_data
     assert datetime.fromisoformat(serializer_data["updated"]) == fake_account.updated
     assert "user" not in serializer_data
-    assert len(serializer_data) == 14
+    assert len(serializer_data) == 15
 
 
 @pytest.mark.django_db
@@ -108,6 +110,8 @@ def test_input(account_payload, request_context):
         serializer_data["allow_insecure_connection"]
         == account_payload["allow_insecure_connection"]
     )
+    assert "use_compression" in serializer_data
+    assert serializer_data["use_compression"] == account_payload["use_compression"]
     assert "is_healthy" not in serializer_data
     assert "last_error" not in serializer_data
     assert "last_error_occurred_at" not in serializer_data
@@ -118,7 +122,7 @@ def test_input(account_payload, request_context):
     assert "user" in serializer_data
     assert serializer_data["user"] == request_context["request"].user
 
-    assert len(serializer_data) == 9
+    assert len(serializer_data) == 10
 
 
 @pytest.mark.django_db
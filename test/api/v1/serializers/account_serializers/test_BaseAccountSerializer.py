@@ -60,6 +60,8 @@ def test_output(fake_account, request_context):
         serializer_data["allow_insecure_connection"]
         == fake_account.allow_insecure_connection
     )
+    assert "use_compression" in serializer_data
+    assert serializer_data["use_compression"] == fake_account.use_compression
     assert "is_healthy" in serializer_data
     assert serializer_data["is_healthy"] == fake_account.is_healthy
     assert "last_error" in serializer_data
@@ -75,7 +77,7 @@ def test_output(fake_account, request_context):
     assert "updated" in serializer_data
     assert datetime.fromisoformat(serializer_data["updated"]) == fake_account.updated
     assert "user" not in serializer_data
-    assert len(serializer_data) == 13
+    assert len(serializer_data) == 14
 
 
 @pytest.mark.django_db
@@ -105,6 +107,8 @@ def test_input__test_success(account_payload, request_context, mock_Account_test
         serializer_data["allow_insecure_connection"]
         == account_payload["allow_insecure_connection"]
     )
+    assert "use_compression" in serializer_data
+    assert serializer_data["use_compression"] == account_payload["use_compression"]
     assert "is_healthy" not in serializer_data
     assert "last_error" not in serializer_data
     assert "last_error_occurred_at" not in serializer_data
@@ -114,7 +118,7 @@ def test_input__test_success(account_payload, request_context, mock_Account_test
     assert "updated" not in serializer_data
     assert "user" in serializer_data
     assert serializer_data["user"] == request_context["request"].user
-    assert len(serializer_data) == 9
+    assert len(serializer_data) == 10
     mock_Account_test.assert_called_once()
 
 
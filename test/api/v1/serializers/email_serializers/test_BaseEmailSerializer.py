@@ -62,6 +62,8 @@ def test_output(fake_email, request_context):
     assert serializer_data["headers"] == fake_email.headers
     assert "x_spam_flag" in serializer_data
     assert serializer_data["x_spam_flag"] == fake_email.x_spam_flag
+    assert "thread_id" in serializer_data
+    assert serializer_data["thread_id"] == fake_email.thread_id
     assert "created" in serializer_data
     assert datetime.fromisoformat(serializer_data["created"]) == fake_email.created
     assert "updated" in serializer_data
@@ -72,7 +74,7 @@ def test_output(fake_email, request_context):
     assert len(serializer_data["correspondents"]) == 1
     assert isinstance(serializer_data["correspondents"][0], int)
 
-    assert len(serializer_data) == 16
+    assert len(serializer_data) == 17
 
 
 @pytest.mark.django_db
@@ -98,6 +100,7 @@ def test_input(email_payload, request_context):
     assert "mailbox" not in serializer_data
     assert "headers" not in serializer_data
     assert "x_spam_flag" not in serializer_data
+    assert "thread_id" not in serializer_data
     assert "created" not in serializer_data
     assert "updated" not in serializer_data
     assert "attachments" not in serializer_data
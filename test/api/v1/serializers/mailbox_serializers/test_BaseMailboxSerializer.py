@@ -46,6 +46,10 @@ def test_output(fake_mailbox, request_context):
     assert serializer_data["save_attachments"] == fake_mailbox.save_attachments
     assert "save_to_eml" in serializer_data
     assert serializer_data["save_to_eml"] == fake_mailbox.save_to_eml
+    assert "use_idle" in serializer_data
+    assert serializer_data["use_idle"] == fake_mailbox.use_idle
+    assert "partial_fetch" in serializer_data
+    assert serializer_data["partial_fetch"] == fake_mailbox.partial_fetch
     assert "is_favorite" in serializer_data
     assert serializer_data["is_favorite"] == fake_mailbox.is_favorite
     assert "is_healthy" in serializer_data
@@ -60,7 +64,21 @@ def test_output(fake_mailbox, request_context):
     assert datetime.fromisoformat(serializer_data["created"]) == fake_mailbox.created
     assert "updated" in serializer_data
     assert datetime.fromisoformat(serializer_data["updated"]) == fake_mailbox.updated
-    assert len(serializer_data) == 12
+    assert "fetch_progress_criterion" in serializer_data
+    assert (
+        serializer_data["fetch_progress_criterion"]
+        == fake_mailbox.fetch_progress_criterion
+    )
+    assert "fetch_progress_count" in serializer_data
+    assert serializer_data["fetch_progress_count"] == fake_mailbox.fetch_progress_count
+    assert "fetch_progress_total" in serializer_data
+    assert serializer_data["fetch_progress_total"] == fake_mailbox.fetch_progress_total
+    assert "fetch_progress_updated" in serializer_data
+    assert (
+        serializer_data["fetch_progress_updated"] == fake_mailbox.fetch_progress_updated
+    )
+    assert "fetch_progress_checkpoint" not in serializer_data
+    assert len(serializer_data) == 18
 
 
 @pytest.mark.django_db
@@ -78,6 +96,10 @@ def test_input(mailbox_payload, request_context):
     assert serializer_data["save_attachments"] == mailbox_payload["save_attachments"]
     assert "save_to_eml" in serializer_data
     assert serializer_data["save_to_eml"] == mailbox_payload["save_to_eml"]
+    assert "use_idle" in serializer_data
+    assert serializer_data["use_idle"] == mailbox_payload["use_idle"]
+    assert "partial_fetch" in serializer_data
+    assert serializer_data["partial_fetch"] == mailbox_payload["partial_fetch"]
     assert "is_favorite" in serializer_data
     assert serializer_data["is_favorite"] == mailbox_payload["is_favorite"]
     assert "is_healthy" not in serializer_data
@@ -85,4 +107,4 @@ def test_input(mailbox_payload, request_context):
     assert "last_error_occurred_at" not in serializer_data
     assert "created" not in serializer_data
     assert "updated" not in serializer_data
-    assert len(serializer_data) == 3
+    assert len(serializer_data) == 5
@@ -25,6 +25,7 @@ from django.http import FileResponse
 from rest_framework import status
 
 from api.v1.views.AccountViewSet import AccountViewSet
+from core.constants import EmailFetchingCriterionChoices
 from core.utils.fetchers.exceptions import MailAccountError
 
 
@@ -42,6 +43,12 @@ def mock_Account_test(mocker):
     return mocker.patch("api.v1.views.AccountViewSet.Account.test", autospec=True)
 
 
+@pytest.fixture
+def mock_celery_app(mocker):
+    """Patches the celery current app."""
+    return mocker.patch("api.v1.views.AccountViewSet.current_app", autospec=True)
+
+
 @pytest.fixture
 def mock_Mailbox_queryset_as_file(mocker, fake_file):
     """Patches `core.models.Mailbox.queryset_as_file`."""
@@ -382,6 +389,176 @@ def test_test__auth_admin(
     assert "mail_address" not in response.data
 
 
+@pytest.mark.django_db
+def test_fetch__noauth(
+    fake_account,
+    noauth_api_client,
+    custom_detail_action_url,
+    mock_celery_app,
+):
+    """Tests the post method :func:`api.v1.views.AccountViewSet.AccountViewSet.fetch` action with an unauthenticated user client."""
+    response = noauth_api_client.post(
+        custom_detail_action_url(
+            AccountViewSet, AccountViewSet.URL_NAME_FETCH, fake_account
+        ),
+        data={"criterion": EmailFetchingCriterionChoices.ALL.value},
+    )
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    mock_celery_app.send_task.assert_not_called()
+    assert "mail_address" not in response.data
+
+
+@pytest.mark.django_db
+def test_fetch__auth_other(
+    fake_account,
+    other_api_client,
+    custom_detail_action_url,
+    mock_celery_app,
+):
+    """Tests the post method :func:`api.v1.views.AccountViewSet.AccountViewSet.fetch` action with the authenticated other user client."""
+    response = other_api_client.post(
+        custom_detail_action_url(
+            AccountViewSet, AccountViewSet.URL_NAME_FETCH, fake_account
+        ),
+        data={"criterion": EmailFetchingCriterionChoices.ALL.value},
+    )
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    mock_celery_app.send_task.assert_not_called()
+    assert "mail_address" not in response.data
+
+
+@pytest.mark.django_db
+def test_fetch__success__auth_owner(
+    fake_account,
+    owner_api_client,
+    custom_detail_action_url,
+    mock_celery_app,
+):
+    """Tests the post method :func:`api.v1.views.AccountViewSet.AccountViewSet.fetch` action with the authenticated owner user client."""
+    response = owner_api_client.post(
+        custom_detail_action_url(
+            AccountViewSet, AccountViewSet.URL_NAME_FETCH, fake_account
+        ),
+        data={
+            "criterion": EmailFetchingCriterionChoices.SENTSINCE.value,
+            "criterion_arg": "2024-01-01",
+        },
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    fake_account.refresh_from_db()
+    assert response.data["data"] == AccountViewSet.serializer_class(fake_account).data
+    assert "error" not in response.data
+    mock_celery_app.send_task.assert_called_once_with(
+        "core.tasks.fetch_account_emails",
+        args=[
+            fake_account.id,
+            EmailFetchingCriterionChoices.SENTSINCE.value,
+            "2024-01-01",
+        ],
+    )
+
+
+@pytest.mark.django_db
+def test_fetch__failure__auth_owner(
+    fake_error_message,
+    fake_account,
+    owner_api_client,
+    custom_detail_action_url,
+    mock_celery_app,
+):
+    """Tests the post method :func:`api.v1.views.AccountViewSet.AccountViewSet.fetch` action
+    with the authenticated owner user client in case of failure.
+    """
+    mock_celery_app.send_task.return_value.get.side_effect = MailAccountError(
+        Exception(fake_error_message)
+    )
+
+    response = owner_api_client.post(
+        custom_detail_action_url(
+            AccountViewSet, AccountViewSet.URL_NAME_FETCH, fake_account
+        ),
+        data={"criterion": EmailFetchingCriterionChoices.ALL.value},
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    fake_account.refresh_from_db()
+    assert response.data["data"] == AccountViewSet.serializer_class(fake_account).data
+    assert fake_error_message in response.data["error"]
+    mock_celery_app.send_task.assert_called_once_with(
+        "core.tasks.fetch_account_emails",
+        args=[fake_account.id, EmailFetchingCriterionChoices.ALL.value, ""],
+    )
+
+
+@pytest.mark.django_db
+def test_fetch__auth_owner__no_criterion(
+    fake_account,
+    owner_api_client,
+    custom_detail_action_url,
+    mock_celery_app,
+):
+    """Tests the post method :func:`api.v1.views.AccountViewSet.AccountViewSet.fetch` action
+    with the authenticated owner user client without a criterion.
+    """
+    response = owner_api_client.post(
+        custom_detail_action_url(
+            AccountViewSet, AccountViewSet.URL_NAME_FETCH, fake_account
+        )
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data["criterion"]
+    mock_celery_app.send_task.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_fetch__auth_owner__bad_criterion(
+    faker,
+    fake_account,
+    owner_api_client,
+    custom_detail_action_url,
+    mock_celery_app,
+):
+    """Tests the post method :func:`api.v1.views.AccountViewSet.AccountViewSet.fetch` action
+    with the authenticated owner user client with a criterion unavailable for the account.
+    """
+    response = owner_api_client.post(
+        custom_detail_action_url(
+            AccountViewSet, AccountViewSet.URL_NAME_FETCH, fake_account
+        ),
+        data={"criterion": faker.word()},
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data["criterion"]
+    mock_celery_app.send_task.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_fetch__auth_owner__missing_criterion_arg(
+    fake_account,
+    owner_api_client,
+    custom_detail_action_url,
+    mock_celery_app,
+):
+    """Tests the post method :func:`api.v1.views.AccountViewSet.AccountViewSet.fetch` action
+    with the authenticated owner user client without a required criterion argument.
+    """
+    response = owner_api_client.post(
+        custom_detail_action_url(
+            AccountViewSet, AccountViewSet.URL_NAME_FETCH, fake_account
+        ),
+        data={"criterion": EmailFetchingCriterionChoices.SENTSINCE.value},
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data["criterion_arg"]
+    mock_celery_app.send_task.assert_not_called()
+
+
 @pytest.mark.django_db
 def test_download__noauth(
     faker,
@@ -35,6 +35,7 @@ from core.constants import (
 from core.models import Mailbox
 from core.utils import FetchingCriterion
 from core.utils.fetchers.exceptions import MailAccountError, MailboxError
+from core.utils.fetchers.FetchEstimate import FetchEstimate
 
 
 @pytest.fixture
@@ -43,6 +44,16 @@ def mock_Mailbox_test(mocker):
     return mocker.patch("api.v1.views.MailboxViewSet.Mailbox.test", autospec=True)
 
 
+@pytest.fixture
+def mock_Mailbox_estimate_fetch(mocker):
+    """Patches `core.models.Mailbox.estimate_fetch`."""
+    return mocker.patch(
+        "api.v1.views.MailboxViewSet.Mailbox.estimate_fetch",
+        autospec=True,
+        return_value=FetchEstimate(message_count=3, total_size=1024, known_count=1),
+    )
+
+
 @pytest.fixture
 def mock_celery_app(mocker):
     """Patches the celery current app."""
@@ -481,6 +492,144 @@ def test_fetch__auth_admin(
     assert "name" not in response.data
 
 
+@pytest.mark.django_db
+def test_fetch_estimate__noauth(
+    fake_mailbox,
+    noauth_api_client,
+    custom_detail_action_url,
+    mock_Mailbox_estimate_fetch,
+):
+    """Tests the post method :func:`api.v1.views.MailboxViewSet.MailboxViewSet.fetch_estimate` action with an unauthenticated user client."""
+    response = noauth_api_client.post(
+        custom_detail_action_url(
+            MailboxViewSet, MailboxViewSet.URL_NAME_FETCH_ESTIMATE, fake_mailbox
+        ),
+        data={"criterion": EmailFetchingCriterionChoices.ALL.value},
+    )
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    mock_Mailbox_estimate_fetch.assert_not_called()
+    assert "estimate" not in response.data
+
+
+@pytest.mark.django_db
+def test_fetch_estimate__auth_other(
+    fake_mailbox,
+    other_api_client,
+    custom_detail_action_url,
+    mock_Mailbox_estimate_fetch,
+):
+    """Tests the post method :func:`api.v1.views.MailboxViewSet.MailboxViewSet.fetch_estimate` action with the authenticated other user client."""
+    response = other_api_client.post(
+        custom_detail_action_url(
+            MailboxViewSet, MailboxViewSet.URL_NAME_FETCH_ESTIMATE, fake_mailbox
+        ),
+        data={"criterion": EmailFetchingCriterionChoices.ALL.value},
+    )
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    mock_Mailbox_estimate_fetch.assert_not_called()
+    assert "estimate" not in response.data
+
+
+@pytest.mark.django_db
+def test_fetch_estimate__success__auth_owner(
+    fake_mailbox,
+    owner_api_client,
+    custom_detail_action_url,
+    mock_Mailbox_estimate_fetch,
+    mock_celery_app,
+):
+    """Tests the post method :func:`api.v1.views.MailboxViewSet.MailboxViewSet.fetch_estimate` action with the authenticated owner user client."""
+    response = owner_api_client.post(
+        custom_detail_action_url(
+            MailboxViewSet, MailboxViewSet.URL_NAME_FETCH_ESTIMATE, fake_mailbox
+        ),
+        data={"criterion": EmailFetchingCriterionChoices.ALL.value},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    fake_mailbox.refresh_from_db()
+    assert response.data["data"] == MailboxViewSet.serializer_class(fake_mailbox).data
+    assert response.data["estimate"] == {
+        "message_count": 3,
+        "total_size": 1024,
+        "known_count": 1,
+    }
+    assert "error" not in response.data
+    mock_Mailbox_estimate_fetch.assert_called_once_with(
+        fake_mailbox, FetchingCriterion(EmailFetchingCriterionChoices.ALL)
+    )
+    mock_celery_app.send_task.assert_not_called()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("estimate_side_effect", [MailboxError, MailAccountError])
+def test_fetch_estimate__failure__auth_owner(
+    fake_error_message,
+    fake_mailbox,
+    owner_api_client,
+    custom_detail_action_url,
+    mock_Mailbox_estimate_fetch,
+    estimate_side_effect,
+):
+    """Tests the post method :func:`api.v1.views.MailboxViewSet.MailboxViewSet.fetch_estimate` action with the authenticated owner user client."""
+    mock_Mailbox_estimate_fetch.side_effect = estimate_side_effect(fake_error_message)
+
+    response = owner_api_client.post(
+        custom_detail_action_url(
+            MailboxViewSet, MailboxViewSet.URL_NAME_FETCH_ESTIMATE, fake_mailbox
+        ),
+        data={"criterion": EmailFetchingCriterionChoices.ALL.value},
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    fake_mailbox.refresh_from_db()
+    assert response.data["data"] == MailboxViewSet.serializer_class(fake_mailbox).data
+    assert "estimate" not in response.data
+    assert fake_error_message in response.data["error"]
+
+
+@pytest.mark.django_db
+def test_fetch_estimate__auth_owner__bad_criterion(
+    faker,
+    fake_mailbox,
+    owner_api_client,
+    custom_detail_action_url,
+    mock_Mailbox_estimate_fetch,
+):
+    """Tests the post method :func:`api.v1.views.MailboxViewSet.MailboxViewSet.fetch_estimate` action with the authenticated owner user client."""
+    response = owner_api_client.post(
+        custom_detail_action_url(
+            MailboxViewSet, MailboxViewSet.URL_NAME_FETCH_ESTIMATE, fake_mailbox
+        ),
+        data={"criterion": faker.word()},
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data["criterion"]
+    mock_Mailbox_estimate_fetch.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_fetch_estimate__auth_admin(
+    fake_mailbox,
+    admin_api_client,
+    custom_detail_action_url,
+    mock_Mailbox_estimate_fetch,
+):
+    """Tests the post method :func:`api.v1.views.MailboxViewSet.MailboxViewSet.fetch_estimate` action with the authenticated admin user client."""
+    response = admin_api_client.post(
+        custom_detail_action_url(
+            MailboxViewSet, MailboxViewSet.URL_NAME_FETCH_ESTIMATE, fake_mailbox
+        ),
+        data={"criterion": EmailFetchingCriterionChoices.ALL.value},
+    )
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    mock_Mailbox_estimate_fetch.assert_not_called()
+
+
 @pytest.mark.django_db
 def test_download__noauth(
     faker,
@@ -456,6 +456,8 @@ def fake_email_conversation(fake_email):
     reply_reply_reply_mail.references.add(reply_reply_mail)
     reply_reply_reply_mail.references.add(reply_mails[0])
     reply_reply_reply_mail.references.add(fake_email)
+    Email.rebuild_threads()
+    fake_email.refresh_from_db()
 
 
 @pytest.fixture
@@ -611,6 +613,7 @@ def account_payload(faker, owner_user):
         timeout=faker.random.randint(1, 1000),
         is_favorite=not Account.is_favorite.field.default,
         allow_insecure_connection=True,
+        use_compression=not Account.use_compression.field.default,
     )
     payload = model_to_dict(account_data)
     payload.pop("id")
@@ -708,6 +711,8 @@ def mailbox_payload(fake_account):
         account=fake_account,
         save_attachments=not Mailbox.save_attachments.field.default,
         save_to_eml=not Mailbox.save_to_eml.field.default,
+        use_idle=not Mailbox.use_idle.field.default,
+        partial_fetch=not Mailbox.partial_fetch.field.default,
         is_favorite=not Mailbox.is_favorite.field.default,
     )
     payload = model_to_dict(mailbox_data)
@@ -23,8 +23,9 @@ from io import BytesIO
 
 import pytest
 from django.core.files.storage import default_storage
+from django.db import transaction
 
-from core.models import StorageShard
+from core.models import StorageShard, StoredBlob
 
 
 @pytest.fixture(autouse=True)
@@ -64,7 +65,7 @@ def test_ShardedFileSystemStorage_save__multi(faker, fake_file):
     assert default_storage.listdir("")[1] == []
 
     for index in range(2 * 3 + 2):
-        default_storage.save(faker.name() + str(index), fake_file)
+        default_storage.save(faker.name() + str(index), BytesIO(str(index).encode()))
 
     assert StorageShard.objects.count() == 3
     storage = StorageShard.objects.get(current=True)
@@ -106,3 +107,96 @@ def test_ShardedFileSystemStorage_delete__single(faker, fake_file):
     storage = StorageShard.objects.first()
     assert storage.file_count == 0
     assert not default_storage.exists(file_name)
+
+
+@pytest.mark.django_db
+def test_ShardedFileSystemStorage_save__duplicate(faker, fake_file_bytes):
+    """Tests saving the same content twice via the :class:`core.backends.ShardedFileSystemStorage`."""
+    first_result = default_storage.save(faker.name(), BytesIO(fake_file_bytes))
+    second_result = default_storage.save(faker.name(), BytesIO(fake_file_bytes))
+
+    assert second_result == first_result
+    assert StorageShard.objects.get().file_count == 1
+    assert default_storage.listdir(os.path.dirname(first_result))[1] == [
+        os.path.basename(first_result)
+    ]
+    stored_blob = StoredBlob.objects.get()
+    assert stored_blob.file_path == first_result
+    assert stored_blob.reference_count == 2
+
+
+@pytest.mark.django_db
+def test_ShardedFileSystemStorage_save__missing_blob_file(faker, fake_file_bytes):
+    """Tests saving content via the :class:`core.backends.ShardedFileSystemStorage`
+    in case the stored file with the same content has gone missing.
+    """
+    first_result = default_storage.save(faker.name(), BytesIO(fake_file_bytes))
+    os.remove(default_storage.path(first_result))
+
+    second_result = default_storage.save(faker.name(), BytesIO(fake_file_bytes))
+
+    assert second_result != first_result
+    assert default_storage.open(second_result).read() == fake_file_bytes
+    stored_blob = StoredBlob.objects.get()
+    assert stored_blob.file_path == second_result
+    assert stored_blob.reference_count == 1
+
+
+@pytest.mark.django_db
+def test_ShardedFileSystemStorage_delete__shared(faker, fake_file):
+    """Tests deleting a file that has been saved twice via the :class:`core.backends.ShardedFileSystemStorage`."""
+    file_name = default_storage.save(faker.name(), fake_file)
+    default_storage.save(faker.name(), fake_file)
+
+    default_storage.delete(file_name)
+
+    assert default_storage.exists(file_name)
+    assert StorageShard.objects.get().file_count == 1
+    assert StoredBlob.objects.get().reference_count == 1
+
+    default_storage.delete(file_name)
+
+    assert not default_storage.exists(file_name)
+    assert StorageShard.objects.get().file_count == 0
+    assert StoredBlob.objects.count() == 0
+
+
+@pytest.mark.django_db
+def test_ShardedFileSystemStorage_discard_new_files_on_error__error(
+    faker, fake_file_bytes
+):
+    """Tests :func:`core.backends.ShardedFileSystemStorage.discard_new_files_on_error`
+    in case a transaction saving files is rolled back.
+    """
+    stored_file_name = default_storage.save(faker.name(), BytesIO(fake_file_bytes))
+    new_file_name = None
+
+    with (
+        pytest.raises(ValueError, match="rollback"),
+        default_storage.discard_new_files_on_error(),
+        transaction.atomic(),
+    ):
+        assert (
+            default_storage.save(faker.name(), BytesIO(fake_file_bytes))
+            == stored_file_name
+        )
+        new_file_name = default_storage.save(faker.name(), BytesIO(b"new content"))
+        raise ValueError("rollback")
+
+    assert default_storage.exists(stored_file_name)
+    assert StoredBlob.objects.get().reference_count == 1
+    assert new_file_name is not None
+    assert not default_storage.exists(new_file_name)
+    assert StorageShard.objects.get().file_count == 1
+
+
+@pytest.mark.django_db
+def test_ShardedFileSystemStorage_discard_new_files_on_error__success(faker, fake_file):
+    """Tests :func:`core.backends.ShardedFileSystemStorage.discard_new_files_on_error`
+    in case of success.
+    """
+    with default_storage.discard_new_files_on_error(), transaction.atomic():
+        file_name = default_storage.save(faker.name(), fake_file)
+
+    assert default_storage.exists(file_name)
+    assert StoredBlob.objects.filter(file_path=file_name).exists()
@@ -22,6 +22,7 @@ from __future__ import annotations
 
 import datetime
 import re
+import threading
 
 import pytest
 from django.db import IntegrityError
@@ -36,6 +37,7 @@ from core.constants import (
     SupportedEmailDownloadFormats,
 )
 from core.models import Account, Daemon, Mailbox
+from core.utils import FetchingCriterion
 from core.utils.fetchers import (
     BaseFetcher,
     ExchangeFetcher,
@@ -45,7 +47,7 @@ from core.utils.fetchers import (
     POP3_SSL_Fetcher,
     POP3Fetcher,
 )
-from core.utils.fetchers.exceptions import FetcherError, MailAccountError
+from core.utils.fetchers.exceptions import FetcherError, MailAccountError, MailboxError
 
 
 @pytest.fixture(autouse=True)
@@ -106,6 +108,7 @@ def test_Account_fields(django_user_model, fake_account):
     assert isinstance(fake_account.timeout, int)
     assert fake_account.timeout == 10
     assert fake_account.allow_insecure_connection is False
+    assert fake_account.use_compression is True
     assert fake_account.is_healthy is None
     assert fake_account.is_favorite is False
     assert fake_account.user is not None
@@ -268,6 +271,44 @@ def test_Account_save__old(mocker, fake_account, mock_logger):
     mock_logger.exception.assert_not_called()
 
 
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ("field", "value"),
+    [
+        ("mail_address", "other@example.org"),
+        ("mail_host", "other.example.org"),
+        ("mail_host_port", 1234),
+    ],
+)
+def test_Account_save__connection_changed(fake_account, field, value):
+    """Tests saving a :class:`core.models.Account.Account`
+    resets the JMAP mailbox state in case the connection data changed.
+    """
+    fake_account.jmap_mailbox_state = "state-1"
+    fake_account.save(update_fields=["jmap_mailbox_state"])
+
+    setattr(fake_account, field, value)
+    fake_account.save(update_fields=[field])
+
+    fake_account.refresh_from_db()
+    assert fake_account.jmap_mailbox_state == ""
+
+
+@pytest.mark.django_db
+def test_Account_save__connection_unchanged(fake_account):
+    """Tests saving a :class:`core.models.Account.Account`
+    keeps the JMAP mailbox state in case the connection data didn't change.
+    """
+    fake_account.jmap_mailbox_state = "state-1"
+    fake_account.save(update_fields=["jmap_mailbox_state"])
+
+    fake_account.is_favorite = not fake_account.is_favorite
+    fake_account.save()
+
+    fake_account.refresh_from_db()
+    assert fake_account.jmap_mailbox_state == "state-1"
+
+
 @pytest.mark.django_db
 def test_Account_save__autoupdate_error(
     mocker, fake_error_message, owner_user, mock_logger
@@ -608,6 +649,199 @@ def test_Account_update_mailboxes__get_fetcher_error(
     mock_logger.info.assert_called()
 
 
+@pytest.fixture
+def mock_Mailbox_fetch(mocker):
+    """Patches :func:`core.models.Mailbox.Mailbox.fetch`."""
+    return mocker.patch("core.models.Mailbox.Mailbox.fetch", autospec=True)
+
+
+@pytest.mark.django_db
+def test_Account_fetch__success(
+    faker,
+    override_config,
+    fake_account,
+    mock_fetcher,
+    mock_Account_get_fetcher,
+    mock_Mailbox_fetch,
+):
+    """Tests :func:`core.models.Account.Account.fetch`
+    in case of success over a single connection.
+    """
+    mailboxes = baker.make(Mailbox, account=fake_account, _quantity=3)
+    fake_criterion = FetchingCriterion(faker.word())
+    fake_account.is_healthy = False
+    fake_account.save(update_fields=["is_healthy"])
+
+    with override_config(MAX_CONNECTIONS_PER_ACCOUNT=1):
+        result = fake_account.fetch(fake_criterion)
+
+    assert result == []
+    fake_account.refresh_from_db()
+    assert fake_account.is_healthy is True
+    mock_Account_get_fetcher.assert_called_once_with(fake_account)
+    mock_fetcher.__exit__.assert_called_once()
+    assert mock_Mailbox_fetch.call_count == len(mailboxes)
+    for mailbox in mailboxes:
+        mock_Mailbox_fetch.assert_any_call(
+            mailbox, fake_criterion, fetcher=mock_fetcher
+        )
+
+
+@pytest.mark.django_db
+def test_Account_fetch__parallel(
+    faker,
+    override_config,
+    fake_account,
+    mock_fetcher,
+    mock_Account_get_fetcher,
+    mock_Mailbox_fetch,
+):
+    """Tests :func:`core.models.Account.Account.fetch`
+    in case the mailboxes are fetched over several connections in parallel.
+    """
+    mailboxes = baker.make(Mailbox, account=fake_account, _quantity=6)
+    fake_criterion = FetchingCriterion(faker.word())
+    connection_barrier = threading.Barrier(3, timeout=5)
+    fetching_threads = set()
+
+    def fetch_side_effect(*args, **kwargs):
+        if threading.current_thread() not in fetching_threads:
+            fetching_threads.add(threading.current_thread())
+            connection_barrier.wait()
+
+    mock_Mailbox_fetch.side_effect = fetch_side_effect
+
+    with override_config(
+        MAX_CONNECTIONS_PER_ACCOUNT=3, MAX_CONNECTIONS_PER_MAIL_HOST=3
+    ):
+        result = fake_account.fetch(fake_criterion)
+
+    assert result == []
+    assert len(fetching_threads) == 3
+    assert threading.current_thread() not in fetching_threads
+    assert mock_Account_get_fetcher.call_count == 3
+    assert mock_fetcher.__exit__.call_count == 3
+    assert mock_Mailbox_fetch.call_count == len(mailboxes)
+    for mailbox in mailboxes:
+        mock_Mailbox_fetch.assert_any_call(
+            mailbox, fake_criterion, fetcher=mock_fetcher
+        )
+
+
+@pytest.mark.django_db
+def test_Account_fetch__parallel_mail_host_limit(
+    faker,
+    override_config,
+    fake_account,
+    mock_fetcher,
+    mock_Account_get_fetcher,
+    mock_Mailbox_fetch,
+):
+    """Tests :func:`core.models.Account.Account.fetch`
+    in case the connections to the mail host are limited.
+    """
+    mailboxes = baker.make(Mailbox, account=fake_account, _quantity=6)
+
+    with override_config(
+        MAX_CONNECTIONS_PER_ACCOUNT=3, MAX_CONNECTIONS_PER_MAIL_HOST=1
+    ):
+        result = fake_account.fetch(FetchingCriterion(faker.word()))
+
+    assert result == []
+    mock_Account_get_fetcher.assert_called_once_with(fake_account)
+    assert mock_Mailbox_fetch.call_count == len(mailboxes)
+
+
+@pytest.mark.django_db
+def test_Account_fetch__given_mailboxes(
+    faker, fake_account, mock_fetcher, mock_Account_get_fetcher, mock_Mailbox_fetch
+):
+    """Tests :func:`core.models.Account.Account.fetch`
+    in case only some mailboxes are given.
+    """
+    mailbox, _ = baker.make(Mailbox, account=fake_account, _quantity=2)
+    fake_criterion = FetchingCriterion(faker.word())
+
+    fake_account.fetch(fake_criterion, [mailbox])
+
+    mock_Mailbox_fetch.assert_called_once_with(
+        mailbox, fake_criterion, fetcher=mock_fetcher
+    )
+
+
+@pytest.mark.django_db
+def test_Account_fetch__mailbox_error(
+    faker, fake_account, mock_fetcher, mock_Account_get_fetcher, mock_Mailbox_fetch
+):
+    """Tests :func:`core.models.Account.Account.fetch`
+    in case fetching a mailbox fails with a :class:`core.utils.fetchers.exceptions.MailboxError`.
+    """
+    failing_mailbox, _ = baker.make(Mailbox, account=fake_account, _quantity=2)
+
+    def fetch_side_effect(mailbox, *args, **kwargs):
+        if mailbox == failing_mailbox:
+            raise MailboxError(Exception())
+
+    mock_Mailbox_fetch.side_effect = fetch_side_effect
+
+    result = fake_account.fetch(FetchingCriterion(faker.word()))
+
+    assert result == [failing_mailbox]
+    assert mock_Mailbox_fetch.call_count == 2
+    fake_account.refresh_from_db()
+    assert fake_account.is_healthy is True
+
+
+@pytest.mark.django_db
+def test_Account_fetch__account_error(
+    faker,
+    override_config,
+    fake_account,
+    mock_fetcher,
+    mock_Account_get_fetcher,
+    mock_Mailbox_fetch,
+):
+    """Tests :func:`core.models.Account.Account.fetch`
+    in case fetching fails with a :class:`core.utils.fetchers.exceptions.MailAccountError`.
+    """
+    baker.make(Mailbox, account=fake_account, _quantity=2)
+    mock_Mailbox_fetch.side_effect = MailAccountError(Exception())
+
+    with (
+        override_config(MAX_CONNECTIONS_PER_ACCOUNT=1),
+        pytest.raises(MailAccountError),
+    ):
+        fake_account.fetch(FetchingCriterion(faker.word()))
+
+    mock_Mailbox_fetch.assert_called_once()
+    mock_fetcher.__exit__.assert_called_once()
+
+
+@pytest.mark.django_db
+def test_Account_fetch__parallel_account_error(
+    faker,
+    override_config,
+    fake_account,
+    mock_fetcher,
+    mock_Account_get_fetcher,
+    mock_Mailbox_fetch,
+):
+    """Tests :func:`core.models.Account.Account.fetch`
+    in case fetching over one of several connections fails with a :class:`core.utils.fetchers.exceptions.MailAccountError`.
+    """
+    baker.make(Mailbox, account=fake_account, _quantity=10)
+    mock_Mailbox_fetch.side_effect = MailAccountError(Exception())
+
+    with (
+        override_config(MAX_CONNECTIONS_PER_ACCOUNT=3),
+        pytest.raises(MailAccountError),
+    ):
+        fake_account.fetch(FetchingCriterion(faker.word()))
+
+    assert 1 <= mock_Mailbox_fetch.call_count <= 3
+    assert mock_fetcher.__exit__.call_count == mock_Account_get_fetcher.call_count
+
+
 @pytest.mark.django_db
 @pytest.mark.parametrize(
     "protocol",
@@ -693,13 +927,19 @@ def test_Account_add_daemons__success__pop(
     fake_inbox_daemon = fake_inbox.daemons.first()
     assert fake_inbox_daemon.interval.period == IntervalSchedule.SECONDS
     assert fake_inbox_daemon.interval.every == fake_inbox_every
-    assert fake_inbox_daemon.fetching_criterion == EmailFetchingCriterionChoices.ALL
+    assert (
+        fake_inbox_daemon.fetching_criterion
+        == EmailFetchingCriterionChoices.INCREMENTAL
+    )
     assert fake_inbox_daemon.fetching_criterion_arg == ""
     assert fake_sentbox.daemons.count() == 1
     fake_sentbox_daemon = fake_sentbox.daemons.first()
     assert fake_sentbox_daemon.interval.period == IntervalSchedule.HOURS
     assert fake_sentbox_daemon.interval.every == fake_sentbox_every
-    assert fake_inbox_daemon.fetching_criterion == EmailFetchingCriterionChoices.ALL
+    assert (
+        fake_sentbox_daemon.fetching_criterion
+        == EmailFetchingCriterionChoices.INCREMENTAL
+    )
     assert fake_inbox_daemon.fetching_criterion_arg == ""
 
 
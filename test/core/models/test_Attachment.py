@@ -19,7 +19,6 @@
 """Test module for :mod:`core.models.Attachment`."""
 
 import datetime
-import email
 import os
 import re
 from tempfile import gettempdir
@@ -28,12 +27,12 @@ from zipfile import ZipFile
 import httpx
 import pytest
 from django.core.files.storage import default_storage
-from django.db import IntegrityError
 from django.urls import reverse
 from model_bakery import baker
 from pyfakefs.fake_filesystem_unittest import Pause
 
 from core.models import Attachment, Email
+from core.utils.mail_parsing import ParsedEmail
 from test.conftest import TEST_EMAIL_PARAMETERS
 
 
@@ -90,13 +89,14 @@ def test_Attachment_foreign_key_deletion(fake_attachment):
 
 
 @pytest.mark.django_db
-def test_Attachment_unique_constraints(fake_mailbox):
-    """Tests the unique constraints of :class:`core.models.Attachment.Attachment`."""
+def test_Attachment_shared_file_path(fake_mailbox):
+    """Tests that :class:`core.models.Attachment.Attachment` instances can share a stored file."""
     email = baker.make(Email, mailbox=fake_mailbox)
 
     baker.make(Attachment, file_path="test", email=email)
-    with pytest.raises(IntegrityError):
-        baker.make(Attachment, file_path="test", email=email)
+    baker.make(Attachment, file_path="test", email=email)
+
+    assert Attachment.objects.filter(file_path="test").count() == 2
 
 
 @pytest.mark.django_db
@@ -325,11 +325,9 @@ def test_Attachment_queryset_as_file(
     assert Attachment.objects.count() == 2
     assert hasattr(result, "read")
     with ZipFile(result) as zipfile:
-        assert zipfile.namelist() == [
-            os.path.basename(fake_attachment_with_file.file_path)
-        ]
+        assert zipfile.namelist() == [fake_attachment_with_file.get_archive_file_name()]
         with zipfile.open(
-            os.path.basename(fake_attachment_with_file.file_path)
+            fake_attachment_with_file.get_archive_file_name()
         ) as zipped_file:
             assert zipped_file.read().strip() == fake_file.getvalue().strip()
     assert hasattr(result, "close")
@@ -337,6 +335,30 @@ def test_Attachment_queryset_as_file(
     assert os.listdir(gettempdir()) == []
 
 
+@pytest.mark.django_db
+def test_Attachment_queryset_as_file__shared_file(fake_attachment_with_file):
+    """Tests :func:`core.models.Attachment.Attachment.queryset_as_file`
+    in case attachments share their stored file.
+    """
+    shared_file_attachment = baker.make(
+        Attachment,
+        email=fake_attachment_with_file.email,
+        file_name=fake_attachment_with_file.file_name,
+        file_path=fake_attachment_with_file.file_path,
+    )
+
+    result = Attachment.queryset_as_file(Attachment.objects.all())
+
+    with ZipFile(result) as zipfile:
+        assert sorted(zipfile.namelist()) == sorted(
+            [
+                fake_attachment_with_file.get_archive_file_name(),
+                shared_file_attachment.get_archive_file_name(),
+            ]
+        )
+    result.close()
+
+
 @pytest.mark.django_db
 def test_Attachment_queryset_as_file_empty_queryset():
     """Tests :func:`core.models.Attachment.Attachment.queryset_as_file`
@@ -690,7 +712,7 @@ def test_Attachment_share_to_immich__status_error(
     ),
     TEST_EMAIL_PARAMETERS,
 )
-def test_Attachment_create_from_email_message(
+def test_Attachment_create_from_parsed_email(
     fake_fs,
     fake_email,
     test_email_path,
@@ -698,14 +720,14 @@ def test_Attachment_create_from_email_message(
     expected_correspondents_features,
     expected_attachments_features,
 ):
-    """Tests :func:`core.models.Attachment.Attachment.from_data`
+    """Tests :func:`core.models.Attachment.Attachment.create_from_parsed_email`
     in case of success.
     """
     with Pause(fake_fs), open(test_email_path, "br") as test_email_file:
         test_email_bytes = test_email_file.read()
-    test_email_message = email.message_from_bytes(test_email_bytes)
+    test_parsed_email = ParsedEmail.from_bytes(test_email_bytes)
 
-    result = Attachment.create_from_email_message(test_email_message, fake_email)
+    result = Attachment.create_from_parsed_email(test_parsed_email, fake_email)
 
     assert isinstance(result, list)
     assert all(isinstance(item, Attachment) for item in result)
@@ -733,14 +755,14 @@ def test_Attachment_create_from_email_message(
 
 
 @pytest.mark.django_db
-def test_Attachment_create_from_email_message__unsaved_email():
-    """Tests :func:`core.models.Attachment.Attachment.from_data`
-    in case of success.
+def test_Attachment_create_from_parsed_email__unsaved_email():
+    """Tests :func:`core.models.Attachment.Attachment.create_from_parsed_email`
+    in case the email is not in the db.
     """
-    test_email_message = email.message_from_bytes(b"")
+    test_parsed_email = ParsedEmail.from_bytes(b"")
 
     with pytest.raises(ValueError, match=re.compile("email", re.IGNORECASE)):
-        Attachment.create_from_email_message(test_email_message, Email())
+        Attachment.create_from_parsed_email(test_parsed_email, Email())
 
 
 @pytest.mark.django_db
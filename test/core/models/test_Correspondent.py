@@ -29,6 +29,7 @@ from django.db import IntegrityError
 from django.urls import reverse
 from model_bakery import baker
 
+from core.constants import HeaderFields
 from core.models import Correspondent
 
 
@@ -433,6 +434,95 @@ def test_Correspondent_create_from_correspondent_tuple__no_address(
     mock_logger.debug.assert_called()
 
 
+@pytest.mark.django_db
+def test_Correspondent_create_from_correspondent_tuples(
+    faker, fake_correspondent, owner_user
+):
+    """Tests :func:`core.models.Correspondent.Correspondent.create_from_correspondent_tuples`."""
+    new_address = faker.email()
+    new_name = faker.name()
+
+    result = Correspondent.create_from_correspondent_tuples(
+        [
+            ("", fake_correspondent.email_address),
+            ("", " " + new_address + " "),
+            (new_name, new_address),
+            (faker.name(), " "),
+        ],
+        owner_user,
+    )
+
+    assert set(result) == {fake_correspondent.email_address, new_address}
+    assert result[fake_correspondent.email_address].pk == fake_correspondent.pk
+    assert result[new_address].pk is not None
+    assert result[new_address].email_name == new_name
+    assert result[new_address].user == owner_user
+    assert Correspondent.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_Correspondent_create_from_correspondent_tuples__cache(
+    mocker, faker, fake_correspondent, owner_user
+):
+    """Tests :func:`core.models.Correspondent.Correspondent.create_from_correspondent_tuples`
+    in case the correspondents are resolved again with the same cache.
+    """
+    new_address = faker.email()
+    correspondent_tuples = [("", fake_correspondent.email_address), ("", new_address)]
+    cache = {}
+
+    first_result = Correspondent.create_from_correspondent_tuples(
+        correspondent_tuples, owner_user, cache
+    )
+    spy_filter = mocker.spy(Correspondent.objects, "filter")
+    spy_bulk_update = mocker.spy(Correspondent.objects, "bulk_update")
+    second_result = Correspondent.create_from_correspondent_tuples(
+        correspondent_tuples, owner_user, cache
+    )
+
+    assert set(cache) == {
+        (owner_user.pk, fake_correspondent.email_address),
+        (owner_user.pk, new_address),
+    }
+    assert second_result == first_result
+    spy_filter.assert_not_called()
+    spy_bulk_update.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_Correspondent_create_from_correspondent_tuple__unchanged_name(
+    mocker, fake_correspondent
+):
+    """Tests :func:`core.models.Correspondent.Correspondent.create_from_correspondent_tuple`
+    in case the correspondent is already in the database with the same name.
+    """
+    spy_save = mocker.spy(Correspondent, "save")
+
+    result = Correspondent.create_from_correspondent_tuple(
+        (fake_correspondent.email_name, fake_correspondent.email_address),
+        user=fake_correspondent.user,
+    )
+
+    assert result == fake_correspondent
+    spy_save.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_Correspondent_set_mailinglist_from_headers(faker, fake_correspondent):
+    """Tests :func:`core.models.Correspondent.Correspondent.set_mailinglist_from_headers`."""
+    list_id = faker.word()
+    fake_correspondent.list_id = ""
+    fake_correspondent.list_owner = ""
+
+    result = fake_correspondent.set_mailinglist_from_headers(
+        {HeaderFields.MailingList.ID: list_id}
+    )
+
+    assert "list_id" in result
+    assert "list_owner" not in result
+    assert fake_correspondent.list_id == list_id
+
+
 @pytest.mark.django_db
 def test_Correspondent_get_absolute_url(fake_correspondent):
     """Tests :func:`core.models.Correspondent.Correspondent.get_absolute_url`."""
@@ -38,8 +38,15 @@ from core.constants import (
     SupportedEmailDownloadFormats,
     file_format_parsers,
 )
-from core.models import Correspondent, Email, Mailbox
+from core.models import (
+    Correspondent,
+    Email,
+    EmailMessageID,
+    Mailbox,
+    MessageIDReference,
+)
 from core.utils.fetchers.exceptions import MailAccountError, MailboxError
+from core.utils.KnownMessageIDs import KnownMessageIDs
 from eonvelope.utils.workarounds import get_config
 from test.conftest import TEST_EMAIL_PARAMETERS
 
@@ -273,6 +280,20 @@ def test_Email_save__no_data__success(
     assert new_email.file_path is None
 
 
+@pytest.mark.django_db
+def test_Email_save__indexes_message_id(fake_mailbox):
+    """Tests :func:`core.models.Email.Email.save`
+    in case a new email is saved.
+    """
+    new_email = baker.make(Email, mailbox=fake_mailbox)
+
+    assert EmailMessageID.objects.filter(
+        email=new_email,
+        user=fake_mailbox.account.user,
+        message_id=new_email.message_id,
+    ).exists()
+
+
 def test_Email_open_file__success(fake_email_with_file):
     """Tests :func:`core.models.Email.Email.open_file`
     in case of success.
@@ -343,6 +364,79 @@ def test_Email_conversation(fake_email_conversation, start_id):
     assert len(conversation_emails) == 8
 
 
+@pytest.mark.django_db
+def test_Email_conversation__other_thread(fake_email_conversation, fake_mailbox):
+    """Tests :func:`core.models.Email.Email.conversation`
+    in case there are emails that are not connected to the conversation.
+    """
+    unconnected_email = baker.make(Email, mailbox=fake_mailbox)
+    Email.rebuild_threads()
+
+    assert list(unconnected_email.conversation) == [unconnected_email]
+    assert unconnected_email not in Email.objects.get(id=1).conversation
+
+
+@pytest.mark.django_db
+def test_Email_conversation__no_thread_id(fake_email):
+    """Tests :func:`core.models.Email.Email.conversation`
+    in case the email has no thread id yet.
+    """
+    baker.make(Email, mailbox=fake_email.mailbox)
+
+    assert fake_email.thread_id is None
+    assert list(fake_email.conversation) == [fake_email]
+
+
+@pytest.mark.django_db
+def test_Email_rebuild_threads(fake_email_conversation, fake_mailbox):
+    """Tests :func:`core.models.Email.Email.rebuild_threads`."""
+    unconnected_email = baker.make(Email, mailbox=fake_mailbox)
+    Email.objects.update(thread_id=None)
+
+    result = Email.rebuild_threads()
+
+    assert result == 1
+    assert set(
+        Email.objects.exclude(pk=unconnected_email.pk).values_list(
+            "thread_id", flat=True
+        )
+    ) == {1}
+    unconnected_email.refresh_from_db()
+    assert unconnected_email.thread_id == unconnected_email.pk
+
+
+@pytest.mark.django_db
+def test_Email_rebuild_thread(fake_email_conversation, fake_email):
+    """Tests :func:`core.models.Email.Email.rebuild_thread`
+    in case links in the thread have been removed.
+    """
+    fake_email.replies.clear()
+    fake_email.referenced_by.clear()
+
+    Email.rebuild_thread(fake_email.thread_id)
+
+    assert dict(Email.objects.values_list("pk", "thread_id")) == {
+        1: 1,
+        2: 2,
+        3: 3,
+        4: 4,
+        5: 3,
+        6: 3,
+        7: 2,
+        8: 2,
+    }
+
+
+@pytest.mark.django_db
+def test_Email_rebuild_thread__unchanged(fake_email_conversation, fake_email):
+    """Tests :func:`core.models.Email.Email.rebuild_thread`
+    in case the thread is still connected.
+    """
+    Email.rebuild_thread(fake_email.thread_id)
+
+    assert set(Email.objects.values_list("thread_id", flat=True)) == {1}
+
+
 @pytest.mark.django_db
 def test_Email_reprocess__success(fake_email_with_file):
     """Tests the :func:`core.models.Email.Email.reprocess` function in case of success."""
@@ -369,6 +463,10 @@ def test_Email_reprocess__success(fake_email_with_file):
     assert (
         len(fake_email_with_file.headers) == TEST_EMAIL_PARAMETERS[0][1]["header_count"]
     )
+    assert (
+        fake_email_with_file.indexed_message_id.message_id
+        == fake_email_with_file.message_id
+    )
 
 
 @pytest.mark.django_db
@@ -387,6 +485,28 @@ def test_Email_reprocess__no_file(fake_email):
     assert fake_email.message_id == previous_message_id
 
 
+@pytest.mark.django_db
+def test_Email_reprocess__splits_thread(fake_email_conversation):
+    """Tests the :func:`core.models.Email.Email.reprocess` function
+    in case the email loses its links to the thread.
+    """
+    reply_email = Email.objects.get(pk=4)
+
+    reply_email.reprocess()
+
+    assert reply_email.thread_id == 4
+    assert dict(Email.objects.values_list("pk", "thread_id")) == {
+        1: 1,
+        2: 1,
+        3: 1,
+        4: 4,
+        5: 1,
+        6: 1,
+        7: 1,
+        8: 1,
+    }
+
+
 @pytest.mark.django_db
 def test_Email_restore_to_mailbox__success(
     fake_email, mock_logger, mock_fetcher, mock_Account_get_fetcher
@@ -529,10 +649,8 @@ def test_Email_queryset_as_file_zip_eml(fake_file, fake_email, fake_email_with_f
     assert Email.objects.count() == 2
     assert hasattr(result, "read")
     with ZipFile(result) as zipfile:
-        assert zipfile.namelist() == [os.path.basename(fake_email_with_file.file_path)]
-        with zipfile.open(
-            os.path.basename(fake_email_with_file.file_path)
-        ) as zipped_file:
+        assert zipfile.namelist() == [fake_email_with_file.get_archive_file_name()]
+        with zipfile.open(fake_email_with_file.get_archive_file_name()) as zipped_file:
             assert (
                 zipped_file.read().replace(b"\r", b"").strip()
                 == default_storage.open(fake_email_with_file.file_path)
@@ -545,6 +663,31 @@ def test_Email_queryset_as_file_zip_eml(fake_file, fake_email, fake_email_with_f
     assert os.listdir(gettempdir()) == []
 
 
+@pytest.mark.django_db
+def test_Email_queryset_as_file_zip_eml__shared_file(fake_email_with_file):
+    """Tests :func:`core.models.Email.Email.queryset_as_file`
+    in case the requested format is zip of eml and emails share their stored file.
+    """
+    shared_file_email = baker.make(
+        Email,
+        mailbox=fake_email_with_file.mailbox,
+        file_path=fake_email_with_file.file_path,
+    )
+
+    result = Email.queryset_as_file(
+        Email.objects.all(), SupportedEmailDownloadFormats.ZIP_EML
+    )
+
+    with ZipFile(result) as zipfile:
+        assert sorted(zipfile.namelist()) == sorted(
+            [
+                fake_email_with_file.get_archive_file_name(),
+                shared_file_email.get_archive_file_name(),
+            ]
+        )
+    result.close()
+
+
 @pytest.mark.django_db
 @pytest.mark.parametrize(
     "file_format",
@@ -741,6 +884,44 @@ def test_Email_add_in_reply_to_multi(faker, fake_email):
     assert fake_referenced_email_2 in fake_email.in_reply_to.all()
 
 
+@pytest.mark.django_db
+def test_Email_add_in_reply_to__pending(faker, fake_email):
+    """Tests :func:`core.models.Email.Email.add_in_reply_to`
+    in case the matching email arrives after the header was indexed.
+    """
+    fake_message_id = faker.name()
+    fake_email.headers = {"in-reply-to": fake_message_id}
+
+    fake_email.add_in_reply_to()
+
+    assert fake_email.in_reply_to.count() == 0
+    assert MessageIDReference.objects.filter(
+        email=fake_email, message_id=fake_message_id, in_reply_to=True
+    ).exists()
+
+    fake_in_reply_to_email = baker.make(
+        Email, message_id=fake_message_id, mailbox=fake_email.mailbox
+    )
+    fake_in_reply_to_email.add_in_reply_to()
+
+    assert fake_email.in_reply_to.count() == 1
+    assert fake_in_reply_to_email in fake_email.in_reply_to.all()
+    assert fake_email.references.count() == 0
+
+
+@pytest.mark.django_db
+def test_Email_add_in_reply_to__pending_other_user(fake_email, fake_other_email):
+    """Tests :func:`core.models.Email.Email.add_in_reply_to`
+    in case the email waiting for the new email belongs to an other user.
+    """
+    fake_other_email.headers = {"in-reply-to": fake_email.message_id}
+    fake_other_email.add_in_reply_to()
+
+    fake_email.add_in_reply_to()
+
+    assert fake_other_email.in_reply_to.count() == 0
+
+
 @pytest.mark.django_db
 def test_Email_add_references__no_header(fake_email):
     """Tests :func:`core.models.Email.Email.references`
@@ -829,6 +1010,74 @@ def test_Email_add_references_multi(faker, fake_email):
     assert fake_referenced_email_2 in fake_email.references.all()
 
 
+@pytest.mark.django_db
+def test_Email_add_references__folded_header(faker, fake_email):
+    """Tests :func:`core.models.Email.Email.references`
+    in case the header is folded with linebreaks and tabs.
+    """
+    fake_message_id_1 = faker.word()
+    fake_message_id_2 = faker.word()
+    fake_referenced_email_1 = baker.make(
+        Email, message_id=fake_message_id_1, mailbox=fake_email.mailbox
+    )
+    fake_referenced_email_2 = baker.make(
+        Email, message_id=fake_message_id_2, mailbox=fake_email.mailbox
+    )
+    fake_email.headers = {
+        "references": fake_message_id_1 + "\r\n\t" + fake_message_id_2 + "\t"
+    }
+
+    fake_email.add_references()
+
+    assert fake_email.references.count() == 2
+    assert fake_referenced_email_1 in fake_email.references.all()
+    assert fake_referenced_email_2 in fake_email.references.all()
+
+
+@pytest.mark.django_db
+def test_Email_add_references__too_long_message_id(faker, fake_email):
+    """Tests :func:`core.models.Email.Email.references`
+    in case the header contains a message-id that is too long to be indexed.
+    """
+    fake_message_id = faker.word()
+    fake_referenced_email = baker.make(
+        Email, message_id=fake_message_id, mailbox=fake_email.mailbox
+    )
+    fake_email.headers = {"references": "a" * 256 + " " + fake_message_id}
+
+    fake_email.add_references()
+
+    assert fake_email.references.count() == 1
+    assert fake_referenced_email in fake_email.references.all()
+    assert list(
+        fake_email.message_id_references.values_list("message_id", flat=True)
+    ) == [fake_message_id]
+
+
+@pytest.mark.django_db
+def test_Email_add_references__pending(faker, fake_email):
+    """Tests :func:`core.models.Email.Email.references`
+    in case the matching emails arrive after the header was indexed.
+    """
+    fake_message_id_1 = faker.word()
+    fake_message_id_2 = faker.word()
+    fake_email.headers = {"references": fake_message_id_1 + " " + fake_message_id_2}
+
+    fake_email.add_references()
+
+    assert fake_email.references.count() == 0
+    assert fake_email.message_id_references.count() == 2
+
+    fake_referenced_email = baker.make(
+        Email, message_id=fake_message_id_2, mailbox=fake_email.mailbox
+    )
+    fake_referenced_email.add_references()
+
+    assert fake_email.references.count() == 1
+    assert fake_referenced_email in fake_email.references.all()
+    assert fake_email.in_reply_to.count() == 0
+
+
 @pytest.mark.django_db
 def test_Email_add_correspondents__no_headers(fake_email):
     """Tests :func:`core.models.Email.Email.add_correspondents`
@@ -893,6 +1142,30 @@ def test_Email_add_correspondents_single_in_db(faker, fake_email):
     )
 
 
+@pytest.mark.django_db
+def test_Email_add_correspondents__unchanged_mailinglist(mocker, faker, fake_email):
+    """Tests :func:`core.models.Email.Email.add_correspondents`
+    in case the mailinglist data of the sender has not changed.
+    """
+    fake_email_address = faker.email()
+    baker.make(
+        Correspondent,
+        email_address=fake_email_address,
+        user=fake_email.mailbox.account.user,
+        list_id="<list.test.org>",
+    )
+    fake_email.headers = {
+        HeaderFields.Correspondents.FROM: fake_email_address,
+        HeaderFields.MailingList.ID: "<list.test.org>",
+    }
+    spy_save = mocker.spy(Correspondent, "save")
+
+    fake_email.add_correspondents()
+
+    assert fake_email.correspondents.count() == 1
+    spy_save.assert_not_called()
+
+
 @pytest.mark.django_db
 def test_Email_add_correspondents_single_not_in_db(faker, fake_email):
     """Tests :func:`core.models.Email.Email.add_correspondents`
@@ -1062,6 +1335,37 @@ def test_Email_create_from_email_bytes__duplicate(
     mock_logger.critical.assert_not_called()
 
 
+@pytest.mark.django_db
+def test_Email_create_from_email_bytes__known_message_ids(
+    mocker, override_config, fake_fs, fake_email, mock_logger
+):
+    """Tests :func:`core.models.Email.Email.create_from_email_bytes`
+    in case the email is checked against preloaded Message-IDs.
+    """
+    known_message_ids = KnownMessageIDs(fake_email.mailbox)
+    previous_email_count = fake_email.mailbox.emails.count()
+    spy_filter = mocker.spy(Email.objects, "filter")
+
+    with override_config(THROW_OUT_SPAM=False):
+        assert (
+            Email.create_from_email_bytes(
+                f"Message-ID: {fake_email.message_id}".encode(),
+                fake_email.mailbox,
+                known_message_ids,
+            )
+            is None
+        )
+        spy_filter.assert_not_called()
+        result = Email.create_from_email_bytes(
+            b"Message-ID: new", fake_email.mailbox, known_message_ids
+        )
+
+    assert result is not None
+    assert "new" in known_message_ids
+    assert fake_email.mailbox.emails.count() == previous_email_count + 1
+    mock_logger.exception.assert_not_called()
+
+
 @pytest.mark.django_db
 @pytest.mark.parametrize(
     ("x_spam_flag", "THROW_OUT_SPAM", "expected_is_none"),
@@ -1131,6 +1435,378 @@ def test_Email_create_from_email_bytes__dberror(
     mock_logger.critical.assert_not_called()
 
 
+def test_Email_parse_email_bytes(fake_mailbox):
+    """Tests :func:`core.models.Email.Email.parse_email_bytes`."""
+    new_email, parsed_email = Email.parse_email_bytes(
+        b"Message-ID: something\nSubject: parsed", fake_mailbox
+    )
+
+    assert new_email.pk is None
+    assert new_email.mailbox == fake_mailbox
+    assert new_email.message_id == "something"
+    assert new_email.subject == "parsed"
+    assert parsed_email.message_id == "something"
+    assert parsed_email.headers["subject"] == "parsed"
+
+
+@pytest.mark.django_db
+def test_Email_create_from_parsed_email__success(
+    override_config, fake_fs, fake_mailbox, mock_logger
+):
+    """Tests :func:`core.models.Email.Email.create_from_parsed_email`
+    in case of success.
+    """
+    email_bytes = b"Message-ID: something\nSubject: parsed"
+    new_email, parsed_email = Email.parse_email_bytes(email_bytes, fake_mailbox)
+
+    with override_config(THROW_OUT_SPAM=False):
+        result = Email.create_from_parsed_email(new_email, parsed_email, email_bytes)
+
+    assert result is new_email
+    assert result.pk is not None
+    assert fake_mailbox.emails.filter(message_id="something").exists()
+    mock_logger.exception.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_Email_create_from_parsed_email__duplicate(
+    override_config, fake_fs, fake_email, mock_logger
+):
+    """Tests :func:`core.models.Email.Email.create_from_parsed_email`
+    in case the parsed email is already in the database.
+    """
+    previous_email_count = fake_email.mailbox.emails.count()
+    email_bytes = f"Message-ID: {fake_email.message_id}".encode()
+    new_email, parsed_email = Email.parse_email_bytes(email_bytes, fake_email.mailbox)
+
+    with override_config(THROW_OUT_SPAM=False):
+        result = Email.create_from_parsed_email(new_email, parsed_email, email_bytes)
+
+    assert result is None
+    assert fake_email.mailbox.emails.count() == previous_email_count
+    mock_logger.exception.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_Email_create_from_parsed_email__spam(
+    override_config, fake_fs, fake_mailbox, mock_logger
+):
+    """Tests :func:`core.models.Email.Email.create_from_parsed_email`
+    in case the parsed email is spam and is supposed to be thrown out.
+    """
+    email_bytes = b"X-Spam-Flag: YES"
+    new_email, parsed_email = Email.parse_email_bytes(email_bytes, fake_mailbox)
+
+    with override_config(THROW_OUT_SPAM=True):
+        result = Email.create_from_parsed_email(new_email, parsed_email, email_bytes)
+
+    assert result is None
+    assert new_email.pk is None
+
+
+@pytest.mark.django_db
+def test_Email_create_from_email_bytes_batch__success(
+    override_config, fake_fs, fake_mailbox, mock_logger
+):
+    """Tests :func:`core.models.Email.Email.create_from_email_bytes_batch`
+    in case of success.
+    """
+    emails_bytes = []
+    for test_email_path, _, _, _ in TEST_EMAIL_PARAMETERS:
+        with Pause(fake_fs), open(test_email_path, "br") as test_email_file:
+            emails_bytes.append(test_email_file.read())
+
+    with override_config(THROW_OUT_SPAM=False):
+        result = Email.create_from_email_bytes_batch(
+            emails_bytes, fake_mailbox, batch_size=2
+        )
+
+    assert result == len(TEST_EMAIL_PARAMETERS)
+    for email_bytes, (
+        _,
+        expected_email_features,
+        expected_correspondents_features,
+        expected_attachments_features,
+    ) in zip(emails_bytes, TEST_EMAIL_PARAMETERS, strict=True):
+        saved_email = fake_mailbox.emails.get(
+            message_id=expected_email_features["message_id"]
+        )
+        assert saved_email.subject == expected_email_features["subject"]
+        assert saved_email.attachments.count() == len(expected_attachments_features)
+        for item in saved_email.attachments.all():
+            assert item.file_name in expected_attachments_features
+            assert item.file_path
+        assert saved_email.emailcorrespondents.count() == sum(
+            len(correspondents)
+            for correspondents in expected_correspondents_features.values()
+        )
+        for item in saved_email.emailcorrespondents.all():
+            assert (
+                item.correspondent.email_address
+                in expected_correspondents_features[item.mention]
+            )
+        with default_storage.open(saved_email.file_path) as email_file:
+            assert email_file.read() == email_bytes
+    mock_logger.exception.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_Email_create_from_email_bytes_batch__skips_before_parsing(
+    mocker, override_config, fake_fs, fake_email, mock_logger
+):
+    """Tests :func:`core.models.Email.Email.create_from_email_bytes_batch`
+    in case emails are duplicates or spam, which must not be parsed.
+    """
+    spy_parse_email_bytes = mocker.spy(Email, "parse_email_bytes")
+    previous_email_count = fake_email.mailbox.emails.count()
+
+    with override_config(THROW_OUT_SPAM=True):
+        result = Email.create_from_email_bytes_batch(
+            [
+                f"Message-ID: {fake_email.message_id}".encode(),
+                b"Message-ID: spam\nX-Spam-Flag: YES",
+                b"Message-ID: new",
+            ],
+            fake_email.mailbox,
+        )
+
+    assert result == 1
+    assert fake_email.mailbox.emails.count() == previous_email_count + 1
+    spy_parse_email_bytes.assert_called_once()
+    mock_logger.exception.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_Email_skip_known_email_bytes(override_config, fake_email):
+    """Tests :func:`core.models.Email.Email.skip_known_email_bytes`."""
+    known_message_ids = KnownMessageIDs(fake_email.mailbox)
+    emails_bytes = [
+        f"Message-ID: {fake_email.message_id}".encode(),
+        b"Message-ID: spam\nX-Spam-Flag: YES",
+        b"Message-ID: new",
+        b"Message-ID: new\nSubject: repeated",
+    ]
+
+    with override_config(THROW_OUT_SPAM=True):
+        result = list(
+            Email.skip_known_email_bytes(
+                emails_bytes, fake_email.mailbox, known_message_ids
+            )
+        )
+
+    assert result == [b"Message-ID: new"]
+    assert "new" in known_message_ids
+    assert "spam" not in known_message_ids
+
+
+@pytest.mark.django_db
+def test_Email_create_from_email_bytes_batch__parse_processes(
+    mocker, override_config, fake_fs, fake_mailbox, mock_logger
+):
+    """Tests :func:`core.models.Email.Email.create_from_email_bytes_batch`
+    in case the emails are parsed by processes.
+    """
+
+    class FakeIngestPipeline:
+        """Runs the stages of the pipeline one after another in this thread."""
+
+        def __init__(self, parse, persist, **kwargs):
+            self.parse = parse
+            self.persist = persist
+
+        def run(self, messages):
+            self.persist([self.parse(message) for message in messages])
+
+    mock_IngestPipeline = mocker.patch(
+        "core.models.Email.IngestPipeline", side_effect=FakeIngestPipeline
+    )
+    emails_bytes = []
+    for test_email_path, _, _, _ in TEST_EMAIL_PARAMETERS:
+        with Pause(fake_fs), open(test_email_path, "br") as test_email_file:
+            emails_bytes.append(test_email_file.read())
+
+    with override_config(THROW_OUT_SPAM=False, INGEST_UPLOAD_PARSE_PROCESSES=2):
+        result = Email.create_from_email_bytes_batch(emails_bytes, fake_mailbox)
+
+    assert result == len(TEST_EMAIL_PARAMETERS)
+    assert mock_IngestPipeline.call_args.kwargs["parse_workers"] == 2
+    assert mock_IngestPipeline.call_args.kwargs["use_processes"] is True
+    for (
+        _,
+        expected_email_features,
+        _,
+        expected_attachments_features,
+    ) in TEST_EMAIL_PARAMETERS:
+        saved_email = fake_mailbox.emails.get(
+            message_id=expected_email_features["message_id"]
+        )
+        assert saved_email.attachments.count() == len(expected_attachments_features)
+    mock_logger.exception.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_Email_create_from_parsed_emails__success(
+    override_config, fake_fs, fake_mailbox, mock_logger
+):
+    """Tests :func:`core.models.Email.Email.create_from_parsed_emails`
+    in case of success.
+    """
+    first_email_bytes = b"Message-ID: first\nFrom: sender@test.org"
+    second_email_bytes = (
+        b"Message-ID: second\nFrom: sender@test.org\nIn-Reply-To: first"
+    )
+    parsed_emails = [
+        (*Email.parse_email_bytes(email_bytes, fake_mailbox), email_bytes)
+        for email_bytes in (first_email_bytes, second_email_bytes)
+    ]
+
+    with override_config(THROW_OUT_SPAM=False):
+        result = Email.create_from_parsed_emails(parsed_emails)
+
+    assert result == [new_email for new_email, _, _ in parsed_emails]
+    first_email = fake_mailbox.emails.get(message_id="first")
+    second_email = fake_mailbox.emails.get(message_id="second")
+    assert list(second_email.in_reply_to.all()) == [first_email]
+    assert first_email.correspondents.get().pk == second_email.correspondents.get().pk
+    assert first_email.file_path
+    assert second_email.file_path
+    mock_logger.exception.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_Email_create_from_parsed_emails__duplicate(
+    override_config, fake_fs, fake_email, mock_logger
+):
+    """Tests :func:`core.models.Email.Email.create_from_parsed_emails`
+    in case parsed emails are already in the database or in the batch.
+    """
+    previous_email_count = fake_email.mailbox.emails.count()
+    parsed_emails = [
+        (*Email.parse_email_bytes(email_bytes, fake_email.mailbox), email_bytes)
+        for email_bytes in (
+            f"Message-ID: {fake_email.message_id}".encode(),
+            b"Message-ID: new",
+            b"Message-ID: new",
+        )
+    ]
+
+    with override_config(THROW_OUT_SPAM=False):
+        result = Email.create_from_parsed_emails(parsed_emails)
+
+    assert result == [parsed_emails[1][0]]
+    assert fake_email.mailbox.emails.count() == previous_email_count + 1
+    mock_logger.exception.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_Email_create_from_parsed_emails__reply_before_parent(
+    override_config, fake_fs, fake_mailbox, mock_logger
+):
+    """Tests :func:`core.models.Email.Email.create_from_parsed_emails`
+    in case a reply is saved in an earlier batch than the email it replies to.
+    """
+    reply_bytes = b"Message-ID: reply\nIn-Reply-To: parent\nReferences: root parent"
+    parent_bytes = b"Message-ID: parent\nReferences: root"
+
+    with override_config(THROW_OUT_SPAM=False):
+        (reply,) = Email.create_from_parsed_emails(
+            [(*Email.parse_email_bytes(reply_bytes, fake_mailbox), reply_bytes)]
+        )
+        (parent,) = Email.create_from_parsed_emails(
+            [(*Email.parse_email_bytes(parent_bytes, fake_mailbox), parent_bytes)]
+        )
+
+    assert list(reply.in_reply_to.all()) == [parent]
+    assert list(reply.references.all()) == [parent]
+    assert parent.in_reply_to.count() == 0
+    assert parent.references.count() == 0
+    reply.refresh_from_db()
+    parent.refresh_from_db()
+    assert reply.thread_id == parent.thread_id == reply.pk
+    assert set(parent.conversation) == {reply, parent}
+    mock_logger.exception.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_Email_create_from_parsed_emails__folded_references(
+    override_config, fake_fs, fake_mailbox, mock_logger
+):
+    """Tests :func:`core.models.Email.Email.create_from_parsed_emails`
+    in case the references header is folded and contains a message-id
+    that is too long to be indexed.
+    """
+    parent_bytes = b"Message-ID: parent"
+    reply_bytes = (
+        b"Message-ID: reply\nReferences: parent\n\t" + b"a" * 300 + b"\n\troot"
+    )
+
+    with override_config(THROW_OUT_SPAM=False):
+        result = Email.create_from_parsed_emails(
+            [
+                (*Email.parse_email_bytes(email_bytes, fake_mailbox), email_bytes)
+                for email_bytes in (parent_bytes, reply_bytes)
+            ]
+        )
+
+    assert len(result) == 2
+    reply = fake_mailbox.emails.get(message_id="reply")
+    parent = fake_mailbox.emails.get(message_id="parent")
+    assert list(reply.references.all()) == [parent]
+    assert set(reply.message_id_references.values_list("message_id", flat=True)) == {
+        "parent",
+        "root",
+    }
+    mock_logger.exception.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_Email_create_from_parsed_emails__spam(
+    override_config, fake_fs, fake_mailbox, mock_logger
+):
+    """Tests :func:`core.models.Email.Email.create_from_parsed_emails`
+    in case parsed emails are spam and are supposed to be thrown out.
+    """
+    email_bytes = b"X-Spam-Flag: YES"
+    parsed_email = (*Email.parse_email_bytes(email_bytes, fake_mailbox), email_bytes)
+
+    with override_config(THROW_OUT_SPAM=True):
+        result = Email.create_from_parsed_emails([parsed_email])
+
+    assert result == []
+    assert fake_mailbox.emails.count() == 0
+
+
+@pytest.mark.django_db
+def test_Email_create_from_parsed_emails__bulk_error(
+    mocker, override_config, fake_fs, fake_mailbox, mock_logger
+):
+    """Tests :func:`core.models.Email.Email.create_from_parsed_emails`
+    in case saving the batch fails.
+    """
+    mock_bulk_create_attachments = mocker.patch(
+        "core.models.Attachment.Attachment.create_from_parsed_emails",
+        side_effect=IntegrityError,
+    )
+    parsed_emails = [
+        (*Email.parse_email_bytes(email_bytes, fake_mailbox), email_bytes)
+        for email_bytes in (b"Message-ID: first", b"Message-ID: second")
+    ]
+
+    with override_config(THROW_OUT_SPAM=False):
+        result = Email.create_from_parsed_emails(parsed_emails)
+
+    assert len(result) == 2
+    assert all(new_email.pk is not None for new_email in result)
+    assert fake_mailbox.emails.count() == 2
+    assert {
+        os.path.join(shard_directory, file_name)
+        for shard_directory in default_storage.listdir("")[0]
+        for file_name in default_storage.listdir(shard_directory)[1]
+    } == {new_email.file_path for new_email in result}
+    mock_bulk_create_attachments.assert_called_once()
+    mock_logger.exception.assert_called_once()
+
+
 @pytest.mark.django_db
 def test_Email_html_version(fake_email, fake_attachment, fake_correspondent):
     """Tests :func:`core.models.Email.Email.html_version`."""
@@ -1231,6 +1907,16 @@ def test_Email_get_absolute_table_url(fake_email):
     )
 
 
+@pytest.mark.django_db
+def test_Email_get_archive_file_name(fake_email):
+    """Tests :func:`core.models.Email.Email.get_archive_file_name`."""
+    fake_email.message_id = "<some/message@id>"
+
+    result = fake_email.get_archive_file_name()
+
+    assert result == f"{fake_email.pk}_somemessageid.eml"
+
+
 @pytest.mark.django_db
 def test_Email__get_storage_file_name(fake_email, fake_other_email):
     """Test that the storage file name is unique."""
@@ -27,6 +27,7 @@ from model_bakery import baker
 
 from core.constants import HeaderFields
 from core.models import Correspondent, Email, EmailCorrespondent
+from core.utils.mail_parsing import ParsedEmail
 
 
 @pytest.fixture
@@ -210,3 +211,49 @@ def test_EmailCorrespondent_create_from_header__unsaved_email(fake_header_name,
 
     assert EmailCorrespondent.objects.count() == 0
     assert Correspondent.objects.count() == 0
+
+
+@pytest.mark.django_db
+def test_EmailCorrespondent_create_from_parsed_emails(fake_email, fake_other_email):
+    """Tests :func:`core.models.EmailCorrespondent.EmailCorrespondent.create_from_parsed_emails`."""
+    parsed_email = ParsedEmail.from_bytes(
+        b"From: sender <sender@test.org>\nTo: one@test.org, two@test.org\n"
+        b"List-Id: <list.test.org>"
+    )
+    other_parsed_email = ParsedEmail.from_bytes(b"To: sender@test.org")
+
+    result = EmailCorrespondent.create_from_parsed_emails(
+        [(parsed_email, fake_email), (other_parsed_email, fake_other_email)]
+    )
+
+    assert len(result) == 4
+    assert EmailCorrespondent.objects.count() == 4
+    sender = fake_email.emailcorrespondents.get(
+        mention=HeaderFields.Correspondents.FROM
+    ).correspondent
+    assert sender.email_name == "sender"
+    assert sender.list_id == "<list.test.org>"
+    assert set(
+        fake_email.emailcorrespondents.filter(
+            mention=HeaderFields.Correspondents.TO
+        ).values_list("correspondent__email_address", flat=True)
+    ) == {"one@test.org", "two@test.org"}
+    assert (
+        fake_other_email.emailcorrespondents.get(
+            mention=HeaderFields.Correspondents.TO
+        ).correspondent.email_address
+        == "sender@test.org"
+    )
+
+
+@pytest.mark.django_db
+def test_EmailCorrespondent_create_from_parsed_emails__unsaved_email():
+    """Tests :func:`core.models.EmailCorrespondent.EmailCorrespondent.create_from_parsed_emails`
+    in case an email is not in the database.
+    """
+    with pytest.raises(ValueError, match=re.compile("email", re.IGNORECASE)):
+        EmailCorrespondent.create_from_parsed_emails(
+            [(ParsedEmail.from_bytes(b"From: sender@test.org"), Email())]
+        )
+
+    assert EmailCorrespondent.objects.count() == 0
@@ -0,0 +1,68 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+#
+# Eonvelope - a open-source self-hostable email archiving server
+# Copyright (C) 2024 David Aderbauer & The Eonvelope Contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+
+"""Test module for :mod:`core.models.EmailMessageID`."""
+
+import pytest
+
+from core.models import Email, EmailMessageID
+
+
+@pytest.fixture
+def fake_email_message_id(fake_email):
+    """Fixture providing the :class:`core.models.EmailMessageID` of an email."""
+    return fake_email.indexed_message_id
+
+
+@pytest.mark.django_db
+def test_EmailMessageID_fields(fake_email_message_id):
+    """Tests the fields of :class:`core.models.EmailMessageID.EmailMessageID`."""
+
+    assert fake_email_message_id.user is not None
+    assert fake_email_message_id.email is not None
+    assert isinstance(fake_email_message_id.email, Email)
+    assert fake_email_message_id.message_id is not None
+    assert isinstance(fake_email_message_id.message_id, str)
+    assert fake_email_message_id.created is not None
+    assert fake_email_message_id.updated is not None
+
+
+@pytest.mark.django_db
+def test_EmailMessageID___str__(fake_email_message_id):
+    """Tests the string representation of :class:`core.models.EmailMessageID.EmailMessageID`."""
+    assert str(fake_email_message_id.email) in str(fake_email_message_id)
+    assert fake_email_message_id.message_id in str(fake_email_message_id)
+
+
+@pytest.mark.django_db
+def test_EmailMessageID_foreign_key_email_deletion(fake_email_message_id):
+    """Tests the on_delete foreign key constraint on email in :class:`core.models.EmailMessageID.EmailMessageID`."""
+    fake_email_message_id.email.delete()
+
+    with pytest.raises(EmailMessageID.DoesNotExist):
+        fake_email_message_id.refresh_from_db()
+
+
+@pytest.mark.django_db
+def test_EmailMessageID_foreign_key_user_deletion(fake_email_message_id):
+    """Tests the on_delete foreign key constraint on user in :class:`core.models.EmailMessageID.EmailMessageID`."""
+    fake_email_message_id.user.delete()
+
+    with pytest.raises(EmailMessageID.DoesNotExist):
+        fake_email_message_id.refresh_from_db()
@@ -68,10 +68,10 @@ def mock_logger(mocker):
 
 
 @pytest.fixture
-def mock_Email_create_from_email_bytes(mocker):
-    """Patches `core.models.Email.create_from_email_bytes`."""
+def mock_Email_create_from_email_bytes_batch(mocker):
+    """Patches `core.models.Email.create_from_email_bytes_batch`."""
     return mocker.patch(
-        "core.models.Email.Email.create_from_email_bytes", autospec=True
+        "core.models.Email.Email.create_from_email_bytes_batch", autospec=True
     )
 
 
@@ -333,11 +333,12 @@ def test_Mailbox_test__get_fetcher_error(
 @pytest.mark.django_db
 def test_Mailbox_fetch__success(
     faker,
+    override_config,
     fake_mailbox,
     mock_logger,
     mock_Account_get_fetcher,
     mock_fetcher,
-    mock_Email_create_from_email_bytes,
+    mock_Email_create_from_email_bytes_batch,
 ):
     """Tests :func:`core.models.Mailbox.Mailbox.fetch`
     in case of success.
@@ -347,7 +348,8 @@ def test_Mailbox_fetch__success(
     fake_mailbox.is_healthy = False
     fake_mailbox.save(update_fields=["is_healthy"])
 
-    fake_mailbox.fetch(FetchingCriterion(fake_criterion, fake_criterion_arg))
+    with override_config(INGEST_PARSE_WORKERS=0):
+        fake_mailbox.fetch(FetchingCriterion(fake_criterion, fake_criterion_arg))
 
     fake_mailbox.refresh_from_db()
     assert fake_mailbox.is_healthy is True
@@ -355,13 +357,301 @@ def test_Mailbox_fetch__success(
     mock_fetcher.fetch_emails.assert_called_once_with(
         fake_mailbox, FetchingCriterion(fake_criterion, fake_criterion_arg)
     )
-    assert mock_Email_create_from_email_bytes.call_count == len(
+    mock_Email_create_from_email_bytes_batch.assert_called_once()
+    assert list(mock_Email_create_from_email_bytes_batch.call_args.args[0]) == list(
         mock_fetcher.fetch_emails.return_value
     )
+    assert mock_Email_create_from_email_bytes_batch.call_args.args[1] == fake_mailbox
     mock_logger.info.assert_called()
     mock_logger.error.assert_not_called()
 
 
+@pytest.mark.django_db
+def test_Mailbox_fetch__given_fetcher(
+    faker,
+    override_config,
+    fake_mailbox,
+    mock_logger,
+    mock_Account_get_fetcher,
+    mock_fetcher,
+    mock_Email_create_from_email_bytes_batch,
+):
+    """Tests :func:`core.models.Mailbox.Mailbox.fetch`
+    in case of success with an already open fetcher.
+    """
+    fake_criterion = faker.word()
+
+    with override_config(INGEST_PARSE_WORKERS=0):
+        fake_mailbox.fetch(FetchingCriterion(fake_criterion), fetcher=mock_fetcher)
+
+    fake_mailbox.refresh_from_db()
+    assert fake_mailbox.is_healthy is True
+    mock_Account_get_fetcher.assert_not_called()
+    mock_fetcher.fetch_emails.assert_called_once_with(
+        fake_mailbox, FetchingCriterion(fake_criterion)
+    )
+    mock_fetcher.__exit__.assert_not_called()
+    mock_Email_create_from_email_bytes_batch.assert_called_once()
+
+
+@pytest.mark.django_db
+def test_Mailbox_fetch__pipeline(
+    mocker,
+    faker,
+    override_config,
+    fake_mailbox,
+    mock_logger,
+    mock_Account_get_fetcher,
+    mock_fetcher,
+):
+    """Tests :func:`core.models.Mailbox.Mailbox.fetch`
+    in case the emails are ingested by a pipeline.
+    """
+    mock_parse_email_bytes = mocker.patch(
+        "core.models.Email.Email.parse_email_bytes",
+        autospec=True,
+        side_effect=lambda email_bytes, mailbox: (email_bytes, mailbox),
+    )
+    saved_emails = []
+    mocker.patch(
+        "core.models.Email.Email.create_from_parsed_emails",
+        autospec=True,
+        side_effect=lambda parsed_emails, correspondent_cache: saved_emails.extend(
+            parsed_emails
+        ),
+    )
+
+    with override_config(INGEST_PARSE_WORKERS=2, INGEST_PERSIST_BATCH_SIZE=2):
+        fake_mailbox.fetch(FetchingCriterion(faker.word()))
+
+    fake_mailbox.refresh_from_db()
+    assert fake_mailbox.is_healthy is True
+    assert mock_parse_email_bytes.call_count == len(
+        mock_fetcher.fetch_emails.return_value
+    )
+    assert saved_emails == [
+        (email_bytes, fake_mailbox, email_bytes)
+        for email_bytes in mock_fetcher.fetch_emails.return_value
+    ]
+
+
+@pytest.mark.django_db
+def test_Mailbox_fetch__pipeline__known_emails(
+    mocker,
+    faker,
+    override_config,
+    fake_email,
+    mock_logger,
+    mock_Account_get_fetcher,
+    mock_fetcher,
+):
+    """Tests :func:`core.models.Mailbox.Mailbox.fetch`
+    in case some of the emails ingested by a pipeline are already in the mailbox.
+    """
+    fake_mailbox = fake_email.mailbox
+    mock_fetcher.fetch_emails.return_value = [
+        f"Message-ID: {fake_email.message_id}".encode(),
+        b"Message-ID: new",
+        b"Message-ID: new",
+    ]
+    mock_parse_email_bytes = mocker.patch(
+        "core.models.Email.Email.parse_email_bytes",
+        autospec=True,
+        side_effect=lambda email_bytes, mailbox: (email_bytes, mailbox),
+    )
+    mocker.patch(
+        "core.models.Email.Email.create_from_parsed_emails",
+        autospec=True,
+    )
+
+    with override_config(INGEST_PARSE_WORKERS=2, THROW_OUT_SPAM=False):
+        fake_mailbox.fetch(FetchingCriterion(EmailFetchingCriterionChoices.ALL))
+
+    mock_parse_email_bytes.assert_called_once_with(b"Message-ID: new", fake_mailbox)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "criterion",
+    [
+        EmailFetchingCriterionChoices.INCREMENTAL,
+        EmailFetchingCriterionChoices.UNSEEN,
+        EmailFetchingCriterionChoices.DAILY,
+    ],
+)
+def test_Mailbox_fetch__pipeline__not_preloaded(
+    mocker,
+    override_config,
+    fake_email,
+    mock_logger,
+    mock_Account_get_fetcher,
+    mock_fetcher,
+    criterion,
+):
+    """Tests :func:`core.models.Mailbox.Mailbox.fetch`
+    in case the emails of a fetch of not all emails are ingested by a pipeline.
+    """
+    fake_mailbox = fake_email.mailbox
+    mock_fetcher.fetch_emails.return_value = [
+        f"Message-ID: {fake_email.message_id}".encode(),
+        b"Message-ID: new",
+        b"Message-ID: new",
+    ]
+    mock_parse_email_bytes = mocker.patch(
+        "core.models.Email.Email.parse_email_bytes",
+        autospec=True,
+        side_effect=lambda email_bytes, mailbox: (email_bytes, mailbox),
+    )
+    mocker.patch(
+        "core.models.Email.Email.create_from_parsed_emails",
+        autospec=True,
+    )
+
+    with override_config(INGEST_PARSE_WORKERS=2, THROW_OUT_SPAM=False):
+        fake_mailbox.fetch(FetchingCriterion(criterion))
+
+    # the emails in the db are only checked when saving
+    parsed_emails_bytes = [
+        call.args[0] for call in mock_parse_email_bytes.call_args_list
+    ]
+    assert sorted(parsed_emails_bytes) == sorted(
+        [
+            f"Message-ID: {fake_email.message_id}".encode(),
+            b"Message-ID: new",
+        ]
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "criterion",
+    [
+        EmailFetchingCriterionChoices.INCREMENTAL,
+        EmailFetchingCriterionChoices.UNSEEN,
+        EmailFetchingCriterionChoices.DAILY,
+    ],
+)
+def test_Mailbox_fetch__not_preloaded(
+    mocker,
+    override_config,
+    fake_mailbox,
+    mock_logger,
+    mock_Account_get_fetcher,
+    mock_fetcher,
+    mock_Email_create_from_email_bytes_batch,
+    criterion,
+):
+    """Tests :func:`core.models.Mailbox.Mailbox.fetch`
+    in case of a fetch of not all emails without a pipeline.
+    """
+    with override_config(INGEST_PARSE_WORKERS=0):
+        fake_mailbox.fetch(FetchingCriterion(criterion))
+
+    mock_Email_create_from_email_bytes_batch.assert_called_once()
+    assert (
+        mock_Email_create_from_email_bytes_batch.call_args.kwargs[
+            "known_message_ids"
+        ].is_preloaded
+        is False
+    )
+
+
+@pytest.mark.django_db
+def test_Mailbox_fetch__pipeline__deferred_save(
+    mocker,
+    faker,
+    override_config,
+    fake_mailbox,
+    mock_logger,
+    mock_Account_get_fetcher,
+    mock_fetcher,
+):
+    """Tests :func:`core.models.Mailbox.Mailbox.fetch`
+    in case the fetcher saves the sync state of the mailbox while the emails are ingested by a pipeline.
+    """
+
+    def fake_fetch_emails(mailbox, criterion):
+        yield b"first"
+        mailbox.imap_highest_uid = 1
+        mailbox.save(update_fields=["imap_highest_uid"])
+        yield b"second"
+
+    mock_fetcher.fetch_emails.side_effect = fake_fetch_emails
+    mocker.patch(
+        "core.models.Email.Email.parse_email_bytes",
+        autospec=True,
+        side_effect=lambda email_bytes, mailbox: (email_bytes, mailbox),
+    )
+    saved_highest_uids = []
+    mocker.patch(
+        "core.models.Email.Email.create_from_parsed_emails",
+        autospec=True,
+        side_effect=lambda parsed_emails, correspondent_cache: saved_highest_uids.extend(
+            Mailbox.objects.get(pk=fake_mailbox.pk).imap_highest_uid
+            for _ in parsed_emails
+        ),
+    )
+
+    with override_config(INGEST_PARSE_WORKERS=2):
+        fake_mailbox.fetch(FetchingCriterion(faker.word()))
+
+    assert saved_highest_uids == [0, 1]
+    fake_mailbox.refresh_from_db()
+    assert fake_mailbox.imap_highest_uid == 1
+
+
+@pytest.mark.django_db
+def test_Mailbox_fetch__deferred_save(
+    mocker,
+    faker,
+    override_config,
+    fake_mailbox,
+    mock_logger,
+    mock_Account_get_fetcher,
+    mock_fetcher,
+):
+    """Tests :func:`core.models.Mailbox.Mailbox.fetch`
+    in case the fetcher saves the sync state of the mailbox while the emails are saved in batches without a pipeline.
+    """
+
+    def fake_fetch_emails(mailbox, criterion):
+        for highest_uid, email_bytes in enumerate(
+            [b"first", b"second", b"third"], start=1
+        ):
+            yield email_bytes
+            mailbox.imap_highest_uid = highest_uid
+            mailbox.save(update_fields=["imap_highest_uid"])
+
+    def fake_create_from_parsed_emails(parsed_emails, correspondent_cache):
+        saved_highest_uids.extend(
+            Mailbox.objects.get(pk=fake_mailbox.pk).imap_highest_uid
+            for _ in parsed_emails
+        )
+        return parsed_emails
+
+    mock_fetcher.fetch_emails.side_effect = fake_fetch_emails
+    mocker.patch(
+        "core.models.Email.Email.parse_email_bytes",
+        autospec=True,
+        side_effect=lambda email_bytes, mailbox: (email_bytes, mailbox),
+    )
+    saved_highest_uids = []
+    mocker.patch(
+        "core.models.Email.Email.create_from_parsed_emails",
+        autospec=True,
+        side_effect=fake_create_from_parsed_emails,
+    )
+
+    with override_config(
+        INGEST_PARSE_WORKERS=0, INGEST_PERSIST_BATCH_SIZE=2, THROW_OUT_SPAM=False
+    ):
+        fake_mailbox.fetch(FetchingCriterion(faker.word()))
+
+    assert saved_highest_uids == [0, 0, 1]
+    fake_mailbox.refresh_from_db()
+    assert fake_mailbox.imap_highest_uid == 3
+
+
 @pytest.mark.django_db
 def test_Mailbox_fetch__failure(
     faker,
@@ -369,7 +659,7 @@ def test_Mailbox_fetch__failure(
     mock_logger,
     mock_fetcher,
     mock_Account_get_fetcher,
-    mock_Email_create_from_email_bytes,
+    mock_Email_create_from_email_bytes_batch,
 ):
     """Tests :func:`core.models.Mailbox.Mailbox.fetch`
     in case fetching fails with a :class:`core.utils.fetchers.exceptions.MailboxError`.
@@ -389,7 +679,7 @@ def test_Mailbox_fetch__failure(
     mock_fetcher.fetch_emails.assert_called_once_with(
         fake_mailbox, FetchingCriterion(fake_criterion, fake_criterion_arg)
     )
-    mock_Email_create_from_email_bytes.assert_not_called()
+    mock_Email_create_from_email_bytes_batch.assert_not_called()
     mock_logger.info.assert_called()
     mock_logger.error.assert_not_called()
 
@@ -400,7 +690,7 @@ def test_Mailbox_fetch__get_fetcher_error(
     mock_logger,
     mock_Account_get_fetcher,
     mock_fetcher,
-    mock_Email_create_from_email_bytes,
+    mock_Email_create_from_email_bytes_batch,
 ):
     """Tests :func:`core.models.Mailbox.Mailbox.fetch`
     in case :func:`core.models.Account.Account.get_fetcher`
@@ -417,11 +707,163 @@ def test_Mailbox_fetch__get_fetcher_error(
     assert fake_mailbox.is_healthy is True
     mock_Account_get_fetcher.assert_called_once_with(fake_mailbox.account)
     mock_fetcher.fetch_emails.assert_not_called()
-    mock_Email_create_from_email_bytes.assert_not_called()
+    mock_Email_create_from_email_bytes_batch.assert_not_called()
     mock_logger.info.assert_called()
     mock_logger.error.assert_not_called()
 
 
+@pytest.mark.django_db
+def test_Mailbox_estimate_fetch__success(
+    faker,
+    fake_mailbox,
+    mock_logger,
+    mock_Account_get_fetcher,
+    mock_fetcher,
+    mock_Email_create_from_email_bytes_batch,
+):
+    """Tests :func:`core.models.Mailbox.Mailbox.estimate_fetch`
+    in case of success.
+    """
+    fake_criterion = FetchingCriterion(faker.word(), faker.word())
+    fake_mailbox.is_healthy = False
+    fake_mailbox.save(update_fields=["is_healthy"])
+
+    result = fake_mailbox.estimate_fetch(fake_criterion)
+
+    assert result == mock_fetcher.estimate_emails.return_value
+    fake_mailbox.refresh_from_db()
+    assert fake_mailbox.is_healthy is True
+    mock_Account_get_fetcher.assert_called_once_with(fake_mailbox.account)
+    mock_fetcher.estimate_emails.assert_called_once_with(fake_mailbox, fake_criterion)
+    mock_fetcher.fetch_emails.assert_not_called()
+    mock_Email_create_from_email_bytes_batch.assert_not_called()
+    mock_logger.info.assert_called()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("estimate_side_effect", [MailboxError, MailAccountError])
+def test_Mailbox_estimate_fetch__failure(
+    fake_mailbox,
+    mock_logger,
+    mock_Account_get_fetcher,
+    mock_fetcher,
+    estimate_side_effect,
+):
+    """Tests :func:`core.models.Mailbox.Mailbox.estimate_fetch`
+    in case the estimation fails with a :class:`core.utils.fetchers.exceptions.FetcherError`.
+    """
+    mock_fetcher.estimate_emails.side_effect = estimate_side_effect(Exception())
+    fake_mailbox.is_healthy = True
+    fake_mailbox.save(update_fields=["is_healthy"])
+
+    with pytest.raises(estimate_side_effect):
+        fake_mailbox.estimate_fetch(FetchingCriterion("criterion", "value"))
+
+    if estimate_side_effect == MailboxError:
+        assert fake_mailbox.is_healthy is False
+    elif estimate_side_effect == MailAccountError:
+        assert fake_mailbox.account.is_healthy is False
+    mock_Account_get_fetcher.assert_called_once_with(fake_mailbox.account)
+    mock_logger.info.assert_called()
+
+
+@pytest.mark.django_db
+def test_Mailbox_start_fetch_progress__new(fake_mailbox):
+    """Tests :func:`core.models.Mailbox.Mailbox.start_fetch_progress`
+    in case there is no interrupted fetch.
+    """
+    criterion = FetchingCriterion(EmailFetchingCriterionChoices.ALL)
+
+    result = fake_mailbox.start_fetch_progress(criterion, ["1", "2", "3"])
+
+    assert result == 0
+    fake_mailbox.refresh_from_db()
+    assert fake_mailbox.fetch_progress_criterion == str(criterion)
+    assert fake_mailbox.fetch_progress_checkpoint == ""
+    assert fake_mailbox.fetch_progress_count == 0
+    assert fake_mailbox.fetch_progress_total == 3
+    assert fake_mailbox.fetch_progress_updated is not None
+
+
+@pytest.mark.django_db
+def test_Mailbox_start_fetch_progress__resume(fake_mailbox):
+    """Tests :func:`core.models.Mailbox.Mailbox.start_fetch_progress`
+    in case the latest fetch with the same criterion was interrupted.
+    """
+    criterion = FetchingCriterion(EmailFetchingCriterionChoices.ALL)
+    fake_mailbox.fetch_progress_criterion = str(criterion)
+    fake_mailbox.fetch_progress_checkpoint = "2"
+    fake_mailbox.save()
+
+    result = fake_mailbox.start_fetch_progress(criterion, ["1", "2", "3", "4"])
+
+    assert result == 2
+    fake_mailbox.refresh_from_db()
+    assert fake_mailbox.fetch_progress_checkpoint == "2"
+    assert fake_mailbox.fetch_progress_count == 2
+    assert fake_mailbox.fetch_progress_total == 4
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ("progress_criterion", "checkpoint"),
+    [
+        (EmailFetchingCriterionChoices.UNSEEN, "2"),
+        (EmailFetchingCriterionChoices.ALL, "deleted"),
+        (EmailFetchingCriterionChoices.ALL, ""),
+    ],
+)
+def test_Mailbox_start_fetch_progress__no_resume(
+    fake_mailbox, progress_criterion, checkpoint
+):
+    """Tests :func:`core.models.Mailbox.Mailbox.start_fetch_progress`
+    in case the latest fetch can't be resumed.
+    """
+    criterion = FetchingCriterion(EmailFetchingCriterionChoices.ALL)
+    fake_mailbox.fetch_progress_criterion = progress_criterion
+    fake_mailbox.fetch_progress_checkpoint = checkpoint
+    fake_mailbox.fetch_progress_count = 2
+    fake_mailbox.save()
+
+    result = fake_mailbox.start_fetch_progress(criterion, ["1", "2", "3"])
+
+    assert result == 0
+    fake_mailbox.refresh_from_db()
+    assert fake_mailbox.fetch_progress_criterion == str(criterion)
+    assert fake_mailbox.fetch_progress_checkpoint == ""
+    assert fake_mailbox.fetch_progress_count == 0
+
+
+@pytest.mark.django_db
+def test_Mailbox_advance_fetch_progress(fake_mailbox):
+    """Tests :func:`core.models.Mailbox.Mailbox.advance_fetch_progress`."""
+    fake_mailbox.fetch_progress_count = 2
+    fake_mailbox.save()
+
+    fake_mailbox.advance_fetch_progress("5", 3)
+
+    fake_mailbox.refresh_from_db()
+    assert fake_mailbox.fetch_progress_checkpoint == "5"
+    assert fake_mailbox.fetch_progress_count == 5
+    assert fake_mailbox.fetch_progress_updated is not None
+
+
+@pytest.mark.django_db
+def test_Mailbox_finish_fetch_progress(fake_mailbox):
+    """Tests :func:`core.models.Mailbox.Mailbox.finish_fetch_progress`."""
+    fake_mailbox.fetch_progress_checkpoint = "5"
+    fake_mailbox.fetch_progress_count = 2
+    fake_mailbox.fetch_progress_total = 7
+    fake_mailbox.save()
+
+    fake_mailbox.finish_fetch_progress()
+
+    fake_mailbox.refresh_from_db()
+    assert fake_mailbox.fetch_progress_checkpoint == ""
+    assert fake_mailbox.fetch_progress_count == 7
+    assert fake_mailbox.fetch_progress_updated is not None
+
+
 @pytest.mark.django_db
 @pytest.mark.parametrize(
     "file_format",
@@ -749,10 +1191,10 @@ def test_Mailbox_queryset_as_file_zip_eml(
             ZipFile(zipped_file) as inner_zipfile,
         ):
             assert inner_zipfile.namelist() == [
-                os.path.basename(fake_email_with_file.file_path)
+                fake_email_with_file.get_archive_file_name()
             ]
             with inner_zipfile.open(
-                os.path.basename(fake_email_with_file.file_path)
+                fake_email_with_file.get_archive_file_name()
             ) as inner_zipped_file:
                 assert (
                     inner_zipped_file.read().replace(b"\r", b"").strip()
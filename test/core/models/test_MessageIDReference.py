@@ -0,0 +1,89 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+#
+# Eonvelope - a open-source self-hostable email archiving server
+# Copyright (C) 2024 David Aderbauer & The Eonvelope Contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+
+"""Test module for :mod:`core.models.MessageIDReference`."""
+
+import pytest
+from django.db import IntegrityError
+from model_bakery import baker
+
+from core.models import Email, MessageIDReference
+
+
+@pytest.fixture
+def fake_message_id_reference(faker, fake_email):
+    """Fixture creating an :class:`core.models.MessageIDReference`."""
+    return baker.make(
+        MessageIDReference,
+        user=fake_email.mailbox.account.user,
+        email=fake_email,
+        message_id=faker.word(),
+    )
+
+
+@pytest.mark.django_db
+def test_MessageIDReference_fields(fake_message_id_reference):
+    """Tests the fields of :class:`core.models.MessageIDReference.MessageIDReference`."""
+
+    assert fake_message_id_reference.user is not None
+    assert fake_message_id_reference.email is not None
+    assert isinstance(fake_message_id_reference.email, Email)
+    assert fake_message_id_reference.message_id is not None
+    assert isinstance(fake_message_id_reference.message_id, str)
+    assert fake_message_id_reference.in_reply_to is False
+    assert fake_message_id_reference.created is not None
+    assert fake_message_id_reference.updated is not None
+
+
+@pytest.mark.django_db
+def test_MessageIDReference___str__(fake_message_id_reference):
+    """Tests the string representation of :class:`core.models.MessageIDReference.MessageIDReference`."""
+    assert str(fake_message_id_reference.email) in str(fake_message_id_reference)
+    assert fake_message_id_reference.message_id in str(fake_message_id_reference)
+
+
+@pytest.mark.django_db
+def test_MessageIDReference_foreign_key_email_deletion(fake_message_id_reference):
+    """Tests the on_delete foreign key constraint on email in :class:`core.models.MessageIDReference.MessageIDReference`."""
+    fake_message_id_reference.email.delete()
+
+    with pytest.raises(MessageIDReference.DoesNotExist):
+        fake_message_id_reference.refresh_from_db()
+
+
+@pytest.mark.django_db
+def test_MessageIDReference_foreign_key_user_deletion(fake_message_id_reference):
+    """Tests the on_delete foreign key constraint on user in :class:`core.models.MessageIDReference.MessageIDReference`."""
+    fake_message_id_reference.user.delete()
+
+    with pytest.raises(MessageIDReference.DoesNotExist):
+        fake_message_id_reference.refresh_from_db()
+
+
+@pytest.mark.django_db
+def test_MessageIDReference_unique_constraints(fake_message_id_reference):
+    """Tests the unique constraint in :class:`core.models.MessageIDReference.MessageIDReference`."""
+    with pytest.raises(IntegrityError):
+        baker.make(
+            MessageIDReference,
+            user=fake_message_id_reference.user,
+            email=fake_message_id_reference.email,
+            message_id=fake_message_id_reference.message_id,
+            in_reply_to=fake_message_id_reference.in_reply_to,
+        )
@@ -22,6 +22,7 @@ from __future__ import annotations
 
 import asyncio
 import os
+from io import BytesIO
 
 import pytest
 from django.core.files.storage import default_storage
@@ -144,7 +145,7 @@ def test_DefaultStorageStorageHealthCheck_filled_storage(faker, fake_fs, fake_fi
     impact on the StorageShard table.
     """
     default_storage.save(faker.file_name(), fake_file)
-    default_storage.save(faker.file_name(), fake_file)
+    default_storage.save(faker.file_name(), BytesIO(faker.binary(length=64)))
     current_storage_path = STORAGE_PATH / str(
         StorageShard.get_current_storage().shard_directory_name
     )
@@ -0,0 +1,66 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+#
+# Eonvelope - a open-source self-hostable email archiving server
+# Copyright (C) 2024 David Aderbauer & The Eonvelope Contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+
+"""Test module for :mod:`core.models.StoredBlob`."""
+
+from io import BytesIO
+
+import pytest
+from django.core.files.storage import default_storage
+from django.db import IntegrityError
+from model_bakery import baker
+
+from core.models import StoredBlob
+
+
+@pytest.fixture(autouse=True)
+def always_fake_fs(fake_fs):
+    """The following tests all run against a mocked fs."""
+
+
+@pytest.fixture
+def fake_stored_blob(faker, fake_file_bytes):
+    """Fixture creating an :class:`core.models.StoredBlob` by saving a file."""
+    default_storage.save(faker.file_name(), BytesIO(fake_file_bytes))
+    return StoredBlob.objects.get()
+
+
+@pytest.mark.django_db
+def test_StoredBlob_fields(fake_stored_blob, fake_file_bytes):
+    """Tests the fields of :class:`core.models.StoredBlob.StoredBlob`."""
+    assert len(fake_stored_blob.digest) == 64
+    assert fake_stored_blob.file_path is not None
+    assert default_storage.open(fake_stored_blob.file_path).read() == fake_file_bytes
+    assert fake_stored_blob.reference_count == 1
+    assert fake_stored_blob.created is not None
+    assert fake_stored_blob.updated is not None
+
+
+@pytest.mark.django_db
+def test_StoredBlob___str__(fake_stored_blob):
+    """Tests the string representation of :class:`core.models.StoredBlob.StoredBlob`."""
+    assert fake_stored_blob.file_path in str(fake_stored_blob)
+    assert str(fake_stored_blob.reference_count) in str(fake_stored_blob)
+
+
+@pytest.mark.django_db
+def test_StoredBlob_unique_constraints(fake_stored_blob):
+    """Tests the unique constraints of :class:`core.models.StoredBlob.StoredBlob`."""
+    with pytest.raises(IntegrityError):
+        baker.make(StoredBlob, digest=fake_stored_blob.digest)
@@ -20,6 +20,7 @@
 
 import pytest
 from django.core.files.storage import default_storage
+from model_bakery import baker
 
 from core.models import Email
 
@@ -78,3 +79,64 @@ def test_bulk_delete_email__with_file(fake_email_with_file):
     assert not default_storage.exists(fake_email_with_file.file_path)
     with pytest.raises(Email.DoesNotExist):
         fake_email_with_file.refresh_from_db()
+
+
+@pytest.mark.django_db
+def test_delete_email__shared_file(fake_email_with_file, fake_mailbox):
+    """Test individual deletion of an :class:`core.models.Email` instance
+    in case its file is shared with another email with identical content.
+    """
+    with fake_email_with_file.open_file() as email_file:
+        email_bytes = email_file.read()
+    other_email = baker.make(Email, mailbox=fake_mailbox)
+    other_email.save(file_payload=email_bytes)
+
+    shared_file_path = other_email.file_path
+    assert shared_file_path == fake_email_with_file.file_path
+
+    fake_email_with_file.delete()
+
+    assert default_storage.exists(shared_file_path)
+
+    other_email.delete()
+
+    assert not default_storage.exists(shared_file_path)
+
+
+@pytest.mark.django_db
+def test_delete_email__splits_thread(
+    django_capture_on_commit_callbacks, fake_email_conversation, fake_email
+):
+    """Test individual deletion of an :class:`core.models.Email` instance
+    in case it connects other emails of its thread.
+    """
+    with django_capture_on_commit_callbacks(execute=True):
+        fake_email.delete()
+
+    assert dict(Email.objects.values_list("pk", "thread_id")) == {
+        2: 2,
+        3: 3,
+        4: 4,
+        5: 3,
+        6: 3,
+        7: 2,
+        8: 2,
+    }
+
+
+@pytest.mark.django_db
+def test_cascade_delete_email__rebuilds_thread_once(
+    mocker, django_capture_on_commit_callbacks, fake_email_conversation, fake_email
+):
+    """Test cascade deletion of a thread of :class:`core.models.Email` instances
+    rebuilding their thread only once.
+    """
+    mock_rebuild_thread = mocker.patch(
+        "core.signals.delete_Email.Email.rebuild_thread", autospec=True
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        fake_email.mailbox.delete()
+
+    assert not Email.objects.exists()
+    mock_rebuild_thread.assert_called_once_with(fake_email.thread_id)
@@ -0,0 +1,52 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+#
+# Eonvelope - a open-source self-hostable email archiving server
+# Copyright (C) 2024 David Aderbauer & The Eonvelope Contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""Test module for :mod:`core.signals.delete_Mailbox`."""
+
+import pytest
+
+from core.models import Mailbox
+
+
+@pytest.mark.django_db
+def test_delete_mailbox__resets_jmap_mailbox_state(fake_account, fake_mailbox):
+    """Test deletion of an :class:`core.models.Mailbox` instance
+    resets the JMAP mailbox state of its account.
+    """
+    fake_account.jmap_mailbox_state = "state-1"
+    fake_account.save(update_fields=["jmap_mailbox_state"])
+
+    fake_mailbox.delete()
+
+    fake_account.refresh_from_db()
+    assert fake_account.jmap_mailbox_state == ""
+    with pytest.raises(Mailbox.DoesNotExist):
+        fake_mailbox.refresh_from_db()
+
+
+@pytest.mark.django_db
+def test_cascade_delete_mailbox(fake_account, fake_mailbox):
+    """Test cascade deletion of an :class:`core.models.Mailbox` instance
+    together with its account.
+    """
+    fake_account.jmap_mailbox_state = "state-1"
+    fake_account.save(update_fields=["jmap_mailbox_state"])
+
+    fake_account.delete()
+
+    with pytest.raises(Mailbox.DoesNotExist):
+        fake_mailbox.refresh_from_db()
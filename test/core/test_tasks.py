@@ -27,9 +27,10 @@ from model_bakery import baker
 from pyfakefs.fake_filesystem_unittest import Pause
 
 from core.constants import SupportedEmailUploadFormats
-from core.models import Email
+from core.models import Email, Mailbox
 from core.tasks import (
     autodelete_expired_emails,
+    fetch_account_emails,
     fetch_emails,
     fetch_mailbox_emails,
     process_emails_file,
@@ -304,6 +305,85 @@ def test_fetch_mailbox_emails_task__ValueError(
     assert fake_error_message in fake_mailbox.last_error
 
 
+@pytest.mark.django_db
+def test_fetch_account_emails_task__success(
+    fake_fs, override_config, fake_mailbox, mock_Account_get_test_email_fetcher
+):
+    """Tests :func:`core.tasks.fetch_account_emails`
+    in case of success over a single connection.
+    """
+    other_mailbox = baker.make(Mailbox, account=fake_mailbox.account)
+
+    with override_config(MAX_CONNECTIONS_PER_ACCOUNT=1):
+        fetch_account_emails(
+            fake_mailbox.account.id, fake_mailbox.available_fetching_criteria[0]
+        )
+
+    mock_Account_get_test_email_fetcher.assert_called_once_with(fake_mailbox.account)
+    fake_mailbox.refresh_from_db()
+    assert fake_mailbox.is_healthy is True
+    assert fake_mailbox.emails.count() == 1
+    other_mailbox.refresh_from_db()
+    assert other_mailbox.is_healthy is True
+    fake_mailbox.account.refresh_from_db()
+    assert fake_mailbox.account.is_healthy is True
+
+
+@pytest.mark.django_db
+def test_fetch_account_emails_task__bad_account_id(
+    fake_mailbox, mock_Account_get_test_email_fetcher
+):
+    """Tests :func:`core.tasks.fetch_account_emails`
+    in case the given id doesn't match any account entry.
+    """
+    fetch_account_emails(12004, fake_mailbox.available_fetching_criteria[0])
+
+    mock_Account_get_test_email_fetcher.assert_not_called()
+    assert fake_mailbox.emails.count() == 0
+
+
+@pytest.mark.django_db
+def test_fetch_account_emails_task__MailboxError(
+    fake_error_message, fake_mailbox, mock_test_email_fetcher
+):
+    """Tests :func:`core.tasks.fetch_account_emails`
+    in case of an MailboxError.
+    """
+    mock_test_email_fetcher.fetch_emails.side_effect = MailboxError(
+        Exception(fake_error_message)
+    )
+
+    fetch_account_emails(
+        fake_mailbox.account.id, fake_mailbox.available_fetching_criteria[0]
+    )
+
+    fake_mailbox.refresh_from_db()
+    assert fake_mailbox.is_healthy is False
+    assert fake_error_message in fake_mailbox.last_error
+    fake_mailbox.account.refresh_from_db()
+    assert fake_mailbox.account.is_healthy is True
+
+
+@pytest.mark.django_db
+def test_fetch_account_emails_task__MailAccountError(
+    fake_error_message, fake_mailbox, mock_test_email_fetcher
+):
+    """Tests :func:`core.tasks.fetch_account_emails`
+    in case of an MailAccountError.
+    """
+    mock_test_email_fetcher.fetch_emails.side_effect = MailAccountError(
+        Exception(fake_error_message)
+    )
+
+    with pytest.raises(MailAccountError, match=fake_error_message):
+        fetch_account_emails(
+            fake_mailbox.account.id, fake_mailbox.available_fetching_criteria[0]
+        )
+
+    fake_mailbox.account.refresh_from_db()
+    assert fake_mailbox.account.is_healthy is False
+
+
 def test_process_emails_file__success(fake_fs, fake_mailbox):
     """Tests :func:`core.tasks.process_emails_file`
     in case of success.
@@ -0,0 +1,124 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+#
+# Eonvelope - a open-source self-hostable email archiving server
+# Copyright (C) 2024 David Aderbauer & The Eonvelope Contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""Test module for :mod:`core.utils.fetchers.BodyStructure`."""
+
+import email
+
+from core.utils.fetchers.BodyStructure import BodyStructure
+
+MULTIPART_FETCH_DATA = [
+    (
+        b'1 (UID 7 BODYSTRUCTURE (("text" "plain" ("name" {5}',
+        b'a"b c',
+    ),
+    (
+        b') NIL NIL "7bit" 5 1 NIL NIL NIL NIL)'
+        b'(("text" "html" NIL NIL NIL "7bit" 5 1 NIL NIL NIL NIL)'
+        b'("video" "mp4" ("name" "clip.mp4") NIL NIL "base64" 4000 NIL ("ATTACHMENT" ("filename" "clip.mp4")) NIL NIL)'
+        b' "alternative" ("boundary" "inner") NIL NIL)'
+        b' "MIXED" ("BOUNDARY" "outer") NIL NIL NIL))'
+    ),
+]
+"""A FETCH response for a nested multipart message with a literal."""
+
+
+def test_BodyStructure_from_fetch_data__multipart():
+    """Tests :func:`core.utils.fetchers.BodyStructure.BodyStructure.from_fetch_data`
+    for a nested multipart message.
+    """
+    result = BodyStructure.from_fetch_data(MULTIPART_FETCH_DATA)
+
+    assert list(result) == [b"7"]
+    structure = result[b"7"]
+    assert structure.is_multipart
+    assert structure.content_subtype == "mixed"
+    assert structure.parameters == {"boundary": "outer"}
+    assert [
+        (part.section, part.content_maintype, part.content_subtype)
+        for part in structure.walk()
+    ] == [
+        ("", "multipart", "mixed"),
+        ("1", "text", "plain"),
+        ("2", "multipart", "alternative"),
+        ("2.1", "text", "html"),
+        ("2.2", "video", "mp4"),
+    ]
+    assert structure.subparts[0].parameters == {"name": 'a"b c'}
+    assert structure.subparts[1].subparts[1].content_disposition == "attachment"
+
+
+def test_BodyStructure_from_fetch_data__singlepart():
+    """Tests :func:`core.utils.fetchers.BodyStructure.BodyStructure.from_fetch_data`
+    for messages that are not multipart.
+    """
+    result = BodyStructure.from_fetch_data(
+        [
+            b'1 (UID 1 RFC822.SIZE 100 BODYSTRUCTURE ("TEXT" "PLAIN" ("charset" "utf-8") NIL NIL "7bit" 5 1 NIL NIL NIL NIL))',
+            b'2 (UID 2 BODYSTRUCTURE ("image" "png" NIL NIL NIL "base64" 10 NIL ("inline" NIL) NIL NIL))',
+        ]
+    )
+
+    assert result == {
+        b"1": BodyStructure("", "text", "plain", None, {"charset": "utf-8"}),
+        b"2": BodyStructure("", "image", "png", "inline"),
+    }
+
+
+def test_BodyStructure_from_fetch_data__malformed():
+    """Tests :func:`core.utils.fetchers.BodyStructure.BodyStructure.from_fetch_data`
+    for malformed and incomplete responses.
+    """
+    result = BodyStructure.from_fetch_data(
+        [
+            b'1 (UID 1 BODYSTRUCTURE ("text" "plain"',
+            b"2 (UID 2 RFC822.SIZE 100)",
+            b"3 (UID 3 BODYSTRUCTURE ())",
+            b"4 (BODYSTRUCTURE ())",
+        ]
+    )
+
+    assert result == {}
+
+
+def test_BodyStructure_assemble():
+    """Tests :func:`core.utils.fetchers.BodyStructure.BodyStructure.assemble`."""
+    structure = BodyStructure.from_fetch_data(MULTIPART_FETCH_DATA)[b"7"]
+    contents = {
+        "HEADER": b"Subject: test\r\nContent-Type: multipart/mixed; boundary=outer\r\n\r\n",
+        "1.MIME": b"Content-Type: text/plain\r\n\r\n",
+        "1": b"plain",
+        "2.MIME": b"Content-Type: multipart/alternative; boundary=inner\r\n",
+        "2.1.MIME": b"Content-Type: text/html\r\n\r\n",
+        "2.1": b"<p>html</p>",
+        "2.2.MIME": b"Content-Type: video/mp4\r\nContent-Disposition: attachment\r\n\r\n",
+    }
+
+    result = structure.assemble(contents)
+
+    email_message = email.message_from_bytes(result)
+    assert email_message["Subject"] == "test"
+    assert [
+        (part.get_content_type(), part.get_payload(decode=True))
+        for part in email_message.walk()
+        if not part.is_multipart()
+    ] == [
+        ("text/plain", b"plain"),
+        ("text/html", b"<p>html</p>"),
+        ("video/mp4", b""),
+    ]
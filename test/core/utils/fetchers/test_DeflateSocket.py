@@ -0,0 +1,131 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+#
+# Eonvelope - a open-source self-hostable email archiving server
+# Copyright (C) 2024 David Aderbauer & The Eonvelope Contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""Test module for the :class:`core.utils.fetchers.DeflateSocket` class."""
+
+import socket
+import zlib
+
+import pytest
+
+from core.utils.fetchers.DeflateSocket import (
+    DeflateSocket,
+    compressed_bytes_received,
+    decompressed_bytes_received,
+)
+
+
+@pytest.fixture
+def socket_pair():
+    """A pair of connected sockets, the first one wrapped in a :class:`DeflateSocket`."""
+    client_socket, server_socket = socket.socketpair()
+    client_socket.settimeout(5)
+    server_socket.settimeout(5)
+    yield DeflateSocket(client_socket), server_socket
+    client_socket.close()
+    server_socket.close()
+
+
+def compress(data):
+    """Compresses data like a server with COMPRESS=DEFLATE."""
+    compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+
+def test_DeflateSocket_recv(socket_pair):
+    """Tests :func:`core.utils.fetchers.DeflateSocket.DeflateSocket.recv`."""
+    deflate_socket, server_socket = socket_pair
+    data = b"* 1 FETCH (RFC822 {1000}\r\n" + b"a" * 1000 + b")\r\n"
+    compressed_data = compress(data)
+    compressed_before = compressed_bytes_received._value.get()
+    decompressed_before = decompressed_bytes_received._value.get()
+
+    server_socket.sendall(compressed_data)
+    result = deflate_socket.recv(4096)
+
+    assert result == data
+    assert deflate_socket.compressed_bytes_received == len(compressed_data)
+    assert deflate_socket.decompressed_bytes_received == len(data)
+    assert deflate_socket.saved_bytes == len(data) - len(compressed_data)
+    assert compressed_bytes_received._value.get() - compressed_before == len(
+        compressed_data
+    )
+    assert decompressed_bytes_received._value.get() - decompressed_before == len(data)
+
+
+def test_DeflateSocket_recv__small_buffer(socket_pair):
+    """Tests :func:`core.utils.fetchers.DeflateSocket.DeflateSocket.recv`
+    in case the decompressed data is larger than the buffer.
+    """
+    deflate_socket, server_socket = socket_pair
+    data = b"a" * 1000
+
+    server_socket.sendall(compress(data))
+    chunks = [deflate_socket.recv(100) for _ in range(10)]
+
+    assert all(len(chunk) == 100 for chunk in chunks)
+    assert b"".join(chunks) == data
+
+
+def test_DeflateSocket_recv__pending_output(mocker, socket_pair):
+    """Tests :func:`core.utils.fetchers.DeflateSocket.DeflateSocket.recv`
+    in case the decompressor holds output without unconsumed input.
+    """
+    deflate_socket, _ = socket_pair
+    mock_decompressor = mocker.patch.object(deflate_socket, "_decompressor")
+    mock_decompressor.unconsumed_tail = b""
+    mock_decompressor.decompress.return_value = b"pending"
+
+    result = deflate_socket.recv(4096)
+
+    assert result == b"pending"
+    mock_decompressor.decompress.assert_called_once_with(b"", 4096)
+    assert deflate_socket.decompressed_bytes_received == len(b"pending")
+
+
+def test_DeflateSocket_recv__closed(socket_pair):
+    """Tests :func:`core.utils.fetchers.DeflateSocket.DeflateSocket.recv`
+    in case the connection is closed.
+    """
+    deflate_socket, server_socket = socket_pair
+
+    server_socket.close()
+
+    assert deflate_socket.recv(4096) == b""
+
+
+def test_DeflateSocket_sendall(socket_pair):
+    """Tests :func:`core.utils.fetchers.DeflateSocket.DeflateSocket.sendall`."""
+    deflate_socket, server_socket = socket_pair
+    decompressor = zlib.decompressobj(wbits=-zlib.MAX_WBITS)
+
+    deflate_socket.sendall(b"a001 NOOP\r\n")
+    first_command = decompressor.decompress(server_socket.recv(4096))
+    deflate_socket.sendall(b"a002 LOGOUT\r\n")
+    second_command = decompressor.decompress(server_socket.recv(4096))
+
+    assert first_command == b"a001 NOOP\r\n"
+    assert second_command == b"a002 LOGOUT\r\n"
+
+
+def test_DeflateSocket_getattr(socket_pair):
+    """Tests passing attributes on to the wrapped socket."""
+    deflate_socket, _ = socket_pair
+
+    assert deflate_socket.gettimeout() == 5
+    assert deflate_socket.fileno() == deflate_socket._sock.fileno()
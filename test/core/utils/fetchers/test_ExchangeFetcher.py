@@ -39,6 +39,7 @@ from core.models import Mailbox
 from core.utils import FetchingCriterion
 from core.utils.fetchers import ExchangeFetcher
 from core.utils.fetchers.exceptions import MailAccountError, MailboxError
+from core.utils.fetchers.FetchEstimate import FetchEstimate
 
 
 @pytest.fixture
@@ -73,6 +74,9 @@ def mock_QuerySet(mocker, mock_message, mock_filtered_QuerySet):
     mock_QuerySet.order_by.return_value = mock_QuerySet
     mock_QuerySet.all.return_value = mock_QuerySet
     mock_QuerySet.filter.return_value = mock_filtered_QuerySet
+    mock_QuerySet.values_list.return_value = [
+        (f"id{number}", f"changekey{number}") for number in range(5)
+    ]
     return mock_QuerySet
 
 
@@ -86,17 +90,24 @@ def mock_filtered_QuerySet(mocker, mock_message):
     mock_filtered_QuerySet.order_by.return_value = mock_filtered_QuerySet
     mock_filtered_QuerySet.all.return_value = mock_filtered_QuerySet
     mock_filtered_QuerySet.filter.return_value = mock_filtered_QuerySet
+    mock_filtered_QuerySet.values_list.return_value = [
+        (f"id{number}", f"changekey{number}") for number in range(3)
+    ]
     return mock_filtered_QuerySet
 
 
 @pytest.fixture
-def mock_Folder(mocker, faker, mock_QuerySet):
+def mock_Folder(mocker, faker, mock_message, mock_QuerySet):
     """Mocks an :class:`exchangelib.Folder` with mocked :class:`exchangelib.queryset.QuerySet` as content."""
     mock_Folder = mocker.MagicMock(spec=exchangelib.Folder)
     mock_Folder.all.return_value = mock_QuerySet
     mock_Folder.folder_class.return_value = "IPF.Note"
     mock_Folder.is_distinguished = True
     mock_Folder.to_id.return_value.id = faker.random_element(MailboxTypeChoices.values)
+    mock_Folder.account.fetch.side_effect = lambda ids, **kwargs: [
+        mock_message for _ in ids
+    ]
+    mock_Folder.item_sync_state = None
     return mock_Folder
 
 
@@ -530,6 +541,13 @@ def test_ExchangeFetcher_fetch_emails_all__success__single_batch(
     assert result == [item.mime_content for item in mock_QuerySet.__iter__.return_value]
     mock_QuerySet.order_by.assert_called_once_with("datetime_received")
     mock_Folder.all.assert_called_once_with()
+    mock_QuerySet.values_list.assert_called_once_with("id", "changekey")
+    mock_Folder.account.fetch.assert_called_once_with(
+        ids=tuple(mock_QuerySet.values_list.return_value),
+        folder=mock_Folder,
+        only_fields=["mime_content"],
+        chunk_size=ExchangeFetcher.EMAIL_FETCH_BATCH_SIZE,
+    )
     mock_msg_folder_root.__truediv__.assert_called_once_with(exchange_mailbox.name)
     mock_msg_folder_root.__truediv__.return_value.__truediv__.assert_not_called()
     mock_logger.debug.assert_called()
@@ -557,9 +575,9 @@ def test_ExchangeFetcher_fetch_emails_all__success__multi_batch(
     )
 
     assert result == [item.mime_content for item in mock_QuerySet.__iter__.return_value]
-    mock_QuerySet.order_by.assert_called_with("datetime_received")
-    assert mock_QuerySet.order_by.call_count == 3
-    assert mock_Folder.all.call_count == 3
+    mock_QuerySet.order_by.assert_called_once_with("datetime_received")
+    mock_Folder.all.assert_called_once_with()
+    assert mock_Folder.account.fetch.call_count == 3
     mock_msg_folder_root.__truediv__.assert_called_with(exchange_mailbox.name)
     mock_msg_folder_root.__truediv__.return_value.__truediv__.assert_not_called()
     mock_logger.debug.assert_called()
@@ -638,15 +656,275 @@ def test_ExchangeFetcher_fetch_emails_filter__success__multi_batch(
         item.mime_content
         for item in mock_QuerySet.filter.return_value.__iter__.return_value
     ]
-    mock_QuerySet.filter.assert_called_with(is_draft=True)
-    assert mock_QuerySet.order_by.call_count == 2
-    assert mock_Folder.all.call_count == 2
+    mock_QuerySet.filter.assert_called_once_with(is_draft=True)
+    mock_Folder.all.assert_called_once_with()
+    assert mock_Folder.account.fetch.call_count == 2
     mock_logger.debug.assert_called()
     mock_logger.info.assert_called()
     mock_logger.exception.assert_not_called()
     mock_logger.error.assert_not_called()
 
 
+@pytest.mark.django_db
+def test_ExchangeFetcher_fetch_emails__item_error(
+    fake_error_message, exchange_mailbox, mock_logger, mock_message, mock_Folder
+):
+    """Tests :func:`core.utils.fetchers.ExchangeFetcher.fetch_emails`
+    in case single items can't be fetched.
+    """
+    mock_Folder.account.fetch.side_effect = lambda ids, **kwargs: [
+        mock_message,
+        exchangelib.errors.ErrorItemNotFound(fake_error_message),
+        *[mock_message] * (len(ids) - 2),
+    ]
+
+    result = list(
+        ExchangeFetcher(exchange_mailbox.account).fetch_emails(exchange_mailbox)
+    )
+
+    assert result == [mock_message.mime_content] * 4
+    exchange_mailbox.refresh_from_db()
+    assert exchange_mailbox.fetch_progress_checkpoint == ""
+    assert exchange_mailbox.fetch_progress_count == 0
+    assert exchange_mailbox.fetch_progress_total == 5
+    mock_logger.warning.assert_called()
+    mock_logger.exception.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_ExchangeFetcher_fetch_emails_incremental__first_sync(
+    mocker, faker, exchange_mailbox, mock_logger, mock_message, mock_Folder
+):
+    """Tests :func:`core.utils.fetchers.ExchangeFetcher.fetch_emails`
+    in case of success with the INCREMENTAL criterion and no stored sync state.
+    """
+    fake_sync_state = faker.sha256()
+    fake_items = [
+        mocker.Mock(id=f"id{number}", changekey=f"changekey{number}")
+        for number in range(3)
+    ]
+
+    def fake_sync_items(**kwargs):
+        yield from (("create", item) for item in fake_items)
+        mock_Folder.item_sync_state = fake_sync_state
+
+    mock_Folder.sync_items.side_effect = fake_sync_items
+
+    result = list(
+        ExchangeFetcher(exchange_mailbox.account).fetch_emails(
+            exchange_mailbox,
+            FetchingCriterion(EmailFetchingCriterionChoices.INCREMENTAL),
+        )
+    )
+
+    assert result == [mock_message.mime_content] * 3
+    mock_Folder.sync_items.assert_called_once_with(
+        sync_state=None,
+        only_fields=[],
+        max_changes_returned=ExchangeFetcher.SYNC_MAX_CHANGES_RETURNED,
+    )
+    mock_Folder.all.assert_not_called()
+    mock_Folder.account.fetch.assert_called_once_with(
+        ids=tuple((item.id, item.changekey) for item in fake_items),
+        folder=mock_Folder,
+        only_fields=["mime_content"],
+        chunk_size=ExchangeFetcher.EMAIL_FETCH_BATCH_SIZE,
+    )
+    exchange_mailbox.refresh_from_db()
+    assert exchange_mailbox.exchange_sync_state == fake_sync_state
+    mock_logger.exception.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_ExchangeFetcher_fetch_emails_incremental__with_state(
+    mocker, faker, exchange_mailbox, mock_logger, mock_message, mock_Folder
+):
+    """Tests :func:`core.utils.fetchers.ExchangeFetcher.fetch_emails`
+    in case of success with the INCREMENTAL criterion and a stored sync state.
+    """
+    exchange_mailbox.exchange_sync_state = "old_state"
+    exchange_mailbox.save(update_fields=["exchange_sync_state"])
+    fake_created_item = mocker.Mock(id="created", changekey="changekey")
+
+    def fake_sync_items(**kwargs):
+        yield "update", mocker.Mock(id="updated", changekey="changekey")
+        yield "create", fake_created_item
+        yield "delete", mocker.Mock(id="deleted")
+        yield "read_flag_change", (mocker.Mock(id="read"), True)
+        mock_Folder.item_sync_state = "new_state"
+
+    mock_Folder.sync_items.side_effect = fake_sync_items
+
+    result = list(
+        ExchangeFetcher(exchange_mailbox.account).fetch_emails(
+            exchange_mailbox,
+            FetchingCriterion(EmailFetchingCriterionChoices.INCREMENTAL),
+        )
+    )
+
+    assert result == [mock_message.mime_content]
+    mock_Folder.sync_items.assert_called_once_with(
+        sync_state="old_state",
+        only_fields=[],
+        max_changes_returned=ExchangeFetcher.SYNC_MAX_CHANGES_RETURNED,
+    )
+    mock_Folder.account.fetch.assert_called_once()
+    assert mock_Folder.account.fetch.call_args.kwargs["ids"] == (
+        ("created", "changekey"),
+    )
+    exchange_mailbox.refresh_from_db()
+    assert exchange_mailbox.exchange_sync_state == "new_state"
+
+
+@pytest.mark.django_db
+def test_ExchangeFetcher_fetch_emails_incremental__failed_item(
+    mocker, fake_error_message, exchange_mailbox, mock_logger, mock_message, mock_Folder
+):
+    """Tests :func:`core.utils.fetchers.ExchangeFetcher.fetch_emails`
+    with the INCREMENTAL criterion in case an item can't be fetched.
+    """
+    exchange_mailbox.exchange_sync_state = "old_state"
+    exchange_mailbox.save(update_fields=["exchange_sync_state"])
+
+    def fake_sync_items(**kwargs):
+        yield "create", mocker.Mock(id="created", changekey="changekey")
+        yield "create", mocker.Mock(id="failed", changekey="changekey")
+        mock_Folder.item_sync_state = "new_state"
+
+    mock_Folder.sync_items.side_effect = fake_sync_items
+    mock_Folder.account.fetch.side_effect = lambda ids, **kwargs: [
+        mock_message,
+        exchangelib.errors.ErrorItemNotFound(fake_error_message),
+    ]
+
+    result = list(
+        ExchangeFetcher(exchange_mailbox.account).fetch_emails(
+            exchange_mailbox,
+            FetchingCriterion(EmailFetchingCriterionChoices.INCREMENTAL),
+        )
+    )
+
+    assert result == [mock_message.mime_content]
+    exchange_mailbox.refresh_from_db()
+    assert exchange_mailbox.exchange_sync_state == "new_state"
+    assert exchange_mailbox.exchange_failed_item_ids == ["failed"]
+    mock_logger.warning.assert_called()
+
+
+@pytest.mark.django_db
+def test_ExchangeFetcher_fetch_emails_incremental__retry_failed_items(
+    mocker, fake_error_message, exchange_mailbox, mock_logger, mock_message, mock_Folder
+):
+    """Tests :func:`core.utils.fetchers.ExchangeFetcher.fetch_emails`
+    with the INCREMENTAL criterion in case items failed to be fetched by the previous sync.
+    """
+    exchange_mailbox.exchange_sync_state = "old_state"
+    exchange_mailbox.exchange_failed_item_ids = ["failed", "still_failing"]
+    exchange_mailbox.save(
+        update_fields=["exchange_sync_state", "exchange_failed_item_ids"]
+    )
+
+    def fake_sync_items(**kwargs):
+        yield "create", mocker.Mock(id="created", changekey="changekey")
+        mock_Folder.item_sync_state = "new_state"
+
+    def fake_fetch(ids, **kwargs):
+        return [
+            (
+                exchangelib.errors.ErrorItemNotFound(fake_error_message)
+                if item_id == "still_failing"
+                else mock_message
+            )
+            for item_id, _changekey in ids
+        ]
+
+    mock_Folder.sync_items.side_effect = fake_sync_items
+    mock_Folder.account.fetch.side_effect = fake_fetch
+
+    result = list(
+        ExchangeFetcher(exchange_mailbox.account).fetch_emails(
+            exchange_mailbox,
+            FetchingCriterion(EmailFetchingCriterionChoices.INCREMENTAL),
+        )
+    )
+
+    assert result == [mock_message.mime_content, mock_message.mime_content]
+    assert mock_Folder.account.fetch.call_args_list[0].kwargs["ids"] == (
+        ("failed", None),
+        ("still_failing", None),
+    )
+    mock_Folder.sync_items.assert_called_once_with(
+        sync_state="old_state",
+        only_fields=[],
+        max_changes_returned=ExchangeFetcher.SYNC_MAX_CHANGES_RETURNED,
+    )
+    exchange_mailbox.refresh_from_db()
+    assert exchange_mailbox.exchange_sync_state == "new_state"
+    assert exchange_mailbox.exchange_failed_item_ids == ["still_failing"]
+    mock_logger.warning.assert_called()
+
+
+@pytest.mark.django_db
+def test_ExchangeFetcher_fetch_emails_incremental__invalid_state(
+    mocker, exchange_mailbox, mock_logger, mock_message, mock_Folder
+):
+    """Tests :func:`core.utils.fetchers.ExchangeFetcher.fetch_emails`
+    with the INCREMENTAL criterion in case the stored sync state is invalid.
+    """
+    exchange_mailbox.exchange_sync_state = "old_state"
+    exchange_mailbox.save(update_fields=["exchange_sync_state"])
+
+    def fake_sync_items(sync_state, **kwargs):
+        if sync_state is not None:
+            yield exchangelib.errors.ErrorInvalidSyncStateData("invalid")
+            return
+        yield "create", mocker.Mock(id="created", changekey="changekey")
+        mock_Folder.item_sync_state = "new_state"
+
+    mock_Folder.sync_items.side_effect = fake_sync_items
+
+    result = list(
+        ExchangeFetcher(exchange_mailbox.account).fetch_emails(
+            exchange_mailbox,
+            FetchingCriterion(EmailFetchingCriterionChoices.INCREMENTAL),
+        )
+    )
+
+    assert result == [mock_message.mime_content]
+    assert mock_Folder.sync_items.call_count == 2
+    assert mock_Folder.sync_items.call_args.kwargs["sync_state"] is None
+    exchange_mailbox.refresh_from_db()
+    assert exchange_mailbox.exchange_sync_state == "new_state"
+    mock_logger.info.assert_called()
+    mock_logger.exception.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_ExchangeFetcher_fetch_emails_incremental__ewserror(
+    fake_error_message, exchange_mailbox, mock_logger, mock_Folder
+):
+    """Tests :func:`core.utils.fetchers.ExchangeFetcher.fetch_emails`
+    with the INCREMENTAL criterion in case of an EWSError during the sync.
+    """
+    exchange_mailbox.exchange_sync_state = "old_state"
+    exchange_mailbox.save(update_fields=["exchange_sync_state"])
+    mock_Folder.sync_items.return_value = [
+        exchangelib.errors.ErrorAccessDenied(fake_error_message)
+    ]
+
+    with pytest.raises(MailboxError, match=fake_error_message):
+        list(
+            ExchangeFetcher(exchange_mailbox.account).fetch_emails(
+                exchange_mailbox,
+                FetchingCriterion(EmailFetchingCriterionChoices.INCREMENTAL),
+            )
+        )
+
+    exchange_mailbox.refresh_from_db()
+    assert exchange_mailbox.exchange_sync_state == "old_state"
+    mock_logger.exception.assert_called()
+
+
 @pytest.mark.django_db
 def test_ExchangeFetcher_fetch_emails__wrong_mailbox(
     fake_other_account, exchange_mailbox, mock_logger
@@ -694,6 +972,76 @@ def test_ExchangeFetcher_fetch_emails__other_exception_query(
     mock_logger.exception.assert_not_called()
 
 
+@pytest.mark.django_db
+def test_ExchangeFetcher_estimate_emails(
+    fake_email, exchange_mailbox, mock_logger, mock_Folder, mock_QuerySet
+):
+    """Tests :func:`core.utils.fetchers.ExchangeFetcher.estimate_emails`
+    in case of success.
+    """
+    fake_email.message_id = "<known@example.org>"
+    fake_email.save(update_fields=["message_id"])
+    mock_QuerySet.values_list.return_value = [
+        (100, "<known@example.org>"),
+        (200, "<new@example.org>"),
+        (None, None),
+    ]
+
+    result = ExchangeFetcher(exchange_mailbox.account).estimate_emails(exchange_mailbox)
+
+    assert result == FetchEstimate(message_count=3, total_size=300, known_count=1)
+    mock_QuerySet.values_list.assert_called_once_with("size", "message_id")
+    mock_Folder.account.fetch.assert_not_called()
+    mock_logger.exception.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_ExchangeFetcher_estimate_emails__incremental(
+    mocker, exchange_mailbox, mock_logger, mock_Folder
+):
+    """Tests :func:`core.utils.fetchers.ExchangeFetcher.estimate_emails`
+    in case of success with the INCREMENTAL criterion and a stored sync state.
+    """
+    exchange_mailbox.exchange_sync_state = "old_state"
+    exchange_mailbox.save(update_fields=["exchange_sync_state"])
+
+    def fake_sync_items(**kwargs):
+        yield "create", mocker.Mock(size=100, message_id="<new@example.org>")
+        yield "delete", mocker.Mock(id="deleted")
+        mock_Folder.item_sync_state = "new_state"
+
+    mock_Folder.sync_items.side_effect = fake_sync_items
+
+    result = ExchangeFetcher(exchange_mailbox.account).estimate_emails(
+        exchange_mailbox, FetchingCriterion(EmailFetchingCriterionChoices.INCREMENTAL)
+    )
+
+    assert result == FetchEstimate(message_count=1, total_size=100, known_count=0)
+    mock_Folder.sync_items.assert_called_once_with(
+        sync_state="old_state",
+        only_fields=["size", "message_id"],
+        max_changes_returned=ExchangeFetcher.SYNC_MAX_CHANGES_RETURNED,
+    )
+    mock_Folder.account.fetch.assert_not_called()
+    exchange_mailbox.refresh_from_db()
+    assert exchange_mailbox.exchange_sync_state == "old_state"
+
+
+@pytest.mark.django_db
+def test_ExchangeFetcher_estimate_emails__ewserror(
+    fake_error_message, exchange_mailbox, mock_logger, mock_Folder
+):
+    """Tests :func:`core.utils.fetchers.ExchangeFetcher.estimate_emails`
+    in case of an EWSError.
+    """
+    mock_Folder.all.side_effect = exchangelib.errors.EWSError(fake_error_message)
+
+    with pytest.raises(MailboxError, match=fake_error_message):
+        ExchangeFetcher(exchange_mailbox.account).estimate_emails(exchange_mailbox)
+
+    mock_logger.exception.assert_called()
+
+
 @pytest.mark.django_db
 def test_ExchangeFetcher_fetch_mailboxes__success(
     exchange_mailbox, mock_logger, mock_msg_folder_root
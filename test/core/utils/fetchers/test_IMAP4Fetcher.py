@@ -25,13 +25,16 @@ from imap_tools.imap_utf7 import utf7_encode
 from model_bakery import baker
 
 from core.constants import (
+    EmailFetchingCriterionChoices,
     EmailProtocolChoices,
     MailboxTypeChoices,
 )
 from core.models import Mailbox
 from core.utils import FetchingCriterion
 from core.utils.fetchers import IMAP4Fetcher
+from core.utils.fetchers.DeflateSocket import DeflateSocket
 from core.utils.fetchers.exceptions import MailAccountError, MailboxError
+from core.utils.fetchers.FetchEstimate import FetchEstimate
 from core.utils.mail_parsing import parse_IMAP_mailbox_data
 
 
@@ -57,6 +60,10 @@ def mock_IMAP4(mocker, faker):
     fake_response = faker.sentence().encode("utf-8")
     mock_IMAP4.return_value.capabilities = []
     mock_IMAP4.return_value.login.return_value = ("OK", [fake_response])
+    mock_IMAP4.return_value.capability.side_effect = lambda: (
+        "OK",
+        [" ".join(mock_IMAP4.return_value.capabilities).encode()],
+    )
     mock_IMAP4.return_value.authenticate.return_value = ("OK", [fake_response])
     mock_IMAP4.return_value.noop.return_value = ("OK", [fake_response])
     mock_IMAP4.return_value.check.return_value = ("OK", [fake_response])
@@ -71,7 +78,9 @@ def mock_IMAP4(mocker, faker):
             )
         ],
     )
+    mock_IMAP4.return_value.enable.return_value = ("OK", [fake_response])
     mock_IMAP4.return_value.select.return_value = ("OK", [fake_response])
+    mock_IMAP4.return_value.response.return_value = ("UIDVALIDITY", [b"1234"])
     mock_IMAP4.return_value.unselect.return_value = ("OK", [fake_response])
     mock_IMAP4.return_value.append.return_value = ("OK", [fake_response])
     mock_IMAP4.return_value.uid.side_effect = lambda cmd, *args: (
@@ -105,6 +114,122 @@ def test_IMAP4Fetcher___init___success(mocker, imap_mailbox, mock_logger, mock_I
     mock_logger.error.assert_not_called()
 
 
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ("capabilities", "expected_enable_calls"),
+    [
+        ([], 0),
+        (["CONDSTORE"], 0),
+        (["ENABLE"], 0),
+        (["CONDSTORE", "ENABLE"], 1),
+        (["QRESYNC", "ENABLE"], 1),
+    ],
+)
+def test_IMAP4Fetcher___init___condstore(
+    imap_mailbox, mock_IMAP4, capabilities, expected_enable_calls
+):
+    """Tests :func:`core.utils.fetchers.IMAP4Fetcher.__init__`
+    in case the server supports CONDSTORE.
+    """
+    mock_IMAP4.return_value.capabilities = capabilities
+
+    IMAP4Fetcher(imap_mailbox.account)
+
+    assert mock_IMAP4.return_value.enable.call_count == expected_enable_calls
+    if expected_enable_calls:
+        mock_IMAP4.return_value.enable.assert_called_with("CONDSTORE")
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ("capabilities", "refreshed_capabilities", "expected_capability_calls"),
+    [
+        (["COMPRESS=DEFLATE"], b"", 0),
+        ([], b"IMAP4rev1 COMPRESS=DEFLATE", 1),
+    ],
+)
+def test_IMAP4Fetcher___init___compression(
+    mocker,
+    imap_mailbox,
+    mock_logger,
+    mock_IMAP4,
+    capabilities,
+    refreshed_capabilities,
+    expected_capability_calls,
+):
+    """Tests :func:`core.utils.fetchers.IMAP4Fetcher.__init__`
+    in case the server supports compression before or after login.
+    """
+    mock_IMAP4.return_value.capabilities = capabilities
+    mock_IMAP4.return_value.capability.side_effect = None
+    mock_IMAP4.return_value.capability.return_value = ("OK", [refreshed_capabilities])
+    mock_IMAP4.return_value.xatom.return_value = ("OK", [b"DEFLATE active"])
+    mock_socket = mock_IMAP4.return_value.sock = mocker.MagicMock()
+
+    fetcher = IMAP4Fetcher(imap_mailbox.account)
+
+    assert mock_IMAP4.return_value.capability.call_count == expected_capability_calls
+    mock_IMAP4.return_value.xatom.assert_called_once_with("COMPRESS", "DEFLATE")
+    assert isinstance(mock_IMAP4.return_value.sock, DeflateSocket)
+    assert mock_IMAP4.return_value.sock._sock is mock_socket
+    assert fetcher.supports_compression is True
+
+    fetcher.close()
+
+    mock_logger.info.assert_any_call("Compression saved %d of %d received bytes.", 0, 0)
+
+
+@pytest.mark.django_db
+def test_IMAP4Fetcher___init___compression__unsupported(
+    mocker, imap_mailbox, mock_IMAP4
+):
+    """Tests :func:`core.utils.fetchers.IMAP4Fetcher.__init__`
+    in case the server doesn't support compression.
+    """
+    mock_socket = mock_IMAP4.return_value.sock = mocker.MagicMock()
+
+    fetcher = IMAP4Fetcher(imap_mailbox.account)
+
+    mock_IMAP4.return_value.capability.assert_called_once_with()
+    mock_IMAP4.return_value.xatom.assert_not_called()
+    assert mock_IMAP4.return_value.sock is mock_socket
+    assert fetcher.supports_compression is False
+
+
+@pytest.mark.django_db
+def test_IMAP4Fetcher___init___compression__disabled(mocker, imap_mailbox, mock_IMAP4):
+    """Tests :func:`core.utils.fetchers.IMAP4Fetcher.__init__`
+    in case compression is disabled for the account.
+    """
+    imap_mailbox.account.use_compression = False
+    mock_IMAP4.return_value.capabilities = ["COMPRESS=DEFLATE"]
+    mock_socket = mock_IMAP4.return_value.sock = mocker.MagicMock()
+
+    IMAP4Fetcher(imap_mailbox.account)
+
+    mock_IMAP4.return_value.capability.assert_not_called()
+    mock_IMAP4.return_value.xatom.assert_not_called()
+    assert mock_IMAP4.return_value.sock is mock_socket
+
+
+@pytest.mark.django_db
+def test_IMAP4Fetcher___init___compression__bad_response(
+    mocker, imap_mailbox, mock_logger, mock_IMAP4
+):
+    """Tests :func:`core.utils.fetchers.IMAP4Fetcher.__init__`
+    in case the server refuses to enable compression.
+    """
+    mock_IMAP4.return_value.capabilities = ["COMPRESS=DEFLATE"]
+    mock_IMAP4.return_value.xatom.return_value = ("NO", [b"failed"])
+    mock_socket = mock_IMAP4.return_value.sock = mocker.MagicMock()
+
+    IMAP4Fetcher(imap_mailbox.account)
+
+    mock_IMAP4.return_value.xatom.assert_called_once_with("COMPRESS", "DEFLATE")
+    assert mock_IMAP4.return_value.sock is mock_socket
+    mock_logger.error.assert_called()
+
+
 @pytest.mark.django_db
 def test_IMAP4Fetcher___init___connection_error(
     mocker, fake_error_message, imap_mailbox, mock_logger, mock_IMAP4
@@ -472,8 +597,9 @@ def test_IMAP4Fetcher_fetch_emails__success__sort__single_batch(
         mocker.call(
             "FETCH",
             b",".join(mock_IMAP4.return_value.uid.side_effect("SORT")[1][0].split()),
-            "(RFC822)",
+            fetch_items,
         )
+        for fetch_items in (IMAP4Fetcher.HEADER_PROBE_FETCH_ITEMS, "(RFC822)")
     ]
 
     result = list(IMAP4Fetcher(imap_mailbox.account).fetch_emails(imap_mailbox))
@@ -509,9 +635,10 @@ def test_IMAP4Fetcher_fetch_emails__success__sort__multi_batch(
         mocker.call(
             "FETCH",
             item,
-            "(RFC822)",
+            fetch_items,
         )
         for item in mock_IMAP4.return_value.uid.side_effect("SORT")[1][0].split()
+        for fetch_items in (IMAP4Fetcher.HEADER_PROBE_FETCH_ITEMS, "(RFC822)")
     ]
 
     result = list(IMAP4Fetcher(imap_mailbox.account).fetch_emails(imap_mailbox))
@@ -519,7 +646,7 @@ def test_IMAP4Fetcher_fetch_emails__success__sort__multi_batch(
     assert result == [
         content[1]
         for content in mock_IMAP4.return_value.uid.side_effect("FETCH")[1][::2]
-    ] * len(expected_uid_fetch_calls)
+    ] * len(mock_IMAP4.return_value.uid.side_effect("SORT")[1][0].split())
     mock_IMAP4.return_value.select.assert_called_once_with(
         utf7_encode(imap_mailbox.name), readonly=True
     )
@@ -545,8 +672,9 @@ def test_IMAP4Fetcher_fetch_emails__success__search__single_batch(
         mocker.call(
             "FETCH",
             b",".join(mock_IMAP4.return_value.uid.side_effect("SEARCH")[1][0].split()),
-            "(RFC822)",
+            fetch_items,
         )
+        for fetch_items in (IMAP4Fetcher.HEADER_PROBE_FETCH_ITEMS, "(RFC822)")
     ]
 
     result = list(IMAP4Fetcher(imap_mailbox.account).fetch_emails(imap_mailbox))
@@ -581,9 +709,10 @@ def test_IMAP4Fetcher_fetch_emails__success__search__multi_batch(
         mocker.call(
             "FETCH",
             item,
-            "(RFC822)",
+            fetch_items,
         )
         for item in mock_IMAP4.return_value.uid.side_effect("SEARCH")[1][0].split()
+        for fetch_items in (IMAP4Fetcher.HEADER_PROBE_FETCH_ITEMS, "(RFC822)")
     ]
 
     result = list(IMAP4Fetcher(imap_mailbox.account).fetch_emails(imap_mailbox))
@@ -591,7 +720,7 @@ def test_IMAP4Fetcher_fetch_emails__success__search__multi_batch(
     assert result == [
         content[1]
         for content in mock_IMAP4.return_value.uid.side_effect("FETCH")[1][::2]
-    ] * len(expected_uid_fetch_calls)
+    ] * len(mock_IMAP4.return_value.uid.side_effect("SEARCH")[1][0].split())
     mock_IMAP4.return_value.select.assert_called_once_with(
         utf7_encode(imap_mailbox.name), readonly=True
     )
@@ -721,8 +850,9 @@ def test_IMAP4Fetcher_fetch_emails__bad_response__ignored(
         mocker.call(
             "FETCH",
             b",".join(mock_IMAP4.return_value.uid.side_effect("SEARCH")[1][0].split()),
-            "(RFC822)",
+            fetch_items,
         )
+        for fetch_items in (IMAP4Fetcher.HEADER_PROBE_FETCH_ITEMS, "(RFC822)")
     ]
     mock_IMAP4.return_value.unselect.return_value = ("NO", [b""])
 
@@ -756,8 +886,9 @@ def test_IMAP4Fetcher_fetch_emails__exception__ignored(
         mocker.call(
             "FETCH",
             b",".join(mock_IMAP4.return_value.uid.side_effect("SEARCH")[1][0].split()),
-            "(RFC822)",
+            fetch_items,
         )
+        for fetch_items in (IMAP4Fetcher.HEADER_PROBE_FETCH_ITEMS, "(RFC822)")
     ]
     mock_IMAP4.return_value.unselect.side_effect = AssertionError
 
@@ -780,6 +911,944 @@ def test_IMAP4Fetcher_fetch_emails__exception__ignored(
     mock_logger.exception.assert_called()
 
 
+@pytest.fixture
+def mock_IMAP4_uids(mock_IMAP4, faker):
+    """Patches the uid responses of :func:`mock_IMAP4` to return numeric uIDs."""
+    fake_response = faker.sentence().encode("utf-8")
+    mock_IMAP4.return_value.uid.side_effect = lambda cmd, *args: (
+        (
+            "OK",
+            [(b"(", fake_response), b")"] * len(args[0].split(b",")),
+        )
+        if cmd == "FETCH"
+        else ("OK", [b"3 5 7 8", b""])
+    )
+    return mock_IMAP4
+
+
+@pytest.mark.django_db
+def test_IMAP4Fetcher_fetch_emails__incremental__first_sync(
+    mocker, monkeypatch, imap_mailbox, mock_logger, mock_IMAP4_uids
+):
+    """Tests :func:`core.utils.fetchers.IMAP4Fetcher.fetch_emails`
+    in case of an incremental fetch of a mailbox that has never been synced.
+    """
+    monkeypatch.setattr(IMAP4Fetcher, "EMAIL_FETCH_BATCH_SIZE", 3)
+
+    result = list(
+        IMAP4Fetcher(imap_mailbox.account).fetch_emails(
+            imap_mailbox, FetchingCriterion(EmailFetchingCriterionChoices.INCREMENTAL)
+        )
+    )
+
+    assert len(result) == 4
+    mock_IMAP4_uids.return_value.response.assert_called_once_with("UIDVALIDITY")
+    mock_IMAP4_uids.return_value.uid.assert_has_calls(
+        [
+            mocker.call("SEARCH", "UID 1:*"),
+            mocker.call("FETCH", b"3,5,7", IMAP4Fetcher.HEADER_PROBE_FETCH_ITEMS),
+            mocker.call("FETCH", b"3,5,7", "(RFC822)"),
+            mocker.call("FETCH", b"8", IMAP4Fetcher.HEADER_PROBE_FETCH_ITEMS),
+            mocker.call("FETCH", b"8", "(RFC822)"),
+        ]
+    )
+    imap_mailbox.refresh_from_db()
+    assert imap_mailbox.imap_uidvalidity == 1234
+    assert imap_mailbox.imap_highest_uid == 8
+    mock_logger.exception.assert_not_called()
+    mock_logger.error.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_IMAP4Fetcher_fetch_emails__incremental__resume(
+    mocker, imap_mailbox, mock_logger, mock_IMAP4_uids
+):
+    """Tests :func:`core.utils.fetchers.IMAP4Fetcher.fetch_emails`
+    in case of an incremental fetch of a mailbox with a valid sync state.
+    """
+    mock_IMAP4_uids.return_value.capabilities = ["SORT"]
+    imap_mailbox.imap_uidvalidity = 1234
+    imap_mailbox.imap_highest_uid = 5
+    imap_mailbox.save(update_fields=["imap_uidvalidity", "imap_highest_uid"])
+
+    result = list(
+        IMAP4Fetcher(imap_mailbox.account).fetch_emails(
+            imap_mailbox, FetchingCriterion(EmailFetchingCriterionChoices.INCREMENTAL)
+        )
+    )
+
+    assert len(result) == 2
+    assert mock_IMAP4_uids.return_value.uid.call_count == 3
+    mock_IMAP4_uids.return_value.uid.assert_has_calls(
+        [
+            mocker.call("SEARCH", "UID 6:*"),
+            mocker.call("FETCH", b"7,8", IMAP4Fetcher.SIZE_PROBE_FETCH_ITEMS),
+            mocker.call("FETCH", b"7,8", "(RFC822)"),
+        ]
+    )
+    imap_mailbox.refresh_from_db()
+    assert imap_mailbox.imap_uidvalidity == 1234
+    assert imap_mailbox.imap_highest_uid == 8
+
+
+@pytest.mark.django_db
+def test_IMAP4Fetcher_fetch_emails__incremental__nothing_new(
+    mocker, imap_mailbox, mock_logger, mock_IMAP4_uids
+):
+    """Tests :func:`core.utils.fetchers.IMAP4Fetcher.fetch_emails`
+    in case of an incremental fetch of a mailbox without new messages.
+    """
+    imap_mailbox.imap_uidvalidity = 1234
+    imap_mailbox.imap_highest_uid = 8
+    imap_mailbox.save(update_fields=["imap_uidvalidity", "imap_highest_uid"])
+
+    result = list(
+        IMAP4Fetcher(imap_mailbox.account).fetch_emails(
+            imap_mailbox, FetchingCriterion(EmailFetchingCriterionChoices.INCREMENTAL)
+        )
+    )
+
+    assert result == []
+    mock_IMAP4_uids.return_value.uid.assert_called_once_with("SEARCH", "UID 9:*")
+    imap_mailbox.refresh_from_db()
+    assert imap_mailbox.imap_highest_uid == 8
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("uidvalidity_data", [[b"4321"], [None]])
+def test_IMAP4Fetcher_fetch_emails__incremental__uidvalidity_changed(
+    mocker, imap_mailbox, mock_logger, mock_IMAP4_uids, uidvalidity_data
+):
+    """Tests :func:`core.utils.fetchers.IMAP4Fetcher.fetch_emails`
+    in case of an incremental fetch of a mailbox with a changed or missing UIDVALIDITY.
+    """
+    mock_IMAP4_uids.return_value.response.return_value = (
+        "UIDVALIDITY",
+        uidvalidity_data,
+    )
+    imap_mailbox.imap_uidvalidity = 1234
+    imap_mailbox.imap_highest_uid = 8
+    imap_mailbox.save(update_fields=["imap_uidvalidity", "imap_highest_uid"])
+
+    result = list(
+        IMAP4Fetcher(imap_mailbox.account).fetch_emails(
+            imap_mailbox, FetchingCriterion(EmailFetchingCriterionChoices.INCREMENTAL)
+        )
+    )
+
+    assert len(result) == 4
+    mock_IMAP4_uids.return_value.uid.assert_has_calls(
+        [
+            mocker.call("SEARCH", "UID 1:*"),
+            mocker.call("FETCH", b"3,5,7,8", IMAP4Fetcher.HEADER_PROBE_FETCH_ITEMS),
+            mocker.call("FETCH", b"3,5,7,8", "(RFC822)"),
+        ]
+    )
+    imap_mailbox.refresh_from_db()
+    assert imap_mailbox.imap_uidvalidity == (
+        int(uidvalidity_data[0]) if uidvalidity_data[0] else None
+    )
+    assert imap_mailbox.imap_highest_uid == 8
+    mock_logger.info.assert_called()
+
+
+@pytest.mark.django_db
+def test_IMAP4Fetcher_fetch_emails__incremental__no_uidvalidity(
+    mocker, imap_mailbox, mock_logger, mock_IMAP4_uids
+):
+    """Tests :func:`core.utils.fetchers.IMAP4Fetcher.fetch_emails`
+    in case of an incremental fetch of a mailbox on a server that never reports a UIDVALIDITY.
+    """
+    mock_IMAP4_uids.return_value.response.return_value = ("UIDVALIDITY", [None])
+    imap_mailbox.imap_uidvalidity = None
+    imap_mailbox.imap_highest_uid = 5
+    imap_mailbox.save(update_fields=["imap_uidvalidity", "imap_highest_uid"])
+
+    result = list(
+        IMAP4Fetcher(imap_mailbox.account).fetch_emails(
+            imap_mailbox, FetchingCriterion(EmailFetchingCriterionChoices.INCREMENTAL)
+        )
+    )
+
+    assert len(result) == 2
+    mock_IMAP4_uids.return_value.uid.assert_has_calls(
+        [
+            mocker.call("SEARCH", "UID 6:*"),
+            mocker.call("FETCH", b"7,8", IMAP4Fetcher.SIZE_PROBE_FETCH_ITEMS),
+            mocker.call("FETCH", b"7,8", "(RFC822)"),
+        ]
+    )
+    imap_mailbox.refresh_from_db()
+    assert imap_mailbox.imap_uidvalidity is None
+    assert imap_mailbox.imap_highest_uid == 8
+    assert all(
+        "UIDVALIDITY" not in call.args[0] for call in mock_logger.info.call_args_list
+    )
+
+
+@pytest.mark.django_db
+def test_IMAP4Fetcher_fetch_emails__incremental__failed_batch(
+    monkeypatch, faker, imap_mailbox, mock_logger, mock_IMAP4_uids
+):
+    """Tests :func:`core.utils.fetchers.IMAP4Fetcher.fetch_emails`
+    in case of an incremental fetch where a batch fails to be fetched.
+    """
+    monkeypatch.setattr(IMAP4Fetcher, "EMAIL_FETCH_BATCH_SIZE", 2)
+    fake_response = faker.sentence().encode("utf-8")
+    mock_IMAP4_uids.return_value.uid.side_effect = lambda cmd, *args: (
+        (
+            ("NO", [b"failed"])
+            if args[0] == b"7,8"
+            else ("OK", [(b"(", fake_response), b")"] * 2)
+        )
+        if cmd == "FETCH"
+        else ("OK", [b"3 5 7 8 9 10", b""])
+    )
+
+    result = list(
+        IMAP4Fetcher(imap_mailbox.account).fetch_emails(
+            imap_mailbox, FetchingCriterion(EmailFetchingCriterionChoices.INCREMENTAL)
+        )
+    )
+
+    assert len(result) == 4
+    imap_mailbox.refresh_from_db()
+    assert imap_mailbox.imap_highest_uid == 5
+    mock_logger.warning.assert_called()
+
+
+@pytest.mark.django_db
+def test_IMAP4Fetcher_fetch_emails__incremental__condstore_unchanged(
+    imap_mailbox, mock_logger, mock_IMAP4_uids
+):
+    """Tests :func:`core.utils.fetchers.IMAP4Fetcher.fetch_emails`
+    in case of an incremental fetch of a mailbox with unchanged HIGHESTMODSEQ.
+    """
+    mock_IMAP4_uids.return_value.capabilities = ["CONDSTORE"]
+    imap_mailbox.imap_uidvalidity = 1234
+    imap_mailbox.imap_highest_uid = 5
+    imap_mailbox.imap_highestmodseq = 1234
+    imap_mailbox.save(
+        update_fields=["imap_uidvalidity", "imap_highest_uid", "imap_highestmodseq"]
+    )
+
+    result = list(
+        IMAP4Fetcher(imap_mailbox.account).fetch_emails(
+            imap_mailbox, FetchingCriterion(EmailFetchingCriterionChoices.INCREMENTAL)
+        )
+    )
+
+    assert result == []
+    mock_IMAP4_uids.return_value.uid.assert_not_called()
+    mock_IMAP4_uids.return_value.unselect.assert_called_once_with()
+    imap_mailbox.refresh_from_db()
+    assert imap_mailbox.imap_highest_uid == 5
+    assert imap_mailbox.imap_highestmodseq == 1234
+    mock_logger.info.assert_called()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("stored_highestmodseq", [None, 1000])
+def test_IMAP4Fetcher_fetch_emails__incremental__condstore_changed(
+    mocker, imap_mailbox, mock_logger, mock_IMAP4_uids, stored_highestmodseq
+):
+    """Tests :func:`core.utils.fetchers.IMAP4Fetcher.fetch_emails`
+    in case of an incremental fetch of a mailbox with changed HIGHESTMODSEQ.
+    """
+    mock_IMAP4_uids.return_value.capabilities = ["QRESYNC"]
+    imap_mailbox.imap_uidvalidity = 1234
+    imap_mailbox.imap_highest_uid = 5
+    imap_mailbox.imap_highestmodseq = stored_highestmodseq
+    imap_mailbox.save(
+        update_fields=["imap_uidvalidity", "imap_highest_uid", "imap_highestmodseq"]
+    )
+
+    result = list(
+        IMAP4Fetcher(imap_mailbox.account).fetch_emails(
+            imap_mailbox, FetchingCriterion(EmailFetchingCriterionChoices.INCREMENTAL)
+        )
+    )
+
+    assert len(result) == 2
+    mock_IMAP4_uids.return_value.response.assert_has_calls(
+        [mocker.call("HIGHESTMODSEQ"), mocker.call("UIDVALIDITY")]
+    )
+    mock_IMAP4_uids.return_value.uid.assert_has_calls(
+        [
+            mocker.call("SEARCH", "UID 6:*"),
+            mocker.call("FETCH", b"7,8", IMAP4Fetcher.SIZE_PROBE_FETCH_ITEMS),
+            mocker.call("FETCH", b"7,8", "(RFC822)"),
+        ]
+    )
+    imap_mailbox.refresh_from_db()
+    assert imap_mailbox.imap_highest_uid == 8
+    assert imap_mailbox.imap_highestmodseq == 1234
+
+
+@pytest.mark.django_db
+def test_IMAP4Fetcher_fetch_emails__incremental__condstore_failed_batch(
+    faker, imap_mailbox, mock_logger, mock_IMAP4_uids
+):
+    """Tests :func:`core.utils.fetchers.IMAP4Fetcher.fetch_emails`
+    in case of an incremental fetch with CONDSTORE where a batch fails to be fetched.
+    """
+    mock_IMAP4_uids.return_value.capabilities = ["CONDSTORE"]
+    mock_IMAP4_uids.return_value.uid.side_effect = lambda cmd, *args: (
+        ("NO", [b"failed"]) if cmd == "FETCH" else ("OK", [b"3 5", b""])
+    )
+
+    result = list(
+        IMAP4Fetcher(imap_mailbox.account).fetch_emails(
+            imap_mailbox, FetchingCriterion(EmailFetchingCriterionChoices.INCREMENTAL)
+        )
+    )
+
+    assert result == []
+    imap_mailbox.refresh_from_db()
+    assert imap_mailbox.imap_highest_uid == 0
+    assert imap_mailbox.imap_highestmodseq is None
+
+
+@pytest.mark.django_db
+def test_IMAP4Fetcher_fetch_emails__progress(
+    monkeypatch, imap_mailbox, mock_logger, mock_IMAP4_uids
+):
+    """Tests :func:`core.utils.fetchers.IMAP4Fetcher.fetch_emails`
+    records the progress of the fetch in the mailbox.
+    """
+    monkeypatch.setattr(IMAP4Fetcher, "EMAIL_FETCH_BATCH_SIZE", 3)
+
+    result = list(IMAP4Fetcher(imap_mailbox.account).fetch_emails(imap_mailbox))
+
+    assert len(result) == 4
+    imap_mailbox.refresh_from_db()
+    assert imap_mailbox.fetch_progress_criterion == EmailFetchingCriterionChoices.ALL
+    assert imap_mailbox.fetch_progress_checkpoint == ""
+    assert imap_mailbox.fetch_progress_count == 4
+    assert imap_mailbox.fetch_progress_total == 4
+    assert imap_mailbox.fetch_progress_updated is not None
+
+
+@pytest.mark.django_db
+def test_IMAP4Fetcher_fetch_emails__progress__interrupted(
+    monkeypatch, imap_mailbox, mock_logger, mock_IMAP4_uids
+):
+    """Tests :func:`core.utils.fetchers.IMAP4Fetcher.fetch_emails`
+    in case the fetch is interrupted after the first batch.
+    """
+    monkeypatch.setattr(IMAP4Fetcher, "EMAIL_FETCH_BATCH_SIZE", 3)
+
+    fetch_generator = IMAP4Fetcher(imap_mailbox.account).fetch_emails(imap_mailbox)
+    for _ in range(4):
+        next(fetch_generator)
+    fetch_generator.close()
+
+    imap_mailbox.refresh_from_db()
+    assert imap_mailbox.fetch_progress_checkpoint == "7"
+    assert imap_mailbox.fetch_progress_count == 3
+    assert imap_mailbox.fetch_progress_total == 4
+
+
+@pytest.mark.django_db
+def test_IMAP4Fetcher_fetch_emails__progress__resume(
+    mocker, imap_mailbox, mock_logger, mock_IMAP4_uids
+):
+    """Tests :func:`core.utils.fetchers.IMAP4Fetcher.fetch_emails`
+    in case an interrupted fetch with the same criterion is resumed.
+    """
+    imap_mailbox.fetch_progress_criterion = EmailFetchingCriterionChoices.ALL
+    imap_mailbox.fetch_progress_checkpoint = "5"
+    imap_mailbox.save(
+        update_fields=["fetch_progress_criterion", "fetch_progress_checkpoint"]
+    )
+
+    result = list(IMAP4Fetcher(imap_mailbox.account).fetch_emails(imap_mailbox))
+
+    assert len(result) == 2
+    mock_IMAP4_uids.return_value.uid.assert_has_calls(
+        [
+            mocker.call("SEARCH", "ALL"),
+            mocker.call("FETCH", b"7,8", IMAP4Fetcher.HEADER_PROBE_FETCH_ITEMS),
+            mocker.call("FETCH", b"7,8", "(RFC822)"),
+        ]
+    )
+    imap_mailbox.refresh_from_db()
+    assert imap_mailbox.fetch_progress_checkpoint == ""
+    assert imap_mailbox.fetch_progress_count == 4
+
+
+@pytest.mark.django_db
+def test_IMAP4Fetcher_fetch_emails__progress__failed_batch(
+    mocker, monkeypatch, faker, imap_mailbox, mock_logger, mock_IMAP4_uids
+):
+    """Tests :func:`core.utils.fetchers.IMAP4Fetcher.fetch_emails`
+    in case a batch fails to be fetched and the fetch is resumed.
+    """
+    monkeypatch.setattr(IMAP4Fetcher, "EMAIL_FETCH_BATCH_SIZE", 2)
+    fake_response = faker.sentence().encode("utf-8")
+
+    def uid_side_effect(cmd, *args):
+        if cmd != "FETCH":
+            return ("OK", [b"3 5 7 8 9 10", b""])
+        if args == (b"7,8", "(RFC822)"):
+            return ("NO", [b"failed"])
+        return ("OK", [(b"(", fake_response), b")"] * len(args[0].split(b",")))
+
+    mock_IMAP4_uids.return_value.uid.side_effect = uid_side_effect
+
+    result = list(IMAP4Fetcher(imap_mailbox.account).fetch_emails(imap_mailbox))
+
+    assert len(result) == 4
+    imap_mailbox.refresh_from_db()
+    assert imap_mailbox.fetch_progress_checkpoint == "5"
+    assert imap_mailbox.fetch_progress_count == 2
+    assert imap_mailbox.fetch_progress_total == 6
+    mock_logger.warning.assert_called()
+
+    mock_IMAP4_uids.return_value.uid.reset_mock()
+    mock_IMAP4_uids.return_value.uid.side_effect = lambda cmd, *args: (
+        ("OK", [(b"(", fake_response), b")"] * len(args[0].split(b",")))
+        if cmd == "FETCH"
+        else ("OK", [b"3 5 7 8 9 10", b""])
+    )
+
+    result = list(IMAP4Fetcher(imap_mailbox.account).fetch_emails(imap_mailbox))
+
+    assert len(result) == 4
+    mock_IMAP4_uids.return_value.uid.assert_has_calls(
+        [
+            mocker.call("SEARCH", "ALL"),
+            mocker.call("FETCH", b"7,8", IMAP4Fetcher.HEADER_PROBE_FETCH_ITEMS),
+            mocker.call("FETCH", b"7,8", "(RFC822)"),
+            mocker.call("FETCH", b"9,10", IMAP4Fetcher.HEADER_PROBE_FETCH_ITEMS),
+            mocker.call("FETCH", b"9,10", "(RFC822)"),
+        ]
+    )
+    imap_mailbox.refresh_from_db()
+    assert imap_mailbox.fetch_progress_checkpoint == ""
+    assert imap_mailbox.fetch_progress_count == 6
+
+
+@pytest.fixture
+def mock_IMAP4_header_probe(mock_IMAP4, fake_email):
+    """Patches the uid responses of :func:`mock_IMAP4` to answer header probes.
+
+    The message with uID 1 is :func:`fake_email`, 2 is spam, 3 is unknown and 4 has no Message-ID.
+    """
+    fake_email.message_id = "<known@example.org>"
+    fake_email.save(update_fields=["message_id"])
+    header_responses = {
+        b"1": f"Message-ID: {fake_email.message_id}\r\n\r\n".encode(),
+        b"2": b"Message-ID: <spam@example.org>\r\nX-Spam-Flag: YES\r\n\r\n",
+        b"3": b"Message-ID: <new@example.org>\r\n\r\n",
+        b"4": b"\r\n",
+    }
+
+    def uid_side_effect(cmd, *args):
+        if cmd != "FETCH":
+            return ("OK", [b"1 2 3 4", b""])
+        if args[1] == IMAP4Fetcher.HEADER_PROBE_FETCH_ITEMS:
+            response = []
+            for uid in args[0].split(b","):
+                response.append(
+                    (
+                        b"1 (UID "
+                        + uid
+                        + b" RFC822.SIZE 1000 BODY[HEADER.FIELDS (MESSAGE-ID X-SPAM-FLAG)] {10}",
+                        header_responses[uid],
+                    )
+                )
+                response.append(b")")
+            return ("OK", response)
+        response = []
+        for uid in args[0].split(b","):
+            response.append((b"1 (UID " + uid + b" RFC822 {1}", uid))
+            response.append(b")")
+        return ("OK", response)
+
+    mock_IMAP4.return_value.uid.side_effect = uid_side_effect
+    return mock_IMAP4
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ("throw_out_spam", "expected_uids"),
+    [(True, [b"3", b"4"]), (False, [b"2", b"3", b"4"])],
+)
+def test_IMAP4Fetcher_fetch_emails__header_probe(
+    mocker,
+    override_config,
+    fake_email,
+    mock_logger,
+    mock_IMAP4_header_probe,
+    throw_out_spam,
+    expected_uids,
+):
+    """Tests :func:`core.utils.fetchers.IMAP4Fetcher.fetch_emails`
+    in case of messages that are known, spam, new or without Message-ID.
+    """
+    mailbox = fake_email.mailbox
+    mailbox.account.protocol = EmailProtocolChoices.IMAP4
+    mailbox.account.save(update_fields=["protocol"])
+
+    with override_config(THROW_OUT_SPAM=throw_out_spam):
+        result = list(IMAP4Fetcher(mailbox.account).fetch_emails(mailbox))
+
+    assert result == expected_uids
+    mock_IMAP4_header_probe.return_value.uid.assert_has_calls(
+        [
+            mocker.call("SEARCH", "ALL"),
+            mocker.call("FETCH", b"1,2,3,4", IMAP4Fetcher.HEADER_PROBE_FETCH_ITEMS),
+            mocker.call("FETCH", b",".join(expected_uids), "(RFC822)"),
+        ]
+    )
+    mock_logger.exception.assert_not_called()
+    mock_logger.error.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_IMAP4Fetcher_fetch_emails__header_probe__all_known(
+    mocker, fake_email, mock_logger, mock_IMAP4_header_probe
+):
+    """Tests :func:`core.utils.fetchers.IMAP4Fetcher.fetch_emails`
+    in case all probed messages are already in the db.
+    """
+    mock_IMAP4_header_probe.return_value.uid.side_effect = lambda cmd, *args: (
+        ("OK", [b"1", b""])
+        if cmd != "FETCH"
+        else (
+            "OK",
+            [
+                (
+                    b"1 (UID 1 RFC822.SIZE 1000 BODY[HEADER.FIELDS (MESSAGE-ID)] {10}",
+                    f"Message-ID: {fake_email.message_id}\r\n\r\n".encode(),
+                ),
+                b")",
+            ],
+        )
+    )
+    mailbox = fake_email.mailbox
+    mailbox.account.protocol = EmailProtocolChoices.IMAP4
+    mailbox.account.save(update_fields=["protocol"])
+
+    result = list(IMAP4Fetcher(mailbox.account).fetch_emails(mailbox))
+
+    assert result == []
+    assert mock_IMAP4_header_probe.return_value.uid.call_count == 2
+    mock_IMAP4_header_probe.return_value.uid.assert_called_with(
+        "FETCH", b"1", IMAP4Fetcher.HEADER_PROBE_FETCH_ITEMS
+    )
+
+
+@pytest.mark.django_db
+def test_IMAP4Fetcher_estimate_emails(
+    mocker, fake_email, mock_logger, mock_IMAP4_header_probe
+):
+    """Tests :func:`core.utils.fetchers.IMAP4Fetcher.estimate_emails`
+    in case of messages that are known, spam, new or without Message-ID.
+    """
+    mailbox = fake_email.mailbox
+    mailbox.account.protocol = EmailProtocolChoices.IMAP4
+    mailbox.account.save(update_fields=["protocol"])
+
+    result = IMAP4Fetcher(mailbox.account).estimate_emails(mailbox)
+
+    assert result == FetchEstimate(message_count=4, total_size=4000, known_count=1)
+    mock_IMAP4_header_probe.return_value.select.assert_called_once_with(
+        mocker.ANY, readonly=True
+    )
+    assert mock_IMAP4_header_probe.return_value.uid.call_count == 2
+    mock_IMAP4_header_probe.return_value.uid.assert_has_calls(
+        [
+            mocker.call("SEARCH", "ALL"),
+            mocker.call("FETCH", b"1,2,3,4", IMAP4Fetcher.HEADER_PROBE_FETCH_ITEMS),
+        ]
+    )
+    mock_logger.error.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_IMAP4Fetcher_estimate_emails__incremental(
+    mocker, imap_mailbox, mock_logger, mock_IMAP4_header_probe
+):
+    """Tests :func:`core.utils.fetchers.IMAP4Fetcher.estimate_emails`
+    in case of an incremental estimate of a mailbox with a valid sync state.
+    """
+    imap_mailbox.imap_uidvalidity = 1234
+    imap_mailbox.imap_highest_uid = 2
+    imap_mailbox.save(update_fields=["imap_uidvalidity", "imap_highest_uid"])
+
+    result = IMAP4Fetcher(imap_mailbox.account).estimate_emails(
+        imap_mailbox, FetchingCriterion(EmailFetchingCriterionChoices.INCREMENTAL)
+    )
+
+    assert result == FetchEstimate(message_count=2, total_size=2000, known_count=0)
+    mock_IMAP4_header_probe.return_value.uid.assert_has_calls(
+        [
+            mocker.call("SEARCH", "UID 3:*"),
+            mocker.call("FETCH", b"3,4", IMAP4Fetcher.HEADER_PROBE_FETCH_ITEMS),
+        ]
+    )
+    imap_mailbox.refresh_from_db()
+    assert imap_mailbox.imap_highest_uid == 2
+
+
+@pytest.mark.django_db
+def test_IMAP4Fetcher_fetch_emails__header_probe__bad_response(
+    mocker, faker, imap_mailbox, mock_logger, mock_IMAP4
+):
+    """Tests :func:`core.utils.fetchers.IMAP4Fetcher.fetch_emails`
+    in case of a bad response to the header probe.
+    """
+    fake_response = faker.sentence().encode("utf-8")
+    mock_IMAP4.return_value.uid.side_effect = lambda cmd, *args: (
+        ("OK", [b"1 2", b""])
+        if cmd != "FETCH"
+        else (
+            ("NO", [b"failed"])
+            if args[1] == IMAP4Fetcher.HEADER_PROBE_FETCH_ITEMS
+            else ("OK", [(b"(", fake_response), b")"] * 2)
+        )
+    )
+
+    result = list(IMAP4Fetcher(imap_mailbox.account).fetch_emails(imap_mailbox))
+
+    assert result == [fake_response] * 2
+    mock_IMAP4.return_value.uid.assert_called_with("FETCH", b"1,2", "(RFC822)")
+    mock_logger.warning.assert_called()
+
+
+@pytest.mark.django_db
+def test_IMAP4Fetcher_fetch_emails__batch_max_size(
+    mocker, override_config, fake_email, mock_logger, mock_IMAP4_header_probe
+):
+    """Tests :func:`core.utils.fetchers.IMAP4Fetcher.fetch_emails`
+    in case the messages are larger than the byte budget of a batch.
+    """
+    mailbox = fake_email.mailbox
+    mailbox.account.protocol = EmailProtocolChoices.IMAP4
+    mailbox.account.save(update_fields=["protocol"])
+
+    with override_config(THROW_OUT_SPAM=False, IMAP_FETCH_BATCH_MAX_SIZE=2500):
+        result = list(IMAP4Fetcher(mailbox.account).fetch_emails(mailbox))
+
+    assert result == [b"2", b"3", b"4"]
+    mock_IMAP4_header_probe.return_value.uid.assert_has_calls(
+        [
+            mocker.call("FETCH", b"1,2,3,4", IMAP4Fetcher.HEADER_PROBE_FETCH_ITEMS),
+            mocker.call("FETCH", b"2,3", "(RFC822)"),
+            mocker.call("FETCH", b"4", "(RFC822)"),
+        ]
+    )
+
+
+@pytest.fixture
+def mock_IMAP4_partial(mock_IMAP4):
+    """Patches the uid responses of :func:`mock_IMAP4` to serve a message with a video attachment and a plain message."""
+    parts = {
+        b"HEADER": b'Content-Type: multipart/mixed; boundary="xyz"\r\n\r\n',
+        b"1.MIME": b"Content-Type: text/plain\r\n\r\n",
+        b"1": b"hello",
+        b"2.MIME": b"Content-Type: video/mp4\r\nContent-Disposition: attachment\r\n\r\n",
+    }
+
+    def uid_side_effect(cmd, *args):
+        if cmd != "FETCH":
+            return ("OK", [b"1 2", b""])
+        if args[1] == IMAP4Fetcher.HEADER_PROBE_FETCH_ITEMS:
+            return (
+                "OK",
+                [
+                    b"1 (UID 1 RFC822.SIZE 5000)",
+                    b"2 (UID 2 RFC822.SIZE 100)",
+                ],
+            )
+        if args[1] == IMAP4Fetcher.STRUCTURE_PROBE_FETCH_ITEMS:
+            return (
+                "OK",
+                [
+                    (
+                        b'1 (UID 1 RFC822.SIZE 5000 BODYSTRUCTURE (("text" "plain" ("charset" "utf-8") NIL NIL "7bit" 5 1 NIL NIL NIL NIL)'
+                        b'("video" "mp4" ("name" "clip.mp4") NIL NIL "base64" 4000 NIL ("attachment" ("filename" "clip.mp4")) NIL NIL)'
+                        b' "mixed" ("boundary" "xyz") NIL NIL NIL))'
+                    ),
+                    b'2 (UID 2 RFC822.SIZE 100 BODYSTRUCTURE ("text" "plain" ("charset" "utf-8") NIL NIL "7bit" 5 1 NIL NIL NIL NIL))',
+                ],
+            )
+        if args[1] == "(RFC822)":
+            return ("OK", [(b"2 (UID 2 RFC822 {1}", b"2"), b")"])
+        response = [
+            (b" BODY[" + section + b"] {%d}" % len(part), part)
+            for section, part in parts.items()
+            if f"BODY.PEEK[{section.decode()}]" in args[1]
+        ]
+        return ("OK", [*response, b")"])
+
+    mock_IMAP4.return_value.uid.side_effect = uid_side_effect
+    return mock_IMAP4
+
+
+@pytest.mark.django_db
+def test_IMAP4Fetcher_fetch_emails__partial(
+    mocker, override_config, imap_mailbox, mock_logger, mock_IMAP4_partial
+):
+    """Tests :func:`core.utils.fetchers.IMAP4Fetcher.fetch_emails`
+    in case of a mailbox with partial fetching.
+    """
+    imap_mailbox.save_to_eml = False
+    imap_mailbox.partial_fetch = True
+    imap_mailbox.save(update_fields=["save_to_eml", "partial_fetch"])
+
+    with override_config(THROW_OUT_SPAM=False, DONT_PARSE_CONTENT_MAINTYPES=["video"]):
+        result = list(IMAP4Fetcher(imap_mailbox.account).fetch_emails(imap_mailbox))
+
+    assert result == [
+        (
+            b'Content-Type: multipart/mixed; boundary="xyz"\r\n\r\n'
+            b"--xyz\r\nContent-Type: text/plain\r\n\r\nhello\r\n"
+            b"--xyz\r\nContent-Type: video/mp4\r\nContent-Disposition: attachment\r\n\r\n\r\n"
+            b"--xyz--\r\n"
+        ),
+        b"2",
+    ]
+    mock_IMAP4_partial.return_value.uid.assert_has_calls(
+        [
+            mocker.call("FETCH", b"1,2", IMAP4Fetcher.STRUCTURE_PROBE_FETCH_ITEMS),
+            mocker.call(
+                "FETCH",
+                b"1",
+                "(BODY.PEEK[HEADER] BODY.PEEK[1.MIME] BODY.PEEK[1] BODY.PEEK[2.MIME])",
+            ),
+            mocker.call("FETCH", b"2", "(RFC822)"),
+        ]
+    )
+    mock_logger.warning.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_IMAP4Fetcher_fetch_emails__partial__nothing_skipped(
+    mocker, override_config, imap_mailbox, mock_logger, mock_IMAP4_partial
+):
+    """Tests :func:`core.utils.fetchers.IMAP4Fetcher.fetch_emails`
+    in case of a mailbox with partial fetching and messages without skipped parts.
+    """
+    imap_mailbox.save_to_eml = False
+    imap_mailbox.partial_fetch = True
+    imap_mailbox.save(update_fields=["save_to_eml", "partial_fetch"])
+    uid_side_effect = mock_IMAP4_partial.return_value.uid.side_effect
+    mock_IMAP4_partial.return_value.uid.side_effect = lambda cmd, *args: (
+        (
+            "OK",
+            [
+                (b"1 (UID 1 RFC822 {1}", b"1"),
+                b")",
+                (b"2 (UID 2 RFC822 {1}", b"2"),
+                b")",
+            ],
+        )
+        if args[-1] == "(RFC822)"
+        else uid_side_effect(cmd, *args)
+    )
+
+    with override_config(THROW_OUT_SPAM=False):
+        result = list(IMAP4Fetcher(imap_mailbox.account).fetch_emails(imap_mailbox))
+
+    assert result == [b"1", b"2"]
+    mock_IMAP4_partial.return_value.uid.assert_called_with("FETCH", b"1,2", "(RFC822)")
+
+
+@pytest.mark.django_db
+def test_IMAP4Fetcher_fetch_emails__partial__save_to_eml(
+    mocker, override_config, imap_mailbox, mock_logger, mock_IMAP4_partial
+):
+    """Tests :func:`core.utils.fetchers.IMAP4Fetcher.fetch_emails`
+    in case of a mailbox with partial fetching that saves its emails as eml.
+    """
+    imap_mailbox.save_to_eml = True
+    imap_mailbox.partial_fetch = True
+    imap_mailbox.save(update_fields=["save_to_eml", "partial_fetch"])
+
+    with override_config(THROW_OUT_SPAM=False, DONT_PARSE_CONTENT_MAINTYPES=["video"]):
+        list(IMAP4Fetcher(imap_mailbox.account).fetch_emails(imap_mailbox))
+
+    assert (
+        mocker.call("FETCH", b"1,2", IMAP4Fetcher.STRUCTURE_PROBE_FETCH_ITEMS)
+        not in mock_IMAP4_partial.return_value.uid.call_args_list
+    )
+
+
+@pytest.mark.django_db
+def test_IMAP4Fetcher_fetch_emails__partial__bad_response(
+    override_config, imap_mailbox, mock_logger, mock_IMAP4_partial
+):
+    """Tests :func:`core.utils.fetchers.IMAP4Fetcher.fetch_emails`
+    in case of a bad response while fetching the parts of a message.
+    """
+    imap_mailbox.save_to_eml = False
+    imap_mailbox.partial_fetch = True
+    imap_mailbox.save(update_fields=["save_to_eml", "partial_fetch"])
+    uid_side_effect = mock_IMAP4_partial.return_value.uid.side_effect
+    mock_IMAP4_partial.return_value.uid.side_effect = lambda cmd, *args: (
+        ("NO", [b"failed"])
+        if cmd == "FETCH" and args[1].startswith("(BODY.PEEK[HEADER]")
+        else uid_side_effect(cmd, *args)
+    )
+
+    with override_config(THROW_OUT_SPAM=False, DONT_PARSE_CONTENT_MAINTYPES=["video"]):
+        result = list(IMAP4Fetcher(imap_mailbox.account).fetch_emails(imap_mailbox))
+
+    assert result == [b"2"]
+    mock_logger.warning.assert_called()
+
+
+@pytest.fixture
+def mock_IMAP4_idle(mocker, mock_IMAP4):
+    """Extends :func:`mock_IMAP4` with IDLE support announcing new messages."""
+    mock_IMAP4.return_value.capabilities = ["IDLE"]
+    mock_IMAP4.return_value.idle = mocker.MagicMock()
+    mock_IMAP4.return_value.idle.return_value.__enter__.return_value = [
+        ("EXPUNGE", [b"2"]),
+        ("EXISTS", [b"5"]),
+    ]
+    mock_IMAP4.return_value.response.return_value = ("UIDNEXT", [None])
+    return mock_IMAP4
+
+
+@pytest.mark.django_db
+def test_IMAP4Fetcher_wait_for_new_emails__new_emails(
+    imap_mailbox, mock_logger, mock_IMAP4_idle
+):
+    """Tests :func:`core.utils.fetchers.IMAP4Fetcher.wait_for_new_emails`
+    in case the server announces new messages.
+    """
+    result = IMAP4Fetcher(imap_mailbox.account).wait_for_new_emails(imap_mailbox, 60)
+
+    assert result is True
+    mock_IMAP4_idle.return_value.select.assert_called_once_with(
+        utf7_encode(imap_mailbox.name), readonly=True
+    )
+    mock_IMAP4_idle.return_value.response.assert_any_call("EXISTS")
+    mock_IMAP4_idle.return_value.idle.assert_called_once_with(duration=60)
+    mock_IMAP4_idle.return_value.idle.return_value.__exit__.assert_called_once()
+    mock_IMAP4_idle.return_value.unselect.assert_called_once_with()
+    mock_logger.error.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_IMAP4Fetcher_wait_for_new_emails__unfetched_emails(
+    imap_mailbox, mock_logger, mock_IMAP4_idle
+):
+    """Tests :func:`core.utils.fetchers.IMAP4Fetcher.wait_for_new_emails`
+    in case messages arrived after the last fetch and before idling.
+    """
+    imap_mailbox.imap_uidvalidity = 1234
+    imap_mailbox.imap_highest_uid = 5
+    mock_IMAP4_idle.return_value.response.side_effect = lambda code: {
+        "UIDNEXT": ("UIDNEXT", [b"8"]),
+        "UIDVALIDITY": ("UIDVALIDITY", [b"1234"]),
+    }.get(code, (code, [None]))
+    fetcher = IMAP4Fetcher(imap_mailbox.account)
+
+    first_result = fetcher.wait_for_new_emails(imap_mailbox, 60)
+    second_result = fetcher.wait_for_new_emails(imap_mailbox, 60)
+
+    assert first_result is True
+    assert second_result is True
+    # the unchanged UIDNEXT is not checked again
+    mock_IMAP4_idle.return_value.idle.assert_called_once_with(duration=60)
+    assert mock_IMAP4_idle.return_value.unselect.call_count == 2
+
+
+@pytest.mark.django_db
+def test_IMAP4Fetcher_wait_for_new_emails__all_fetched(
+    imap_mailbox, mock_logger, mock_IMAP4_idle
+):
+    """Tests :func:`core.utils.fetchers.IMAP4Fetcher.wait_for_new_emails`
+    in case all messages have been fetched before idling.
+    """
+    imap_mailbox.imap_uidvalidity = 1234
+    imap_mailbox.imap_highest_uid = 7
+    mock_IMAP4_idle.return_value.response.side_effect = lambda code: {
+        "UIDNEXT": ("UIDNEXT", [b"8"]),
+        "UIDVALIDITY": ("UIDVALIDITY", [b"1234"]),
+    }.get(code, (code, [None]))
+
+    IMAP4Fetcher(imap_mailbox.account).wait_for_new_emails(imap_mailbox, 60)
+
+    mock_IMAP4_idle.return_value.idle.assert_called_once_with(duration=60)
+
+
+@pytest.mark.django_db
+def test_IMAP4Fetcher_wait_for_new_emails__timeout(
+    imap_mailbox, mock_logger, mock_IMAP4_idle
+):
+    """Tests :func:`core.utils.fetchers.IMAP4Fetcher.wait_for_new_emails`
+    in case the server announces no new messages before the timeout.
+    """
+    mock_IMAP4_idle.return_value.idle.return_value.__enter__.return_value = [
+        ("FETCH", [b"1 (FLAGS (\\Seen))"])
+    ]
+
+    result = IMAP4Fetcher(imap_mailbox.account).wait_for_new_emails(imap_mailbox)
+
+    assert result is False
+    mock_IMAP4_idle.return_value.idle.assert_called_once_with(
+        duration=IMAP4Fetcher.IDLE_TIMEOUT
+    )
+    mock_IMAP4_idle.return_value.unselect.assert_called_once_with()
+
+
+@pytest.mark.django_db
+def test_IMAP4Fetcher_wait_for_new_emails__no_idle_support(
+    imap_mailbox, mock_logger, mock_IMAP4_idle
+):
+    """Tests :func:`core.utils.fetchers.IMAP4Fetcher.wait_for_new_emails`
+    in case the server doesn't support IDLE.
+    """
+    mock_IMAP4_idle.return_value.capabilities = []
+
+    with pytest.raises(MailboxError, match="IDLE"):
+        IMAP4Fetcher(imap_mailbox.account).wait_for_new_emails(imap_mailbox)
+
+    mock_IMAP4_idle.return_value.select.assert_not_called()
+    mock_IMAP4_idle.return_value.idle.assert_not_called()
+    mock_logger.error.assert_called()
+
+
+@pytest.mark.django_db
+def test_IMAP4Fetcher_wait_for_new_emails__wrong_mailbox(
+    fake_other_account, imap_mailbox, mock_logger, mock_IMAP4_idle
+):
+    """Tests :func:`core.utils.fetchers.IMAP4Fetcher.wait_for_new_emails`
+    in case the given mailbox doesn't belong to the given account.
+    """
+    wrong_mailbox = baker.make(Mailbox, account=fake_other_account)
+
+    with pytest.raises(ValueError, match="is not in"):
+        IMAP4Fetcher(imap_mailbox.account).wait_for_new_emails(wrong_mailbox)
+
+    mock_IMAP4_idle.return_value.idle.assert_not_called()
+    mock_logger.error.assert_called()
+
+
+@pytest.mark.django_db
+def test_IMAP4Fetcher_wait_for_new_emails__exception(
+    fake_error_message, imap_mailbox, mock_logger, mock_IMAP4_idle
+):
+    """Tests :func:`core.utils.fetchers.IMAP4Fetcher.wait_for_new_emails`
+    in case of an exception during IDLE.
+    """
+    mock_IMAP4_idle.return_value.idle.return_value.__enter__.side_effect = (
+        FakeIMAP4Error(fake_error_message)
+    )
+
+    with pytest.raises(MailboxError, match=fake_error_message):
+        IMAP4Fetcher(imap_mailbox.account).wait_for_new_emails(imap_mailbox)
+
+    mock_IMAP4_idle.return_value.unselect.assert_not_called()
+    mock_logger.exception.assert_called()
+
+
 @pytest.mark.django_db
 def test_IMAP4Fetcher_fetch_mailboxes__success(imap_mailbox, mock_logger, mock_IMAP4):
     """Tests :func:`core.utils.fetchers.IMAP4Fetcher.fetch_mailboxes`
@@ -44,8 +44,13 @@ def mock_IMAP4_SSL(mocker, faker):
         "core.utils.fetchers.IMAP4_SSL_Fetcher.imaplib.IMAP4_SSL", autospec=True
     )
     mock_IMAP4_SSL.error = FakeIMAP4Error
+    mock_IMAP4_SSL.return_value.capabilities = []
     fake_response = faker.sentence().encode("utf-8")
     mock_IMAP4_SSL.return_value.login.return_value = ("OK", [fake_response])
+    mock_IMAP4_SSL.return_value.capability.side_effect = lambda: (
+        "OK",
+        [" ".join(mock_IMAP4_SSL.return_value.capabilities).encode()],
+    )
     mock_IMAP4_SSL.return_value.noop.return_value = ("OK", [fake_response])
     mock_IMAP4_SSL.return_value.check.return_value = ("OK", [fake_response])
     mock_IMAP4_SSL.return_value.list.return_value = ("OK", fake_response.split())
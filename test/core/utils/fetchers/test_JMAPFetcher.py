@@ -27,12 +27,14 @@ import requests
 import urllib3.exceptions
 
 from core.constants import (
+    EmailFetchingCriterionChoices,
     EmailProtocolChoices,
     MailboxTypeChoices,
 )
 from core.utils import FetchingCriterion
 from core.utils.fetchers import JMAPFetcher
 from core.utils.fetchers.exceptions import MailAccountError, MailboxError
+from core.utils.fetchers.FetchEstimate import FetchEstimate
 
 
 @pytest.fixture
@@ -100,7 +102,7 @@ def mock_JMAP_request_handler(faker, fake_get_response_data, fake_query_response
             return jmapc.methods.MailboxGetResponse(**fake_get_response_data)
         if isinstance(methods, jmapc.methods.EmailGet):
             fake_get_response_data.update(
-                data=[jmapc.Email(blob_id=word) for word in faker.words()]
+                data=[jmapc.Email(id=word, blob_id=word) for word in faker.words()]
             )
             return jmapc.methods.EmailGetResponse(**fake_get_response_data)
         if isinstance(methods, jmapc.methods.MailboxQuery):
@@ -116,6 +118,59 @@ def mock_JMAP_request_handler(faker, fake_get_response_data, fake_query_response
     return handle_request
 
 
+@pytest.fixture
+def fake_changes_response_data(faker):
+    """Fake response data for a /changes JMAP request."""
+    return {
+        "account_id": faker.word(),
+        "old_state": faker.word(),
+        "new_state": faker.word(),
+        "has_more_changes": False,
+        "created": faker.words(),
+        "updated": faker.words(),
+        "destroyed": faker.words(),
+    }
+
+
+@pytest.fixture
+def mock_JMAP_changes_request_handler(
+    fake_changes_response_data, fake_query_response_data, mock_JMAP_request_handler
+):
+    """Extends :func:`mock_JMAP_request_handler` to handle /changes requests
+    and return emails in the queried mailbox for Email/get requests by id.
+    """
+
+    def handle_changes_request(methods):
+        if isinstance(methods, jmapc.methods.EmailChanges):
+            return jmapc.methods.EmailChangesResponse(**fake_changes_response_data)
+        if isinstance(methods, jmapc.methods.MailboxChanges):
+            return jmapc.methods.MailboxChangesResponse(**fake_changes_response_data)
+        if isinstance(methods, jmapc.methods.EmailGet) and isinstance(
+            methods.ids, list
+        ):
+            return jmapc.methods.EmailGetResponse(
+                account_id=fake_changes_response_data["account_id"],
+                state=fake_changes_response_data["new_state"],
+                not_found=[],
+                data=[
+                    jmapc.Email(
+                        blob_id=email_id,
+                        mailbox_ids={
+                            (
+                                fake_query_response_data["ids"][0]
+                                if index % 2
+                                else "other"
+                            ): True
+                        },
+                    )
+                    for index, email_id in enumerate(methods.ids)
+                ],
+            )
+        return mock_JMAP_request_handler(methods)
+
+    return handle_changes_request
+
+
 @pytest.fixture
 def mock_JMAP_error_response_handler(faker):
     """Handler for fake JMAP error responses."""
@@ -167,11 +222,18 @@ def mock_JMAP_client(mocker, faker, mock_JMAP_request_handler):
         id=faker.word(), type=faker.word(), size=faker.random.randint(0, 100)
     )
     mock_JMAP_client.return_value.request.side_effect = mock_JMAP_request_handler
+    mock_requests_session = mocker.Mock(spec=requests.Session)
+    mock_requests_session.get.return_value.iter_content.return_value = [
+        faker.sentence().encode(),
+        faker.sentence().encode(),
+    ]
     type(mock_JMAP_client.return_value).requests_session = mocker.PropertyMock(
-        return_value=mocker.Mock(spec=requests.Session)
+        return_value=mock_requests_session
     )
+    mock_jmap_session = mocker.Mock()
+    mock_jmap_session.capabilities.core.max_objects_in_get = 500
     type(mock_JMAP_client.return_value).jmap_session = mocker.PropertyMock(
-        return_value=mocker.Mock()
+        return_value=mock_jmap_session
     )
 
     return mock_JMAP_client
@@ -458,6 +520,105 @@ def test_JMAPFetcher_fetch_mailboxes__success(
     mock_logger.exception.assert_not_called()
 
 
+@pytest.mark.django_db
+def test_JMAPFetcher_fetch_mailboxes__incremental(
+    jmap_mailbox,
+    mock_logger,
+    mock_JMAP_client,
+    mock_JMAP_changes_request_handler,
+    fake_changes_response_data,
+):
+    """Tests :func:`core.utils.fetchers.IMAP4Fetcher.fetch_mailboxes`
+    in case of success with a stored mailbox state.
+    """
+    jmap_mailbox.account.jmap_mailbox_state = "old_state"
+    jmap_mailbox.account.save(update_fields=["jmap_mailbox_state"])
+    mock_JMAP_client.return_value.request.side_effect = (
+        mock_JMAP_changes_request_handler
+    )
+
+    result = JMAPFetcher(jmap_mailbox.account).fetch_mailboxes()
+
+    assert result
+    assert mock_JMAP_client.return_value.request.call_count == 2
+    changes_method = mock_JMAP_client.return_value.request.call_args_list[0].args[0]
+    assert isinstance(changes_method, jmapc.methods.MailboxChanges)
+    assert changes_method.since_state == "old_state"
+    get_method = mock_JMAP_client.return_value.request.call_args_list[1].args[0]
+    assert isinstance(get_method, jmapc.methods.MailboxGet)
+    assert (
+        get_method.ids
+        == fake_changes_response_data["created"] + fake_changes_response_data["updated"]
+    )
+    jmap_mailbox.account.refresh_from_db()
+    assert (
+        jmap_mailbox.account.jmap_mailbox_state
+        == fake_changes_response_data["new_state"]
+    )
+    mock_logger.error.assert_not_called()
+    mock_logger.exception.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_JMAPFetcher_fetch_mailboxes__incremental__no_changes(
+    jmap_mailbox,
+    mock_JMAP_client,
+    mock_JMAP_changes_request_handler,
+    fake_changes_response_data,
+):
+    """Tests :func:`core.utils.fetchers.IMAP4Fetcher.fetch_mailboxes`
+    in case there are no changes since the stored mailbox state.
+    """
+    jmap_mailbox.account.jmap_mailbox_state = "old_state"
+    jmap_mailbox.account.save(update_fields=["jmap_mailbox_state"])
+    fake_changes_response_data.update(created=[], updated=[])
+    mock_JMAP_client.return_value.request.side_effect = (
+        mock_JMAP_changes_request_handler
+    )
+
+    result = JMAPFetcher(jmap_mailbox.account).fetch_mailboxes()
+
+    assert result == []
+    mock_JMAP_client.return_value.request.assert_called_once()
+    jmap_mailbox.account.refresh_from_db()
+    assert (
+        jmap_mailbox.account.jmap_mailbox_state
+        == fake_changes_response_data["new_state"]
+    )
+
+
+@pytest.mark.django_db
+def test_JMAPFetcher_fetch_mailboxes__incremental__cannot_calculate_changes(
+    faker,
+    jmap_mailbox,
+    mock_logger,
+    mock_JMAP_client,
+    mock_JMAP_request_handler,
+    fake_get_response_data,
+):
+    """Tests :func:`core.utils.fetchers.IMAP4Fetcher.fetch_mailboxes`
+    in case the server can't calculate the changes since the stored mailbox state.
+    """
+    jmap_mailbox.account.jmap_mailbox_state = "old_state"
+    jmap_mailbox.account.save(update_fields=["jmap_mailbox_state"])
+    mock_JMAP_client.return_value.request.side_effect = [
+        jmapc.Error(type="cannotCalculateChanges"),
+        mock_JMAP_request_handler(jmapc.methods.MailboxGet(ids=None)),
+    ]
+
+    result = JMAPFetcher(jmap_mailbox.account).fetch_mailboxes()
+
+    assert result
+    assert mock_JMAP_client.return_value.request.call_count == 2
+    get_method = mock_JMAP_client.return_value.request.call_args_list[1].args[0]
+    assert isinstance(get_method, jmapc.methods.MailboxGet)
+    assert get_method.ids is None
+    jmap_mailbox.account.refresh_from_db()
+    assert jmap_mailbox.account.jmap_mailbox_state == fake_get_response_data["state"]
+    mock_logger.info.assert_called()
+    mock_logger.error.assert_not_called()
+
+
 @pytest.mark.django_db
 @pytest.mark.parametrize("error", [requests.HTTPError, requests.ConnectionError])
 def test_JMAPFetcher_fetch_mailboxes__failure(
@@ -548,6 +709,401 @@ def test_JMAPFetcher_fetch_emails__success(jmap_mailbox, mock_logger, mock_JMAP_
     mock_logger.exception.assert_not_called()
 
 
+@pytest.mark.django_db
+def test_JMAPFetcher_fetch_emails__paged(
+    faker, jmap_mailbox, mock_logger, mock_JMAP_client, fake_get_response_data
+):
+    """Tests :func:`core.utils.fetchers.IMAP4Fetcher.fetch_emails`
+    in case the matching messages span multiple pages.
+    """
+    fake_ids = [faker.uuid4() for _ in range(5)]
+    mock_JMAP_client.return_value.jmap_session.capabilities.core.max_objects_in_get = 2
+    mock_JMAP_client.return_value.requests_session.get.return_value.iter_content.side_effect = lambda **kwargs: [
+        b"chunk1",
+        b"chunk2",
+    ]
+
+    def handle_request(methods):
+        if isinstance(methods, jmapc.methods.MailboxQuery):
+            return jmapc.methods.MailboxQueryResponse(
+                account_id="account",
+                query_state="state",
+                can_calculate_changes=False,
+                position=0,
+                ids=["mailbox"],
+            )
+        query, _ = methods
+        page_ids = fake_ids[query.position : query.position + query.limit]
+        return [
+            jmapc.methods.InvocationResponse(
+                id="0",
+                response=jmapc.methods.EmailQueryResponse(
+                    account_id="account",
+                    query_state="state",
+                    can_calculate_changes=False,
+                    position=query.position,
+                    ids=page_ids,
+                    total=len(fake_ids) if query.calculate_total else None,
+                ),
+            ),
+            jmapc.methods.InvocationResponse(
+                id="1",
+                response=jmapc.methods.EmailGetResponse(
+                    **{
+                        **fake_get_response_data,
+                        "data": [jmapc.Email(id=id_, blob_id=id_) for id_ in page_ids],
+                    }
+                ),
+            ),
+        ]
+
+    mock_JMAP_client.return_value.request.side_effect = handle_request
+
+    result = list(JMAPFetcher(jmap_mailbox.account).fetch_emails(jmap_mailbox))
+
+    assert result == [b"chunk1chunk2"] * len(fake_ids)
+    assert mock_JMAP_client.return_value.request.call_count == 4
+    assert [
+        call.args[0][0].position
+        for call in mock_JMAP_client.return_value.request.call_args_list[1:]
+    ] == [0, 2, 4]
+    assert [
+        call.kwargs["blobId"]
+        for call in mock_JMAP_client.return_value.jmap_session.download_url.format.call_args_list
+    ] == fake_ids
+    mock_logger.error.assert_not_called()
+    mock_logger.exception.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_JMAPFetcher_fetch_emails__spooled(faker, jmap_mailbox, mock_JMAP_client):
+    """Tests :func:`core.utils.fetchers.IMAP4Fetcher.fetch_emails`
+    in case the message blobs are larger than the spool memory size.
+    """
+    fake_chunks = [faker.sentence().encode() for _ in range(10)]
+    mock_JMAP_client.return_value.requests_session.get.return_value.iter_content.return_value = (
+        fake_chunks
+    )
+    fetcher = JMAPFetcher(jmap_mailbox.account)
+    fetcher.BLOB_SPOOL_MAX_MEMORY_SIZE = 8
+
+    result = list(fetcher.fetch_emails(jmap_mailbox))
+
+    assert result
+    assert all(blob == b"".join(fake_chunks) for blob in result)
+    mock_JMAP_client.return_value.requests_session.get.return_value.close.assert_called()
+
+
+@pytest.mark.django_db
+def test_JMAPFetcher_fetch_emails__failure_download__stops_downloads(
+    fake_error_message, faker, jmap_mailbox, mock_JMAP_client, fake_get_response_data
+):
+    """Tests :func:`core.utils.fetchers.IMAP4Fetcher.fetch_emails`
+    in case of an error with a download among many.
+    """
+    fake_get_response_data["data"] = [
+        jmapc.Email(id=str(number), blob_id=str(number)) for number in range(50)
+    ]
+    mock_JMAP_client.return_value.requests_session.get.side_effect = [
+        mock_JMAP_client.return_value.requests_session.get.return_value,
+        requests.HTTPError(fake_error_message),
+        *[mock_JMAP_client.return_value.requests_session.get.return_value] * 48,
+    ]
+
+    def handle_request(methods):
+        if isinstance(methods, jmapc.methods.MailboxQuery):
+            return jmapc.methods.MailboxQueryResponse(
+                account_id="account",
+                query_state="state",
+                can_calculate_changes=False,
+                position=0,
+                ids=["mailbox"],
+            )
+        return [
+            jmapc.methods.InvocationResponse(
+                id="0",
+                response=jmapc.methods.EmailQueryResponse(
+                    account_id="account",
+                    query_state="state",
+                    can_calculate_changes=False,
+                    position=0,
+                    ids=[email.blob_id for email in fake_get_response_data["data"]],
+                ),
+            ),
+            jmapc.methods.InvocationResponse(
+                id="1",
+                response=jmapc.methods.EmailGetResponse(**fake_get_response_data),
+            ),
+        ]
+
+    mock_JMAP_client.return_value.request.side_effect = handle_request
+
+    result = []
+    with pytest.raises(MailAccountError, match=fake_error_message):
+        result.extend(JMAPFetcher(jmap_mailbox.account).fetch_emails(jmap_mailbox))
+
+    assert len(result) == 1
+    assert (
+        mock_JMAP_client.return_value.requests_session.get.call_count
+        <= 2 * JMAPFetcher.MAX_CONCURRENT_DOWNLOADS + 1
+    )
+
+
+@pytest.mark.django_db
+def test_JMAPFetcher_fetch_emails__incremental__first_sync(
+    jmap_mailbox, mock_logger, mock_JMAP_client, fake_get_response_data
+):
+    """Tests :func:`core.utils.fetchers.IMAP4Fetcher.fetch_emails`
+    in case of success with the INCREMENTAL criterion and no stored state.
+    """
+    result = list(
+        JMAPFetcher(jmap_mailbox.account).fetch_emails(
+            jmap_mailbox, FetchingCriterion(EmailFetchingCriterionChoices.INCREMENTAL)
+        )
+    )
+
+    assert result
+    assert mock_JMAP_client.return_value.request.call_count == 3
+    state_method = mock_JMAP_client.return_value.request.call_args_list[1].args[0]
+    assert isinstance(state_method, jmapc.methods.EmailGet)
+    assert state_method.ids == []
+    jmap_mailbox.refresh_from_db()
+    assert jmap_mailbox.jmap_email_state == fake_get_response_data["state"]
+    mock_logger.error.assert_not_called()
+    mock_logger.exception.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_JMAPFetcher_fetch_emails__incremental(
+    mocker,
+    jmap_mailbox,
+    mock_logger,
+    mock_JMAP_client,
+    mock_JMAP_changes_request_handler,
+    fake_changes_response_data,
+):
+    """Tests :func:`core.utils.fetchers.IMAP4Fetcher.fetch_emails`
+    in case of success with the INCREMENTAL criterion and a stored state.
+    """
+    jmap_mailbox.jmap_email_state = "old_state"
+    jmap_mailbox.save(update_fields=["jmap_email_state"])
+    mock_JMAP_client.return_value.request.side_effect = (
+        mock_JMAP_changes_request_handler
+    )
+    expected_blob_ids = fake_changes_response_data["created"][1::2]
+
+    result = list(
+        JMAPFetcher(jmap_mailbox.account).fetch_emails(
+            jmap_mailbox, FetchingCriterion(EmailFetchingCriterionChoices.INCREMENTAL)
+        )
+    )
+
+    assert len(result) == len(expected_blob_ids)
+    assert mock_JMAP_client.return_value.request.call_count == 3
+    changes_method = mock_JMAP_client.return_value.request.call_args_list[1].args[0]
+    assert isinstance(changes_method, jmapc.methods.EmailChanges)
+    assert changes_method.since_state == "old_state"
+    get_method = mock_JMAP_client.return_value.request.call_args_list[2].args[0]
+    assert get_method.ids == fake_changes_response_data["created"]
+    assert (
+        mock_JMAP_client.return_value.jmap_session.download_url.format.call_args_list
+        == [
+            mocker.call(
+                accountId=mock_JMAP_client.return_value.account_id,
+                blobId=blob_id,
+                name="",
+                type="message/rfc822",
+            )
+            for blob_id in expected_blob_ids
+        ]
+    )
+    jmap_mailbox.refresh_from_db()
+    assert jmap_mailbox.jmap_email_state == fake_changes_response_data["new_state"]
+    mock_logger.error.assert_not_called()
+    mock_logger.exception.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_JMAPFetcher_fetch_emails__incremental__more_changes(
+    jmap_mailbox,
+    mock_JMAP_client,
+    mock_JMAP_changes_request_handler,
+    fake_changes_response_data,
+):
+    """Tests :func:`core.utils.fetchers.IMAP4Fetcher.fetch_emails`
+    with the INCREMENTAL criterion in case the server returns the changes in multiple parts.
+    """
+    jmap_mailbox.jmap_email_state = "old_state"
+    jmap_mailbox.save(update_fields=["jmap_email_state"])
+    first_changes_response = jmapc.methods.EmailChangesResponse(
+        **{
+            **fake_changes_response_data,
+            "new_state": "intermediate_state",
+            "has_more_changes": True,
+            "created": ["first"],
+        }
+    )
+
+    def handle_request(methods):
+        if (
+            isinstance(methods, jmapc.methods.EmailChanges)
+            and methods.since_state == "old_state"
+        ):
+            return first_changes_response
+        return mock_JMAP_changes_request_handler(methods)
+
+    mock_JMAP_client.return_value.request.side_effect = handle_request
+
+    list(
+        JMAPFetcher(jmap_mailbox.account).fetch_emails(
+            jmap_mailbox, FetchingCriterion(EmailFetchingCriterionChoices.INCREMENTAL)
+        )
+    )
+
+    assert mock_JMAP_client.return_value.request.call_count == 4
+    second_changes_method = mock_JMAP_client.return_value.request.call_args_list[
+        2
+    ].args[0]
+    assert second_changes_method.since_state == "intermediate_state"
+    get_method = mock_JMAP_client.return_value.request.call_args_list[3].args[0]
+    assert get_method.ids == ["first", *fake_changes_response_data["created"]]
+    jmap_mailbox.refresh_from_db()
+    assert jmap_mailbox.jmap_email_state == fake_changes_response_data["new_state"]
+
+
+@pytest.mark.django_db
+def test_JMAPFetcher_fetch_emails__incremental__cannot_calculate_changes(
+    jmap_mailbox,
+    mock_logger,
+    mock_JMAP_client,
+    mock_JMAP_request_handler,
+    fake_get_response_data,
+):
+    """Tests :func:`core.utils.fetchers.IMAP4Fetcher.fetch_emails`
+    with the INCREMENTAL criterion in case the server can't calculate the changes.
+    """
+    jmap_mailbox.jmap_email_state = "old_state"
+    jmap_mailbox.save(update_fields=["jmap_email_state"])
+
+    def handle_request(methods):
+        if isinstance(methods, jmapc.methods.EmailChanges):
+            return jmapc.Error(type="cannotCalculateChanges")
+        return mock_JMAP_request_handler(methods)
+
+    mock_JMAP_client.return_value.request.side_effect = handle_request
+
+    result = list(
+        JMAPFetcher(jmap_mailbox.account).fetch_emails(
+            jmap_mailbox, FetchingCriterion(EmailFetchingCriterionChoices.INCREMENTAL)
+        )
+    )
+
+    assert result
+    assert mock_JMAP_client.return_value.request.call_count == 4
+    query_methods = mock_JMAP_client.return_value.request.call_args_list[3].args[0]
+    assert isinstance(query_methods[0], jmapc.methods.EmailQuery)
+    jmap_mailbox.refresh_from_db()
+    assert jmap_mailbox.jmap_email_state == fake_get_response_data["state"]
+    mock_logger.info.assert_called()
+    mock_logger.error.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_JMAPFetcher_fetch_emails__incremental__failure_download(
+    fake_error_message, jmap_mailbox, mock_JMAP_client
+):
+    """Tests :func:`core.utils.fetchers.IMAP4Fetcher.fetch_emails`
+    with the INCREMENTAL criterion in case of an error with a download.
+    """
+    mock_JMAP_client.return_value.requests_session.get.side_effect = requests.HTTPError(
+        fake_error_message
+    )
+
+    with pytest.raises(MailAccountError, match=fake_error_message):
+        list(
+            JMAPFetcher(jmap_mailbox.account).fetch_emails(
+                jmap_mailbox,
+                FetchingCriterion(EmailFetchingCriterionChoices.INCREMENTAL),
+            )
+        )
+
+    jmap_mailbox.refresh_from_db()
+    assert jmap_mailbox.jmap_email_state == ""
+
+
+@pytest.mark.django_db
+def test_JMAPFetcher_estimate_emails(
+    fake_email,
+    jmap_mailbox,
+    mock_logger,
+    mock_JMAP_client,
+    mock_JMAP_request_handler,
+    fake_get_response_data,
+):
+    """Tests :func:`core.utils.fetchers.JMAPFetcher.estimate_emails`
+    in case of success.
+    """
+    fake_email.message_id = "<known@example.org>"
+    fake_email.save(update_fields=["message_id"])
+
+    def handle_estimate_request(methods):
+        if isinstance(methods, jmapc.methods.EmailGet):
+            fake_get_response_data.update(
+                data=[
+                    jmapc.Email(size=100, message_id=["known@example.org"]),
+                    jmapc.Email(size=200, message_id=["new@example.org"]),
+                    jmapc.Email(size=300, message_id=None),
+                ]
+            )
+            return jmapc.methods.EmailGetResponse(**fake_get_response_data)
+        if isinstance(methods, Iterable):
+            return [
+                jmapc.methods.InvocationResponse(
+                    id="id", response=handle_estimate_request(method)
+                )
+                for method in methods
+            ]
+        return mock_JMAP_request_handler(methods)
+
+    mock_JMAP_client.return_value.request.side_effect = handle_estimate_request
+
+    result = JMAPFetcher(jmap_mailbox.account).estimate_emails(jmap_mailbox)
+
+    assert result == FetchEstimate(message_count=3, total_size=600, known_count=1)
+    get_method = mock_JMAP_client.return_value.request.call_args_list[-1].args[0][1]
+    assert get_method.properties == ["size", "messageId"]
+    mock_JMAP_client.return_value.requests_session.get.assert_not_called()
+    mock_logger.error.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_JMAPFetcher_estimate_emails__incremental(
+    jmap_mailbox,
+    mock_logger,
+    mock_JMAP_client,
+    mock_JMAP_changes_request_handler,
+):
+    """Tests :func:`core.utils.fetchers.JMAPFetcher.estimate_emails`
+    in case of success with the INCREMENTAL criterion and a stored state.
+    """
+    jmap_mailbox.jmap_email_state = "old_state"
+    jmap_mailbox.save(update_fields=["jmap_email_state"])
+    mock_JMAP_client.return_value.request.side_effect = (
+        mock_JMAP_changes_request_handler
+    )
+
+    JMAPFetcher(jmap_mailbox.account).estimate_emails(
+        jmap_mailbox, FetchingCriterion(EmailFetchingCriterionChoices.INCREMENTAL)
+    )
+
+    changes_method = mock_JMAP_client.return_value.request.call_args_list[1].args[0]
+    assert isinstance(changes_method, jmapc.methods.EmailChanges)
+    mock_JMAP_client.return_value.requests_session.get.assert_not_called()
+    jmap_mailbox.refresh_from_db()
+    assert jmap_mailbox.jmap_email_state == "old_state"
+    mock_logger.error.assert_not_called()
+
+
 @pytest.mark.django_db
 @pytest.mark.parametrize("error", [requests.HTTPError, requests.ConnectionError])
 def test_JMAPFetcher_fetch_emails__failure_request(
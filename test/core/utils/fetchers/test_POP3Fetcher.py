@@ -23,11 +23,12 @@ import re
 import pytest
 from model_bakery import baker
 
-from core.constants import EmailProtocolChoices
+from core.constants import EmailFetchingCriterionChoices, EmailProtocolChoices
 from core.models import Mailbox
 from core.utils import FetchingCriterion
 from core.utils.fetchers import POP3Fetcher
 from core.utils.fetchers.exceptions import MailAccountError
+from core.utils.fetchers.FetchEstimate import FetchEstimate
 
 
 @pytest.fixture
@@ -51,6 +52,8 @@ def mock_POP3(mocker, faker):
     mock_POP3.return_value.list.return_value = b"+OK" + fake_response
     mock_POP3.return_value.list.return_value = (b"+OK", fake_response.split(), 123)
     mock_POP3.return_value.retr.return_value = (b"+OK", fake_response.split(), 123)
+    mock_POP3.return_value.uidl.return_value = (b"+OK", [], 123)
+    mock_POP3.return_value.top.return_value = (b"+OK", [], 123)
     mock_POP3.return_value.quit.return_value = b"+OK" + fake_response
     return mock_POP3
 
@@ -491,6 +494,315 @@ def test_POP3Fetcher_fetch_emails__exception__ignored(
     mock_logger.exception.assert_called()
 
 
+@pytest.fixture
+def mock_POP3_uidls(mock_POP3):
+    """Extends :func:`mock_POP3` to list three messages with UIDLs."""
+    mock_POP3.return_value.list.return_value = (
+        b"+OK",
+        [b"1 120", b"2 240", b"3 360"],
+        123,
+    )
+    mock_POP3.return_value.uidl.return_value = (
+        b"+OK",
+        [b"1 uidl-1", b"2 uidl-2", b"3 uidl-3"],
+        123,
+    )
+    return mock_POP3
+
+
+@pytest.mark.django_db
+def test_POP3Fetcher_fetch_emails__progress__resume(
+    mocker, pop3_mailbox, mock_logger, mock_POP3_uidls
+):
+    """Tests :func:`core.utils.fetchers.POP3Fetcher.fetch_emails`
+    in case an interrupted fetch with the same criterion is resumed.
+    """
+    pop3_mailbox.fetch_progress_criterion = EmailFetchingCriterionChoices.ALL
+    pop3_mailbox.fetch_progress_checkpoint = "uidl-1"
+    pop3_mailbox.save(
+        update_fields=["fetch_progress_criterion", "fetch_progress_checkpoint"]
+    )
+
+    result = list(POP3Fetcher(pop3_mailbox.account).fetch_emails(pop3_mailbox))
+
+    assert len(result) == 2
+    assert mock_POP3_uidls.return_value.retr.call_count == 2
+    mock_POP3_uidls.return_value.retr.assert_has_calls([mocker.call(2), mocker.call(3)])
+    pop3_mailbox.refresh_from_db()
+    assert pop3_mailbox.fetch_progress_checkpoint == ""
+    assert pop3_mailbox.fetch_progress_count == 3
+    assert pop3_mailbox.fetch_progress_total == 3
+
+
+@pytest.mark.django_db
+def test_POP3Fetcher_fetch_emails__progress__failed_message(
+    mocker, monkeypatch, pop3_mailbox, mock_logger, mock_POP3_uidls
+):
+    """Tests :func:`core.utils.fetchers.POP3Fetcher.fetch_emails`
+    in case a message fails to be retrieved and the fetch is resumed.
+    """
+    monkeypatch.setattr(POP3Fetcher, "EMAIL_FETCH_BATCH_SIZE", 1)
+    retr_return_value = mock_POP3_uidls.return_value.retr.return_value
+    mock_POP3_uidls.return_value.retr.side_effect = lambda number: (
+        b"+NO" if number == 2 else retr_return_value
+    )
+
+    result = list(POP3Fetcher(pop3_mailbox.account).fetch_emails(pop3_mailbox))
+
+    assert len(result) == 2
+    pop3_mailbox.refresh_from_db()
+    assert pop3_mailbox.fetch_progress_checkpoint == "uidl-1"
+    assert pop3_mailbox.fetch_progress_count == 1
+
+    mock_POP3_uidls.return_value.retr.reset_mock(side_effect=True)
+
+    result = list(POP3Fetcher(pop3_mailbox.account).fetch_emails(pop3_mailbox))
+
+    assert len(result) == 2
+    mock_POP3_uidls.return_value.retr.assert_has_calls([mocker.call(2), mocker.call(3)])
+    pop3_mailbox.refresh_from_db()
+    assert pop3_mailbox.fetch_progress_checkpoint == ""
+    assert pop3_mailbox.fetch_progress_count == 3
+
+
+@pytest.mark.django_db
+def test_POP3Fetcher_fetch_emails__progress__no_uidl(
+    mocker, pop3_mailbox, mock_logger, mock_POP3_uidls
+):
+    """Tests :func:`core.utils.fetchers.POP3Fetcher.fetch_emails`
+    in case the server doesn't support UIDL and the message numbers can't be checkpointed.
+    """
+    mock_POP3_uidls.return_value.uidl.side_effect = AssertionError
+    pop3_mailbox.fetch_progress_criterion = EmailFetchingCriterionChoices.ALL
+    pop3_mailbox.fetch_progress_checkpoint = "1"
+    pop3_mailbox.save(
+        update_fields=["fetch_progress_criterion", "fetch_progress_checkpoint"]
+    )
+    spy_start_fetch_progress = mocker.spy(pop3_mailbox, "start_fetch_progress")
+    spy_advance_fetch_progress = mocker.spy(pop3_mailbox, "advance_fetch_progress")
+
+    result = list(POP3Fetcher(pop3_mailbox.account).fetch_emails(pop3_mailbox))
+
+    assert len(result) == 3
+    mock_POP3_uidls.return_value.retr.assert_has_calls(
+        [mocker.call(1), mocker.call(2), mocker.call(3)]
+    )
+    spy_start_fetch_progress.assert_not_called()
+    spy_advance_fetch_progress.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_POP3Fetcher_fetch_emails__incremental(
+    mocker, pop3_mailbox, mock_logger, mock_POP3_uidls
+):
+    """Tests :func:`core.utils.fetchers.POP3Fetcher.fetch_emails`
+    in case of success with the INCREMENTAL criterion and known UIDLs.
+    """
+    pop3_mailbox.pop_seen_uidls = ["uidl-1", "uidl-deleted"]
+    pop3_mailbox.save(update_fields=["pop_seen_uidls"])
+
+    result = list(
+        POP3Fetcher(pop3_mailbox.account).fetch_emails(
+            pop3_mailbox, EmailFetchingCriterionChoices.INCREMENTAL
+        )
+    )
+
+    assert result == [b"\n".join(mock_POP3_uidls.return_value.retr.return_value[1])] * 2
+    mock_POP3_uidls.return_value.uidl.assert_called_once_with()
+    mock_POP3_uidls.return_value.top.assert_not_called()
+    assert mock_POP3_uidls.return_value.retr.call_count == 2
+    mock_POP3_uidls.return_value.retr.assert_has_calls([mocker.call(2), mocker.call(3)])
+    pop3_mailbox.refresh_from_db()
+    assert pop3_mailbox.pop_seen_uidls == ["uidl-1", "uidl-2", "uidl-3"]
+    mock_logger.exception.assert_not_called()
+    mock_logger.error.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_POP3Fetcher_fetch_emails__incremental__first_sync(
+    mocker, pop3_mailbox, fake_email, mock_logger, mock_POP3_uidls
+):
+    """Tests :func:`core.utils.fetchers.POP3Fetcher.fetch_emails`
+    in case of success with the INCREMENTAL criterion and no sync state yet.
+    """
+    mock_POP3_uidls.return_value.top.side_effect = [
+        (b"+OK", [b"Message-ID: " + fake_email.message_id.encode()], 123),
+        (b"+OK", [b"Message-ID: <new-2@test.org>"], 123),
+        (b"+OK", [b"Subject: no id"], 123),
+    ]
+
+    result = list(
+        POP3Fetcher(pop3_mailbox.account).fetch_emails(
+            pop3_mailbox, EmailFetchingCriterionChoices.INCREMENTAL
+        )
+    )
+
+    assert len(result) == 2
+    mock_POP3_uidls.return_value.top.assert_has_calls(
+        [mocker.call(1, 0), mocker.call(2, 0), mocker.call(3, 0)]
+    )
+    assert mock_POP3_uidls.return_value.retr.call_count == 2
+    mock_POP3_uidls.return_value.retr.assert_has_calls([mocker.call(2), mocker.call(3)])
+    pop3_mailbox.refresh_from_db()
+    assert pop3_mailbox.pop_seen_uidls == ["uidl-1", "uidl-2", "uidl-3"]
+    mock_logger.error.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_POP3Fetcher_fetch_emails__incremental__saved_once(
+    mocker, monkeypatch, pop3_mailbox, mock_logger, mock_POP3_uidls
+):
+    """Tests :func:`core.utils.fetchers.POP3Fetcher.fetch_emails`
+    with the INCREMENTAL criterion in case the messages are retrieved in several batches.
+    """
+    monkeypatch.setattr(POP3Fetcher, "EMAIL_FETCH_BATCH_SIZE", 1)
+    pop3_mailbox.pop_seen_uidls = ["uidl-1"]
+    pop3_mailbox.save(update_fields=["pop_seen_uidls"])
+    spy_save_seen_uidls = mocker.spy(POP3Fetcher, "_save_seen_uidls")
+
+    result = list(
+        POP3Fetcher(pop3_mailbox.account).fetch_emails(
+            pop3_mailbox, EmailFetchingCriterionChoices.INCREMENTAL
+        )
+    )
+
+    assert len(result) == 2
+    spy_save_seen_uidls.assert_called_once()
+    pop3_mailbox.refresh_from_db()
+    assert pop3_mailbox.pop_seen_uidls == ["uidl-1", "uidl-2", "uidl-3"]
+
+
+@pytest.mark.django_db
+def test_POP3Fetcher_fetch_emails__incremental__no_uidl(
+    mocker, pop3_mailbox, fake_email, mock_logger, mock_POP3_uidls
+):
+    """Tests :func:`core.utils.fetchers.POP3Fetcher.fetch_emails`
+    with the INCREMENTAL criterion in case the server doesn't support UIDL.
+    """
+    mock_POP3_uidls.return_value.uidl.side_effect = AssertionError
+    mock_POP3_uidls.return_value.top.side_effect = [
+        (b"+OK", [b"Message-ID: <new-1@test.org>"], 123),
+        (b"+OK", [b"Message-ID: " + fake_email.message_id.encode()], 123),
+        (b"+OK", [b"Message-ID: <new-3@test.org>"], 123),
+    ]
+
+    result = list(
+        POP3Fetcher(pop3_mailbox.account).fetch_emails(
+            pop3_mailbox, EmailFetchingCriterionChoices.INCREMENTAL
+        )
+    )
+
+    assert len(result) == 2
+    assert mock_POP3_uidls.return_value.retr.call_count == 2
+    mock_POP3_uidls.return_value.retr.assert_has_calls([mocker.call(1), mocker.call(3)])
+    pop3_mailbox.refresh_from_db()
+    assert pop3_mailbox.pop_seen_uidls == []
+    mock_logger.exception.assert_called()
+
+
+@pytest.mark.django_db
+def test_POP3Fetcher_fetch_emails__incremental__no_top(
+    mocker, pop3_mailbox, fake_email, mock_logger, mock_POP3_uidls
+):
+    """Tests :func:`core.utils.fetchers.POP3Fetcher.fetch_emails`
+    with the INCREMENTAL criterion in case the server doesn't support TOP.
+    """
+    mock_POP3_uidls.return_value.top.side_effect = AssertionError
+
+    result = list(
+        POP3Fetcher(pop3_mailbox.account).fetch_emails(
+            pop3_mailbox, EmailFetchingCriterionChoices.INCREMENTAL
+        )
+    )
+
+    assert len(result) == 3
+    mock_POP3_uidls.return_value.top.assert_called_once_with(1, 0)
+    assert mock_POP3_uidls.return_value.retr.call_count == 3
+    pop3_mailbox.refresh_from_db()
+    assert pop3_mailbox.pop_seen_uidls == ["uidl-1", "uidl-2", "uidl-3"]
+
+
+@pytest.mark.django_db
+def test_POP3Fetcher_fetch_emails__incremental__exception__ignored(
+    pop3_mailbox, mock_logger, mock_POP3_uidls
+):
+    """Tests :func:`core.utils.fetchers.POP3Fetcher.fetch_emails`
+    with the INCREMENTAL criterion in case of an ignored error during retrieval.
+    """
+    pop3_mailbox.pop_seen_uidls = ["uidl-1"]
+    pop3_mailbox.save(update_fields=["pop_seen_uidls"])
+    mock_POP3_uidls.return_value.retr.side_effect = [
+        AssertionError,
+        mock_POP3_uidls.return_value.retr.return_value,
+    ]
+
+    result = list(
+        POP3Fetcher(pop3_mailbox.account).fetch_emails(
+            pop3_mailbox, EmailFetchingCriterionChoices.INCREMENTAL
+        )
+    )
+
+    assert len(result) == 1
+    pop3_mailbox.refresh_from_db()
+    assert pop3_mailbox.pop_seen_uidls == ["uidl-1", "uidl-3"]
+    mock_logger.warning.assert_called()
+    mock_logger.exception.assert_called()
+
+
+@pytest.mark.django_db
+def test_POP3Fetcher_estimate_emails__all(pop3_mailbox, mock_logger, mock_POP3_uidls):
+    """Tests :func:`core.utils.fetchers.POP3Fetcher.estimate_emails`
+    in case of success with the ALL criterion.
+    """
+    pop3_mailbox.pop_seen_uidls = ["uidl-1", "uidl-deleted"]
+    pop3_mailbox.save(update_fields=["pop_seen_uidls"])
+
+    result = POP3Fetcher(pop3_mailbox.account).estimate_emails(
+        pop3_mailbox, EmailFetchingCriterionChoices.ALL
+    )
+
+    assert result == FetchEstimate(message_count=3, total_size=720, known_count=1)
+    mock_POP3_uidls.return_value.retr.assert_not_called()
+    mock_POP3_uidls.return_value.top.assert_not_called()
+    pop3_mailbox.refresh_from_db()
+    assert pop3_mailbox.pop_seen_uidls == ["uidl-1", "uidl-deleted"]
+    mock_logger.error.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_POP3Fetcher_estimate_emails__incremental(
+    pop3_mailbox, mock_logger, mock_POP3_uidls
+):
+    """Tests :func:`core.utils.fetchers.POP3Fetcher.estimate_emails`
+    in case of success with the INCREMENTAL criterion.
+    """
+    pop3_mailbox.pop_seen_uidls = ["uidl-1", "uidl-deleted"]
+    pop3_mailbox.save(update_fields=["pop_seen_uidls"])
+
+    result = POP3Fetcher(pop3_mailbox.account).estimate_emails(
+        pop3_mailbox, EmailFetchingCriterionChoices.INCREMENTAL
+    )
+
+    assert result == FetchEstimate(message_count=2, total_size=600, known_count=0)
+    mock_POP3_uidls.return_value.retr.assert_not_called()
+    pop3_mailbox.refresh_from_db()
+    assert pop3_mailbox.pop_seen_uidls == ["uidl-1", "uidl-deleted"]
+    mock_logger.error.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_POP3Fetcher_estimate_emails__bad_criterion(pop3_mailbox, mock_logger):
+    """Tests :func:`core.utils.fetchers.POP3Fetcher.estimate_emails`
+    in case of an unavailable criterion.
+    """
+    with pytest.raises(ValueError, match=re.compile("criterion", re.IGNORECASE)):
+        POP3Fetcher(pop3_mailbox.account).estimate_emails(
+            pop3_mailbox, FetchingCriterion("NONE")
+        )
+
+    mock_logger.error.assert_called()
+
+
 @pytest.mark.django_db
 def test_POP3Fetcher_fetch_mailboxes(pop3_mailbox):
     """Tests :func:`core.utils.fetchers.POP3Fetcher.fetch_mailboxes`."""
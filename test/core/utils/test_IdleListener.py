@@ -0,0 +1,443 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+#
+# Eonvelope - a open-source self-hostable email archiving server
+# Copyright (C) 2024 David Aderbauer & The Eonvelope Contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""Test module for the :class:`core.utils.IdleListener.IdleListener` class."""
+
+import re
+import select
+import socketserver
+import threading
+
+import pytest
+from model_bakery import baker
+
+from core.constants import EmailFetchingCriterionChoices, EmailProtocolChoices
+from core.models import Email, Mailbox
+from core.utils import FetchingCriterion
+from core.utils.fetchers import IMAP4Fetcher
+from core.utils.fetchers.exceptions import MailAccountError
+from core.utils.IdleListener import IdleListener
+
+FAKE_MESSAGE = (
+    b"Message-ID: <idle-test@example.org>\r\n"
+    b"From: sender@example.org\r\n"
+    b"To: receiver@example.org\r\n"
+    b"Subject: Pushed\r\n"
+    b"\r\n"
+    b"Delivered while idling.\r\n"
+)
+
+
+class FakeIMAPHandler(socketserver.StreamRequestHandler):
+    """Handles a single client connection to :class:`FakeIMAPServer`.
+
+    Implements just enough of IMAP4rev1 and IDLE for the fetcher to work.
+    """
+
+    server: FakeIMAPServer
+
+    def send_line(self, line: str | bytes) -> None:
+        """Sends a line to the client."""
+        if isinstance(line, str):
+            line = line.encode()
+        self.wfile.write(line + b"\r\n")
+
+    def handle(self) -> None:
+        """Answers the client commands until it logs out."""
+        self.send_line("* OK fake IMAP server ready")
+        while line := self.rfile.readline():
+            tag, command, *args = line.decode().rstrip("\r\n").split(" ", 2)
+            self.server.commands.append(command.upper())
+            handler = getattr(self, f"do_{command.upper()}", None)
+            if handler is None:
+                self.send_line(f"{tag} BAD unknown command")
+            elif handler(tag, *args) is False:
+                return
+
+    def do_CAPABILITY(self, tag: str) -> None:
+        """Answers the CAPABILITY command."""
+        self.send_line(f"* CAPABILITY {' '.join(self.server.capabilities)}")
+        self.send_line(f"{tag} OK CAPABILITY completed")
+
+    def do_LOGIN(self, tag: str, credentials: str) -> None:
+        """Answers the LOGIN command."""
+        self.send_line(f"{tag} OK LOGIN completed")
+
+    def do_EXAMINE(self, tag: str, mailbox_name: str) -> None:
+        """Answers the EXAMINE command."""
+        self.send_line(f"* {len(self.server.messages)} EXISTS")
+        self.send_line("* OK [UIDVALIDITY 1] UIDs valid")
+        self.send_line(
+            f"* OK [UIDNEXT {len(self.server.messages) + 1}] Predicted next UID"
+        )
+        self.send_line(f"{tag} OK [READ-ONLY] EXAMINE completed")
+
+    def do_UNSELECT(self, tag: str) -> None:
+        """Answers the UNSELECT command."""
+        self.send_line(f"{tag} OK UNSELECT completed")
+
+    def do_NOOP(self, tag: str) -> None:
+        """Answers the NOOP command."""
+        self.send_line(f"{tag} OK NOOP completed")
+
+    def do_UID(self, tag: str, arguments: str) -> None:
+        """Answers the UID SEARCH and UID FETCH commands."""
+        subcommand, uid_set, *_ = arguments.split(" ", 2)
+        uids = range(1, len(self.server.messages) + 1)
+        if subcommand.upper() == "SEARCH":
+            self.send_line(f"* SEARCH {' '.join(str(uid) for uid in uids)}".rstrip())
+        else:
+            for uid in (int(uid) for uid in uid_set.split(",")):
+                message = self.server.messages[uid - 1]
+                if "HEADER.FIELDS" in arguments:
+                    header = message.split(b"\r\n")[0] + b"\r\n\r\n"
+                    data_item = f"RFC822.SIZE {len(message)} BODY[HEADER.FIELDS (MESSAGE-ID X-SPAM-FLAG)]"
+                else:
+                    header = message
+                    data_item = "RFC822"
+                self.send_line(
+                    f"* {uid} FETCH (UID {uid} {data_item} {{{len(header)}}}"
+                )
+                self.wfile.write(header)
+                self.send_line(")")
+        self.send_line(f"{tag} OK UID completed")
+
+    def do_IDLE(self, tag: str) -> None:
+        """Answers the IDLE command, announcing the queued messages until the client is done."""
+        self.send_line("+ idling")
+        while not select.select([self.connection], [], [], 0.05)[0]:
+            if self.server.queued_messages:
+                self.server.messages.append(self.server.queued_messages.pop(0))
+                self.send_line(f"* {len(self.server.messages)} EXISTS")
+        assert self.rfile.readline().strip().upper() == b"DONE"
+        self.send_line(f"{tag} OK IDLE terminated")
+
+    def do_LOGOUT(self, tag: str) -> bool:
+        """Answers the LOGOUT command and ends the connection."""
+        self.send_line("* BYE logging out")
+        self.send_line(f"{tag} OK LOGOUT completed")
+        return False
+
+
+class FakeIMAPServer(socketserver.ThreadingTCPServer):
+    """A local in-process stand-in for an IMAP server with a single mailbox."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self) -> None:
+        """Binds the server to a free local port."""
+        super().__init__(("127.0.0.1", 0), FakeIMAPHandler)
+        self.capabilities = ["IMAP4rev1", "IDLE", "UNSELECT"]
+        self.messages: list[bytes] = []
+        self.queued_messages: list[bytes] = []
+        self.commands: list[str] = []
+
+
+@pytest.fixture
+def fake_imap_server():
+    """A running :class:`FakeIMAPServer`."""
+    server = FakeIMAPServer()
+    server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+    server_thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def idle_mailbox(fake_mailbox, fake_imap_server):
+    """Extends :func:`test.conftest.fake_mailbox` to listen with IDLE on :func:`fake_imap_server`."""
+    fake_mailbox.account.mail_host = "127.0.0.1"
+    fake_mailbox.account.mail_host_port = fake_imap_server.server_address[1]
+    fake_mailbox.account.save(update_fields=["mail_host", "mail_host_port"])
+    fake_mailbox.use_idle = True
+    fake_mailbox.save_to_eml = False
+    fake_mailbox.save(update_fields=["use_idle", "save_to_eml"])
+    return fake_mailbox
+
+
+@pytest.fixture
+def listener():
+    """An :class:`core.utils.IdleListener.IdleListener` renewing IDLE quickly."""
+    listener = IdleListener()
+    listener.IDLE_RENEWAL_INTERVAL = 1
+    return listener
+
+
+@pytest.fixture
+def mock_Thread(mocker):
+    """Patches :class:`threading.Thread` in the listener module."""
+    return mocker.patch("core.utils.IdleListener.threading.Thread", autospec=True)
+
+
+def wrap_method(monkeypatch, cls, name, after_call):
+    """Wraps a method of a class to call :attr:`after_call` with the number of calls after every call."""
+    original_method = getattr(cls, name)
+    calls = []
+
+    def wrapper(*args, **kwargs):
+        result = original_method(*args, **kwargs)
+        calls.append(args)
+        after_call(len(calls))
+        return result
+
+    monkeypatch.setattr(cls, name, wrapper)
+    return calls
+
+
+@pytest.mark.django_db
+def test_IdleListener_listen__new_email(
+    monkeypatch, override_config, listener, idle_mailbox, fake_imap_server
+):
+    """Tests :func:`core.utils.IdleListener.IdleListener.listen`
+    in case the server announces a new email while idling.
+    """
+    fake_imap_server.queued_messages.append(FAKE_MESSAGE)
+    fetch_calls = wrap_method(
+        monkeypatch,
+        Mailbox,
+        "fetch",
+        lambda call_count: call_count == 2 and listener.stop(),
+    )
+
+    # the fetching thread of an ingest pipeline can't access the in-memory test db
+    with override_config(INGEST_PARSE_WORKERS=0):
+        listener.listen(idle_mailbox.id)
+
+    assert len(fetch_calls) == 2
+    assert fetch_calls[-1][1] == FetchingCriterion(
+        EmailFetchingCriterionChoices.INCREMENTAL
+    )
+    assert Email.objects.filter(
+        mailbox=idle_mailbox, message_id="<idle-test@example.org>"
+    ).exists()
+    idle_mailbox.refresh_from_db()
+    assert idle_mailbox.imap_highest_uid == 1
+    assert fake_imap_server.commands.count("LOGIN") == 1
+    assert fake_imap_server.commands.count("IDLE") == 1
+    assert fake_imap_server.commands[-1] == "LOGOUT"
+
+
+@pytest.mark.django_db
+def test_IdleListener_listen__email_before_idle(
+    monkeypatch, override_config, listener, idle_mailbox, fake_imap_server
+):
+    """Tests :func:`core.utils.IdleListener.IdleListener.listen`
+    in case an email arrives between the fetch and the start of IDLE.
+    """
+    fetch_calls = wrap_method(
+        monkeypatch,
+        Mailbox,
+        "fetch",
+        lambda call_count: (
+            fake_imap_server.messages.append(FAKE_MESSAGE)
+            if call_count == 1
+            else listener.stop()
+        ),
+    )
+
+    # the fetching thread of an ingest pipeline can't access the in-memory test db
+    with override_config(INGEST_PARSE_WORKERS=0):
+        listener.listen(idle_mailbox.id)
+
+    assert len(fetch_calls) == 2
+    assert Email.objects.filter(
+        mailbox=idle_mailbox, message_id="<idle-test@example.org>"
+    ).exists()
+    assert "IDLE" not in fake_imap_server.commands
+
+
+@pytest.mark.django_db
+def test_IdleListener_listen__idle_renewal(
+    monkeypatch, listener, idle_mailbox, fake_imap_server
+):
+    """Tests :func:`core.utils.IdleListener.IdleListener.listen`
+    in case no email arrives before the mailbox setting is disabled.
+    """
+    fetch_calls = wrap_method(monkeypatch, Mailbox, "fetch", lambda call_count: None)
+    wrap_method(
+        monkeypatch,
+        IMAP4Fetcher,
+        "wait_for_new_emails",
+        lambda call_count: call_count == 2
+        and Mailbox.objects.filter(id=idle_mailbox.id).update(use_idle=False),
+    )
+
+    listener.listen(idle_mailbox.id)
+
+    assert len(fetch_calls) == 1
+    assert fake_imap_server.commands.count("IDLE") == 2
+    assert fake_imap_server.commands.count("LOGIN") == 1
+    assert fake_imap_server.commands[-1] == "LOGOUT"
+
+
+@pytest.mark.django_db
+def test_IdleListener_listen__no_idle_support(listener, idle_mailbox, fake_imap_server):
+    """Tests :func:`core.utils.IdleListener.IdleListener.listen`
+    in case the server doesn't support IDLE.
+    """
+    fake_imap_server.capabilities.remove("IDLE")
+
+    listener.listen(idle_mailbox.id)
+
+    assert listener._idle_unsupported_mailbox_ids == {idle_mailbox.id}
+    assert "IDLE" not in fake_imap_server.commands
+    assert "UID" not in fake_imap_server.commands
+    assert fake_imap_server.commands[-1] == "LOGOUT"
+
+
+@pytest.mark.django_db
+def test_IdleListener_listen__disabled(mocker, listener, fake_mailbox):
+    """Tests :func:`core.utils.IdleListener.IdleListener.listen`
+    in case IDLE is disabled for the mailbox.
+    """
+    mock_get_fetcher = mocker.patch(
+        "core.models.Account.Account.get_fetcher", autospec=True
+    )
+
+    listener.listen(fake_mailbox.id)
+
+    mock_get_fetcher.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_IdleListener_listen__reconnect(mocker, listener, idle_mailbox):
+    """Tests :func:`core.utils.IdleListener.IdleListener.listen`
+    in case connecting fails.
+    """
+    mock_get_fetcher = mocker.patch(
+        "core.models.Account.Account.get_fetcher",
+        autospec=True,
+        side_effect=MailAccountError(Exception()),
+    )
+    mock_wait = mocker.patch.object(
+        listener._stop_event, "wait", side_effect=lambda timeout: listener.stop()
+    )
+
+    listener.listen(idle_mailbox.id)
+
+    mock_get_fetcher.assert_called_once()
+    mock_wait.assert_called_once_with(IdleListener.RECONNECT_DELAY)
+
+
+@pytest.mark.django_db
+def test_IdleListener_listen__reconnect_backoff(mocker, listener, idle_mailbox):
+    """Tests :func:`core.utils.IdleListener.IdleListener.listen`
+    in case listening fails repeatedly with an unexpected error.
+    """
+    mock_get_fetcher = mocker.patch(
+        "core.models.Account.Account.get_fetcher",
+        autospec=True,
+        side_effect=RuntimeError,
+    )
+    mock_close_old_connections = mocker.patch(
+        "core.utils.IdleListener.close_old_connections", autospec=True
+    )
+    mock_wait = mocker.patch.object(
+        listener._stop_event,
+        "wait",
+        side_effect=lambda timeout: mock_wait.call_count == 3 and listener.stop(),
+    )
+
+    listener.listen(idle_mailbox.id)
+
+    assert mock_get_fetcher.call_count == 3
+    assert mock_close_old_connections.call_count == 3
+    assert [call.args[0] for call in mock_wait.call_args_list] == [
+        IdleListener.RECONNECT_DELAY,
+        2 * IdleListener.RECONNECT_DELAY,
+        4 * IdleListener.RECONNECT_DELAY,
+    ]
+
+
+@pytest.mark.django_db
+def test_IdleListener_update_listeners(listener, fake_account, mock_Thread):
+    """Tests :func:`core.utils.IdleListener.IdleListener.update_listeners`."""
+    enabled_mailbox = baker.make(Mailbox, account=fake_account, use_idle=True)
+    baker.make(Mailbox, account=fake_account, use_idle=False)
+    pop_account = baker.make(
+        "core.Account", user=fake_account.user, protocol=EmailProtocolChoices.POP3
+    )
+    baker.make(Mailbox, account=pop_account, use_idle=True)
+
+    listener.update_listeners()
+    listener.update_listeners()
+
+    mock_Thread.assert_called_once_with(
+        target=listener.listen,
+        args=(enabled_mailbox.id,),
+        name=f"idle-listener-{enabled_mailbox.id}",
+        daemon=True,
+    )
+    mock_Thread.return_value.start.assert_called_once_with()
+
+
+@pytest.mark.django_db
+def test_IdleListener_update_listeners__ended_thread(
+    listener, fake_account, mock_Thread
+):
+    """Tests :func:`core.utils.IdleListener.IdleListener.update_listeners`
+    in case a listener thread has ended.
+    """
+    baker.make(Mailbox, account=fake_account, use_idle=True)
+    listener.update_listeners()
+    mock_Thread.return_value.is_alive.return_value = False
+
+    listener.update_listeners()
+
+    assert mock_Thread.call_count == 2
+    assert mock_Thread.return_value.start.call_count == 2
+
+
+@pytest.mark.django_db
+def test_IdleListener_update_listeners__idle_unsupported(
+    listener, fake_account, mock_Thread
+):
+    """Tests :func:`core.utils.IdleListener.IdleListener.update_listeners`
+    in case the server of a mailbox doesn't support IDLE.
+    """
+    mailbox = baker.make(Mailbox, account=fake_account, use_idle=True)
+    listener.update_listeners()
+    mock_Thread.return_value.is_alive.return_value = False
+    listener._idle_unsupported_mailbox_ids.add(mailbox.id)
+
+    listener.update_listeners()
+
+    mock_Thread.assert_called_once()
+
+    mailbox.use_idle = False
+    mailbox.save(update_fields=["use_idle"])
+    listener.update_listeners()
+    mailbox.use_idle = True
+    mailbox.save(update_fields=["use_idle"])
+    listener.update_listeners()
+
+    assert mock_Thread.call_count == 2
+
+
+@pytest.mark.django_db
+def test_IdleListener_run(mocker, listener):
+    """Tests :func:`core.utils.IdleListener.IdleListener.run`."""
+    mock_update_listeners = mocker.patch.object(
+        listener, "update_listeners", side_effect=listener.stop
+    )
+
+    listener.run()
+
+    mock_update_listeners.assert_called_once_with()
@@ -0,0 +1,188 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+#
+# Eonvelope - a open-source self-hostable email archiving server
+# Copyright (C) 2024 David Aderbauer & The Eonvelope Contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""Test module for :mod:`core.utils.IngestPipeline`."""
+
+import threading
+
+import pytest
+
+from core.utils.IngestPipeline import IngestPipeline
+
+
+def make_pipeline(persisted_batches, **kwargs):
+    """Creates a pipeline that uppercases the messages and records the persisted batches."""
+    return IngestPipeline(
+        bytes.upper,
+        lambda batch: persisted_batches.append(list(batch)),
+        parse_workers=kwargs.get("parse_workers", 2),
+        queue_size=kwargs.get("queue_size", 4),
+        persist_batch_size=kwargs.get("persist_batch_size", 3),
+        use_processes=kwargs.get("use_processes", False),
+    )
+
+
+def test_IngestPipeline_run():
+    """Tests :func:`core.utils.IngestPipeline.IngestPipeline.run`
+    in case of success.
+    """
+    messages = [str(number).encode() + b"a" for number in range(10)]
+    persisted_batches = []
+
+    make_pipeline(persisted_batches).run(iter(messages))
+
+    assert all(len(batch) <= 3 for batch in persisted_batches)
+    assert [message for batch in persisted_batches for message in batch] == [
+        message.upper() for message in messages
+    ]
+
+
+def test_IngestPipeline_run__processes():
+    """Tests :func:`core.utils.IngestPipeline.IngestPipeline.run`
+    in case the messages are parsed by processes.
+    """
+    messages = [str(number).encode() + b"a" for number in range(10)]
+    persisted_batches = []
+
+    make_pipeline(persisted_batches, use_processes=True).run(iter(messages))
+
+    assert all(len(batch) <= 3 for batch in persisted_batches)
+    assert [message for batch in persisted_batches for message in batch] == [
+        message.upper() for message in messages
+    ]
+
+
+def test_IngestPipeline_run__backpressure():
+    """Tests :func:`core.utils.IngestPipeline.IngestPipeline.run`
+    in case persisting is slower than fetching.
+    """
+    fetched_count = 0
+    max_fetch_ahead = 0
+    persisted_batches = []
+
+    def fetch():
+        nonlocal fetched_count
+        for number in range(20):
+            fetched_count += 1
+            yield str(number).encode()
+
+    def persist(batch):
+        nonlocal max_fetch_ahead
+        persisted_batches.append(batch)
+        persisted_count = sum(len(persisted) for persisted in persisted_batches)
+        max_fetch_ahead = max(max_fetch_ahead, fetched_count - persisted_count)
+        threading.Event().wait(0.01)
+
+    IngestPipeline(
+        bytes.upper, persist, parse_workers=1, queue_size=2, persist_batch_size=1
+    ).run(fetch())
+
+    assert len(persisted_batches) == 20
+    # the queue, the message in the fetching thread and the one being persisted
+    assert max_fetch_ahead <= 4
+
+
+def test_IngestPipeline_run_after_pending():
+    """Tests :func:`core.utils.IngestPipeline.IngestPipeline.run_after_pending`."""
+    persisted_batches = []
+    deferred_calls = []
+    pipeline = make_pipeline(persisted_batches, persist_batch_size=10)
+
+    def fetch():
+        yield b"first"
+        yield b"second"
+        pipeline.run_after_pending(
+            lambda: deferred_calls.append(
+                [message for batch in persisted_batches for message in batch]
+            )
+        )
+        yield b"third"
+
+    pipeline.run(fetch())
+
+    assert deferred_calls == [[b"FIRST", b"SECOND"]]
+    assert [message for batch in persisted_batches for message in batch] == [
+        b"FIRST",
+        b"SECOND",
+        b"THIRD",
+    ]
+
+
+def test_IngestPipeline_run_after_pending__other_thread():
+    """Tests :func:`core.utils.IngestPipeline.IngestPipeline.run_after_pending`
+    in case it is not called from the fetching thread.
+    """
+    deferred_calls = []
+
+    make_pipeline([]).run_after_pending(lambda: deferred_calls.append(True))
+
+    assert deferred_calls == [True]
+
+
+def test_IngestPipeline_run__fetch_error(fake_error_message):
+    """Tests :func:`core.utils.IngestPipeline.IngestPipeline.run`
+    in case fetching fails.
+    """
+    persisted_batches = []
+
+    def fetch():
+        yield b"first"
+        raise ValueError(fake_error_message)
+
+    with pytest.raises(ValueError, match=fake_error_message):
+        make_pipeline(persisted_batches).run(fetch())
+
+    assert persisted_batches == [[b"FIRST"]]
+
+
+def test_IngestPipeline_run__parse_error(fake_error_message):
+    """Tests :func:`core.utils.IngestPipeline.IngestPipeline.run`
+    in case parsing fails.
+    """
+
+    def parse(message):
+        raise ValueError(fake_error_message)
+
+    with pytest.raises(ValueError, match=fake_error_message):
+        IngestPipeline(
+            parse, list, parse_workers=1, queue_size=1, persist_batch_size=1
+        ).run(iter([b"first", b"second"]))
+
+
+def test_IngestPipeline_run__persist_error(fake_error_message):
+    """Tests :func:`core.utils.IngestPipeline.IngestPipeline.run`
+    in case persisting fails.
+    """
+    fetch_closed = threading.Event()
+
+    def fetch():
+        try:
+            while True:
+                yield b"message"
+        finally:
+            fetch_closed.set()
+
+    def persist(batch):
+        raise ValueError(fake_error_message)
+
+    with pytest.raises(ValueError, match=fake_error_message):
+        IngestPipeline(
+            bytes.upper, persist, parse_workers=1, queue_size=2, persist_batch_size=1
+        ).run(fetch())
+
+    assert fetch_closed.is_set()
@@ -0,0 +1,83 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+#
+# Eonvelope - a open-source self-hostable email archiving server
+# Copyright (C) 2024 David Aderbauer & The Eonvelope Contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+
+"""Test module for :mod:`core.utils.KnownMessageIDs`."""
+
+import pytest
+from model_bakery import baker
+
+from core.models import Email
+from core.utils.KnownMessageIDs import KnownMessageIDs
+
+
+@pytest.mark.django_db
+def test_KnownMessageIDs___init__(fake_email, fake_other_email):
+    """Tests :func:`core.utils.KnownMessageIDs.KnownMessageIDs.__init__`."""
+    other_mailbox_email = baker.make(Email, mailbox=fake_other_email.mailbox)
+
+    result = KnownMessageIDs(fake_email.mailbox)
+
+    assert len(result) == 1
+    assert fake_email.message_id in result
+    assert other_mailbox_email.message_id not in result
+
+
+@pytest.mark.django_db
+def test_KnownMessageIDs___init__chunks(monkeypatch, fake_mailbox):
+    """Tests :func:`core.utils.KnownMessageIDs.KnownMessageIDs.__init__`
+    in case the Message-IDs are loaded in more than one chunk.
+    """
+    monkeypatch.setattr(KnownMessageIDs, "LOAD_CHUNK_SIZE", 2)
+    emails = baker.make(Email, mailbox=fake_mailbox, _quantity=5)
+
+    result = KnownMessageIDs(fake_mailbox)
+
+    assert len(result) == 5
+    assert all(email.message_id in result for email in emails)
+
+
+@pytest.mark.django_db
+def test_KnownMessageIDs_add(faker, fake_mailbox, django_assert_num_queries):
+    """Tests :func:`core.utils.KnownMessageIDs.KnownMessageIDs.add`."""
+    fake_message_id = faker.name()
+    known_message_ids = KnownMessageIDs(fake_mailbox)
+
+    with django_assert_num_queries(0):
+        assert fake_message_id not in known_message_ids
+        known_message_ids.add(fake_message_id)
+        assert fake_message_id in known_message_ids
+
+
+@pytest.mark.django_db
+def test_KnownMessageIDs___init__no_preload(
+    fake_email, faker, django_assert_num_queries
+):
+    """Tests :func:`core.utils.KnownMessageIDs.KnownMessageIDs.__init__`
+    in case the Message-IDs are not preloaded.
+    """
+    fake_message_id = faker.name()
+
+    with django_assert_num_queries(0):
+        result = KnownMessageIDs(fake_email.mailbox, preload=False)
+        result.add(fake_message_id)
+
+    assert result.is_preloaded is False
+    assert len(result) == 1
+    assert fake_message_id in result
+    assert fake_email.message_id not in result
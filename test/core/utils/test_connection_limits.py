@@ -0,0 +1,68 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+#
+# Eonvelope - a open-source self-hostable email archiving server
+# Copyright (C) 2024 David Aderbauer & The Eonvelope Contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""Test module for :mod:`core.utils.connection_limits`."""
+
+import pytest
+
+from core.utils.connection_limits import get_mail_host_slots
+
+
+@pytest.mark.django_db
+def test_get_mail_host_slots(faker, override_config):
+    """Tests :func:`core.utils.connection_limits.get_mail_host_slots`."""
+    fake_mail_host = faker.domain_name()
+
+    with override_config(MAX_CONNECTIONS_PER_MAIL_HOST=2):
+        slots = get_mail_host_slots(fake_mail_host)
+
+        assert get_mail_host_slots(fake_mail_host.upper()) is slots
+        assert get_mail_host_slots(faker.unique.domain_name()) is not slots
+        assert slots.acquire(blocking=False) is True
+        assert slots.acquire(blocking=False) is True
+        assert slots.acquire(blocking=False) is False
+
+
+@pytest.mark.django_db
+def test_get_mail_host_slots__limit_changed(faker, override_config):
+    """Tests :func:`core.utils.connection_limits.get_mail_host_slots`
+    in case the limit setting changes.
+    """
+    fake_mail_host = faker.domain_name()
+
+    with override_config(MAX_CONNECTIONS_PER_MAIL_HOST=1):
+        slots = get_mail_host_slots(fake_mail_host)
+    with override_config(MAX_CONNECTIONS_PER_MAIL_HOST=3):
+        new_slots = get_mail_host_slots(fake_mail_host)
+
+    assert new_slots is not slots
+    for _ in range(3):
+        assert new_slots.acquire(blocking=False) is True
+    assert new_slots.acquire(blocking=False) is False
+
+
+@pytest.mark.django_db
+def test_get_mail_host_slots__nonpositive_limit(faker, override_config):
+    """Tests :func:`core.utils.connection_limits.get_mail_host_slots`
+    in case the limit setting is not positive.
+    """
+    with override_config(MAX_CONNECTIONS_PER_MAIL_HOST=0):
+        slots = get_mail_host_slots(faker.domain_name())
+
+    assert slots.acquire(blocking=False) is True
+    assert slots.acquire(blocking=False) is False
@@ -19,10 +19,12 @@
 """Test module for :mod:`core.utils.mail_parsing`."""
 
 import email
+import pickle
 from datetime import UTC, datetime
 from email import policy
 from email.message import EmailMessage
 from email.utils import format_datetime
+from hashlib import md5
 
 import pytest
 from django.utils.timezone import get_current_timezone
@@ -303,6 +305,111 @@ def test_get_bodytexts(
     assert result.get("html", "") == expected_email_features["html_bodytext"]
 
 
+@pytest.mark.parametrize(
+    (
+        "test_email_path",
+        "expected_email_features",
+        "expected_correspondents_features",
+        "expected_attachments_features",
+    ),
+    TEST_EMAIL_PARAMETERS,
+)
+def test_scan_headers(
+    test_email_path,
+    expected_email_features,
+    expected_correspondents_features,
+    expected_attachments_features,
+):
+    """Tests :func:`core.utils.mail_parsing.scan_headers` on test-email data."""
+    with open(test_email_path, "br") as test_email_file:
+        test_email_bytes = test_email_file.read()
+    test_email_message = email.message_from_bytes(
+        test_email_bytes, policy=policy.default
+    )
+
+    result = mail_parsing.scan_headers(test_email_bytes, ["Message-ID", "Subject"])
+
+    assert result["message-id"] == expected_email_features["message_id"]
+    assert result["subject"] == mail_parsing.get_header(test_email_message, "Subject")
+
+
+@pytest.mark.parametrize(
+    ("email_bytes", "expected_result"),
+    [
+        (b"Message-ID: <id@test>\r\n\r\nbody", {"message-id": "<id@test>"}),
+        (b"message-id:\r\n <folded@test>\r\n\r\n", {"message-id": "<folded@test>"}),
+        (
+            b"Subject: =?utf-8?q?Gr=C3=BC=C3=9Fe?=\nX-Spam-Flag: NO\nX-Spam-Flag: YES\n",
+            {"subject": "Grüße", "x-spam-flag": "NO,YES"},
+        ),
+        (b"Subject: test\n\nMessage-ID: <body@test>", {"subject": "test"}),
+        (b"\nMessage-ID: <body@test>", {}),
+        (b"", {}),
+    ],
+)
+def test_scan_headers__edge_cases(email_bytes, expected_result):
+    """Tests :func:`core.utils.mail_parsing.scan_headers`
+    for folded, encoded, repeated and missing headers.
+    """
+    result = mail_parsing.scan_headers(
+        email_bytes, ["Message-ID", "Subject", "X-Spam-Flag"]
+    )
+
+    assert result == expected_result
+
+
+@pytest.mark.parametrize(
+    (
+        "test_email_path",
+        "expected_email_features",
+        "expected_correspondents_features",
+        "expected_attachments_features",
+    ),
+    TEST_EMAIL_PARAMETERS,
+)
+def test_ParsedEmail_from_bytes(
+    test_email_path,
+    expected_email_features,
+    expected_correspondents_features,
+    expected_attachments_features,
+):
+    """Tests :func:`core.utils.mail_parsing.ParsedEmail.from_bytes` on test-email data."""
+    with open(test_email_path, "br") as test_email_file:
+        test_email_bytes = test_email_file.read()
+
+    result = mail_parsing.ParsedEmail.from_bytes(test_email_bytes)
+
+    assert result.message_id == expected_email_features["message_id"]
+    assert result.datasize == len(test_email_bytes)
+    assert len(result.headers) == expected_email_features["header_count"]
+    assert (
+        result.bodytexts.get("plain", "") == expected_email_features["plain_bodytext"]
+    )
+    assert result.bodytexts.get("html", "") == expected_email_features["html_bodytext"]
+    for mention, _, address in result.correspondents:
+        assert address in expected_correspondents_features[mention]
+    assert len(result.correspondents) == sum(
+        len(addresses) for addresses in expected_correspondents_features.values()
+    )
+    assert len(result.attachments) >= len(expected_attachments_features)
+
+
+def test_ParsedEmail_from_bytes__no_message_id():
+    """Tests :func:`core.utils.mail_parsing.ParsedEmail.from_bytes`
+    in case the email has no Message-ID header.
+    """
+    result = mail_parsing.ParsedEmail.from_bytes(b"Subject: test\n\ntext")
+
+    assert (
+        result.message_id
+        == md5(b"Subject: test\n\ntext", usedforsecurity=False).hexdigest()
+    )
+    assert result.headers == {"subject": "test"}
+    assert result.bodytexts == {"plain": "text"}
+    assert result.attachments == []
+    assert result.correspondents == []
+
+
 @pytest.mark.parametrize(
     ("header", "expected_href"),
     [
@@ -448,3 +555,52 @@ def test_make_vcard_readout(vcard_data, expected_readout):
     result = mail_parsing.make_vcard_readout(vcard_data)
 
     assert result == expected_readout
+
+
+def test_parse_email_bytes_detached():
+    """Tests :func:`core.utils.mail_parsing.parse_email_bytes_detached`."""
+    with open(TEST_EMAIL_PARAMETERS[0][0], "br") as test_email_file:
+        test_email_bytes = test_email_file.read()
+
+    parsed_email, email_bytes = mail_parsing.parse_email_bytes_detached(
+        test_email_bytes
+    )
+    result = pickle.loads(  # noqa: S301  # the data was pickled by this test
+        pickle.dumps(parsed_email)
+    )
+
+    assert email_bytes == test_email_bytes
+    assert result.message_id == parsed_email.message_id
+    assert result.attachments
+    for attachment in result.attachments:
+        assert attachment.part is None
+    assert [attachment.payload for attachment in result.attachments] == [
+        attachment.payload
+        for attachment in mail_parsing.ParsedEmail.from_bytes(
+            test_email_bytes
+        ).attachments
+    ]
+
+
+def test_parse_email_bytes_detached__ignored_content_types(mocker):
+    """Tests :func:`core.utils.mail_parsing.parse_email_bytes_detached`
+    in case the content types of the attachments are ignored.
+    """
+    with open(TEST_EMAIL_PARAMETERS[0][0], "br") as test_email_file:
+        test_email_bytes = test_email_file.read()
+    attachments = mail_parsing.ParsedEmail.from_bytes(test_email_bytes).attachments
+    spy_detach = mocker.spy(mail_parsing.ParsedAttachment, "detach")
+
+    parsed_email, _ = mail_parsing.parse_email_bytes_detached(
+        test_email_bytes,
+        ignore_maintypes=[attachments[0].content_maintype],
+        ignore_subtypes=[attachments[-1].content_subtype],
+    )
+
+    assert all(
+        attachment.content_maintype != attachments[0].content_maintype
+        and attachment.content_subtype != attachments[-1].content_subtype
+        for attachment in parsed_email.attachments
+    )
+    assert len(parsed_email.attachments) < len(attachments)
+    assert spy_detach.call_count == len(parsed_email.attachments)
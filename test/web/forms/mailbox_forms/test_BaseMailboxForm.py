@@ -34,13 +34,17 @@ def test_post(mailbox_payload):
     assert form_data["save_to_eml"] == mailbox_payload["save_to_eml"]
     assert "save_attachments" in form_data
     assert form_data["save_attachments"] == mailbox_payload["save_attachments"]
+    assert "use_idle" in form_data
+    assert form_data["use_idle"] == mailbox_payload["use_idle"]
+    assert "partial_fetch" in form_data
+    assert form_data["partial_fetch"] == mailbox_payload["partial_fetch"]
     assert "is_favorite" not in form_data
     assert "name" not in form_data
     assert "account" not in form_data
     assert "is_healthy" not in form_data
     assert "created" not in form_data
     assert "updated" not in form_data
-    assert len(form_data) == 2
+    assert len(form_data) == 4
 
 
 @pytest.mark.django_db
@@ -56,10 +60,16 @@ def test_get(fake_mailbox):
     assert "save_attachments" in form_fields
     assert "save_attachments" in form_initial_data
     assert form_initial_data["save_attachments"] == fake_mailbox.save_attachments
+    assert "use_idle" in form_fields
+    assert "use_idle" in form_initial_data
+    assert form_initial_data["use_idle"] == fake_mailbox.use_idle
+    assert "partial_fetch" in form_fields
+    assert "partial_fetch" in form_initial_data
+    assert form_initial_data["partial_fetch"] == fake_mailbox.partial_fetch
     assert "is_favorite" not in form_fields
     assert "name" not in form_fields
     assert "account" not in form_fields
     assert "is_healthy" not in form_fields
     assert "created" not in form_fields
     assert "updated" not in form_fields
-    assert len(form_fields) == 2
+    assert len(form_fields) == 4